@@ -10,7 +10,13 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
-from typing import Optional, List, Union, Dict, Any
+from typing import Optional, List, Union, Dict, Any, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+import json
+import multiprocessing
+import time
+import traceback
 import numpy as np
 import itertools
 from tqdm import tqdm
@@ -34,6 +40,12 @@ from syne_tune.optimizer.schedulers.transfer_learning import (
 )
 from syne_tune.stopping_criterion import StoppingCriterion
 from syne_tune.tuner import Tuner
+from syne_tune.util import experiment_path, name_from_base
+
+
+# Written to the tuner directory once an experiment finished successfully.
+# Used to skip completed experiments if ``--resume 1`` is given
+COMPLETED_MARKER_NAME = "completed"
 
 
 SurrogateBenchmarkDefinitions = Union[
@@ -159,6 +171,18 @@ def parse_args(
                 default="none",
                 help="Ordinal encoding for fcnet categorical HPs",
             ),
+            dict(
+                name="num_processes",
+                type=int,
+                default=1,
+                help="Number of experiments to run in parallel (local processes)",
+            ),
+            dict(
+                name="resume",
+                type=int,
+                default=0,
+                help="If 1, experiments which completed before (same experiment_tag) are skipped",
+            ),
         ]
     )
     if nested_dict:
@@ -172,6 +196,7 @@ def parse_args(
     args, method_names, seeds = _parse_args(methods, extra_args)
     args.verbose = bool(args.verbose)
     args.support_checkpointing = bool(args.support_checkpointing)
+    args.resume = bool(args.resume)
     if args.benchmark is not None:
         benchmark_names = [args.benchmark]
     else:
@@ -192,6 +217,164 @@ def parse_args(
     return args, method_names, benchmark_names, seeds
 
 
+def completed_combinations(experiment_tag: str) -> Set[Tuple[str, int, str]]:
+    """
+    :param experiment_tag: Tag of experiments
+    :return: Set of ``(method, seed, benchmark_name)`` of experiments with
+        tag ``experiment_tag`` which completed successfully
+    """
+    result = set()
+    for path in experiment_path().glob(f"{experiment_tag}-*"):
+        metadata_path = path / "metadata.json"
+        if (path / COMPLETED_MARKER_NAME).exists() and metadata_path.exists():
+            with open(metadata_path, "r") as f:
+                metadata = json.load(f)
+            if metadata.get("tag") == experiment_tag:
+                result.add(
+                    (metadata["algorithm"], metadata["seed"], metadata["benchmark"])
+                )
+    return result
+
+
+def _create_tuner_name(experiment_tag: str) -> str:
+    """
+    Creates the directory for a new experiment, whose name has a timestamp
+    appended to ``experiment_tag``. Different from :class:`~syne_tune.Tuner`,
+    this makes sure the name does not clash with experiments started at the
+    same time by other processes.
+    """
+    while True:
+        tuner_name = name_from_base(experiment_tag, default="st-tuner")
+        try:
+            experiment_path(tuner_name=tuner_name).mkdir(parents=True)
+            return tuner_name
+        except FileExistsError:
+            time.sleep(0.001)
+
+
+def run_experiment(
+    method: str,
+    seed: int,
+    benchmark_name: str,
+    args,
+    methods: MethodDefinitions,
+    benchmark_definitions: Dict[str, SurrogateBenchmarkDefinition],
+    extra_args: Optional[dict] = None,
+    use_transfer_learning: bool = False,
+):
+    """
+    Runs a single experiment with the simulator back-end.
+
+    :param method: Name of method, key in ``methods``
+    :param seed: Seed of repetition
+    :param benchmark_name: Name of benchmark, key in ``benchmark_definitions``
+    :param args: Command line arguments, see :func:`parse_args`
+    :param methods: Dictionary with method constructors
+    :param benchmark_definitions: Definitions of benchmarks
+    :param extra_args: Values of extra arguments, as returned by
+        ``map_extra_args``. Optional
+    :param use_transfer_learning: If True, we use transfer tuning. Defaults to
+        False
+    """
+    experiment_tag = args.experiment_tag
+    np.random.seed(seed)
+    benchmark = benchmark_definitions[benchmark_name]
+    if args.n_workers is not None:
+        benchmark.n_workers = args.n_workers
+    if args.max_wallclock_time is not None:
+        benchmark.max_wallclock_time = args.max_wallclock_time
+    print(f"Starting experiment ({method}/{benchmark_name}/{seed}) of {experiment_tag}")
+
+    max_resource_attr = benchmark.max_resource_attr
+    backend = BlackboxRepositoryBackend(
+        blackbox_name=benchmark.blackbox_name,
+        elapsed_time_attr=benchmark.elapsed_time_attr,
+        max_resource_attr=max_resource_attr,
+        support_checkpointing=args.support_checkpointing,
+        dataset=benchmark.dataset_name,
+        surrogate=benchmark.surrogate,
+        surrogate_kwargs=benchmark.surrogate_kwargs,
+        add_surrogate_kwargs=benchmark.add_surrogate_kwargs,
+    )
+
+    resource_attr = next(iter(backend.blackbox.fidelity_space.keys()))
+    max_resource_level = int(max(backend.blackbox.fidelity_values))
+    if max_resource_attr is not None:
+        config_space = dict(
+            backend.blackbox.configuration_space,
+            **{max_resource_attr: max_resource_level},
+        )
+        method_kwargs = {"max_resource_attr": max_resource_attr}
+    else:
+        config_space = backend.blackbox.configuration_space
+        method_kwargs = {"max_t": max_resource_level}
+    if extra_args is not None:
+        method_kwargs["scheduler_kwargs"] = extra_args
+    if use_transfer_learning:
+        method_kwargs["transfer_learning_evaluations"] = (
+            get_transfer_learning_evaluations(
+                blackbox_name=benchmark.blackbox_name,
+                test_task=benchmark.dataset_name,
+                datasets=benchmark.datasets,
+            ),
+        )
+    scheduler = methods[method](
+        MethodArguments(
+            config_space=config_space,
+            metric=benchmark.metric,
+            mode=benchmark.mode,
+            random_seed=seed,
+            resource_attr=resource_attr,
+            verbose=args.verbose,
+            fcnet_ordinal=args.fcnet_ordinal,
+            use_surrogates="lcbench" in benchmark_name,
+            **method_kwargs,
+        )
+    )
+
+    stop_criterion = StoppingCriterion(
+        max_wallclock_time=benchmark.max_wallclock_time,
+        max_num_evaluations=benchmark.max_num_evaluations,
+    )
+    metadata = get_metadata(
+        seed, method, experiment_tag, benchmark_name, extra_args=extra_args
+    )
+    metadata["fcnet_ordinal"] = args.fcnet_ordinal
+    if benchmark.add_surrogate_kwargs is not None:
+        metadata["predict_curves"] = int(
+            benchmark.add_surrogate_kwargs["predict_curves"]
+        )
+    tuner = Tuner(
+        trial_backend=backend,
+        scheduler=scheduler,
+        stop_criterion=stop_criterion,
+        n_workers=benchmark.n_workers,
+        sleep_time=0,
+        callbacks=[SimulatorCallback()],
+        results_update_interval=600,
+        print_update_interval=600,
+        tuner_name=_create_tuner_name(experiment_tag),
+        suffix_tuner_name=False,
+        metadata=metadata,
+        save_tuner=args.save_tuner,
+    )
+    tuner.run()
+    (tuner.tuner_path / COMPLETED_MARKER_NAME).touch()
+
+
+# Set in :func:`main` before worker processes are forked, so that ``methods``
+# and ``benchmark_definitions`` need not be pickled
+_run_experiment_in_worker = None
+
+
+def _run_experiment_catch_failure(combination: Tuple[str, int, str]) -> Optional[str]:
+    try:
+        _run_experiment_in_worker(*combination)
+        return None
+    except Exception:
+        return traceback.format_exc()
+
+
 def main(
     methods: MethodDefinitions,
     benchmark_definitions: SurrogateBenchmarkDefinitions,
@@ -200,11 +383,19 @@ def main(
     use_transfer_learning: bool = False,
 ):
     """
-    Runs sequence of experiments with simulator back-end sequentially. The loop
-    runs over methods selected from ``methods``, repetitions and benchmarks
-    selected from ``benchmark_definitions``, with the range being controlled by
+    Runs sequence of experiments with simulator back-end. The loop runs over
+    methods selected from ``methods``, repetitions and benchmarks selected
+    from ``benchmark_definitions``, with the range being controlled by
     command line arguments.
 
+    If ``--num_processes`` is larger than 1, experiments are run in parallel
+    by a pool of local processes. Tabulated blackboxes are memory-mapped, so
+    their data is shared between these processes. Failed experiments do not
+    stop the others, they are reported at the end. If ``--resume 1`` is
+    given, experiments which completed before with the same
+    ``--experiment_tag`` are skipped. In any case, results are written to the
+    same place as for sequential runs.
+
     :param methods: Dictionary with method constructors
     :param benchmark_definitions: Definitions of benchmarks
     :param extra_args: Extra arguments for command line parser. Optional
@@ -213,6 +404,8 @@ def main(
     :param use_transfer_learning: If True, we use transfer tuning. Defaults to
         False
     """
+    global _run_experiment_in_worker
+
     args, method_names, benchmark_names, seeds = parse_args(
         methods, benchmark_definitions, extra_args
     )
@@ -223,92 +416,55 @@ def main(
         ), "Use --benchmark_key if benchmark_definitions is a nested dictionary"
         benchmark_definitions = benchmark_definitions[args.benchmark_key]
     set_logging_level(args)
+    if extra_args is not None:
+        assert map_extra_args is not None
+        extra_args = map_extra_args(args)
 
     combinations = list(itertools.product(method_names, seeds, benchmark_names))
-    print(combinations)
-    for method, seed, benchmark_name in tqdm(combinations):
-        np.random.seed(seed)
-        benchmark = benchmark_definitions[benchmark_name]
-        if args.n_workers is not None:
-            benchmark.n_workers = args.n_workers
-        if args.max_wallclock_time is not None:
-            benchmark.max_wallclock_time = args.max_wallclock_time
+    if args.resume:
+        completed = completed_combinations(experiment_tag)
+        num_before = len(combinations)
+        combinations = [c for c in combinations if c not in completed]
         print(
-            f"Starting experiment ({method}/{benchmark_name}/{seed}) of {experiment_tag}"
-        )
-
-        max_resource_attr = benchmark.max_resource_attr
-        backend = BlackboxRepositoryBackend(
-            blackbox_name=benchmark.blackbox_name,
-            elapsed_time_attr=benchmark.elapsed_time_attr,
-            max_resource_attr=max_resource_attr,
-            support_checkpointing=args.support_checkpointing,
-            dataset=benchmark.dataset_name,
-            surrogate=benchmark.surrogate,
-            surrogate_kwargs=benchmark.surrogate_kwargs,
-            add_surrogate_kwargs=benchmark.add_surrogate_kwargs,
-        )
-
-        resource_attr = next(iter(backend.blackbox.fidelity_space.keys()))
-        max_resource_level = int(max(backend.blackbox.fidelity_values))
-        if max_resource_attr is not None:
-            config_space = dict(
-                backend.blackbox.configuration_space,
-                **{max_resource_attr: max_resource_level},
-            )
-            method_kwargs = {"max_resource_attr": max_resource_attr}
-        else:
-            config_space = backend.blackbox.configuration_space
-            method_kwargs = {"max_t": max_resource_level}
-        if extra_args is not None:
-            assert map_extra_args is not None
-            extra_args = map_extra_args(args)
-            method_kwargs["scheduler_kwargs"] = extra_args
-        if use_transfer_learning:
-            method_kwargs["transfer_learning_evaluations"] = (
-                get_transfer_learning_evaluations(
-                    blackbox_name=benchmark.blackbox_name,
-                    test_task=benchmark.dataset_name,
-                    datasets=benchmark.datasets,
-                ),
-            )
-        scheduler = methods[method](
-            MethodArguments(
-                config_space=config_space,
-                metric=benchmark.metric,
-                mode=benchmark.mode,
-                random_seed=seed,
-                resource_attr=resource_attr,
-                verbose=args.verbose,
-                fcnet_ordinal=args.fcnet_ordinal,
-                use_surrogates="lcbench" in benchmark_name,
-                **method_kwargs,
-            )
+            f"Skipping {num_before - len(combinations)} experiments which "
+            f"completed before (experiment_tag = {experiment_tag})"
         )
-
-        stop_criterion = StoppingCriterion(
-            max_wallclock_time=benchmark.max_wallclock_time,
-            max_num_evaluations=benchmark.max_num_evaluations,
-        )
-        metadata = get_metadata(
-            seed, method, experiment_tag, benchmark_name, extra_args=extra_args
-        )
-        metadata["fcnet_ordinal"] = args.fcnet_ordinal
-        if benchmark.add_surrogate_kwargs is not None:
-            metadata["predict_curves"] = int(
-                benchmark.add_surrogate_kwargs["predict_curves"]
-            )
-        tuner = Tuner(
-            trial_backend=backend,
-            scheduler=scheduler,
-            stop_criterion=stop_criterion,
-            n_workers=benchmark.n_workers,
-            sleep_time=0,
-            callbacks=[SimulatorCallback()],
-            results_update_interval=600,
-            print_update_interval=600,
-            tuner_name=experiment_tag,
-            metadata=metadata,
-            save_tuner=args.save_tuner,
-        )
-        tuner.run()
+    print(combinations)
+    experiment_fn = partial(
+        run_experiment,
+        args=args,
+        methods=methods,
+        benchmark_definitions=benchmark_definitions,
+        extra_args=extra_args,
+        use_transfer_learning=use_transfer_learning,
+    )
+    if args.num_processes <= 1:
+        for method, seed, benchmark_name in tqdm(combinations):
+            experiment_fn(method, seed, benchmark_name)
+    else:
+        _run_experiment_in_worker = experiment_fn
+        failures = []
+        with ProcessPoolExecutor(
+            max_workers=args.num_processes,
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            futures = {
+                executor.submit(_run_experiment_catch_failure, combination): combination
+                for combination in combinations
+            }
+            for future in tqdm(as_completed(futures), total=len(futures)):
+                combination = futures[future]
+                try:
+                    error_msg = future.result()
+                except Exception:
+                    # For example, the worker process died
+                    error_msg = traceback.format_exc()
+                if error_msg is not None:
+                    print(f"Experiment {combination} failed:\n{error_msg}")
+                    failures.append((combination, error_msg))
+        _run_experiment_in_worker = None
+        if failures:
+            msg_lines = [
+                f"{len(failures)} of {len(combinations)} experiments failed:"
+            ] + [f"  {combination}" for combination, _ in failures]
+            raise RuntimeError("\n".join(msg_lines))
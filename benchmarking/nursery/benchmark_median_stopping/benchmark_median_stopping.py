@@ -0,0 +1,178 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Micro-benchmark for :class:`MedianStoppingRule`, measuring the number of
+reports processed per second on a synthetic stream of results.
+
+The stream consists of ``num_trials`` trials, each reporting at resource
+levels ``1, ..., num_resources`` (trials are not stopped, so the stream has
+``num_trials * num_resources`` reports). The wrapped scheduler always returns
+``CONTINUE``, so only the cost of the median stopping rule is measured. We
+compare the current implementation, which maintains results in a
+:class:`~syne_tune.optimizer.schedulers.utils.sorted_list.SortedList`, against
+the previous one, which inserted into sorted NumPy arrays. Since the latter is
+quadratic in the number of trials, it is run on a prefix of the stream only
+(see ``--num_reports_before``). If ``--rank_window`` is given, ranks are
+computed over a sliding window of recent results.
+
+Run with:
+
+.. code-block:: bash
+
+   python benchmarking/nursery/benchmark_median_stopping/benchmark_median_stopping.py \
+       --num_trials 100000 --num_resources 10
+
+With --num_trials 1000000 --num_resources 1, all one million reports are
+ranked at the same resource level.
+"""
+from argparse import ArgumentParser
+from collections import defaultdict
+from datetime import datetime
+from time import perf_counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from syne_tune.backend.trial_status import Trial
+from syne_tune.optimizer.scheduler import (
+    TrialScheduler,
+    SchedulerDecision,
+    TrialSuggestion,
+)
+from syne_tune.optimizer.schedulers.median_stopping_rule import MedianStoppingRule
+
+
+class ContinueScheduler(TrialScheduler):
+    def __init__(self, metric: str, mode: str):
+        super().__init__(config_space=dict())
+        self.metric = metric
+        self._mode = mode
+
+    def _suggest(self, trial_id: int) -> Optional[TrialSuggestion]:
+        return None
+
+    def on_trial_result(self, trial: Trial, result: Dict) -> str:
+        return SchedulerDecision.CONTINUE
+
+    def metric_names(self) -> List[str]:
+        return [self.metric]
+
+    def metric_mode(self) -> str:
+        return self._mode
+
+
+class SortedArrayMedianStoppingRule(MedianStoppingRule):
+    """
+    Previous implementation, which inserts each result into a sorted NumPy
+    array. This costs O(n) for each report.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sorted_results = defaultdict(list)
+
+    def on_trial_result(self, trial: Trial, result: Dict) -> str:
+        new_metric = result[self.metric]
+        if self.mode == "max":
+            new_metric *= -1
+        time_step = result[self.resource_attr]
+        if self.running_average:
+            self.trial_to_results[trial.trial_id].append(new_metric)
+            new_metric = np.mean(self.trial_to_results[trial.trial_id])
+        index = np.searchsorted(self.sorted_results[time_step], new_metric)
+        self.sorted_results[time_step] = np.insert(
+            self.sorted_results[time_step], index, new_metric
+        )
+        normalized_rank = index / float(len(self.sorted_results[time_step]))
+        if (
+            self.grace_condition(time_step=time_step)
+            or normalized_rank <= self.rank_cutoff
+        ):
+            return self.scheduler.on_trial_result(trial=trial, result=result)
+        else:
+            return SchedulerDecision.STOP
+
+
+def run_stream(
+    scheduler: MedianStoppingRule,
+    num_trials: int,
+    num_resources: int,
+    num_reports: int,
+    seed: int,
+) -> (int, float):
+    """
+    :return: ``(num_reports, elapsed_time)``, where ``num_reports`` is the
+        number of reports processed, and ``elapsed_time`` is the time spent
+        (in secs)
+    """
+    random_state = np.random.RandomState(seed)
+    trials = [
+        Trial(trial_id=trial_id, config=dict(), creation_time=datetime.now())
+        for trial_id in range(num_trials)
+    ]
+    # Reports arrive in order of resource level, trials interleaved
+    metric_values = random_state.rand(num_resources, num_trials).tolist()
+    count = 0
+    start_time = perf_counter()
+    for resource, values in enumerate(metric_values, start=1):
+        for trial, value in zip(trials, values):
+            if count >= num_reports:
+                return count, perf_counter() - start_time
+            scheduler.on_trial_result(trial, {"epoch": resource, "metric": value})
+            count += 1
+    return count, perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--num_trials", type=int, default=100000)
+    parser.add_argument("--num_resources", type=int, default=10)
+    parser.add_argument("--num_reports_before", type=int, default=200000)
+    parser.add_argument("--rank_window", type=int)
+    parser.add_argument("--seed", type=int, default=31415927)
+    args = parser.parse_args()
+
+    num_reports = args.num_trials * args.num_resources
+    for name, scheduler_cls, _num_reports, kwargs in [
+        (
+            "before (sorted arrays)",
+            SortedArrayMedianStoppingRule,
+            min(num_reports, args.num_reports_before),
+            dict(),
+        ),
+        (
+            "after (sorted list)",
+            MedianStoppingRule,
+            num_reports,
+            dict(rank_window=args.rank_window),
+        ),
+    ]:
+        if _num_reports <= 0:
+            continue
+        scheduler = scheduler_cls(
+            scheduler=ContinueScheduler(metric="metric", mode="min"),
+            resource_attr="epoch",
+            running_average=False,
+            **kwargs,
+        )
+        num_processed, elapsed_time = run_stream(
+            scheduler,
+            num_trials=args.num_trials,
+            num_resources=args.num_resources,
+            num_reports=_num_reports,
+            seed=args.seed,
+        )
+        print(
+            f"{name}: {num_processed} reports in {elapsed_time:.2f} secs "
+            f"({num_processed / elapsed_time:.0f} reports/sec)"
+        )
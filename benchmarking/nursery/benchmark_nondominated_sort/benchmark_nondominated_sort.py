@@ -0,0 +1,74 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Benchmark for non-dominated sorting, as used by
+:class:`~syne_tune.optimizer.schedulers.multiobjective.multiobjective_priority.NonDominatedPriority`.
+
+For each number of points and objectives, points are drawn uniformly at
+random, and we measure the time for computing the Pareto efficient points
+(``pareto_efficient``), the indices of non-dominated layers
+(``nondominated_layer_indices``), and the full ``nondominated_sort``, which
+also orders points within each layer by an epsilon-net. Set ``--max_items``
+to sort only the top points. For more than three objectives, dominance is
+computed between blocks of points, which is quadratic in the number of
+points, so use smaller sizes then.
+
+Run with:
+
+.. code-block:: bash
+
+   python benchmarking/nursery/benchmark_nondominated_sort/benchmark_nondominated_sort.py \
+       --num_points 10000 100000 1000000 --num_objectives 2 3
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+
+import numpy as np
+
+from syne_tune.optimizer.schedulers.multiobjective.non_dominated_priority import (
+    pareto_efficient,
+    nondominated_layer_indices,
+    nondominated_sort,
+)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--num_points", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    parser.add_argument("--num_objectives", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--max_items", type=int)
+    parser.add_argument("--seed", type=int, default=31415927)
+    args = parser.parse_args()
+
+    random_state = np.random.RandomState(args.seed)
+    for num_objectives in args.num_objectives:
+        for num_points in args.num_points:
+            X = random_state.rand(num_points, num_objectives)
+            start_time = perf_counter()
+            num_efficient = int(np.sum(pareto_efficient(X)))
+            time_pareto = perf_counter() - start_time
+            start_time = perf_counter()
+            num_layers = int(np.max(nondominated_layer_indices(X))) + 1
+            time_layers = perf_counter() - start_time
+            start_time = perf_counter()
+            nondominated_sort(X, dim=0, max_items=args.max_items)
+            time_sort = perf_counter() - start_time
+            print(
+                f"num_points = {num_points}, num_objectives = {num_objectives} "
+                f"[{num_efficient} efficient, {num_layers} layers]:\n"
+                f"  pareto_efficient:           {time_pareto:.2f} secs\n"
+                f"  nondominated_layer_indices: {time_layers:.2f} secs\n"
+                f"  nondominated_sort:          {time_sort:.2f} secs"
+            )
@@ -0,0 +1,143 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Micro-benchmark for the event heap of the simulator back-end, measuring the
+number of simulated events processed per second.
+
+The workload mimics asynchronous successive halving run with the simulator
+back-end: whenever a worker is free, a trial is started, which pushes one
+``OnTrialResultEvent`` per epoch and a final ``CompleteEvent``. At rung levels,
+most trials are stopped, which removes their remaining events. We compare
+:class:`SimulatorState` (lazy removal) with :class:`EagerRemovalSimulatorState`,
+which rebuilds the heap for every removal (as done before).
+
+Run with:
+
+.. code-block:: bash
+
+   python benchmarking/nursery/benchmark_simulator_events/benchmark_event_heap.py \
+       --num_trials 5000 --num_workers 256
+"""
+import heapq
+import math
+from argparse import ArgumentParser
+from time import perf_counter
+
+import numpy as np
+
+from syne_tune.backend.simulator_backend.events import (
+    SimulatorState,
+    OnTrialResultEvent,
+    CompleteEvent,
+)
+
+
+class EagerRemovalSimulatorState(SimulatorState):
+    """
+    Removes events of a trial by rebuilding the heap, which costs O(n) for
+    each call of :meth:`remove_events`.
+    """
+
+    def remove_events(self, trial_id: int):
+        self.event_heap = [
+            elem for elem in self.event_heap if elem[2].trial_id != trial_id
+        ]
+        heapq.heapify(self.event_heap)
+        self._num_events_per_trial.pop(trial_id, None)
+
+
+def run_simulation(
+    state: SimulatorState,
+    num_trials: int,
+    num_workers: int,
+    max_epochs: int,
+    reduction_factor: int,
+    seed: int,
+) -> (int, float):
+    """
+    :return: ``(num_events, elapsed_time)``, where ``num_events`` is the number
+        of events processed, and ``elapsed_time`` is the time spent (in secs)
+    """
+    random_state = np.random.RandomState(seed)
+    rung_levels = set()
+    level = 1
+    while level < max_epochs:
+        rung_levels.add(level)
+        level *= reduction_factor
+    next_trial_id = 0
+
+    def start_trial(time_start: float):
+        nonlocal next_trial_id
+        trial_id = next_trial_id
+        next_trial_id += 1
+        epoch_times = time_start + np.cumsum(
+            random_state.uniform(0.5, 1.5, size=max_epochs)
+        )
+        for epoch, event_time in enumerate(epoch_times.tolist(), start=1):
+            state.push(
+                OnTrialResultEvent(trial_id=trial_id, result=dict(epoch=epoch)),
+                event_time=event_time,
+            )
+        state.push(
+            CompleteEvent(trial_id=trial_id, status="Completed"),
+            event_time=time_start + 2 * max_epochs,
+        )
+
+    num_events = 0
+    start_time = perf_counter()
+    for _ in range(num_workers):
+        start_trial(0.0)
+    while True:
+        entry = state.next_until(math.inf)
+        if entry is None:
+            break
+        num_events += 1
+        time_event, event = entry
+        worker_free = isinstance(event, CompleteEvent)
+        if (
+            isinstance(event, OnTrialResultEvent)
+            and event.result["epoch"] in rung_levels
+            and random_state.rand() >= 1 / reduction_factor
+        ):
+            state.remove_events(event.trial_id)
+            worker_free = True
+        if worker_free and next_trial_id < num_trials:
+            start_trial(time_event)
+    return num_events, perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--num_trials", type=int, default=5000)
+    parser.add_argument("--num_workers", type=int, default=256)
+    parser.add_argument("--max_epochs", type=int, default=81)
+    parser.add_argument("--reduction_factor", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=31415927)
+    args = parser.parse_args()
+
+    for name, state in [
+        ("before (eager removal)", EagerRemovalSimulatorState()),
+        ("after (lazy removal)", SimulatorState()),
+    ]:
+        num_events, elapsed_time = run_simulation(
+            state,
+            num_trials=args.num_trials,
+            num_workers=args.num_workers,
+            max_epochs=args.max_epochs,
+            reduction_factor=args.reduction_factor,
+            seed=args.seed,
+        )
+        print(
+            f"{name}: {num_events} events in {elapsed_time:.2f} secs "
+            f"({num_events / elapsed_time:.0f} events/sec)"
+        )
@@ -0,0 +1,134 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Benchmark comparing exact Gaussian process surrogate models against sparse
+approximations (VFE, FITC) for Bayesian optimization with many observations.
+
+:class:`~syne_tune.optimizer.schedulers.searchers.GPFIFOSearcher` is fed with
+``num_observations`` random evaluations of the Hartmann6 function, then runs
+``num_iterations`` sequential BO steps. We report the average latency of
+``get_config`` (which includes fitting the surrogate model) and the simple
+regret of the best configuration suggested by BO. The random evaluations are
+the same for all variants.
+
+Run with:
+
+.. code-block:: bash
+
+   python benchmarking/nursery/benchmark_sparse_gp/benchmark_sparse_gp.py \
+       --num_observations 250 500 1000 --num_iterations 10
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+
+import numpy as np
+
+from syne_tune.config_space import uniform
+from syne_tune.optimizer.schedulers.searchers import GPFIFOSearcher
+
+HARTMANN6_ALPHA = np.array([1.0, 1.2, 3.0, 3.2])
+HARTMANN6_A = np.array(
+    [
+        [10, 3, 17, 3.5, 1.7, 8],
+        [0.05, 10, 17, 0.1, 8, 14],
+        [3, 3.5, 1.7, 10, 17, 8],
+        [17, 8, 0.05, 10, 0.1, 14],
+    ]
+)
+HARTMANN6_P = 1e-4 * np.array(
+    [
+        [1312, 1696, 5569, 124, 8283, 5886],
+        [2329, 4135, 8307, 3736, 1004, 9991],
+        [2348, 1451, 3522, 2883, 3047, 6650],
+        [4047, 8828, 8732, 5743, 1091, 381],
+    ]
+)
+HARTMANN6_MINIMUM = -3.32237
+
+CONFIG_SPACE = {f"x{i}": uniform(0.0, 1.0) for i in range(6)}
+
+
+def hartmann6(config: dict) -> float:
+    x = np.array([config[f"x{i}"] for i in range(6)])
+    inner = np.sum(HARTMANN6_A * np.square(x - HARTMANN6_P), axis=1)
+    return float(-np.sum(HARTMANN6_ALPHA * np.exp(-inner)))
+
+
+def run_bo(
+    gp_approximation: str,
+    num_inducing_points: int,
+    num_observations: int,
+    num_iterations: int,
+    seed: int,
+) -> (float, float):
+    """
+    :return: ``(latency, regret)``, where ``latency`` is the average time
+        (in secs) for ``get_config``, and ``regret`` the simple regret of the
+        best configuration suggested by BO
+    """
+    searcher = GPFIFOSearcher(
+        CONFIG_SPACE,
+        metric="y",
+        mode="min",
+        random_seed=seed,
+        debug_log=False,
+        num_init_random=0,
+        gp_approximation=gp_approximation,
+        gp_num_inducing_points=num_inducing_points,
+    )
+    random_state = np.random.RandomState(seed)
+    for trial_id in range(num_observations):
+        config = {
+            name: domain.sample(random_state=random_state)
+            for name, domain in CONFIG_SPACE.items()
+        }
+        searcher._update(str(trial_id), config, {"y": hartmann6(config)})
+    latencies = []
+    best_value = np.inf
+    for trial_id in range(num_observations, num_observations + num_iterations):
+        start_time = perf_counter()
+        config = searcher.get_config(trial_id=str(trial_id))
+        latencies.append(perf_counter() - start_time)
+        value = hartmann6(config)
+        best_value = min(best_value, value)
+        searcher._update(str(trial_id), config, {"y": value})
+    return float(np.mean(latencies)), best_value - HARTMANN6_MINIMUM
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--num_observations", type=int, nargs="+", default=[250, 500, 1000]
+    )
+    parser.add_argument("--num_iterations", type=int, default=10)
+    parser.add_argument("--num_inducing_points", type=int, default=128)
+    parser.add_argument(
+        "--gp_approximations", type=str, nargs="+", default=["exact", "vfe", "fitc"]
+    )
+    parser.add_argument("--seed", type=int, default=31415927)
+    args = parser.parse_args()
+
+    for num_observations in args.num_observations:
+        for gp_approximation in args.gp_approximations:
+            latency, regret = run_bo(
+                gp_approximation=gp_approximation,
+                num_inducing_points=args.num_inducing_points,
+                num_observations=num_observations,
+                num_iterations=args.num_iterations,
+                seed=args.seed,
+            )
+            print(
+                f"num_observations = {num_observations}, "
+                f"gp_approximation = {gp_approximation}: "
+                f"latency = {latency:.3f} secs, regret = {regret:.4f}"
+            )
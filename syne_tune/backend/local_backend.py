@@ -13,25 +13,37 @@
 import json
 import logging
 import os
+import selectors
 import shutil
 import sys
+import time
 
 import numpy as np
 import subprocess
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from syne_tune.backend.trial_backend import TrialBackend, BUSY_STATUS
 from syne_tune.num_gpu import get_num_gpus
-from syne_tune.report import retrieve
+from syne_tune.report import IncrementalLogReader
+from syne_tune.metrics_channel import MetricsChannelReader
 from syne_tune.backend.trial_status import TrialResult, Status
-from syne_tune.constants import ST_CHECKPOINT_DIR
+from syne_tune.constants import (
+    ST_CHECKPOINT_DIR,
+    ST_METRICS_CHANNEL_ENV,
+    ST_METRICS_CHANNEL_BATCH_SIZE_ENV,
+    ST_METRICS_CHANNEL_MAX_DELAY_ENV,
+)
 from syne_tune.util import experiment_path, random_string
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_EVENT_POLL_INTERVAL = 0.2
+
+
 if "OMP_NUM_THREADS" not in os.environ:
     logger.debug(
         "OMP_NUM_THREADS is not set, it is going to be set to 1 to avoid "
@@ -41,6 +53,43 @@ if "OMP_NUM_THREADS" not in os.environ:
     os.environ["OMP_NUM_THREADS"] = "1"
 
 
+@dataclass
+class MetricsChannelConfig:
+    """
+    Configures the binary metrics channel between
+    :class:`~syne_tune.Reporter` and :class:`LocalBackend` (see
+    :mod:`syne_tune.metrics_channel`). Reports are written to the file
+    ``metrics.bin`` in the trial directory instead of ``std.out``. For trials
+    whose scripts do not write to this channel, reports are still parsed from
+    ``std.out``.
+
+    :param batch_size: Number of reports buffered by the reporter before they
+        are written. Defaults to 1 (each report is written immediately)
+    :param max_delay: If given, buffered reports are written once the oldest
+        one is older than this (in seconds). Only relevant if ``batch_size > 1``
+    """
+
+    batch_size: int = 1
+    max_delay: Optional[float] = None
+
+    def __post_init__(self):
+        assert self.batch_size >= 1
+        assert self.max_delay is None or self.max_delay >= 0
+
+    def environment(self, path: Path) -> Dict[str, str]:
+        """
+        :param path: Path of metrics channel file for a trial
+        :return: Environment variables to be set for the trial
+        """
+        env = {
+            ST_METRICS_CHANNEL_ENV: str(path),
+            ST_METRICS_CHANNEL_BATCH_SIZE_ENV: str(self.batch_size),
+        }
+        if self.max_delay is not None:
+            env[ST_METRICS_CHANNEL_MAX_DELAY_ENV] = str(self.max_delay)
+        return env
+
+
 class LocalBackend(TrialBackend):
     """
     A backend running locally by spawning sub-process concurrently. Note that
@@ -55,6 +104,12 @@ class LocalBackend(TrialBackend):
         scheduled on a free GPU, and otherwise the GPU with least prior
         assignments is chosen. If ``False``, then all GPUs are used at the same
         time for all trials. Defaults to ``True``.
+    :param event_poll_interval: In :meth:`wait_for_events`, the ``std.out``
+        files of busy trials are checked for new results with this period
+        (in seconds). Defaults to :const:`DEFAULT_EVENT_POLL_INTERVAL`
+    :param metrics_channel: If given, trials report metrics through a binary
+        metrics channel file instead of printing them to ``std.out``, which is
+        faster for scripts reporting at high frequency. Optional
     """
 
     def __init__(
@@ -62,6 +117,8 @@ class LocalBackend(TrialBackend):
         entry_point: str,
         delete_checkpoints: bool = False,
         rotate_gpus: bool = True,
+        event_poll_interval: float = DEFAULT_EVENT_POLL_INTERVAL,
+        metrics_channel: Optional[MetricsChannelConfig] = None,
     ):
         super(LocalBackend, self).__init__(delete_checkpoints)
 
@@ -69,8 +126,13 @@ class LocalBackend(TrialBackend):
             entry_point
         ).exists(), f"the script provided to tune does not exist ({entry_point})"
         self.entry_point = entry_point
+        self.event_poll_interval = event_poll_interval
+        self.metrics_channel = metrics_channel
         self.local_path = None
         self.trial_subprocess = dict()
+        # Metrics are parsed incrementally from the metrics channel file (if
+        # ``metrics_channel`` is used) and ``std.out`` of each trial
+        self._metrics_readers = dict()
 
         # GPU rotation
         # Note that the initialization is delayed until first used, so we can
@@ -151,36 +213,51 @@ class LocalBackend(TrialBackend):
         self._prepare_for_schedule()
         trial_path = self.trial_path(trial_id)
         os.makedirs(trial_path, exist_ok=True)
-        with open(trial_path / "std.out", "a") as stdout:
-            with open(trial_path / "std.err", "a") as stderr:
-                logger.debug(
-                    f"scheduling {trial_id}, {self.entry_point}, {config}, logging into {trial_path}"
-                )
-                config_copy = config.copy()
-                config_copy[ST_CHECKPOINT_DIR] = str(trial_path / "checkpoints")
-                config_str = " ".join(
-                    [f"--{key} {value}" for key, value in config_copy.items()]
-                )
+        logger.debug(
+            f"scheduling {trial_id}, {self.entry_point}, {config}, logging into {trial_path}"
+        )
 
-                def np_encoder(obj):
-                    if isinstance(obj, np.generic):
-                        return obj.item()
+        def np_encoder(obj):
+            if isinstance(obj, np.generic):
+                return obj.item()
 
-                with open(trial_path / "config.json", "w") as f:
-                    # the encoder fixes json error "TypeError: Object of type 'int64' is not JSON serializable"
-                    json.dump(config, f, default=np_encoder)
+        with open(trial_path / "config.json", "w") as f:
+            # the encoder fixes json error "TypeError: Object of type 'int64' is not JSON serializable"
+            json.dump(config, f, default=np_encoder)
 
-                cmd = f"{sys.executable} {self.entry_point} {config_str}"
+        env = dict(os.environ)
+        if self.metrics_channel is not None:
+            env.update(self.metrics_channel.environment(trial_path / "metrics.bin"))
+        self._allocate_gpu(trial_id, env)
 
-                env = dict(os.environ)
-                self._allocate_gpu(trial_id, env)
+        self.trial_subprocess[trial_id] = self._start_process(
+            trial_id=trial_id, config=config, env=env
+        )
+        self._busy_trial_id_candidates.add(trial_id)  # Mark trial as busy
 
-                logger.info(f"running subprocess with command: {cmd}")
+    def _start_process(self, trial_id: int, config: dict, env: Dict[str, str]):
+        """
+        Starts the job evaluating a trial. Called by :meth:`_schedule`.
 
-                self.trial_subprocess[trial_id] = subprocess.Popen(
+        :param trial_id: ID of trial
+        :param config: Configuration for this trial
+        :param env: Environment variables for the job
+        :return: Object representing the job, with the methods ``poll`` and
+            ``kill`` of ``subprocess.Popen``
+        """
+        trial_path = self.trial_path(trial_id)
+        config_copy = config.copy()
+        config_copy[ST_CHECKPOINT_DIR] = str(trial_path / "checkpoints")
+        config_str = " ".join(
+            [f"--{key} {value}" for key, value in config_copy.items()]
+        )
+        cmd = f"{sys.executable} {self.entry_point} {config_str}"
+        logger.info(f"running subprocess with command: {cmd}")
+        with open(trial_path / "std.out", "a") as stdout:
+            with open(trial_path / "std.err", "a") as stderr:
+                return subprocess.Popen(
                     cmd.split(" "), stdout=stdout, stderr=stderr, env=env
                 )
-        self._busy_trial_id_candidates.add(trial_id)  # Mark trial as busy
 
     def _allocate_gpu(self, trial_id: int, env: dict):
         if self.rotate_gpus:
@@ -202,6 +279,9 @@ class LocalBackend(TrialBackend):
             if status != Status.in_progress:
                 # Trial completed or failed: Deallocate GPU
                 self._deallocate_gpu(trial_id)
+                # The end of the job has been reported, so it is not waited
+                # for in :meth:`wait_for_events` anymore
+                self._release_from_worker(trial_id)
 
             # If the job has finished, we read its end-time in a time-stamp.
             # If the time-stamp does not exist and the job finished, we create it. As a consequence the end-time is
@@ -218,7 +298,7 @@ class LocalBackend(TrialBackend):
                 if self._is_process_done(trial_id=trial_id):
                     self._write_time_stamp(trial_id=trial_id, name="end")
 
-            metrics = retrieve(log_lines=self.stdout(trial_id=trial_id))
+            metrics = self._read_metrics(trial_id)
             trial_results = self._trial_dict[trial_id].add_results(
                 metrics=metrics,
                 status=status,
@@ -227,6 +307,25 @@ class LocalBackend(TrialBackend):
             res.append(trial_results)
         return res
 
+    def _readers_for_metrics(self, trial_id: int) -> List[IncrementalLogReader]:
+        readers = self._metrics_readers.get(trial_id)
+        if readers is None:
+            trial_path = self.trial_path(trial_id)
+            readers = [IncrementalLogReader(trial_path / "std.out")]
+            if self.metrics_channel is not None:
+                readers.insert(0, MetricsChannelReader(trial_path / "metrics.bin"))
+            self._metrics_readers[trial_id] = readers
+        return readers
+
+    def _read_metrics(self, trial_id: int) -> List[dict]:
+        # If the metrics channel is used, but the trial does not write to it,
+        # metrics are parsed from ``std.out``
+        for reader in self._readers_for_metrics(trial_id):
+            metrics = reader.read()
+            if metrics:
+                break
+        return metrics
+
     def _release_from_worker(self, trial_id: int):
         if trial_id in self._busy_trial_id_candidates:
             self._busy_trial_id_candidates.remove(trial_id)
@@ -310,6 +409,80 @@ class LocalBackend(TrialBackend):
         else:
             return []
 
+    def wait_for_events(self, timeout: float) -> bool:
+        """
+        Returns as soon as a busy trial has reported new results or its job
+        has finished, or after ``timeout`` seconds. Where supported (Linux),
+        we wait on process file descriptors to be notified of job ends
+        immediately. Since ``std.out`` files cannot be waited on with a
+        selector, they are checked for new results every
+        ``event_poll_interval`` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        trial_ids = list(self._busy_trial_id_candidates)
+        selector = self._process_exit_selector(trial_ids)
+        try:
+            while not self._has_new_events(trial_ids):
+                remaining_time = deadline - time.monotonic()
+                if remaining_time <= 0:
+                    break
+                wait_time = min(remaining_time, self.event_poll_interval)
+                if selector is not None:
+                    selector.select(timeout=wait_time)
+                else:
+                    time.sleep(wait_time)
+        finally:
+            if selector is not None:
+                for key in list(selector.get_map().values()):
+                    selector.unregister(key.fileobj)
+                    os.close(key.fd)
+                selector.close()
+        return True
+
+    def _process_exit_selector(
+        self, trial_ids: List[int]
+    ) -> Optional[selectors.BaseSelector]:
+        """
+        :param trial_ids: Trials whose jobs are to be waited for
+        :return: Selector which becomes ready when one of the jobs of
+            ``trial_ids`` has finished, or ``None`` if this is not supported
+        """
+        selector = None
+        for trial_id in trial_ids:
+            exit_fd = self._process_exit_fd(trial_id)
+            if exit_fd is not None:
+                if selector is None:
+                    selector = selectors.DefaultSelector()
+                selector.register(exit_fd, selectors.EVENT_READ)
+        return selector
+
+    def _process_exit_fd(self, trial_id: int) -> Optional[int]:
+        """
+        :param trial_id: ID of trial
+        :return: New file descriptor which becomes readable when the job of
+            ``trial_id`` has finished (to be closed by the caller), or ``None``
+            if this is not supported
+        """
+        if not hasattr(os, "pidfd_open"):
+            return None
+        try:
+            return os.pidfd_open(self.trial_subprocess[trial_id].pid)
+        except OSError:
+            # Process has been reaped already (which is detected by
+            # ``_has_new_events``), or pidfd is not supported by the kernel
+            return None
+
+    def _has_new_events(self, trial_ids: List[int]) -> bool:
+        for trial_id in trial_ids:
+            if self._is_process_done(trial_id=trial_id):
+                return True
+            readers = self._readers_for_metrics(trial_id)
+            num_metrics = [len(reader.metrics) for reader in readers]
+            self._read_metrics(trial_id)
+            if [len(reader.metrics) for reader in readers] != num_metrics:
+                return True
+        return False
+
     def stdout(self, trial_id: int) -> List[str]:
         with open(self.trial_path(trial_id=trial_id) / "std.out", "r") as f:
             return f.readlines()
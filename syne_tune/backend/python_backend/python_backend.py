@@ -15,11 +15,13 @@ import json
 import logging
 import types
 from pathlib import Path
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional
 
 import dill
 
 from syne_tune.backend import LocalBackend
+from syne_tune.backend.local_backend import MetricsChannelConfig
+from syne_tune.backend.python_backend.warm_pool import WarmPool
 from syne_tune.config_space import config_space_to_json_dict
 
 
@@ -74,6 +76,19 @@ class PythonBackend(LocalBackend):
         be performed inside the function body.
     :param config_space: Configuration space corresponding to arguments of
         ``tune_function``
+    :param metrics_channel: See :class:`~syne_tune.backend.LocalBackend`
+    :param use_warm_pool: If ``True``, trials are run by a pool of persistent
+        worker processes (see
+        :class:`~syne_tune.backend.python_backend.warm_pool.WarmPool`), which
+        import modules and deserialize ``tune_function`` only once, instead of
+        starting a new Python process for every trial. This is useful if
+        ``tune_function`` is cheap to evaluate. A worker is killed and replaced
+        if its trial is paused or stopped. Note that with ``rotate_gpus``, the
+        GPU assigned to a trial only takes effect if CUDA has not been
+        initialized in the worker before. Defaults to ``False``
+    :param preload_modules: Only if ``use_warm_pool=True``. Modules imported by
+        each worker when it starts, for example the deep learning framework
+        used in ``tune_function``. Optional
     """
 
     def __init__(
@@ -82,15 +97,23 @@ class PythonBackend(LocalBackend):
         config_space: Dict[str, object],
         rotate_gpus: bool = True,
         delete_checkpoints: bool = False,
+        metrics_channel: Optional[MetricsChannelConfig] = None,
+        use_warm_pool: bool = False,
+        preload_modules: Optional[List[str]] = None,
     ):
         super(PythonBackend, self).__init__(
             entry_point=str(Path(__file__).parent / "python_entrypoint.py"),
             rotate_gpus=rotate_gpus,
             delete_checkpoints=delete_checkpoints,
+            metrics_channel=metrics_channel,
         )
         self.config_space = config_space
         # save function without reference to global variables or modules
         self.tune_function = types.FunctionType(tune_function.__code__, {})
+        if use_warm_pool:
+            self.warm_pool = WarmPool(preload_modules=preload_modules)
+        else:
+            self.warm_pool = None
 
     @property
     def tune_function_path(self) -> Path:
@@ -119,6 +142,32 @@ class PythonBackend(LocalBackend):
         )
         super(PythonBackend, self)._schedule(trial_id=trial_id, config=config)
 
+    def _start_process(self, trial_id: int, config: dict, env: Dict[str, str]):
+        if self.warm_pool is None:
+            return super(PythonBackend, self)._start_process(
+                trial_id=trial_id, config=config, env=env
+            )
+        trial_path = self.trial_path(trial_id)
+        return self.warm_pool.start_trial(
+            tune_function_root=config["tune_function_root"],
+            tune_function_hash=config["tune_function_hash"],
+            config=config,
+            env=env,
+            stdout_path=trial_path / "std.out",
+            stderr_path=trial_path / "std.err",
+        )
+
+    def _process_exit_fd(self, trial_id: int) -> Optional[int]:
+        if self.warm_pool is None:
+            return super(PythonBackend, self)._process_exit_fd(trial_id)
+        # Workers do not exit when a trial finishes
+        return self.trial_subprocess[trial_id].exit_fd()
+
+    def stop_all(self):
+        super(PythonBackend, self).stop_all()
+        if self.warm_pool is not None:
+            self.warm_pool.shutdown()
+
     def save_tune_function(self, tune_function):
         self.tune_function_path.mkdir(parents=True, exist_ok=True)
         with open(self.tune_function_path / "tune_function.dill", "wb") as file:
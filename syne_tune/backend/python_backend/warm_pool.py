@@ -0,0 +1,281 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Pool of persistent worker processes, which run trials of
+:class:`~syne_tune.backend.PythonBackend` without starting a new Python
+interpreter for each of them. Workers import modules and deserialize the tuned
+function once, and receive trials as messages. While running a trial, a worker
+redirects its ``stdout`` and ``stderr`` to the files of the trial.
+
+Workers are started as ``python warm_pool.py``, and not with
+``multiprocessing``, since the ``spawn`` and ``forkserver`` start methods
+import the ``__main__`` module of the tuning script in each worker.
+"""
+import importlib
+import json
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import traceback
+from argparse import ArgumentParser
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import dill
+
+logger = logging.getLogger(__name__)
+
+
+class _Worker:
+    def __init__(self, preload_modules: List[str]):
+        parent_socket, child_socket = socket.socketpair()
+        cmd = [
+            sys.executable,
+            __file__,
+            "--connection_fd",
+            str(child_socket.fileno()),
+        ]
+        if preload_modules:
+            cmd += ["--preload_modules"] + preload_modules
+        self.process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            pass_fds=(child_socket.fileno(),),
+        )
+        child_socket.close()
+        self.connection = Connection(parent_socket.detach())
+
+    def close(self):
+        self.connection.close()
+
+
+class WarmPoolTrialProcess:
+    """
+    Represents a trial running on a worker of :class:`WarmPool`. Supports the
+    methods of ``subprocess.Popen`` used by
+    :class:`~syne_tune.backend.LocalBackend`.
+    """
+
+    def __init__(self, pool: "WarmPool", worker: _Worker):
+        self._pool = pool
+        self._worker = worker
+        self.returncode = None
+
+    @property
+    def pid(self) -> int:
+        return self._worker.process.pid
+
+    def poll(self) -> Optional[int]:
+        if self.returncode is None:
+            try:
+                if self._worker.connection.poll():
+                    self.returncode = self._worker.connection.recv()
+                    self._pool._release(self._worker)
+            except (EOFError, OSError):
+                # The worker died while running the trial
+                self.returncode = self._worker.process.wait()
+                self._pool._discard(self._worker)
+                if self.returncode == 0:
+                    self.returncode = 1
+        return self.returncode
+
+    def kill(self):
+        """
+        Kills the worker running the trial, which is replaced by a new one
+        when needed. Does nothing if the trial has already finished.
+        """
+        if self.poll() is None:
+            self._worker.process.kill()
+            self.returncode = self._worker.process.wait()
+            self._pool._discard(self._worker)
+
+    def __getstate__(self):
+        # The worker cannot be serialized. A trial which is still running is
+        # marked as killed
+        state = self.__dict__.copy()
+        state["_worker"] = None
+        if state["returncode"] is None:
+            state["returncode"] = -signal.SIGKILL
+        return state
+
+    def exit_fd(self) -> Optional[int]:
+        """
+        :return: New file descriptor which becomes readable once the trial has
+            finished, or ``None`` if it has finished already
+        """
+        if self.returncode is not None:
+            return None
+        return os.dup(self._worker.connection.fileno())
+
+
+class WarmPool:
+    """
+    Pool of worker processes for :class:`~syne_tune.backend.PythonBackend`.
+    Workers are started on demand, and are reused once the trial they ran has
+    finished. A worker is killed if its trial is paused or stopped.
+
+    :param preload_modules: Modules imported by each worker when it starts
+    """
+
+    def __init__(self, preload_modules: Optional[List[str]] = None):
+        self.preload_modules = [] if preload_modules is None else preload_modules
+        self._idle_workers = []
+
+    def start_trial(
+        self,
+        tune_function_root: str,
+        tune_function_hash: str,
+        config: dict,
+        env: Dict[str, str],
+        stdout_path: Path,
+        stderr_path: Path,
+    ) -> WarmPoolTrialProcess:
+        """
+        Sends trial to an idle worker, which is started if there is none.
+
+        :param tune_function_root: Directory containing ``tune_function.dill``
+            and ``configspace.json``
+        :param tune_function_hash: MD5 hash of ``tune_function.dill``
+        :param config: Configuration of trial, entries which are not in the
+            configuration space are ignored
+        :param env: Environment variables for running the trial
+        :param stdout_path: Output of trial is appended to this file
+        :param stderr_path: Error output of trial is appended to this file
+        :return: Object representing the trial
+        """
+        message = dict(
+            tune_function_root=tune_function_root,
+            tune_function_hash=tune_function_hash,
+            config=config,
+            env=env,
+            stdout_path=str(stdout_path),
+            stderr_path=str(stderr_path),
+        )
+        while self._idle_workers:
+            worker = self._idle_workers.pop()
+            try:
+                worker.connection.send(message)
+                return WarmPoolTrialProcess(pool=self, worker=worker)
+            except OSError:
+                self._discard(worker)
+        worker = _Worker(self.preload_modules)
+        worker.connection.send(message)
+        return WarmPoolTrialProcess(pool=self, worker=worker)
+
+    def _release(self, worker: _Worker):
+        self._idle_workers.append(worker)
+
+    def _discard(self, worker: _Worker):
+        worker.close()
+        if worker.process.poll() is None:
+            worker.process.kill()
+            worker.process.wait()
+
+    def shutdown(self):
+        """Terminates all idle workers."""
+        for worker in self._idle_workers:
+            # Workers exit once their connection is closed
+            worker.close()
+            worker.process.wait()
+        self._idle_workers = []
+
+    def __getstate__(self):
+        # Workers are not serialized with the back-end
+        state = self.__dict__.copy()
+        state["_idle_workers"] = []
+        return state
+
+
+def _load_tune_function(root: Path, tune_function_hash: str):
+    from syne_tune.backend.python_backend.python_backend import file_md5
+    from syne_tune.config_space import config_space_from_json_dict
+
+    assert (
+        file_md5(root / "tune_function.dill") == tune_function_hash
+    ), "The hash of the tuned function should match the hash obtained when serializing in Syne Tune."
+    with open(root / "tune_function.dill", "rb") as file:
+        tune_function = dill.load(file)
+    with open(root / "configspace.json", "r") as file:
+        config_space = config_space_from_json_dict(json.load(file))
+    return tune_function, config_space
+
+
+def _run_trial(message: dict, tune_functions: dict) -> int:
+    from syne_tune.metrics_channel import flush_metrics_channels
+
+    saved_environ = dict(os.environ)
+    saved_fds = []
+    try:
+        with open(message["stdout_path"], "a") as stdout:
+            with open(message["stderr_path"], "a") as stderr:
+                for stream, file in ((sys.stdout, stdout), (sys.stderr, stderr)):
+                    stream.flush()
+                    saved_fds.append(os.dup(stream.fileno()))
+                    os.dup2(file.fileno(), stream.fileno())
+        os.environ.clear()
+        os.environ.update(message["env"])
+        key = (message["tune_function_root"], message["tune_function_hash"])
+        if key not in tune_functions:
+            tune_functions[key] = _load_tune_function(Path(key[0]), key[1])
+        tune_function, config_space = tune_functions[key]
+        hps = {k: v for k, v in message["config"].items() if k in config_space}
+        tune_function(**hps)
+        returncode = 0
+    except SystemExit as ex:
+        if ex.code is None or isinstance(ex.code, int):
+            returncode = 0 if ex.code is None else ex.code
+        else:
+            returncode = 1
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+    finally:
+        flush_metrics_channels()
+        os.environ.clear()
+        os.environ.update(saved_environ)
+        for stream, saved_fd in zip((sys.stdout, sys.stderr), saved_fds):
+            stream.flush()
+            os.dup2(saved_fd, stream.fileno())
+            os.close(saved_fd)
+    return returncode
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--connection_fd", type=int, required=True)
+    parser.add_argument("--preload_modules", type=str, nargs="*", default=[])
+    args = parser.parse_args()
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    for name in args.preload_modules:
+        importlib.import_module(name)
+    connection = Connection(args.connection_fd)
+    # Maps ``(tune_function_root, tune_function_hash)`` to deserialized function
+    # and configuration space
+    tune_functions = dict()
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        connection.send(_run_trial(message, tune_functions))
+
+
+if __name__ == "__main__":
+    main()
@@ -66,7 +66,7 @@ class OnTrialResultEvent(Event):
     result: dict
 
 
-EventHeapType = List[Tuple[float, int, Event]]
+EventHeapType = List[Tuple[float, int, Event, int]]
 
 
 class SimulatorState:
@@ -78,6 +78,12 @@ class SimulatorState:
     break ties. When an event is added, the ``cnt`` value is taken from
     ``events_added``. This means that ties are broken first_in_first_out.
 
+    Events are removed lazily. Each heap entry records the generation of its
+    trial at the time it was pushed, and :meth:`remove_events` just increments
+    the generation of a trial. Entries with an outdated generation are skipped
+    when popped. Once more than half of the heap consists of such entries, it
+    is compacted.
+
     """
 
     def __init__(
@@ -87,6 +93,17 @@ class SimulatorState:
             event_heap = []
         self.event_heap = event_heap
         self.events_added = events_added
+        # Generation of each trial, entries of older generations are removed
+        self._trial_generation = dict()
+        # Number of entries in ``event_heap`` for each trial which are not
+        # removed
+        self._num_events_per_trial = dict()
+        for _, _, event, _ in event_heap:
+            trial_id = event.trial_id
+            self._num_events_per_trial[trial_id] = (
+                self._num_events_per_trial.get(trial_id, 0) + 1
+            )
+        self._num_removed_events = 0
 
     def push(self, event: Event, event_time: float):
         """
@@ -95,8 +112,20 @@ class SimulatorState:
         :param event:
         :param event_time:
         """
-        heapq.heappush(self.event_heap, (event_time, self.events_added, event))
+        trial_id = event.trial_id
+        heapq.heappush(
+            self.event_heap,
+            (
+                event_time,
+                self.events_added,
+                event,
+                self._trial_generation.get(trial_id, 0),
+            ),
+        )
         self.events_added += 1
+        self._num_events_per_trial[trial_id] = (
+            self._num_events_per_trial.get(trial_id, 0) + 1
+        )
 
     def remove_events(self, trial_id: int):
         """
@@ -104,10 +133,24 @@ class SimulatorState:
 
         :param trial_id:
         """
+        num_events = self._num_events_per_trial.pop(trial_id, 0)
+        if num_events > 0:
+            self._trial_generation[trial_id] = (
+                self._trial_generation.get(trial_id, 0) + 1
+            )
+            self._num_removed_events += num_events
+            if 2 * self._num_removed_events > len(self.event_heap):
+                self._compact()
+
+    def _is_removed(self, entry: Tuple[float, int, Event, int]) -> bool:
+        return entry[3] != self._trial_generation.get(entry[2].trial_id, 0)
+
+    def _compact(self):
         self.event_heap = [
-            elem for elem in self.event_heap if elem[2].trial_id != trial_id
+            entry for entry in self.event_heap if not self._is_removed(entry)
         ]
         heapq.heapify(self.event_heap)
+        self._num_removed_events = 0
 
     def next_until(self, time_until: float) -> Optional[Tuple[float, Event]]:
         """
@@ -117,10 +160,19 @@ class SimulatorState:
         :param time_until:
         :return:
         """
+        while self.event_heap and self._is_removed(self.event_heap[0]):
+            heapq.heappop(self.event_heap)
+            self._num_removed_events -= 1
         result = None
         if self.event_heap:
-            top_time, _, top_event = self.event_heap[0]
+            top_time, _, top_event, _ = self.event_heap[0]
             if top_time <= time_until:
                 heapq.heappop(self.event_heap)
                 result = (top_time, top_event)
+                trial_id = top_event.trial_id
+                num_events = self._num_events_per_trial[trial_id] - 1
+                if num_events > 0:
+                    self._num_events_per_trial[trial_id] = num_events
+                else:
+                    del self._num_events_per_trial[trial_id]
         return result
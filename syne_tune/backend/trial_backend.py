@@ -264,6 +264,21 @@ class TrialBackend:
         """
         raise NotImplementedError
 
+    def wait_for_events(self, timeout: float) -> bool:
+        """Blocks until there is activity in the back-end which the tuning loop
+        should react to (for example, a trial reported a new result or its job
+        finished), or until ``timeout`` seconds have passed.
+
+        Back-ends which are able to wait for such events should override this
+        method. The default implementation does not wait and returns ``False``,
+        in which case the caller is expected to sleep for ``timeout`` seconds.
+
+        :param timeout: Maximum time to wait (in seconds)
+        :return: ``True`` if the back-end has waited, ``False`` if waiting is not
+            supported
+        """
+        return False
+
     def stdout(self, trial_id: int) -> List[str]:
         """Fetch ``stdout`` log for trial
 
@@ -111,6 +111,111 @@ class Blackbox:
         """
         pass
 
+    def objective_function_batch(
+        self,
+        configurations: Union[pd.DataFrame, np.ndarray],
+        fidelities: Optional[Union[Number, List[Number], np.ndarray]] = None,
+        seeds: Optional[Union[int, List[int], np.ndarray]] = None,
+    ) -> np.ndarray:
+        """Returns evaluations of the blackbox for a batch of configurations.
+
+        This is equivalent to calling :meth:`objective_function` for every
+        row of ``configurations``, but subclasses resolve all rows at once.
+
+        :param configurations: configurations to be evaluated, one per row. If
+            this is a dataframe, its columns must contain the names of
+            :attr:`configuration_space` (further columns are ignored). If it
+            is an array, its columns correspond to the entries of
+            :attr:`configuration_space` (in this order)
+        :param fidelities: fidelity values to be evaluated for all
+            configurations. Defaults to all values in :attr:`fidelity_values`.
+            Ignored if the blackbox has no fidelity space
+        :param seeds: seed for each configuration, or a single one for all of
+            them. If not given, seeds are drawn at random for every row (only
+            used if the blackbox defines multiple seeds)
+        :return: tensor with shape ``(n, num_fidelities, num_objectives)``,
+            where ``n`` is the number of rows of ``configurations``, and
+            ``num_fidelities`` is the number of fidelities (1 if the blackbox
+            has no fidelity space)
+        """
+        if isinstance(configurations, pd.DataFrame):
+            hp_names = list(self.configuration_space.keys())
+            configurations = configurations.loc[:, hp_names]
+        else:
+            configurations = pd.DataFrame(
+                data=np.asarray(configurations).reshape(
+                    (-1, len(self.configuration_space))
+                ),
+                columns=list(self.configuration_space.keys()),
+            )
+        if self.fidelity_space is None:
+            fidelities = None
+        else:
+            assert (
+                len(self.fidelity_space) == 1
+            ), "objective_function_batch only supports a single fidelity"
+            if fidelities is None:
+                fidelities = self.fidelity_values
+            if fidelities is not None:
+                fidelities = np.array(fidelities).reshape((-1,))
+        if seeds is not None:
+            seeds = np.array(seeds, dtype=np.int64).reshape((-1,))
+            if seeds.size == 1:
+                seeds = np.full(len(configurations), seeds[0])
+            assert seeds.size == len(
+                configurations
+            ), f"seeds must have size 1 or {len(configurations)}, but has size {seeds.size}"
+        return self._objective_function_batch(
+            configurations=configurations, fidelities=fidelities, seeds=seeds
+        )
+
+    def _objective_function_batch(
+        self,
+        configurations: pd.DataFrame,
+        fidelities: Optional[np.ndarray] = None,
+        seeds: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Override this method to provide a vectorized implementation.
+
+        The default implementation calls :meth:`objective_function` for every
+        configuration.
+
+        :param configurations: dataframe of configurations, columns are the
+            names of :attr:`configuration_space`
+        :param fidelities: fidelity values to be evaluated for all
+            configurations. If None, either the blackbox has no fidelity space,
+            or all fidelities are to be returned
+        :param seeds: seed for each configuration, or None
+        :return: tensor with shape ``(n, num_fidelities, num_objectives)``
+        """
+        results = []
+        for pos, configuration in enumerate(configurations.to_dict(orient="records")):
+            seed = None if seeds is None else int(seeds[pos])
+            if fidelities is None:
+                result = self.objective_function(configuration, seed=seed)
+                if isinstance(result, dict):
+                    result = [self._objectives_values_from_dict(result)]
+            else:
+                fidelity_name = next(iter(self.fidelity_space.keys()))
+                result = [
+                    self._objectives_values_from_dict(
+                        self.objective_function(
+                            configuration,
+                            fidelity={fidelity_name: fidelity},
+                            seed=seed,
+                        )
+                    )
+                    for fidelity in fidelities
+                ]
+            results.append(np.asarray(result))
+        return np.stack(results)
+
+    def _objectives_values_from_dict(self, result: Dict[str, float]) -> List[float]:
+        if self.objectives_names is None:
+            return list(result.values())
+        else:
+            return [result[name] for name in self.objectives_names]
+
     def __call__(self, *args, **kwargs) -> ObjectiveFunctionResult:
         return self.objective_function(*args, **kwargs)
 
@@ -164,18 +269,38 @@ def from_function(
     eval_fun: Callable,
     fidelity_space: Optional[dict] = None,
     objectives_names: Optional[List[str]] = None,
+    fidelity_values: Optional[List[Number]] = None,
 ) -> Blackbox:
     """
     Helper to create a blackbox from a function, useful for test or to wrap-up
     real blackbox functions.
 
+    If ``fidelity_values`` is given, the blackbox can be queried without a
+    fidelity, in which case ``eval_fun`` is called for each of these values,
+    and the objectives are returned as tensor of shape
+    ``(num_fidelities, num_objectives)``. This allows to use the blackbox
+    with :class:`~syne_tune.blackbox_repository.UserBlackboxBackend`, which
+    simulates experiments in-process.
+
     :param configuration_space: Configuration space for blackbox
     :param eval_fun: Function that returns dictionary of objectives given
         configuration and fidelity
     :param fidelity_space: Fidelity space for blackbox
     :param objectives_names: Objectives returned by blackbox
+    :param fidelity_values: Fidelity values of blackbox, optional. If given,
+        ``fidelity_space`` must contain a single fidelity, and
+        ``objectives_names`` must be given
     :return: Resulting blackbox wrapping ``eval_fun``
     """
+    if fidelity_values is not None:
+        assert (
+            fidelity_space is not None and len(fidelity_space) == 1
+        ), "fidelity_values requires fidelity_space with a single fidelity"
+        assert (
+            objectives_names is not None
+        ), "fidelity_values requires objectives_names to be given"
+        fidelity_name = next(iter(fidelity_space.keys()))
+        fidelity_values = np.array(fidelity_values)
 
     class BB(Blackbox):
         def __init__(self):
@@ -191,6 +316,18 @@ def from_function(
             fidelity: Optional[dict] = None,
             seed: Optional[int] = None,
         ) -> ObjectiveFunctionResult:
+            if fidelity is None and fidelity_values is not None:
+                objectives_values = []
+                for value in fidelity_values:
+                    result = eval_fun(configuration, {fidelity_name: value}, seed)
+                    objectives_values.append(
+                        [result[name] for name in objectives_names]
+                    )
+                return np.array(objectives_values)
             return eval_fun(configuration, fidelity, seed)
 
+        @property
+        def fidelity_values(self) -> Optional[np.array]:
+            return fidelity_values
+
     return BB()
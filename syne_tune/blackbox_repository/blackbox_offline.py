@@ -13,6 +13,7 @@
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 from syne_tune.blackbox_repository.blackbox import (
@@ -134,6 +135,55 @@ class BlackboxOffline(Blackbox):
             #  values in the dataframe. Then the output tensor has larger number of elements than expected num_fidelities.
             return output.to_numpy()
 
+    def _objective_function_batch(
+        self,
+        configurations: pd.DataFrame,
+        fidelities: Optional[np.ndarray] = None,
+        seeds: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        num_configs = len(configurations)
+        index = self.df.index
+        if self.fidelity_space is not None:
+            fidelity_name = next(iter(self.fidelity_space.keys()))
+            if fidelities is None:
+                # All fidelity values present in the data
+                fidelities = np.sort(
+                    index.get_level_values(fidelity_name).unique().to_numpy()
+                )
+            num_fidelities = fidelities.size
+        else:
+            num_fidelities = 1
+        # Key columns for all ``(configuration, fidelity)`` combinations, in
+        # the order of ``index_cols``. Rows are ordered by configuration first
+        config_rows = np.repeat(np.arange(num_configs), num_fidelities)
+        keys = []
+        for name in self.index_cols:
+            if name in configurations.columns:
+                keys.append(configurations[name].to_numpy()[config_rows])
+            elif name == self.seed_col:
+                if seeds is None:
+                    seed_values = index.get_level_values(name).unique().to_numpy()
+                    seeds = np.random.choice(seed_values, size=num_configs)
+                keys.append(seeds[config_rows])
+            else:
+                keys.append(np.tile(fidelities, num_configs))
+        if len(keys) == 1:
+            target = pd.Index(keys[0], name=self.index_cols[0])
+        else:
+            target = pd.MultiIndex.from_arrays(keys, names=self.index_cols)
+        positions = index.get_indexer(target)
+        not_found = np.flatnonzero(positions < 0)
+        if not_found.size > 0:
+            configuration = configurations.iloc[
+                not_found[0] // num_fidelities
+            ].to_dict()
+            raise ValueError(
+                f"the hyperparameter {configuration} is not present in available evaluations. Use ``add_surrogate(blackbox)`` if"
+                f" you want to add interpolation or a surrogate model that support querying any configuration."
+            )
+        objectives_values = self.df.loc[:, self.objectives_names].to_numpy()
+        return objectives_values[positions].reshape((num_configs, num_fidelities, -1))
+
     def __str__(self):
         stats = {
             "total evaluations": len(self.df),
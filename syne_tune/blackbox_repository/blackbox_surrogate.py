@@ -317,7 +317,8 @@ class BlackboxSurrogate(Blackbox):
         Note: ``fidelity_values`` need not be contiguous (``1, 2, 3, ...``). We use
         generalized weighted finite differences to account for that.
 
-        :param prediction: Shape ``(num_fidelities, num_objectives)``
+        :param prediction: Shape ``(num_fidelities, num_objectives)``, or
+            ``(n, num_fidelities, num_objectives)`` for a batch
         :return:
         """
         num_fidelities = self.num_fidelities
@@ -326,8 +327,10 @@ class BlackboxSurrogate(Blackbox):
             if is_contiguous:
                 spacing = 1
             for objective_pos in self.fit_differences:
-                prediction_new = np.cumsum(prediction[:, objective_pos] * spacing)
-                prediction[:, objective_pos] = prediction_new
+                prediction_new = np.cumsum(
+                    prediction[..., objective_pos] * spacing, axis=-1
+                )
+                prediction[..., objective_pos] = prediction_new
             return prediction
         else:
             return prediction
@@ -426,6 +429,75 @@ class BlackboxSurrogate(Blackbox):
             prediction = dict(zip(self.objectives_names, prediction[ind]))
         return prediction
 
+    def _fidelity_indices(self, fidelities: np.ndarray) -> np.ndarray:
+        indices = []
+        for fidelity in fidelities:
+            ind = np.flatnonzero(self.fidelity_values == fidelity)
+            assert ind.size > 0, f"fidelity {fidelity} not among {self.fidelity_values}"
+            indices.append(ind[0])
+        return np.array(indices)
+
+    def _objective_function_batch(
+        self,
+        configurations: pd.DataFrame,
+        fidelities: Optional[np.ndarray] = None,
+        seeds: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        num_configs = len(configurations)
+        if seeds is None:
+            seeds = np.random.randint(0, self.num_seeds, size=num_configs)
+        else:
+            assert np.all(
+                (0 <= seeds) & (seeds < self.num_seeds)
+            ), f"seeds must be in [0, {self.num_seeds - 1}]"
+        if self.fidelity_space is not None:
+            fidelity_attr = next(iter(self.fidelity_space.keys()))
+        else:
+            fidelity_attr = None
+        do_fit_diffs = len(self.fit_differences) > 0
+        if fidelities is not None and (self.predict_curves or do_fit_diffs):
+            # Predictions are done for all fidelities, from which we select
+            fidelity_indices = self._fidelity_indices(fidelities)
+        else:
+            fidelity_indices = None
+        num_objectives = len(self.objectives_names)
+        num_fidelities_out = 1 if fidelities is None else fidelities.size
+        prediction = np.zeros((num_configs, num_fidelities_out, num_objectives))
+        # Rows with the same seed share the same surrogate model
+        for seed in np.unique(seeds):
+            rows = np.flatnonzero(seeds == seed)
+            features = configurations.iloc[rows].reset_index(drop=True)
+            pipeline = self.surrogate_pipeline[seed]
+            if self.predict_curves:
+                # Multivariate regression
+                prediction_seed = self._transform_from_finite_differences(
+                    pipeline.predict(features).reshape(
+                        (rows.size, self.num_fidelities, -1)
+                    )
+                )
+            elif fidelities is not None:
+                # Univariate regression, where fidelity is an input. If
+                # ``fit_differences`` is used, we need to predict for all
+                # fidelities
+                if do_fit_diffs:
+                    input_fidelities = self.fidelity_values
+                else:
+                    input_fidelities = fidelities
+                num_input_fidelities = len(input_fidelities)
+                features = features.loc[features.index.repeat(num_input_fidelities)]
+                features[fidelity_attr] = np.tile(input_fidelities, rows.size)
+                prediction_seed = self._transform_from_finite_differences(
+                    pipeline.predict(features).reshape(
+                        (rows.size, num_input_fidelities, -1)
+                    )
+                )
+            else:
+                prediction_seed = pipeline.predict(features).reshape((rows.size, 1, -1))
+            if fidelity_indices is not None:
+                prediction_seed = prediction_seed[:, fidelity_indices, :]
+            prediction[rows] = prediction_seed
+        return prediction
+
     def hyperparameter_objectives_values(
         self, predict_curves: bool = False
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -10,8 +10,9 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
+import collections.abc
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Union
+from typing import List, Dict, Mapping, Optional, Tuple, Union
 import pandas as pd
 import numpy as np
 
@@ -95,6 +96,9 @@ class BlackboxTabular(Blackbox):
         self.hyperparameters_index = hyperparameters.copy()
         self.hyperparameters_index["index"] = hyperparameters.index
         self.hyperparameters_index.set_index(self._hp_cols, inplace=True)
+        # Hash index over rows of ``hyperparameters``, used to resolve batches
+        # of configurations at once in :meth:`_objective_function_batch`
+        self._hp_rows_index = pd.MultiIndex.from_frame(hyperparameters[self._hp_cols])
 
         self.objectives_evaluations = objectives_evaluations
         if objectives_names is None:
@@ -151,6 +155,47 @@ class BlackboxTabular(Blackbox):
             ]
             return dict(zip(self.objectives_names, objectives_values))
 
+    def _objective_function_batch(
+        self,
+        configurations: pd.DataFrame,
+        fidelities: Optional[np.ndarray] = None,
+        seeds: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        num_configs = len(configurations)
+        indices = self._hp_rows_index.get_indexer(
+            pd.MultiIndex.from_frame(configurations[self._hp_cols])
+        )
+        not_found = np.flatnonzero(indices < 0)
+        if not_found.size > 0:
+            configuration = configurations.iloc[not_found[0]].to_dict()
+            raise ValueError(
+                f"the hyperparameter {configuration} is not present in available evaluations. Use ``add_surrogate(blackbox)`` if"
+                f" you want to add interpolation or a surrogate model that support querying any configuration."
+            )
+        if seeds is None:
+            seeds = np.random.randint(0, self.num_seeds, size=num_configs)
+        else:
+            assert np.all(
+                (0 <= seeds) & (seeds < self.num_seeds)
+            ), f"seeds must be in [0, {self.num_seeds - 1}]"
+        if fidelities is None or np.array_equal(fidelities, self._fidelity_values):
+            return self.objectives_evaluations[indices, seeds, :, :]
+        else:
+            try:
+                fidelity_indices = np.array(
+                    [self.fidelity_map[fidelity] for fidelity in fidelities]
+                )
+            except KeyError as ex:
+                raise ValueError(
+                    f"fidelity {ex.args[0]} not among {self._fidelity_values}"
+                )
+            return self.objectives_evaluations[
+                indices.reshape((-1, 1)),
+                seeds.reshape((-1, 1)),
+                fidelity_indices.reshape((1, -1)),
+                :,
+            ]
+
     @property
     def fidelity_values(self) -> np.array:
         return self._fidelity_values
@@ -357,11 +402,63 @@ def serialize(
     )
 
 
-def deserialize(path: str) -> Dict[str, BlackboxTabular]:
+class _LazyBlackboxTabularDict(collections.abc.Mapping):
+    """
+    Maps task names to :class:`BlackboxTabular` objects, which are created
+    when first accessed. All tasks share ``hyperparameters``, and
+    ``objectives_evaluations`` has shape
+    ``(num_tasks, num_evals, num_seeds, num_fidelities, num_objectives)``.
+    If this is a memory-mapped array, the blackbox for a task is backed by a
+    view into it, so that only the entries queried are read from disk.
+    """
+
+    def __init__(
+        self,
+        task_names: List[str],
+        objectives_evaluations: np.ndarray,
+        **blackbox_kwargs,
+    ):
+        assert len(task_names) == objectives_evaluations.shape[0]
+        self._task_index = {task: i for i, task in enumerate(task_names)}
+        self._objectives_evaluations = objectives_evaluations
+        self._blackbox_kwargs = blackbox_kwargs
+        self._blackboxes = dict()
+
+    def __getitem__(self, task: str) -> BlackboxTabular:
+        blackbox = self._blackboxes.get(task)
+        if blackbox is None:
+            index = self._task_index[task]
+            blackbox = BlackboxTabular(
+                objectives_evaluations=np.asarray(self._objectives_evaluations[index]),
+                **self._blackbox_kwargs,
+            )
+            self._blackboxes[task] = blackbox
+        return blackbox
+
+    def __iter__(self):
+        return iter(self._task_index)
+
+    def __len__(self) -> int:
+        return len(self._task_index)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(tasks={list(self._task_index.keys())})"
+
+
+def deserialize(
+    path: str, mmap_mode: Optional[str] = "r"
+) -> Mapping[str, BlackboxTabular]:
     """
     Deserialize blackboxes contained in a path that were saved with :func:`serialize`
     above.
 
+    By default, the objectives table is memory-mapped rather than loaded into
+    memory, and the blackbox for a task is only created once it is accessed.
+    This means that only the parts of the table which are used are read from
+    disk, and that processes simulating on the same blackbox share the OS page
+    cache. Memory-mapped objectives are read-only. Pass ``mmap_mode=None`` to
+    load the whole table into memory.
+
     TODO: the API is currently dissonant with :func:`serialize`,
     :func:`deserialize` for :class:`~syne_tune.blackbox_repository.BlackboxOffline`
     as ``serialize`` is a member function there. A possible way to unify is to
@@ -369,7 +466,10 @@ def deserialize(path: str) -> Dict[str, BlackboxTabular]:
 
     :param path: a path that contains blackboxes that were saved with
         :func:`serialize`
-    :return: a dictionary from task name to blackbox
+    :param mmap_mode: Passed to ``np.load`` for the objectives table. Defaults
+        to "r" (read-only memory map)
+    :return: a read-only mapping from task name to blackbox (blackboxes are created
+        lazily when accessed)
     """
     path = Path(path)
 
@@ -385,18 +485,17 @@ def deserialize(path: str) -> Dict[str, BlackboxTabular]:
     with open(path / "fidelities_values.npy", "rb") as f:
         fidelity_values = np.load(f)
 
-    # possibly we could use memmap to avoid memory use or speed-up loading times
-    with open(path / "objectives_evaluations.npy", "rb") as f:
-        objectives_evaluations = np.load(f)
+    # Shape (num_tasks, num_evals, num_seeds, num_fidelities, num_objectives)
+    objectives_evaluations = np.load(
+        path / "objectives_evaluations.npy", mmap_mode=mmap_mode, allow_pickle=False
+    )
 
-    return {
-        task: BlackboxTabular(
-            hyperparameters=hyperparameters,
-            configuration_space=configuration_space,
-            fidelity_space=fidelity_space,
-            objectives_evaluations=objectives_evaluations[i],
-            fidelity_values=fidelity_values,
-            objectives_names=objectives_names,
-        )
-        for i, task in enumerate(task_names)
-    }
+    return _LazyBlackboxTabularDict(
+        task_names=task_names,
+        objectives_evaluations=objectives_evaluations,
+        hyperparameters=hyperparameters,
+        configuration_space=configuration_space,
+        fidelity_space=fidelity_space,
+        fidelity_values=fidelity_values,
+        objectives_names=objectives_names,
+    )
@@ -11,6 +11,7 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 import logging
+from collections.abc import Mapping
 from pathlib import Path
 from typing import List, Optional
 
@@ -336,7 +337,7 @@ class BlackboxRepositoryBackend(_BlackboxSimulatorBackend):
                 self.blackbox_name, yahpo_kwargs=self._surrogate_kwargs
             )
             if self.dataset is None:
-                assert not isinstance(self._blackbox, dict), (
+                assert not isinstance(self._blackbox, Mapping), (
                     f"blackbox_name = '{self.blackbox_name}' maps to a dict, "
                     + "dataset argument must be given"
                 )
@@ -25,6 +25,17 @@ ST_TUNER_CREATION_TIMESTAMP = "st_tuner_creation_timestamp"
 
 ST_TUNER_START_TIMESTAMP = "st_tuner_start_timestamp"
 
+ST_METRICS_CHANNEL_ENV = "SYNETUNE_METRICS_CHANNEL"
+"""Environment variable with path of the metrics channel file of a trial. If
+set, :class:`~syne_tune.Reporter` writes reports to this file instead of
+printing them"""  # pylint: disable=W0105
+
+ST_METRICS_CHANNEL_BATCH_SIZE_ENV = "SYNETUNE_METRICS_CHANNEL_BATCH_SIZE"
+"""Environment variable with ``batch_size`` for the metrics channel writer"""  # pylint: disable=W0105
+
+ST_METRICS_CHANNEL_MAX_DELAY_ENV = "SYNETUNE_METRICS_CHANNEL_MAX_DELAY"
+"""Environment variable with ``max_delay`` for the metrics channel writer"""  # pylint: disable=W0105
+
 # constants of keys that are written by ``report``
 
 ST_WORKER_ITER = "st_worker_iter"
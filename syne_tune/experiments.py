@@ -21,6 +21,7 @@ from pathlib import Path
 
 from syne_tune.constants import ST_TUNER_TIME, ST_TUNER_CREATION_TIMESTAMP
 from syne_tune import Tuner
+from syne_tune.tuner_callback import results_chunk_paths, read_results_chunks
 from syne_tune.util import experiment_path, s3_experiment_path
 from syne_tune.try_import import try_import_aws_message
 
@@ -180,7 +181,10 @@ def load_experiment(
     except FileNotFoundError:
         metadata = None
     try:
-        if (path / "results.csv.zip").exists():
+        if results_chunk_paths(path):
+            # Written by ``ChunkedStoreResultsCallback``
+            results = pd.concat(read_results_chunks(path), ignore_index=True)
+        elif (path / "results.csv.zip").exists():
             results = pd.read_csv(path / "results.csv.zip")
         else:
             results = pd.read_csv(path / "results.csv")
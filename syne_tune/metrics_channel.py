@@ -0,0 +1,227 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Binary channel for metrics reported by :class:`~syne_tune.Reporter`, which can
+be used by file-based back-ends instead of printing reports to ``stdout``. This
+avoids the JSON text round trip and scanning of ``stdout`` for reports, which
+matters for training scripts which report at high frequency.
+
+Reports are appended to a per-trial file as frames, consisting of a header
+(kind, payload size) and a payload. For each distinct set of keys and value
+types, a schema frame is written once, subsequent reports with this schema are
+written as struct-packed values only. Reports with values which are not
+``int``, ``float`` or ``bool`` are written as JSON frames. Schemas are keyed
+by process ID of the writer, so that a file can be appended to by several
+processes one after the other (e.g., when a trial is paused and resumed).
+"""
+import atexit
+import json
+import os
+import struct
+import weakref
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from syne_tune.report import IncrementalLogReader
+
+
+_HEADER = struct.Struct("<cI")
+
+_SCHEMA_KEY = struct.Struct("<IH")
+
+_KIND_SCHEMA = b"S"
+
+_KIND_RECORD = b"R"
+
+_KIND_JSON = b"J"
+
+_MAX_NUM_SCHEMAS = 2**16
+
+
+def _value_format(value) -> Optional[str]:
+    if isinstance(value, bool):
+        return "?"
+    if isinstance(value, int):
+        return "q" if -(2**63) <= value < 2**63 else None
+    if isinstance(value, float):
+        return "d"
+    return None
+
+
+def _np_encoder(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+
+
+class MetricsChannelWriter:
+    """
+    Writes reports to a metrics channel file. Frames are buffered and written
+    with a single call once ``batch_size`` reports are buffered, or the oldest
+    buffered report is older than ``max_delay`` seconds. Remaining frames are
+    written when the writer is garbage collected, when the process exits
+    normally, or when :func:`flush_metrics_channels` is called.
+
+    :param path: Path of metrics channel file
+    :param batch_size: Number of reports which are buffered before being
+        written. Defaults to 1 (each report is written immediately)
+    :param max_delay: If given, buffered reports are written once the oldest
+        one is older than this (in seconds). This is checked whenever a report
+        is written
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 1,
+        max_delay: Optional[float] = None,
+    ):
+        assert batch_size >= 1
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._file = None
+        self._reset_for_process()
+        _writers.add(self)
+
+    def _reset_for_process(self):
+        # Called at construction, and in a process forked from the one which
+        # created this object, so schemas and buffered frames are not shared
+        self._pid = os.getpid()
+        self._schemas = dict()
+        self._buffer = bytearray()
+        self._num_buffered = 0
+        self._time_first_buffered = None
+
+    def _append_frame(self, kind: bytes, payload: bytes):
+        self._buffer += _HEADER.pack(kind, len(payload))
+        self._buffer += payload
+
+    def _schema(self, keys: tuple, value_format: str) -> Optional[tuple]:
+        schema = self._schemas.get((keys, value_format))
+        if schema is None:
+            schema_id = len(self._schemas)
+            if schema_id >= _MAX_NUM_SCHEMAS:
+                return None
+            schema_key = _SCHEMA_KEY.pack(self._pid, schema_id)
+            self._append_frame(
+                _KIND_SCHEMA,
+                schema_key + json.dumps([list(keys), value_format]).encode(),
+            )
+            schema = (schema_key, struct.Struct("<" + value_format))
+            self._schemas[(keys, value_format)] = schema
+        return schema
+
+    def write(self, report_dict: Dict[str, object]):
+        """
+        :param report_dict: Report to be written. Values must be serializable
+            with json
+        """
+        if os.getpid() != self._pid:
+            self._reset_for_process()
+        values = [
+            value.item() if isinstance(value, np.generic) else value
+            for value in report_dict.values()
+        ]
+        value_formats = [_value_format(value) for value in values]
+        schema = None
+        if None not in value_formats:
+            schema = self._schema(tuple(report_dict.keys()), "".join(value_formats))
+        if schema is not None:
+            schema_key, packer = schema
+            self._append_frame(_KIND_RECORD, schema_key + packer.pack(*values))
+        else:
+            self._append_frame(
+                _KIND_JSON, json.dumps(report_dict, default=_np_encoder).encode()
+            )
+        self._num_buffered += 1
+        if self._time_first_buffered is None:
+            self._time_first_buffered = perf_counter()
+        if self._num_buffered >= self.batch_size or (
+            self.max_delay is not None
+            and perf_counter() - self._time_first_buffered >= self.max_delay
+        ):
+            self.flush()
+
+    def flush(self):
+        """Writes all buffered frames to the file."""
+        if self._buffer and os.getpid() == self._pid:
+            if self._file is None:
+                self._file = open(self.path, "ab", buffering=0)
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+        self._num_buffered = 0
+        self._time_first_buffered = None
+
+    def __del__(self):
+        self.flush()
+
+
+_writers = weakref.WeakSet()
+
+
+def flush_metrics_channels():
+    """Writes buffered frames of all :class:`MetricsChannelWriter` objects."""
+    for writer in list(_writers):
+        writer.flush()
+
+
+atexit.register(flush_metrics_channels)
+
+
+class MetricsChannelReader(IncrementalLogReader):
+    """
+    Retrieves metrics written by :class:`MetricsChannelWriter` from a
+    metrics channel file which is appended to while being read. As with
+    :class:`~syne_tune.report.IncrementalLogReader`, only frames appended since
+    the previous call of :meth:`read` are decoded.
+
+    :param path: Path of metrics channel file. The file need not exist yet
+    """
+
+    def _reset(self, inode: Optional[int]):
+        super()._reset(inode)
+        self._schemas = dict()
+
+    def _parse(self, data: bytes) -> bytes:
+        view = memoryview(data)
+        pos = 0
+        while pos + _HEADER.size <= len(view):
+            kind, size = _HEADER.unpack_from(view, pos)
+            start = pos + _HEADER.size
+            end = start + size
+            if end > len(view):
+                break
+            if kind == _KIND_RECORD:
+                keys, unpacker = self._schemas[
+                    bytes(view[start : start + _SCHEMA_KEY.size])
+                ]
+                values = unpacker.unpack_from(view, start + _SCHEMA_KEY.size)
+                self.metrics.append(dict(zip(keys, values)))
+            elif kind == _KIND_SCHEMA:
+                schema_key = bytes(view[start : start + _SCHEMA_KEY.size])
+                keys, value_format = json.loads(
+                    bytes(view[start + _SCHEMA_KEY.size : end])
+                )
+                self._schemas[schema_key] = (keys, struct.Struct("<" + value_format))
+            elif kind == _KIND_JSON:
+                self.metrics.append(json.loads(bytes(view[start:end])))
+            else:
+                raise ValueError(
+                    f"Metrics channel file {self.path} contains frame of unknown "
+                    f"kind {kind}"
+                )
+            pos = end
+        return bytes(view[pos:])
@@ -14,6 +14,7 @@ from typing import List, Optional
 import logging
 
 from syne_tune.optimizer.schedulers.hyperband_promotion import PromotionRungSystem
+from syne_tune.optimizer.schedulers.hyperband_stopping import RungData
 
 logger = logging.getLogger(__name__)
 
@@ -89,11 +90,16 @@ class CostPromotionRungSystem(PromotionRungSystem):
         """
         ret_id = None
         if len(recorded) > 1:
-            sign = 2 * (self._mode == "min") - 1
-            # Sort best-first
-            sorted_record = sorted(
-                ((k,) + v for k, v in recorded.items()), key=lambda x: x[1] * sign
-            )
+            if isinstance(recorded, RungData) and not recorded.has_nan:
+                # Already sorted best-first
+                sorted_record = [(k,) + v for k, v in recorded.sorted_items()]
+            else:
+                sign = 2 * (self._mode == "min") - 1
+                # Sort best-first
+                sorted_record = sorted(
+                    ((k,) + v for k, v in recorded.items()),
+                    key=lambda x: x[1] * sign,
+                )
             cost_threshold = sum(x[2] for x in sorted_record) * prom_quant
             sum_costs = 0
             # DEBUG
@@ -15,6 +15,7 @@ from typing import Optional, List
 from syne_tune.optimizer.schedulers.hyperband_stopping import (
     quantile_cutoff,
     RungSystem,
+    RungData,
 )
 
 
@@ -70,6 +71,8 @@ class PromotionRungSystem(RungSystem):
         self._running = dict()
 
     def _cutoff(self, recorded: dict, prom_quant: float):
+        if isinstance(recorded, RungData) and not recorded.has_nan:
+            return recorded.quantile_cutoff(prom_quant)
         values = [x[0] for x in recorded.values()]
         return quantile_cutoff(values, prom_quant, self._mode)
 
@@ -93,7 +96,15 @@ class PromotionRungSystem(RungSystem):
         # criterion values
         sign = 1 - 2 * (self._mode == "min")
         cutoff = self._cutoff(recorded, prom_quant)
-        if cutoff is not None:
+        if cutoff is None:
+            return None
+        if self._use_best_paused_trial(recorded):
+            best_paused = recorded.best_paused_trial()
+            if best_paused is not None:
+                trial_id, val = best_paused
+                if sign * (val - cutoff) >= 0:
+                    ret_id = trial_id
+        else:
             # Best id among trials paused at this rung (i.e., not yet promoted)
             trial_id, val = max(
                 (
@@ -108,6 +119,21 @@ class PromotionRungSystem(RungSystem):
                 ret_id = trial_id
         return ret_id
 
+    def _use_best_paused_trial(self, recorded: dict) -> bool:
+        """
+        If ``_is_promotable_trial`` is not overridden, the best promotable trial
+        is the best paused one, which ``recorded`` can provide without a scan.
+        Subclasses may override ``_is_promotable_trial`` with side effects
+        which depend on all trials being scanned, so we do not take the
+        shortcut then.
+        """
+        return (
+            isinstance(recorded, RungData)
+            and not recorded.has_nan
+            and type(self)._is_promotable_trial
+            is PromotionRungSystem._is_promotable_trial
+        )
+
     def _is_promotable_trial(
         self, trial_id: str, metric_value: float, is_paused: bool, resource: int
     ) -> bool:
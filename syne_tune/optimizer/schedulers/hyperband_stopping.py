@@ -11,14 +11,223 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 import logging
+import heapq
+import math
+from bisect import bisect_left, insort
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Tuple, Optional, Iterator, Any
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+def quantile_cutoff(values, prom_quant, mode):
+    if len(values) < 2:
+        # Cannot determine cutoff from one value
+        return None
+    q = prom_quant if mode == "min" else (1 - prom_quant)
+    return np.quantile(values, q)
+
+
+class RungData(dict):
+    """
+    Data recorded at a rung level. This is a dictionary mapping ``trial_id``
+    to a record, which is either the metric value, or a tuple whose first
+    entry is the metric value and whose last entry is a flag indicating
+    whether the trial has been promoted from this rung.
+
+    On top of the dictionary, we maintain all records sorted w.r.t. metric
+    value (best first, ties broken by insertion order), as well as a heap of
+    trials paused at the rung (i.e., not yet promoted). This allows to compute
+    quantile cutoffs and to find the best paused trial without scanning all
+    records. Results are identical to what is obtained from the dictionary
+    alone (using ``np.quantile`` and scanning in insertion order). Records
+    with NaN metric values are not sorted. If there are any, :attr:`has_nan`
+    is ``True``, and callers should fall back to scanning.
+
+    :param mode: "min" or "max"
+    """
+
+    def __init__(self, mode: str):
+        super().__init__()
+        self._mode = mode
+        self._sign = 1 if mode == "min" else -1
+        # Entries ``(sign * metric_value, position, trial_id)``, sorted
+        # ascending (best first). ``position`` is the insertion position
+        # in the dictionary
+        self._sorted_entries = []
+        self._position = dict()
+        self._next_position = 0
+        # Lazy heap with entries as in ``_sorted_entries``, for paused
+        # trials only. ``_paused_entry`` maps ``trial_id`` of paused trials
+        # to their valid entry
+        self._paused_heap = []
+        self._paused_entry = dict()
+        self._num_nan = 0
+
+    @staticmethod
+    def _metric_value(record) -> Any:
+        return record[0] if isinstance(record, tuple) else record
+
+    @staticmethod
+    def _is_paused(record) -> bool:
+        return isinstance(record, tuple) and not record[-1]
+
+    def _entry(self, trial_id: str, record) -> Optional[tuple]:
+        metric_value = self._metric_value(record)
+        if metric_value != metric_value:
+            return None  # NaN
+        return self._sign * metric_value, self._position[trial_id], trial_id
+
+    def _remove_entry(self, trial_id: str):
+        entry = self._entry(trial_id, super().__getitem__(trial_id))
+        if entry is None:
+            self._num_nan -= 1
+        else:
+            pos = bisect_left(self._sorted_entries, entry)
+            del self._sorted_entries[pos]
+        # Entry in ``_paused_heap`` is removed lazily
+        self._paused_entry.pop(trial_id, None)
+
+    def __setitem__(self, trial_id: str, record):
+        if trial_id in self:
+            self._remove_entry(trial_id)
+        else:
+            self._position[trial_id] = self._next_position
+            self._next_position += 1
+        super().__setitem__(trial_id, record)
+        entry = self._entry(trial_id, record)
+        if entry is None:
+            self._num_nan += 1
+        else:
+            insort(self._sorted_entries, entry)
+            if self._is_paused(record):
+                self._paused_entry[trial_id] = entry
+                heapq.heappush(self._paused_heap, entry)
+
+    def __delitem__(self, trial_id: str):
+        self._remove_entry(trial_id)
+        del self._position[trial_id]
+        super().__delitem__(trial_id)
+
+    def update(self, *args, **kwargs):
+        for trial_id, record in dict(*args, **kwargs).items():
+            self[trial_id] = record
+
+    def setdefault(self, trial_id: str, default=None):
+        if trial_id not in self:
+            self[trial_id] = default
+        return self[trial_id]
+
+    def pop(self, trial_id: str, *args):
+        if trial_id not in self:
+            return super().pop(trial_id, *args)
+        record = self[trial_id]
+        del self[trial_id]
+        return record
+
+    def popitem(self):
+        trial_id = next(reversed(self))
+        return trial_id, self.pop(trial_id)
+
+    def clear(self):
+        super().clear()
+        self._sorted_entries.clear()
+        self._position.clear()
+        self._paused_heap.clear()
+        self._paused_entry.clear()
+        self._num_nan = 0
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        # Records are inserted by ``__setitem__`` when unpickling, which
+        # recreates the internal structures
+        return self.__class__, (self._mode,), None, None, iter(self.items())
+
+    @property
+    def has_nan(self) -> bool:
+        """
+        :return: Is there any record with NaN metric value?
+        """
+        return self._num_nan > 0
+
+    def _ascending_value(self, pos: int):
+        if self._sign == 1:
+            return self._sorted_entries[pos][0]
+        else:
+            return -self._sorted_entries[-(pos + 1)][0]
+
+    def quantile(self, q: float) -> float:
+        """
+        Same as ``np.quantile(values, q)`` (with default linear interpolation),
+        where ``values`` are all metric values recorded here, but runs in
+        constant time. Must not be called if :attr:`has_nan` is ``True``, or
+        if there are no records.
+
+        :param q: Quantile, in :math:`[0, 1]`
+        :return: Quantile of metric values
+        """
+        num_values = len(self._sorted_entries)
+        assert num_values > 0 and not self.has_nan
+        # Replicates ``numpy.lib.function_base._quantile`` and ``_lerp``
+        virtual_index = (num_values - 1) * q
+        if virtual_index >= num_values - 1:
+            return float(self._ascending_value(num_values - 1))
+        previous_index = math.floor(virtual_index)
+        gamma = virtual_index - previous_index
+        previous = float(self._ascending_value(previous_index))
+        next_value = float(self._ascending_value(previous_index + 1))
+        diff_next_previous = next_value - previous
+        if gamma >= 0.5:
+            return next_value - diff_next_previous * (1 - gamma)
+        else:
+            return previous + diff_next_previous * gamma
+
+    def quantile_cutoff(self, prom_quant: float) -> Optional[float]:
+        """
+        Same as :func:`quantile_cutoff` applied to all metric values recorded
+        here. Must not be called if :attr:`has_nan` is ``True``.
+
+        :param prom_quant: Promotion quantile
+        :return: Cutoff value, or ``None`` if there are less than 2 records
+        """
+        if len(self) < 2:
+            # Cannot determine cutoff from one value
+            return None
+        q = prom_quant if self._mode == "min" else (1 - prom_quant)
+        return self.quantile(q)
+
+    def best_paused_trial(self) -> Optional[Tuple[str, Any]]:
+        """
+        Must not be called if :attr:`has_nan` is ``True``.
+
+        :return: ``(trial_id, metric_value)`` for trial paused at this rung
+            with the best metric value (ties are broken by insertion order),
+            or ``None`` if no trial is paused here
+        """
+        heap = self._paused_heap
+        while heap:
+            entry = heap[0]
+            trial_id = entry[-1]
+            if self._paused_entry.get(trial_id) == entry:
+                return trial_id, self._metric_value(self[trial_id])
+            heapq.heappop(heap)  # Entry is stale
+        return None
+
+    def sorted_items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Must not be called if :attr:`has_nan` is ``True``.
+
+        :return: Iterator over ``(trial_id, record)``, sorted best-first
+            w.r.t. metric value (ties are broken by insertion order)
+        """
+        return ((entry[-1], self[entry[-1]]) for entry in self._sorted_entries)
+
+
 @dataclass
 class RungEntry:
     """
@@ -29,15 +238,7 @@ class RungEntry:
 
     level: int
     prom_quant: float
-    data: dict
-
-
-def quantile_cutoff(values, prom_quant, mode):
-    if len(values) < 2:
-        # Cannot determine cutoff from one value
-        return None
-    q = prom_quant if mode == "min" else (1 - prom_quant)
-    return np.quantile(values, q)
+    data: RungData
 
 
 class RungSystem:
@@ -73,7 +274,7 @@ class RungSystem:
         # value type depends on the subclass, but it contains the
         # metric value
         self._rungs = [
-            RungEntry(level=x, prom_quant=y, data=dict())
+            RungEntry(level=x, prom_quant=y, data=RungData(mode))
             for x, y in reversed(list(zip(rung_levels, promote_quantiles)))
         ]
 
@@ -184,6 +385,8 @@ class StoppingRungSystem(RungSystem):
     """
 
     def _cutoff(self, recorded, prom_quant):
+        if isinstance(recorded, RungData) and not recorded.has_nan:
+            return recorded.quantile_cutoff(prom_quant)
         values = list(recorded.values())
         return quantile_cutoff(values, prom_quant, self._mode)
 
@@ -11,7 +11,7 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 from typing import Optional, Dict, List
 
 import numpy as np
@@ -22,6 +22,7 @@ from syne_tune.optimizer.scheduler import (
     SchedulerDecision,
     TrialSuggestion,
 )
+from syne_tune.optimizer.schedulers.utils.sorted_list import SortedList
 
 
 class MedianStoppingRule(TrialScheduler):
@@ -56,6 +57,9 @@ class MedianStoppingRule(TrialScheduler):
         ``grace_population`` have been observed at a resource level. Defaults to 5
     :param rank_cutoff: Results whose quantiles are below this level are
         discarded. Defaults to 0.5 (median)
+    :param rank_window: If given, the rank of a result is computed only among
+        the ``rank_window`` most recent results observed at the same resource
+        level. Defaults to ``None`` (all results are used)
     """
 
     def __init__(
@@ -67,15 +71,22 @@ class MedianStoppingRule(TrialScheduler):
         grace_time: Optional[int] = 1,
         grace_population: int = 5,
         rank_cutoff: float = 0.5,
+        rank_window: Optional[int] = None,
     ):
         super(MedianStoppingRule, self).__init__(config_space=scheduler.config_space)
         if metric is None and hasattr(scheduler, "metric"):
             metric = getattr(scheduler, "metric")
         self.metric = metric
-        self.sorted_results = defaultdict(list)
+        # Maps resource level to :class:`SortedList` of results
+        self.sorted_results = defaultdict(SortedList)
         self.scheduler = scheduler
         self.resource_attr = resource_attr
         self.rank_cutoff = rank_cutoff
+        assert rank_window is None or rank_window >= 1
+        self.rank_window = rank_window
+        if rank_window is not None:
+            # Results at each resource level, in the order they were observed
+            self._recent_results = defaultdict(deque)
         self.grace_time = grace_time
         self.min_samples_required = grace_population
         self.running_average = running_average
@@ -98,11 +109,14 @@ class MedianStoppingRule(TrialScheduler):
             new_metric = np.mean(self.trial_to_results[trial.trial_id])
 
         # insert new metric in sorted results acquired at this resource
-        index = np.searchsorted(self.sorted_results[time_step], new_metric)
-        self.sorted_results[time_step] = np.insert(
-            self.sorted_results[time_step], index, new_metric
-        )
-        normalized_rank = index / float(len(self.sorted_results[time_step]))
+        sorted_results = self.sorted_results[time_step]
+        if self.rank_window is not None:
+            recent_results = self._recent_results[time_step]
+            if len(recent_results) >= self.rank_window:
+                sorted_results.remove(recent_results.popleft())
+            recent_results.append(new_metric)
+        index = sorted_results.add(new_metric)
+        normalized_rank = index / float(len(sorted_results))
 
         if (
             self.grace_condition(time_step=time_step)
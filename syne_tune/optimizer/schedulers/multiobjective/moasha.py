@@ -211,14 +211,23 @@ class _Bracket:
             (min_t * self.rf ** (k + s), {}) for k in reversed(range(MAX_RUNGS))
         ]
         self.priority = mo_priority
+        # If supported by ``mo_priority``, ranks at each rung are maintained
+        # as results are recorded, instead of being recomputed from scratch
+        self._rung_ranks = [mo_priority.rank_structure() for _ in self._rungs]
 
     def on_result(self, trial_id: int, cur_iter: int, metrics: Optional[dict]) -> str:
         action = SchedulerDecision.CONTINUE
-        for milestone, recorded in self._rungs:
+        for (milestone, recorded), rung_ranks in zip(self._rungs, self._rung_ranks):
             if cur_iter < milestone or trial_id in recorded:
                 continue
             else:
-                if not recorded:
+                if rung_ranks is not None:
+                    new_priority_rank = rung_ranks.add(
+                        np.array(list(metrics.values()))
+                    ) / (len(recorded) + 1)
+                    if new_priority_rank > 1 / self.rf:
+                        action = SchedulerDecision.STOP
+                elif not recorded:
                     # if no result was previously recorded, we saw the first result and we continue
                     action = SchedulerDecision.CONTINUE
                 else:
@@ -232,9 +241,6 @@ class _Bracket:
 
                     # self._plot(milestone, metric_recorded, priorities)
 
-                    # We sort priorities at every call, assuming the cost of sort would be negligible
-                    # in case this becomes slow, we could just maintain a sorted list of priorities in cost
-                    # of memory.
                     ranks = np.searchsorted(sorted(priorities), priorities) / len(
                         priorities
                     )
@@ -15,7 +15,10 @@ from typing import Optional, List
 import numpy as np
 from syne_tune.optimizer.schedulers.multiobjective.non_dominated_priority import (
     nondominated_sort,
+    IncrementalEpsilonNet,
+    NonDominatedLayers,
 )
+from syne_tune.optimizer.schedulers.utils.sorted_list import SortedList
 
 
 class MOPriority:
@@ -33,15 +36,112 @@ class MOPriority:
         are picked first).
         """
         num_samples, num_objectives = objectives.shape
+        self._check_num_objectives(num_objectives)
+        return self.priority_unsafe(objectives=objectives)
+
+    def _check_num_objectives(self, num_objectives: int):
         if self.metrics is None:
             # set anonymous metric names
             self.metrics = [f"metric-{i}" for i in range(num_objectives)]
         assert num_objectives == len(self.metrics)
-        return self.priority_unsafe(objectives=objectives)
 
     def priority_unsafe(self, objectives: np.array) -> np.array:
         raise NotImplementedError()
 
+    def rank_structure(self) -> Optional["RankStructure"]:
+        """
+        :return: Structure which ranks objectives added one by one, or ``None``
+            if this is not supported. In the latter case, priorities are
+            recomputed from scratch for every new objective vector
+        """
+        return None
+
+
+class RankStructure:
+    """
+    Maintains objective vectors added one by one, and ranks each new vector
+    against all vectors added before, without recomputing priorities from
+    scratch.
+    """
+
+    def add(self, objectives: np.array) -> int:
+        """
+        :param objectives: New objective vector, shape ``(num_objectives,)``
+        :return: Number of objective vectors added before which rank strictly
+            better than the new one
+        """
+        raise NotImplementedError()
+
+
+class ScalarPriorityRanks(RankStructure):
+    """
+    Rank structure for priorities which are computed independently for each
+    objective vector. Priorities are maintained in a sorted list, so that
+    ranks are the same as obtained with ``np.searchsorted``.
+
+    :param priority: Multi-objective priority, which must compute the priority
+        of each objective vector independently of the others
+    """
+
+    def __init__(self, priority: MOPriority):
+        self._priority = priority
+        self._sorted_priorities = SortedList()
+
+    def add(self, objectives: np.array) -> int:
+        objectives = np.asarray(objectives).reshape((1, -1))
+        return self._sorted_priorities.add(self._priority(objectives)[0])
+
+
+class NonDominatedRanks(RankStructure):
+    """
+    Rank structure for :class:`NonDominatedPriority`. The rank of a new
+    objective vector is its position in the order computed by
+    :func:`~syne_tune.optimizer.schedulers.multiobjective.non_dominated_priority.nondominated_sort`
+    for all vectors added so far, which is the number of vectors in
+    non-dominated layers (Pareto fronts) before its own, plus its rank in the
+    epsilon-net of its layer. Layers are maintained in
+    :class:`~syne_tune.optimizer.schedulers.multiobjective.non_dominated_priority.NonDominatedLayers`,
+    and epsilon-nets of each layer in
+    :class:`~syne_tune.optimizer.schedulers.multiobjective.non_dominated_priority.IncrementalEpsilonNet`.
+    Ranks are the same as obtained from priorities computed from scratch.
+
+    :param priority: Non-dominated priority, whose ``dim`` and
+        ``max_num_samples`` are used. ``dim`` must not be ``None``
+    """
+
+    def __init__(self, priority: "NonDominatedPriority"):
+        assert priority.dim is not None, "priority.dim must not be None"
+        self._priority = priority
+        self._layers = None
+        self._epsilon_nets = []
+        self._objectives = []
+
+    def add(self, objectives: np.array) -> int:
+        objectives = np.asarray(objectives, dtype=np.float64).reshape((-1,))
+        self._priority._check_num_objectives(objectives.size)
+        if self._layers is None:
+            self._layers = NonDominatedLayers(num_objectives=objectives.size)
+        index = len(self._objectives)
+        self._objectives.append(objectives)
+        num_before, changes = self._layers.add_and_get_changes(objectives)
+        for layer, added, removed in changes:
+            if layer == len(self._epsilon_nets):
+                self._epsilon_nets.append(IncrementalEpsilonNet(dim=self._priority.dim))
+            epsilon_net = self._epsilon_nets[layer]
+            if removed:
+                epsilon_net.remove(removed)
+            epsilon_net.add(added, np.array([self._objectives[i] for i in added]))
+        max_num_samples = self._priority.max_num_samples
+        if max_num_samples is None:
+            max_rank = None
+        elif num_before >= max_num_samples:
+            # Vectors not sorted share the lowest priority
+            return max_num_samples
+        else:
+            max_rank = max_num_samples - num_before
+        epsilon_net = self._epsilon_nets[changes[0][0]]
+        return num_before + epsilon_net.rank(index, max_rank=max_rank)
+
 
 class LinearScalarizationPriority(MOPriority):
     def __init__(
@@ -68,6 +168,9 @@ class LinearScalarizationPriority(MOPriority):
         weighted_objectives = (objectives * self.weights).mean(axis=-1)
         return weighted_objectives
 
+    def rank_structure(self) -> Optional[RankStructure]:
+        return ScalarPriorityRanks(self)
+
 
 class FixedObjectivePriority(MOPriority):
     def __init__(self, metrics: Optional[List[str]] = None, dim: Optional[int] = None):
@@ -82,6 +185,9 @@ class FixedObjectivePriority(MOPriority):
     def priority_unsafe(self, objectives: np.array) -> np.array:
         return objectives[:, self.dim]
 
+    def rank_structure(self) -> Optional[RankStructure]:
+        return ScalarPriorityRanks(self)
+
 
 class NonDominatedPriority(MOPriority):
     def __init__(
@@ -97,20 +203,31 @@ class NonDominatedPriority(MOPriority):
         David Salinas, Valerio Perrone, Cedric Archambeau and Olivier Cruchant
         NAS workshop, ICLR2021.
 
+        The priority of an item is its position in the order returned by
+        :func:`~syne_tune.optimizer.schedulers.multiobjective.non_dominated_priority.nondominated_sort`.
+
         :param metrics:
         :param dim: The objective to prefer when ranking items within the Pareto front and picking the first
         element. If ``None``, the first element is chosen randomly.
-        :param max_num_samples: The maximum number of samples that should be returned.
-        When this is ``None``, all items are sorted (less efficient), if you have a large number of samples but only want
-        the top k indices, set this to k for efficiency.
+        :param max_num_samples: The maximum number of samples that should be sorted. Items which are not
+        sorted share the lowest priority. When this is ``None``, all items are sorted (less efficient), if you
+        have a large number of samples but only want the top k indices, set this to k for efficiency.
         """
         super(NonDominatedPriority, self).__init__(metrics=metrics)
         self.dim = dim
         self.max_num_samples = max_num_samples
 
     def priority_unsafe(self, objectives: np.array) -> np.array:
-        return np.array(
-            nondominated_sort(
-                X=objectives, dim=self.dim, max_items=self.max_num_samples
-            )
+        order = nondominated_sort(
+            X=objectives, dim=self.dim, max_items=self.max_num_samples
         )
+        priorities = np.full(objectives.shape[0], len(order))
+        priorities[order] = np.arange(len(order))
+        return priorities
+
+    def rank_structure(self) -> Optional[RankStructure]:
+        # If the seed of epsilon-nets is chosen at random, ranks cannot be
+        # maintained incrementally
+        if self.dim is None:
+            return None
+        return NonDominatedRanks(self)
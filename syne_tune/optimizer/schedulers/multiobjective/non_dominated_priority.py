@@ -10,16 +10,204 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
-from typing import Optional, List, Union
+from bisect import bisect_left, bisect_right
+from typing import Optional, List, Tuple, Union
 
 import numpy as np
 
 
+def _dominance_matrix(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """
+    Returns boolean matrix of shape ``(A.shape[0], B.shape[0])``, whose entry
+    ``(i, j)`` is ``True`` iff ``A[i]`` dominates ``B[j]``, namely all costs
+    of ``A[i]`` are equal or lower and at least one cost is strictly lower.
+    """
+    lhs = A[:, None, :]
+    rhs = B[None, :, :]
+    return np.all(lhs <= rhs, axis=2) & np.any(lhs < rhs, axis=2)
+
+
+def _unique_rows_in_lexicographic_order(X: np.ndarray) -> (np.ndarray, np.ndarray):
+    """
+    Returns ``(unique_rows, inverse)``, where ``unique_rows`` contains the
+    distinct rows of ``X`` in lexicographic order, and
+    ``X = unique_rows[inverse]``.
+    """
+    order = np.lexsort(X.T[::-1])
+    sorted_rows = X[order]
+    is_new = np.ones(X.shape[0], dtype=bool)
+    is_new[1:] = np.any(sorted_rows[1:] != sorted_rows[:-1], axis=1)
+    inverse = np.empty(X.shape[0], dtype=int)
+    inverse[order] = np.cumsum(is_new) - 1
+    return sorted_rows[is_new], inverse
+
+
+def _layer_indices_2d(X: np.ndarray, first_layer_only: bool = False) -> np.ndarray:
+    """
+    Two objectives: Points are visited in lexicographic order, so that each
+    point is visited after all points dominating it. ``tails[k]`` is the
+    smallest second cost among points visited so far in layer ``k``. A point
+    is dominated by some point in layer ``k`` iff ``tails[k]`` is equal or
+    lower than its second cost. Since ``tails`` is non-decreasing, the layer
+    of a point is found by bisection.
+
+    If ``first_layer_only`` is ``True``, only layer 0 is determined, and all
+    other points are assigned to layer 1.
+    """
+    unique_rows, inverse = _unique_rows_in_lexicographic_order(X)
+    layers = np.empty(unique_rows.shape[0], dtype=int)
+    tails = []
+    for pos, y in enumerate(unique_rows[:, 1].tolist()):
+        layer = bisect_right(tails, y)
+        if first_layer_only and layer > 0:
+            layer = 1
+        elif layer == len(tails):
+            tails.append(y)
+        else:
+            tails[layer] = y
+        layers[pos] = layer
+    return layers[inverse]
+
+
+def _layer_indices_3d(X: np.ndarray, first_layer_only: bool = False) -> np.ndarray:
+    """
+    Three objectives: Points are visited in lexicographic order, so that each
+    point is visited after all points dominating it. Among points visited so
+    far, a point is dominated by some point in layer ``k`` iff one of them is
+    equal or lower in the second and third cost. For each layer, we maintain
+    the minimal elements w.r.t. these two costs (a staircase, with ``ys``
+    increasing and ``zs`` decreasing), so this test is done by bisection. If a
+    point is dominated by some point in layer ``k``, it is also dominated by
+    some point in all layers before, so the layer of a point is found by
+    bisection as well. This needs :math:`O(N \\log^2 N)` comparisons, but
+    staircases are Python lists, and inserting into them moves elements, so
+    the worst case is :math:`O(N^2)` element moves.
+
+    If ``first_layer_only`` is ``True``, only layer 0 is determined, and all
+    other points are assigned to layer 1.
+    """
+    unique_rows, inverse = _unique_rows_in_lexicographic_order(X)
+    layers = np.empty(unique_rows.shape[0], dtype=int)
+    # Staircases ``(ys, neg_zs)`` for each layer. We store ``-zs``, so that
+    # bisection can be used
+    staircases = []
+
+    def is_dominated(staircase, y, z) -> bool:
+        ys, neg_zs = staircase
+        pos = bisect_right(ys, y) - 1
+        return pos >= 0 and -neg_zs[pos] <= z
+
+    for pos, (_, y, z) in enumerate(unique_rows.tolist()):
+        lower, upper = 0, len(staircases)
+        if first_layer_only:
+            upper = min(upper, 1)
+        while lower < upper:
+            middle = (lower + upper) // 2
+            if is_dominated(staircases[middle], y, z):
+                lower = middle + 1
+            else:
+                upper = middle
+        layers[pos] = lower
+        if first_layer_only and lower > 0:
+            continue
+        if lower == len(staircases):
+            staircases.append(([y], [-z]))
+        else:
+            # Insert ``(y, z)``, removing elements it dominates
+            ys, neg_zs = staircases[lower]
+            start = bisect_left(ys, y)
+            end = bisect_right(neg_zs, -z, start)
+            ys[start:end] = [y]
+            neg_zs[start:end] = [-z]
+    return layers[inverse]
+
+
+def _layer_indices_blocked(X: np.ndarray, block_size: int) -> np.ndarray:
+    """
+    Any number of objectives: Points are visited in lexicographic order, so
+    that each point is visited after all points dominating it. The layer of a
+    point is one plus the largest layer of points dominating it. Dominance
+    is computed between blocks of points, so that peak memory is
+    ``O(block_size ** 2)``.
+    """
+    num_points = X.shape[0]
+    order = np.lexsort(X.T[::-1])
+    sorted_rows = X[order]
+    layers = np.empty(num_points, dtype=int)
+    for start in range(0, num_points, block_size):
+        end = min(start + block_size, num_points)
+        block = sorted_rows[start:end]
+        # Largest layer of dominating points in earlier blocks
+        max_layer = np.full(end - start, -1)
+        for other_start in range(0, start, block_size):
+            other_end = min(other_start + block_size, start)
+            dominates = _dominance_matrix(sorted_rows[other_start:other_end], block)
+            other_layers = layers[other_start:other_end, None]
+            max_layer = np.maximum(
+                max_layer, np.max(np.where(dominates, other_layers, -1), axis=0)
+            )
+        # Points in the block are visited sequentially
+        dominates = _dominance_matrix(block, block)
+        block_layers = layers[start:end]
+        for pos in range(end - start):
+            if pos > 0:
+                max_layer[pos] = max(
+                    max_layer[pos],
+                    np.max(np.where(dominates[:pos, pos], block_layers[:pos], -1)),
+                )
+            block_layers[pos] = max_layer[pos] + 1
+    result = np.empty(num_points, dtype=int)
+    result[order] = layers
+    return result
+
+
+def nondominated_layer_indices(X: np.ndarray, block_size: int = 1024) -> np.ndarray:
+    """
+    Computes the index of the non-dominated layer (or Pareto front) for each
+    item in the provided array. Layer 0 contains all items which are Pareto
+    efficient (see :func:`pareto_efficient`), layer 1 contains all items which
+    are Pareto efficient once layer 0 is removed, and so on. The costs are
+    assumed to be improved by lowering them (eg lower is better).
+
+    For two objectives, this runs in :math:`O(N \\log N)`. For three
+    objectives, it needs :math:`O(N \\log^2 N)` comparisons, but list
+    inserts make it :math:`O(N^2)` in the worst case. For more objectives,
+    pairwise comparisons are done in blocks, which bounds peak memory, and
+    time is :math:`O(N^2)`.
+
+    Parameters
+    ----------
+    X: np.ndarray [N, D]
+        The items to sort into layers, where N is the number of items and D
+        the number of costs per item.
+    block_size: int, default: 1024
+        Size of blocks of items compared against each other, if ``D > 3``.
+
+    Returns
+    -------
+    np.ndarray [N]
+        The index of the layer of each item.
+    """
+    num_points, num_objectives = X.shape
+    if num_points == 0:
+        return np.zeros(0, dtype=int)
+    if num_objectives == 1:
+        return np.unique(X[:, 0], return_inverse=True)[1].reshape((-1,))
+    if num_objectives == 2:
+        return _layer_indices_2d(X)
+    if num_objectives == 3:
+        return _layer_indices_3d(X)
+    return _layer_indices_blocked(X, block_size=block_size)
+
+
 def pareto_efficient(X: np.ndarray) -> np.ndarray:
     """
     Evaluates for each allocation in the provided array whether it is Pareto efficient. The costs
     are assumed to be improved by lowering them (eg lower is better).
 
+    For two or three costs, allocations are visited in lexicographic order, and dominance is
+    tested by bisection (see :func:`nondominated_layer_indices`).
+
     Parameters
     ----------
     X: np.ndarray [N, D]
@@ -31,6 +219,14 @@ def pareto_efficient(X: np.ndarray) -> np.ndarray:
     np.ndarray [N]
         A boolean array, indicating for each allocation whether it is Pareto efficient.
     """
+    num_objectives = X.shape[1]
+    if X.shape[0] > 0 and num_objectives in (2, 3):
+        if num_objectives == 2:
+            layer_indices = _layer_indices_2d(X, first_layer_only=True)
+        else:
+            layer_indices = _layer_indices_3d(X, first_layer_only=True)
+        return layer_indices == 0
+
     # First, we assume that all allocations are Pareto efficient, i.e. not dominated
     mask = np.ones(X.shape[0], dtype=bool)
     # Then, we iterate over all allocations A and check which are dominated by then current
@@ -48,7 +244,19 @@ def pareto_efficient(X: np.ndarray) -> np.ndarray:
     return mask
 
 
-def compute_epsilon_net(X: np.ndarray, dim: Optional[int] = None) -> np.ndarray:
+def _distances(X: np.ndarray, Y: np.ndarray) -> np.ndarray:
+    """
+    Euclidean distances between ``X`` and ``Y`` along the last axis, after
+    broadcasting. Same as ``np.linalg.norm(X - Y, axis=-1)``, without its
+    overhead.
+    """
+    diff = X - Y
+    return np.sqrt(np.add.reduce(diff * diff, axis=-1))
+
+
+def compute_epsilon_net(
+    X: np.ndarray, dim: Optional[int] = None, max_items: Optional[int] = None
+) -> np.ndarray:
     """
     Outputs an order of the items in the provided array such that the items are spaced well. This
     means that after choosing a seed item, the next item is chosen to be the farthest from the seed
@@ -57,6 +265,11 @@ def compute_epsilon_net(X: np.ndarray, dim: Optional[int] = None) -> np.ndarray:
     This algorithm is taken from "Nearest-Neighbor Searching and Metric Space Dimensions"
     (Clarkson, 2005, p.17).
 
+    The distance of each item to the chosen ones is updated whenever an item is chosen, which
+    needs O(N) memory and O(N K) time for K items chosen. We do not know of a sub-quadratic
+    algorithm which returns the same order (including tie-breaking), so the full order costs
+    O(N^2) time. Use ``max_items`` to stop after the first items.
+
     Parameters
     ----------
     X: np.ndarray [N, D]
@@ -65,41 +278,38 @@ def compute_epsilon_net(X: np.ndarray, dim: Optional[int] = None) -> np.ndarray:
         The index of the dimension which to use to choose the seed item. If ``None``, an item is
         chosen at random, otherwise the item with the lowest value in the specified dimension is
         used.
+    max_items: Optional[int], default: None
+        If given, only this many items are chosen, and all other items get rank ``max_items``.
 
     Returns
     -------
     np.ndarray [N]
-        A list of item indices, defining a sparsified order of the items.
+        The rank of each item in the sparsified order, so that
+        ``np.argsort(ranks)`` lists the items in this order.
     """
-    indices = set(range(X.shape[0]))
+    num_items = X.shape[0]
 
     # Choose the seed item according to dim
     if dim is None:
-        initial_index = np.random.choice(X.shape[0])
+        choice = np.random.choice(num_items)
     else:
-        initial_index = np.argmin(X, axis=0)[dim]
-
-    # Initialize the order
-    order = [initial_index]
-    indices.remove(initial_index)
-
-    # Iterate until all models have been chosen
-    while indices:
-        # Get the distance to all items that have already been chosen
-        ordered_indices = list(indices)
-        diff = X[ordered_indices][:, None, :].repeat(len(order), axis=1) - X[order]
-        min_distances = np.linalg.norm(diff, axis=-1).min(-1)
+        choice = np.argmin(X, axis=0)[dim]
 
-        # Then, choose the one with the maximum distance to all points
-        choice = ordered_indices[min_distances.argmax()]
-        order.append(choice)
-        indices.remove(choice)
-
-    # convert argsort indices to rank
-    ranks = np.empty(len(order), dtype=int)
-    for rank, i in enumerate(order):
-        ranks[i] = rank
-    return np.array(ranks)
+    # Iterate until all models have been chosen. ``min_distances`` are the
+    # distances to the items chosen already, or -inf for chosen items. Ties
+    # are broken in favour of the smallest index
+    num_chosen = num_items if max_items is None else min(max_items, num_items)
+    ranks = np.full(num_items, num_chosen)
+    min_distances = np.full(num_items, np.inf)
+    for rank in range(num_chosen):
+        ranks[choice] = rank
+        if rank < num_chosen - 1:
+            distances = _distances(X, X[choice])
+            np.minimum(min_distances, distances, out=min_distances)
+            min_distances[choice] = -np.inf
+            # Then, choose the one with the maximum distance to all points
+            choice = np.argmax(min_distances)
+    return ranks
 
 
 def nondominated_sort(
@@ -131,24 +341,27 @@ def nondominated_sort(
         The indices of the sorted items, either globally or within each of the Pareto front
         depending on the value of ``flatten``.
     """
-    remaining = np.arange(X.shape[0])
+    layer_indices = nondominated_layer_indices(X)
+    # Items of each layer, in increasing order
+    order = np.argsort(layer_indices, kind="stable")
+    layer_starts = np.flatnonzero(np.diff(layer_indices[order], prepend=-1))
+    layer_ends = np.append(layer_starts[1:], order.size)
     indices = []
     num_items = 0
 
     # Iterate until max_items are reached or there are no items left
-    while remaining.size > 0 and (max_items is None or num_items < max_items):
-        # Compute the Pareto front and sort the items within
-        pareto_mask = pareto_efficient(X[remaining])
-        pareto_front = remaining[pareto_mask]
-        pareto_order = compute_epsilon_net(X[pareto_front], dim=dim)
+    for start, end in zip(layer_starts, layer_ends):
+        if max_items is not None and num_items >= max_items:
+            break
+        # Sort the items within the Pareto front
+        pareto_front = order[start:end]
+        limit = None if max_items is None else max_items - num_items
+        pareto_ranks = compute_epsilon_net(X[pareto_front], dim=dim, max_items=limit)
 
         # Add order to the indices
-        indices.append(pareto_front[pareto_order].tolist())
+        indices.append(pareto_front[np.argsort(pareto_ranks, kind="stable")].tolist())
         num_items += len(pareto_front)
 
-        # Remove items in the Pareto front from the remaining items
-        remaining = remaining[~pareto_mask]
-
     # Restrict the number of items returned and optionally flatten
     if max_items is not None:
         limit = max_items - sum(len(x) for x in indices[:-1])
@@ -159,3 +372,640 @@ def nondominated_sort(
     if flatten:
         return [i for ix in indices for i in ix]
     return indices
+
+
+class IncrementalEpsilonNet:
+    """
+    Maintains the order computed by :func:`compute_epsilon_net` for a set of
+    points, which are added and removed over time, without recomputing it from
+    scratch. Points have indices, and ties are broken in favour of the
+    smallest index, as in :func:`compute_epsilon_net` if points are passed in
+    increasing order of their indices. The seed must be chosen by ``dim``.
+
+    Only a prefix of the order is maintained, which is extended when needed
+    (see :meth:`rank`). For each step, we store the radius, which is the
+    distance of the point chosen to those chosen before. A new point would be
+    chosen at step ``k`` iff its distance to points chosen before is larger
+    than the radius of step ``k`` (or equal, with a smaller index). This is
+    tested for all steps at once, and the prefix is kept up to the first step
+    which changes. If a point is removed, the prefix is kept up to the step
+    it was chosen at. Points added or removed are collected, and the prefix is
+    updated only once it is needed.
+
+    Extending the prefix by one step costs :math:`O(N)` for :math:`N` points
+    (plus recomputing distances to the prefix after it was cut), so that
+    ranking a point at rank :math:`k` costs :math:`O(k N)` in the worst case,
+    compared to :math:`O(N^2)` for computing the full order.
+
+    :param dim: The index of the dimension used to choose the seed item
+    """
+
+    def __init__(self, dim: int):
+        self._dim = dim
+        # Points and their indices, in increasing order of indices
+        self._points = None
+        self._indices = np.zeros(0, dtype=int)
+        # Prefix of the order, with radius of each step
+        self._order = []
+        self._order_points = []
+        self._radii = []
+        self._rank_of = dict()
+        # Distance of each point to those in the prefix (``-inf`` for points
+        # in the prefix). If ``None``, it has to be recomputed
+        self._min_distances = None
+        # Changes not applied yet
+        self._added = dict()
+        self._removed = set()
+
+    def __len__(self) -> int:
+        return self._indices.size + len(self._added) - len(self._removed)
+
+    def add(self, indices: List[int], points: np.ndarray):
+        """
+        :param indices: Indices of new points, different from the ones of
+            points added before
+        :param points: New points, shape ``(len(indices), num_objectives)``
+        """
+        for index, point in zip(indices, points):
+            self._added[index] = point
+
+    def remove(self, indices: List[int]):
+        """
+        :param indices: Indices of points to be removed
+        """
+        for index in indices:
+            if self._added.pop(index, None) is None:
+                self._removed.add(index)
+
+    def _first_changed_step(
+        self, indices: np.ndarray, points: np.ndarray, num_steps: int
+    ) -> Tuple[int, np.ndarray]:
+        """
+        :return: ``(first_step, distances)``, where ``first_step`` is the first
+            step before ``num_steps`` at which some new point would be chosen
+            (or ``num_steps``), and ``distances`` are distances of new points
+            to points chosen before ``first_step``
+        """
+        no_distances = np.full(indices.size, np.inf)
+        if num_steps == 0:
+            return 0, no_distances
+        seed_index, seed_value = self._order[0], self._order_points[0][self._dim]
+        values = points[:, self._dim]
+        if np.any(
+            (values < seed_value) | ((values == seed_value) & (indices < seed_index))
+        ):
+            return 0, no_distances
+        distances = _distances(
+            points[:, None, :], np.array(self._order_points[:num_steps])[None, :, :]
+        )
+        # Distances to points chosen before each step
+        distances = np.minimum.accumulate(distances, axis=1)
+        radii = np.array(self._radii[1:num_steps])
+        before = distances[:, :-1]
+        is_chosen = (before > radii) | (
+            (before == radii) & (indices[:, None] < self._order[1:num_steps])
+        )
+        steps = np.flatnonzero(np.any(is_chosen, axis=0))
+        if steps.size > 0:
+            num_steps = steps[0] + 1
+        return num_steps, distances[:, num_steps - 1]
+
+    def _apply_changes(self):
+        if not (self._added or self._removed):
+            return
+        removed = sorted(self._removed)
+        added_indices = np.array(sorted(self._added), dtype=int)
+        added_points = np.array(
+            [self._added[index] for index in added_indices], dtype=np.float64
+        ).reshape((added_indices.size, -1))
+        self._added = dict()
+        self._removed = set()
+        # First step of the prefix which changes
+        num_steps = min(
+            [len(self._order)]
+            + [self._rank_of[index] for index in removed if index in self._rank_of]
+        )
+        num_steps, added_distances = self._first_changed_step(
+            added_indices, added_points, num_steps
+        )
+        if num_steps < len(self._order):
+            for index in self._order[num_steps:]:
+                del self._rank_of[index]
+            del self._order[num_steps:]
+            del self._order_points[num_steps:]
+            del self._radii[num_steps:]
+            self._min_distances = None
+        if removed:
+            positions = np.searchsorted(self._indices, removed)
+            self._points = np.delete(self._points, positions, axis=0)
+            self._indices = np.delete(self._indices, positions)
+            if self._min_distances is not None:
+                self._min_distances = np.delete(self._min_distances, positions)
+        if added_indices.size > 0:
+            if self._points is None:
+                self._points = added_points
+                self._indices = added_indices
+            else:
+                positions = np.searchsorted(self._indices, added_indices)
+                self._indices = np.insert(self._indices, positions, added_indices)
+                self._points = np.insert(self._points, positions, added_points, axis=0)
+                if self._min_distances is not None:
+                    self._min_distances = np.insert(
+                        self._min_distances, positions, added_distances
+                    )
+
+    def _append_step(self, index: int, point: np.ndarray, radius: float):
+        self._rank_of[index] = len(self._order)
+        self._order.append(index)
+        self._order_points.append(point)
+        self._radii.append(radius)
+
+    def _choose_next(self):
+        if self._min_distances is None:
+            # Recompute distances to points in the prefix, in blocks
+            self._min_distances = np.full(self._indices.size, np.inf)
+            for start in range(0, len(self._order), 256):
+                block = np.array(self._order_points[start : (start + 256)])
+                distances = _distances(self._points[:, None, :], block[None, :, :])
+                np.minimum(
+                    self._min_distances,
+                    np.min(distances, axis=1),
+                    out=self._min_distances,
+                )
+            positions = np.searchsorted(self._indices, self._order)
+            self._min_distances[positions] = -np.inf
+        # Since points are sorted by index, ties are broken in favour of the
+        # smallest index
+        if self._order:
+            pos = np.argmax(self._min_distances)
+            radius = self._min_distances[pos]
+        else:
+            pos = np.argmin(self._points[:, self._dim])
+            radius = np.inf
+        point = self._points[pos]
+        self._append_step(int(self._indices[pos]), point, radius)
+        np.minimum(
+            self._min_distances,
+            _distances(self._points, point),
+            out=self._min_distances,
+        )
+        self._min_distances[pos] = -np.inf
+
+    def rank(self, index: int, max_rank: Optional[int] = None) -> int:
+        """
+        :param index: Index of a point
+        :param max_rank: If given, the order is extended up to this rank at
+            most
+        :return: Rank of point ``index`` in the order, or ``max_rank`` if this
+            is smaller
+        """
+        self._apply_changes()
+        while index not in self._rank_of:
+            if max_rank is not None and len(self._order) >= max_rank:
+                return max_rank
+            self._choose_next()
+        rank = self._rank_of[index]
+        return rank if max_rank is None else min(rank, max_rank)
+
+
+class _Layer2D:
+    """
+    Layer of points with two objectives, none of which dominates another.
+    Points are sorted w.r.t. the first objective ``x`` (ascending), so that
+    the second objective ``y`` is non-increasing, and equal ``x`` implies
+    equal ``y``. We store ``-y``, so that bisection can be used on both.
+    """
+
+    def __init__(self, xs: List[float], neg_ys: List[float], indices: List[int]):
+        self.xs = xs
+        self.neg_ys = neg_ys
+        self.indices = indices
+
+    @staticmethod
+    def from_point(point: np.ndarray, index: int) -> "_Layer2D":
+        return _Layer2D([float(point[0])], [-float(point[1])], [index])
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def dominates(self, point: np.ndarray) -> bool:
+        """
+        :return: Is ``point`` dominated by some point in the layer?
+        """
+        x, y = float(point[0]), float(point[1])
+        # Among points with ``xs <= x``, the last one has the smallest ``y``
+        pos = bisect_right(self.xs, x) - 1
+        if pos < 0:
+            return False
+        other_y = -self.neg_ys[pos]
+        return other_y <= y and (self.xs[pos] != x or other_y != y)
+
+    def remove_dominated_by(self, other: "_Layer2D") -> Optional["_Layer2D"]:
+        """
+        Removes all points dominated by some point in ``other``.
+
+        :return: Layer of removed points, or ``None`` if no point is removed
+        """
+        xs, neg_ys = self.xs, self.neg_ys
+        # Points dominated by ``(x, y)`` are those with ``xs >= x`` and
+        # ``ys >= y``, except for ``(x, y)`` itself, which is a contiguous
+        # range. Ranges are increasing as ``other`` is traversed
+        ranges = []
+        for x, neg_y in zip(other.xs, other.neg_ys):
+            start = bisect_left(xs, x)
+            end = bisect_right(neg_ys, neg_y, start)
+            while start < end and xs[start] == x and neg_ys[start] == neg_y:
+                start += 1
+            if start < end:
+                if ranges and start <= ranges[-1][1]:
+                    ranges[-1][1] = max(ranges[-1][1], end)
+                else:
+                    ranges.append([start, end])
+        if not ranges:
+            return None
+        keep = [], [], []
+        removed = [], [], []
+        prev_end = 0
+        for start, end in ranges + [[len(xs), len(xs)]]:
+            for target, source in zip(keep, (xs, neg_ys, self.indices)):
+                target.extend(source[prev_end:start])
+            for target, source in zip(removed, (xs, neg_ys, self.indices)):
+                target.extend(source[start:end])
+            prev_end = end
+        self.xs, self.neg_ys, self.indices = keep
+        return _Layer2D(*removed)
+
+    def merge(self, other: "_Layer2D"):
+        """
+        Adds points of ``other``. Points in ``self`` and ``other`` must not
+        dominate each other.
+        """
+        if len(other) == 1:
+            pos = bisect_right(self.xs, other.xs[0])
+            self.xs.insert(pos, other.xs[0])
+            self.neg_ys.insert(pos, other.neg_ys[0])
+            self.indices.insert(pos, other.indices[0])
+        else:
+            points = sorted(
+                zip(
+                    self.xs + other.xs,
+                    self.neg_ys + other.neg_ys,
+                    self.indices + other.indices,
+                )
+            )
+            self.xs, self.neg_ys, self.indices = (list(x) for x in zip(*points))
+
+
+class _Block3D:
+    """
+    Block of points ``(x, y, z, index)`` with three objectives, sorted in
+    lexicographic order. We maintain the minimal and the maximal elements
+    w.r.t. ``(y, z)`` as staircases (``ys`` increasing, ``zs`` decreasing),
+    so that :meth:`has_lower` and :meth:`has_higher` are done by bisection.
+    """
+
+    def __init__(self, points: List[Tuple[float, float, float, int]]):
+        self.points = points
+        yzs = sorted([(point[1], point[2]) for point in points])
+        self.min_ys, self.min_zs = [], []
+        for y, z in yzs:
+            if not self.min_zs or z < self.min_zs[-1]:
+                self.min_ys.append(y)
+                self.min_zs.append(z)
+        max_ys, max_zs = [], []
+        for y, z in reversed(yzs):
+            if not max_zs or z > max_zs[-1]:
+                max_ys.append(y)
+                max_zs.append(z)
+        self.max_ys, self.max_zs = max_ys[::-1], max_zs[::-1]
+
+    def has_lower(self, y: float, z: float) -> bool:
+        """
+        :return: Is there a point with ``y`` and ``z`` equal or lower?
+        """
+        pos = bisect_right(self.min_ys, y) - 1
+        return pos >= 0 and self.min_zs[pos] <= z
+
+    def has_higher(self, y: float, z: float) -> bool:
+        """
+        :return: Is there a point with ``y`` and ``z`` equal or higher?
+        """
+        pos = bisect_left(self.max_ys, y)
+        return pos < len(self.max_ys) and self.max_zs[pos] >= z
+
+    def insert(self, point: Tuple[float, float, float, int]):
+        """
+        Inserts ``point``, updating the staircases without rebuilding them.
+        """
+        self.points.insert(bisect_right(self.points, point), point)
+        _, y, z, _ = point
+        if not self.has_lower(y, z):
+            # Remove minimal elements which are equal or higher
+            start = bisect_left(self.min_ys, y)
+            end = start
+            while end < len(self.min_zs) and self.min_zs[end] >= z:
+                end += 1
+            self.min_ys[start:end] = [y]
+            self.min_zs[start:end] = [z]
+        if not self.has_higher(y, z):
+            # Remove maximal elements which are equal or lower
+            end = bisect_right(self.max_ys, y)
+            start = end
+            while start > 0 and self.max_zs[start - 1] <= z:
+                start -= 1
+            self.max_ys[start:end] = [y]
+            self.max_zs[start:end] = [z]
+
+
+class _Layer3D:
+    """
+    Layer of points with three objectives, none of which dominates another.
+    Points are sorted in lexicographic order and split into blocks of less
+    than ``2 * block_size`` points (see :class:`_Block3D`). If all points of
+    a block have a lower first objective ``x`` than a point, the block
+    contains a point dominating it iff some point is equal or lower in the
+    other two objectives, which is tested on the staircase of minimal
+    elements. In the same way, blocks without points dominated by a given
+    one are skipped by a test on the staircase of maximal elements. Only
+    remaining blocks are scanned, so that a test costs
+    :math:`O((L / B) \\log B + B)` for a layer of size :math:`L` and blocks
+    of size :math:`B`, unless many points are dominated. Staircases are
+    updated when points are inserted into a block. A block is rebuilt only if
+    points are removed from it, or if it is split.
+    """
+
+    block_size = 32
+
+    def __init__(self, points: List[Tuple[float, float, float, int]]):
+        self._set_points(points)
+
+    def _set_points(self, points: List[Tuple[float, float, float, int]]):
+        size = self.block_size
+        self._blocks = [
+            _Block3D(points[start : (start + size)])
+            for start in range(0, len(points), size)
+        ]
+        self._num_points = len(points)
+
+    @staticmethod
+    def from_point(point: np.ndarray, index: int) -> "_Layer3D":
+        x, y, z = (float(v) for v in point)
+        return _Layer3D([(x, y, z, index)])
+
+    def __len__(self) -> int:
+        return self._num_points
+
+    def _points(self) -> List[Tuple[float, float, float, int]]:
+        return [point for block in self._blocks for point in block.points]
+
+    @property
+    def indices(self) -> List[int]:
+        return [point[3] for block in self._blocks for point in block.points]
+
+    def dominates(self, point: np.ndarray) -> bool:
+        """
+        :return: Is ``point`` dominated by some point in the layer?
+        """
+        x, y, z = (float(v) for v in point)
+        for block in self._blocks:
+            if block.points[0][0] > x:
+                break
+            if not block.has_lower(y, z):
+                continue
+            if block.points[-1][0] < x:
+                return True
+            for other_x, other_y, other_z, _ in block.points:
+                if other_x > x:
+                    break
+                if (
+                    other_y <= y
+                    and other_z <= z
+                    and (other_x, other_y, other_z) != (x, y, z)
+                ):
+                    return True
+        return False
+
+    def _rebuild_blocks(self, positions: List[int]):
+        """
+        Rebuilds blocks at ``positions`` (increasing) after their points have
+        been changed. Empty blocks are removed, large ones are split. If there
+        are too many blocks, all are rebuilt.
+        """
+        blocks = self._blocks
+        size = self.block_size
+        for pos in reversed(positions):
+            points = blocks[pos].points
+            if len(points) < 2 * size:
+                chunks = [points] if points else []
+            else:
+                chunks = [
+                    points[start : (start + size)]
+                    for start in range(0, len(points), size)
+                ]
+            blocks[pos : (pos + 1)] = [_Block3D(chunk) for chunk in chunks]
+        if len(blocks) > 2 * (self._num_points // size + 1):
+            self._set_points(self._points())
+
+    def remove_dominated_by(self, other: "_Layer3D") -> Optional["_Layer3D"]:
+        """
+        Removes all points dominated by some point in ``other``.
+
+        :return: Layer of removed points, or ``None`` if no point is removed
+        """
+        other_points = other._points()
+        removed = []
+        changed_positions = []
+        for pos, block in enumerate(self._blocks):
+            points = block.points
+            last_x = points[-1][0]
+            removed_positions = set()
+            for x, y, z, _ in other_points:
+                if x > last_x or not block.has_higher(y, z):
+                    continue
+                # Points with equal or higher ``x`` come at ``start`` or later
+                start = bisect_left(points, (x,))
+                for this_pos in range(start, len(points)):
+                    this_x, this_y, this_z, _ = points[this_pos]
+                    if (
+                        this_y >= y
+                        and this_z >= z
+                        and (this_x, this_y, this_z) != (x, y, z)
+                    ):
+                        removed_positions.add(this_pos)
+            if not removed_positions:
+                continue
+            keep = []
+            for this_pos, point in enumerate(points):
+                if this_pos in removed_positions:
+                    removed.append(point)
+                else:
+                    keep.append(point)
+            block.points = keep
+            changed_positions.append(pos)
+        if not removed:
+            return None
+        self._num_points -= len(removed)
+        self._rebuild_blocks(changed_positions)
+        return _Layer3D(removed)
+
+    def merge(self, other: "_Layer3D"):
+        """
+        Adds points of ``other``. Points in ``self`` and ``other`` must not
+        dominate each other.
+        """
+        if not self._blocks:
+            self._set_points(other._points())
+            return
+        blocks = self._blocks
+        first_points = [block.points[0] for block in blocks]
+        changed_positions = set()
+        for point in other._points():
+            pos = max(bisect_right(first_points, point) - 1, 0)
+            blocks[pos].insert(point)
+            if len(blocks[pos].points) >= 2 * self.block_size:
+                changed_positions.add(pos)
+        self._num_points += len(other)
+        self._rebuild_blocks(sorted(changed_positions))
+
+
+class _LayerND:
+    """
+    Layer of points with any number of objectives, none of which dominates
+    another. Dominance tests are vectorized over the points in the layer.
+    """
+
+    def __init__(self, points: np.ndarray, indices: List[int]):
+        self.points = points
+        self.indices = indices
+
+    @staticmethod
+    def from_point(point: np.ndarray, index: int) -> "_LayerND":
+        return _LayerND(point.reshape((1, -1)), [index])
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def dominates(self, point: np.ndarray) -> bool:
+        return bool(
+            np.any(
+                np.all(self.points <= point, axis=1)
+                & np.any(self.points < point, axis=1)
+            )
+        )
+
+    def remove_dominated_by(self, other: "_LayerND") -> Optional["_LayerND"]:
+        lhs = other.points[:, None, :]
+        rhs = self.points[None, :, :]
+        mask = np.any(np.all(lhs <= rhs, axis=2) & np.any(lhs < rhs, axis=2), axis=0)
+        if not np.any(mask):
+            return None
+        removed = _LayerND(
+            self.points[mask], [i for i, m in zip(self.indices, mask) if m]
+        )
+        self.points = self.points[~mask]
+        self.indices = [i for i, m in zip(self.indices, mask) if not m]
+        return removed
+
+    def merge(self, other: "_LayerND"):
+        self.points = np.vstack((self.points, other.points))
+        self.indices = self.indices + other.indices
+
+
+class NonDominatedLayers:
+    """
+    Maintains the non-dominated layers (or Pareto fronts) of a set of points,
+    to which points are added one by one. The first layer contains all points
+    not dominated by any other, the second layer contains all points not
+    dominated once the first layer is removed, and so on. Layers are the same
+    as in :func:`nondominated_sort` (lower is better), but they are updated
+    when a point is added, instead of being recomputed from scratch.
+
+    If a point is dominated by some point in layer ``k``, it is also dominated
+    by some point in all layers before ``k``. The layer of a new point is
+    therefore found by bisection. Points it dominates in this layer are moved
+    down by one layer, which may cascade to the layers below. For two
+    objectives, layers are sorted, so that dominance tests are done by
+    bisection as well. For three objectives, layers are split into sorted
+    blocks, which are skipped or accepted by bisection on staircases (see
+    :class:`_Layer3D`). Otherwise, tests are vectorized over points in a
+    layer.
+
+    :param num_objectives: Number of objectives
+    """
+
+    def __init__(self, num_objectives: int):
+        self._num_objectives = num_objectives
+        if num_objectives == 2:
+            self._layer_class = _Layer2D
+        elif num_objectives == 3:
+            self._layer_class = _Layer3D
+        else:
+            self._layer_class = _LayerND
+        self._layers = []
+        self._num_points = 0
+
+    def __len__(self) -> int:
+        return self._num_points
+
+    def add(self, point: np.ndarray) -> int:
+        """
+        Adds a point. Its index is the number of points added before.
+
+        :param point: New point, shape ``(num_objectives,)``
+        :return: Number of points in layers strictly before the one the new
+            point is placed in
+        """
+        return self.add_and_get_changes(point)[0]
+
+    def add_and_get_changes(
+        self, point: np.ndarray
+    ) -> Tuple[int, List[Tuple[int, List[int], List[int]]]]:
+        """
+        Same as :meth:`add`, but also returns how layers are changed.
+
+        :param point: New point, shape ``(num_objectives,)``
+        :return: ``(num_before, changes)``, where ``num_before`` is returned by
+            :meth:`add`. ``changes`` contains ``(layer, added, removed)`` for
+            each layer changed, in increasing order of ``layer``, starting with
+            the layer of the new point. ``added`` and ``removed`` contain the
+            indices of points added to and removed from this layer. If
+            ``layer`` is equal to the number of layers before, it is created
+        """
+        point = np.asarray(point, dtype=np.float64).reshape((-1,))
+        assert point.size == self._num_objectives, (
+            f"point must have {self._num_objectives} entries, but "
+            f"point.shape = {point.shape}"
+        )
+        lower, upper = 0, len(self._layers)
+        while lower < upper:
+            middle = (lower + upper) // 2
+            if self._layers[middle].dominates(point):
+                lower = middle + 1
+            else:
+                upper = middle
+        num_before = sum(len(layer) for layer in self._layers[:lower])
+        new_layer = self._layer_class.from_point(point, self._num_points)
+        self._num_points += 1
+        pos = lower
+        changes = []
+        while new_layer is not None:
+            added = list(new_layer.indices)
+            if pos == len(self._layers):
+                self._layers.append(new_layer)
+                changes.append((pos, added, []))
+                break
+            layer = self._layers[pos]
+            moved_layer = layer.remove_dominated_by(new_layer)
+            layer.merge(new_layer)
+            removed = [] if moved_layer is None else list(moved_layer.indices)
+            changes.append((pos, added, removed))
+            new_layer = moved_layer
+            pos += 1
+        return num_before, changes
+
+    def layers(self) -> List[List[int]]:
+        """
+        :return: Indices of points in each layer (in no particular order),
+            starting with the first layer
+        """
+        return [list(layer.indices) for layer in self._layers]
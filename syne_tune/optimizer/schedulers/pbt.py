@@ -23,6 +23,7 @@ from syne_tune.config_space import Domain, Integer, Float, FiniteRange
 from syne_tune.backend.trial_status import Trial
 from syne_tune.optimizer.scheduler import SchedulerDecision, TrialSuggestion
 from syne_tune.optimizer.schedulers.fifo import FIFOScheduler
+from syne_tune.optimizer.schedulers.utils.sorted_list import SortedList
 from syne_tune.config_space import cast_config_values
 from syne_tune.optimizer.schedulers.searchers.utils.default_arguments import (
     check_and_merge_defaults,
@@ -164,6 +165,13 @@ class PopulationBasedTraining(FIFOScheduler):
 
         self._metric_op = 1.0 if self.mode == "max" else -1.0
         self._trial_state = dict()
+        # Trials which are not stopped and have a score, as entries
+        # ``(last_score, position, trial_id)`` in ascending order, where
+        # ``position`` is the position of the trial in ``_trial_state``. This
+        # is maintained as states change, so the population does not have to
+        # be sorted for every decision
+        self._ranking = SortedList()
+        self._trial_position = dict()
         self._next_perturbation_sync = self._perturbation_interval
         self._trial_decisions_stack = deque()
         self._checkpointing_history = []
@@ -172,7 +180,32 @@ class PopulationBasedTraining(FIFOScheduler):
         self._random_state = np.random.RandomState(self.random_seed_generator())
 
     def on_trial_add(self, trial: Trial):
-        self._trial_state[trial.trial_id] = PBTTrialState(trial=trial)
+        trial_id = trial.trial_id
+        if trial_id in self._trial_state:
+            self._remove_from_ranking(self._trial_state[trial_id])
+        else:
+            self._trial_position[trial_id] = len(self._trial_position)
+        self._trial_state[trial_id] = PBTTrialState(trial=trial)
+
+    def _ranking_entry(self, state: PBTTrialState) -> Optional[tuple]:
+        if state.stopped or state.last_score is None:
+            return None
+        trial_id = state.trial.trial_id
+        return state.last_score, self._trial_position[trial_id], trial_id
+
+    def _remove_from_ranking(self, state: PBTTrialState):
+        entry = self._ranking_entry(state)
+        if entry is not None:
+            self._ranking.remove(entry)
+
+    def _add_to_ranking(self, state: PBTTrialState):
+        entry = self._ranking_entry(state)
+        if entry is not None:
+            self._ranking.add(entry)
+
+    def _stop_trial(self, state: PBTTrialState):
+        self._remove_from_ranking(state)
+        state.stopped = True
 
     def _get_trial_id_to_continue(self, trial: Trial) -> int:
         """Determine which trial to continue.
@@ -183,11 +216,18 @@ class PopulationBasedTraining(FIFOScheduler):
         :param trial: Trial at question right now
         :return: ID (int) of trial which should be continued inplace of ``trial``
         """
-        lower_quantile, upper_quantile = self._quantiles()
+        num_trials_in_quantile = self._num_trials_in_quantile()
         # If we are not in the upper quantile, we pause:
         trial_id = trial.trial_id
-        if trial_id in lower_quantile:
+        entry = self._ranking_entry(self._trial_state[trial_id])
+        if (
+            entry is not None
+            and self._ranking.bisect_left(entry) < num_trials_in_quantile
+        ):
             # sample random trial from upper quantile
+            upper_quantile = [
+                entry[-1] for entry in self._ranking[-num_trials_in_quantile:]
+            ]
             trial_id_to_clone = int(self._random_state.choice(upper_quantile))
             assert trial_id is not trial_id_to_clone
             logger.debug(
@@ -220,7 +260,7 @@ class PopulationBasedTraining(FIFOScheduler):
 
         # Stop if we reached the maximum budget of this configuration
         if cost >= self.max_t:
-            state.stopped = True
+            self._stop_trial(state)
             return SchedulerDecision.STOP
 
         # Continue training if perturbation interval has not been reached yet.
@@ -242,7 +282,7 @@ class PopulationBasedTraining(FIFOScheduler):
             # continue current trial
             return SchedulerDecision.CONTINUE
         else:
-            state.stopped = True
+            self._stop_trial(state)
             # exploit step
             trial_to_clone = self._trial_state[trial_id_to_continue].trial
 
@@ -263,7 +303,9 @@ class PopulationBasedTraining(FIFOScheduler):
         # This trial has reached its perturbation interval.
         # Record new state in the state object.
         score = self._metric_op * result[self.metric]
+        self._remove_from_ranking(state)
         state.last_score = score
+        self._add_to_ranking(state)
         state.last_train_time = time
         state.last_result = result
         return score
@@ -275,22 +317,27 @@ class PopulationBasedTraining(FIFOScheduler):
 
         :return ``(lower_quantile, upper_quantile)``
         """
-        trials = []
-        for trial, state in self._trial_state.items():
-            if not state.stopped and state.last_score is not None:
-                trials.append(trial)
-
-        trials.sort(key=lambda t: self._trial_state[t].last_score)
-
-        if len(trials) <= 1:
+        if len(self._ranking) <= 1:
             return [], []
         else:
-            num_trials_in_quantile = int(
-                math.ceil(len(trials) * self._quantile_fraction)
+            num_trials_in_quantile = self._num_trials_in_quantile()
+            return (
+                [entry[-1] for entry in self._ranking[:num_trials_in_quantile]],
+                [entry[-1] for entry in self._ranking[-num_trials_in_quantile:]],
             )
-            if num_trials_in_quantile > len(trials) / 2:
-                num_trials_in_quantile = int(math.floor(len(trials) / 2))
-            return trials[:num_trials_in_quantile], trials[-num_trials_in_quantile:]
+
+    def _num_trials_in_quantile(self) -> int:
+        """
+        :return: Number of trials in the lower (or upper) quantile, or 0 if
+            there is not enough data
+        """
+        num_trials = len(self._ranking)
+        if num_trials <= 1:
+            return 0
+        num_trials_in_quantile = int(math.ceil(num_trials * self._quantile_fraction))
+        if num_trials_in_quantile > num_trials / 2:
+            num_trials_in_quantile = int(math.floor(num_trials / 2))
+        return num_trials_in_quantile
 
     def _suggest(self, trial_id: int) -> Optional[TrialSuggestion]:
         # If no time keeper was provided at construction, we use a local
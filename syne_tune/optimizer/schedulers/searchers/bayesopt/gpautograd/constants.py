@@ -40,17 +40,51 @@ WARPING_UPPER_BOUND = 4.0
 
 MIN_POSTERIOR_VARIANCE = 1e-12
 
+MIN_POSTERIOR_VARIANCE_FLOAT32 = 1e-6
+
+MAX_CHOLESKY_DIAGONAL_RATIO_FLOAT32 = 1e3
+
 MIN_CHOLESKY_DIAGONAL_VALUE = 1e-10
 
+INDUCING_POINTS_JITTER = 1e-6
+
+DEFAULT_NUM_INDUCING_POINTS = 256
+
+SUPPORTED_GP_APPROXIMATIONS = ("exact", "vfe", "fitc")
+
+SUPPORTED_PREDICTION_PRECISIONS = ("float64", "float32")
+
+# Maximum number of test feature matrices for which intermediates are cached
+# in a posterior state (see :class:`PredictionCache`). The cache is there for
+# repeated calls with the same test features in a row (e.g., ``predict``
+# followed by ``backward_gradient``), so a few entries are sufficient
+PREDICTION_CACHE_MAX_SIZE = 4
+
+# Maximum number of bytes of all entries cached in a posterior state, test
+# features included. There is a cache for every posterior state (MCMC
+# samples, fantasy samples), so this must be small
+PREDICTION_CACHE_MAX_BYTES = 2**22
+
 DATA_TYPE = anp.float64
 
 
 @dataclass
 class OptimizationConfig:
+    """
+    If ``num_workers > 1``, the ``n_starts`` restarts of L-BFGS are run in
+    parallel, using a pool of ``num_workers`` processes
+    (``parallel_backend == "process"``) or threads
+    (``parallel_backend == "thread"``). Results do not depend on
+    ``num_workers``. The pool is kept alive by the model (see
+    :class:`~syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.optimization_utils.ParallelRestartsPool`).
+    """
+
     lbfgs_tol: float
     lbfgs_maxiter: int
     verbose: bool
     n_starts: int
+    num_workers: int = 1
+    parallel_backend: str = "process"
 
 
 @dataclass
@@ -31,7 +31,9 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.likelihood imp
 from syne_tune.optimizer.schedulers.utils.simple_profiler import SimpleProfiler
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.optimization_utils import (
     apply_lbfgs_with_multiple_starts,
+    apply_lbfgs_with_multiple_starts_parallel,
     create_lbfgs_arguments,
+    ParallelRestartsPool,
 )
 
 logger = logging.getLogger(__name__)
@@ -109,6 +111,8 @@ class GaussianProcessModel:
         """
         Compute the posterior mean(s) and variance(s) for the points in features_test.
         If the posterior state is based on m target vectors, a (n, m) matrix is returned for posterior means.
+        If ``features_test`` is float32, predictions may be computed in reduced
+        precision.
 
         :param features_test: Data matrix X_test of size (n, d) (type np.ndarray) for which n predictions are made
         :return: posterior_means, posterior_variances
@@ -126,6 +130,9 @@ class GaussianProcessModel:
 
     def _assert_check_xtest(self, features_test: np.ndarray):
         assert self.states is not None, "Posterior state does not exist (run 'fit')"
+        if features_test.dtype == np.float32:
+            # Reduced precision prediction (see :meth:`PosteriorState.predict`)
+            return anp.reshape(features_test, (features_test.shape[0], -1))
         features_test = self._check_and_format_input(features_test)
         return features_test
 
@@ -205,6 +212,9 @@ class GaussianProcessOptimizeModel(GaussianProcessModel):
         self._states = None
         self.fit_reset_params = fit_reset_params
         self.optimization_config = optimization_config
+        # Pool of workers for running restarts in parallel, created when first
+        # needed
+        self._restarts_pool = None
 
     @property
     def states(self) -> Optional[List[PosteriorState]]:
@@ -221,61 +231,94 @@ class GaussianProcessOptimizeModel(GaussianProcessModel):
 
         We catch exceptions during the optimization restarts. If any restarts
         fail, log messages are written. If all restarts fail, the current
-        parameters are not changed.
+        parameters are not changed. If ``optimization_config.num_workers > 1``,
+        the restarts are run in parallel, using a pool of workers which is
+        kept alive until :meth:`close` is called. If ``profiler`` is given, the
+        time for ``fit`` is recorded under the tag "fit".
 
         :param data: Input data
         :param profiler: Profiler, optional
         """
-        self.likelihood.on_fit_start(data, profiler)
-        if self.fit_reset_params:
-            self.reset_params()
-        n_starts = self.optimization_config.n_starts
-        ret_infos = apply_lbfgs_with_multiple_starts(
-            *create_lbfgs_arguments(
-                criterion=self.likelihood,
-                crit_args=[data],
-                verbose=self.optimization_config.verbose,
-            ),
-            bounds=self.likelihood.box_constraints_internal(),
-            random_state=self._random_state,
-            n_starts=n_starts,
-            tol=self.optimization_config.lbfgs_tol,
-            maxiter=self.optimization_config.lbfgs_maxiter,
-        )
+        if profiler is not None:
+            profiler.start("fit")
+        try:
+            self.likelihood.on_fit_start(data, profiler)
+            if self.fit_reset_params:
+                self.reset_params()
+            n_starts = self.optimization_config.n_starts
+            num_workers = self.optimization_config.num_workers
+            if num_workers > 1 and n_starts > 1:
+                if self._restarts_pool is None:
+                    self._restarts_pool = ParallelRestartsPool(
+                        num_workers=min(num_workers, n_starts),
+                        parallel_backend=self.optimization_config.parallel_backend,
+                    )
+                ret_infos = apply_lbfgs_with_multiple_starts_parallel(
+                    criterion=self.likelihood,
+                    crit_args=[data],
+                    bounds=self.likelihood.box_constraints_internal(),
+                    random_state=self._random_state,
+                    n_starts=n_starts,
+                    pool=self._restarts_pool,
+                    verbose=self.optimization_config.verbose,
+                    tol=self.optimization_config.lbfgs_tol,
+                    maxiter=self.optimization_config.lbfgs_maxiter,
+                )
+            else:
+                ret_infos = apply_lbfgs_with_multiple_starts(
+                    *create_lbfgs_arguments(
+                        criterion=self.likelihood,
+                        crit_args=[data],
+                        verbose=self.optimization_config.verbose,
+                    ),
+                    bounds=self.likelihood.box_constraints_internal(),
+                    random_state=self._random_state,
+                    n_starts=n_starts,
+                    tol=self.optimization_config.lbfgs_tol,
+                    maxiter=self.optimization_config.lbfgs_maxiter,
+                )
 
-        # Logging in response to failures of optimization runs
-        n_succeeded = sum(x is None for x in ret_infos)
-        if n_succeeded < n_starts:
-            log_msg = "[GaussianProcessOptimizeModel.fit]\n"
-            log_msg += (
-                "{} of the {} restarts failed with the following exceptions:\n".format(
+            # Logging in response to failures of optimization runs
+            n_succeeded = sum(x is None for x in ret_infos)
+            if n_succeeded < n_starts:
+                log_msg = "[GaussianProcessOptimizeModel.fit]\n"
+                log_msg += "{} of the {} restarts failed with the following exceptions:\n".format(
                     n_starts - n_succeeded, n_starts
                 )
-            )
-            copy_params = {
-                param.name: param.data()
-                for param in self.likelihood.collect_params().values()
-            }
-            for i, ret_info in enumerate(ret_infos):
-                if ret_info is not None:
-                    log_msg += "- Restart {}: Exception {}\n".format(
-                        i, ret_info["type"]
+                copy_params = {
+                    param.name: param.data()
+                    for param in self.likelihood.collect_params().values()
+                }
+                for i, ret_info in enumerate(ret_infos):
+                    if ret_info is not None:
+                        log_msg += "- Restart {}: Exception {}\n".format(
+                            i, ret_info["type"]
+                        )
+                        log_msg += "  Message: {}\n".format(ret_info["msg"])
+                        log_msg += "  Args: {}\n".format(ret_info["args"])
+                        # Set parameters in order to print them. These are the
+                        # parameters for which the evaluation failed
+                        self._set_likelihood_params(ret_info["params"])
+                        log_msg += "  Params: " + str(self.get_params())
+                        logger.info(log_msg)
+                # Restore parameters
+                self._set_likelihood_params(copy_params)
+                if n_succeeded == 0:
+                    logger.info(
+                        "All restarts failed: Skipping hyperparameter fitting for now"
                     )
-                    log_msg += "  Message: {}\n".format(ret_info["msg"])
-                    log_msg += "  Args: {}\n".format(ret_info["args"])
-                    # Set parameters in order to print them. These are the
-                    # parameters for which the evaluation failed
-                    self._set_likelihood_params(ret_info["params"])
-                    log_msg += "  Params: " + str(self.get_params())
-                    logger.info(log_msg)
-            # Restore parameters
-            self._set_likelihood_params(copy_params)
-            if n_succeeded == 0:
-                logger.info(
-                    "All restarts failed: Skipping hyperparameter fitting for now"
-                )
-        # Recompute posterior state for new hyperparameters
-        self._recompute_states(data)
+            # Recompute posterior state for new hyperparameters
+            self._recompute_states(data)
+        finally:
+            if profiler is not None:
+                profiler.stop("fit")
+
+    def close(self):
+        """
+        Shuts down workers used for running restarts in parallel, if any.
+        """
+        if self._restarts_pool is not None:
+            self._restarts_pool.close()
 
     def _set_likelihood_params(self, params: dict):
         for param in self.likelihood.collect_params().values():
@@ -11,10 +11,14 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 from typing import Optional
+import numpy as np
+import scipy.linalg as spl
 import logging
 
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.constants import (
     OptimizationConfig,
+    NOISE_VARIANCE_LOWER_BOUND,
+    DEFAULT_NUM_INDUCING_POINTS,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.gp_model import (
     GaussianProcessOptimizeModel,
@@ -25,11 +29,19 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.kernel import
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.likelihood import (
     MarginalLikelihood,
     GaussianProcessMarginalLikelihood,
+    SparseGaussianProcessMarginalLikelihood,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.mean import (
     ScalarMeanFunction,
     MeanFunction,
 )
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_state import (
+    GaussProcPosteriorState,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_utils import (
+    cholesky_block_update,
+    _extract_kernel_and_scale,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +63,17 @@ class GaussianProcessRegression(GaussianProcessOptimizeModel):
     :param random_seed: Random seed to be used (optional)
     :param fit_reset_params: Reset parameters to initial values before running
         'fit'? If False, 'fit' starts from the current values
+
+    If :meth:`recompute_states` is called without the model parameters having
+    changed since the last posterior state was computed, the Cholesky factor
+    of this state is reused. Rows in common with the previous training inputs
+    (longest common prefix) are kept, rows after this prefix are dropped
+    (e.g., pending evaluations which are not pending anymore), and the factor
+    is extended by the remaining new rows. This is much cheaper than
+    recomputing the factor from scratch, which is the common case when
+    fantasy samples are added for pending evaluations, or new data arrives
+    between two refits of the parameters. Counts are maintained in
+    :attr:`num_incremental_updates` and :attr:`num_full_updates`.
     """
 
     def __init__(
@@ -72,6 +95,164 @@ class GaussianProcessRegression(GaussianProcessOptimizeModel):
         self._likelihood = GaussianProcessMarginalLikelihood(
             kernel=kernel, mean=mean, initial_noise_variance=initial_noise_variance
         )
+        self._params_for_states = None
+        self.num_incremental_updates = 0
+        self.num_full_updates = 0
+        self.reset_params()
+
+    @property
+    def likelihood(self) -> MarginalLikelihood:
+        return self._likelihood
+
+    def recompute_states(self, data: dict):
+        state = self._incremental_posterior_state(data)
+        if state is None:
+            self._recompute_states(data)
+        else:
+            self._states = [state]
+            self.num_incremental_updates += 1
+
+    def _recompute_states(self, data: dict):
+        super()._recompute_states(data)
+        self._params_for_states = self.get_params()
+        self.num_full_updates += 1
+
+    def _params_unchanged(self) -> bool:
+        if self._params_for_states is None:
+            return False
+        params = self.get_params()
+        return params.keys() == self._params_for_states.keys() and all(
+            np.array_equal(v, self._params_for_states[k]) for k, v in params.items()
+        )
+
+    def _incremental_posterior_state(
+        self, data: dict
+    ) -> Optional[GaussProcPosteriorState]:
+        """
+        Computes the new posterior state by extending the Cholesky factor of
+        the current state, see class docstring. Returns None if this is not
+        possible, in which case the state has to be computed from scratch.
+        """
+        if (
+            type(self._likelihood) is not GaussianProcessMarginalLikelihood
+            or self._states is None
+            or not self._params_unchanged()
+        ):
+            return None
+        state = self._states[0]
+        if type(state) is not GaussProcPosteriorState:
+            return None
+        self._likelihood.assert_data_entries(data)
+        features, targets = data["features"], data["targets"]
+        features_old, chol_fact = state.features, state.chol_fact
+        num_common = min(features.shape[0], features_old.shape[0])
+        if features.shape[1] != features_old.shape[1] or num_common == 0:
+            return None
+        differs = np.any(features[:num_common] != features_old[:num_common], axis=1)
+        if np.any(differs):
+            num_common = int(np.argmax(differs))
+            if num_common == 0:
+                return None
+        if not self._no_jitter_added(state):
+            # The full computation added jitter to the noise variance. The
+            # extended factor would be inconsistent with that
+            return None
+        chol_fact = chol_fact[:num_common, :num_common]
+        if num_common < features.shape[0]:
+            try:
+                chol_fact = cholesky_block_update(
+                    features=features[:num_common],
+                    kernel=state.kernel,
+                    chol_fact=chol_fact,
+                    noise_variance=state.noise_variance,
+                    features_new=features[num_common:],
+                )
+            except np.linalg.LinAlgError:
+                return None
+        centered_y = targets - np.reshape(state.mean(features), (-1, 1))
+        pred_mat = spl.solve_triangular(chol_fact, centered_y, lower=True)
+        return GaussProcPosteriorState(
+            features=np.array(features, copy=True),
+            targets=None,
+            mean=state.mean,
+            kernel=state.kernel,
+            noise_variance=state.noise_variance,
+            chol_fact=chol_fact,
+            pred_mat=pred_mat,
+        )
+
+    @staticmethod
+    def _no_jitter_added(state: GaussProcPosteriorState) -> bool:
+        """
+        Jitter is added to the noise variance (same for all diagonal entries)
+        only if the Cholesky factorization fails otherwise. Its smallest
+        value is ``NOISE_VARIANCE_LOWER_BOUND * max(mean(diag(K)), 1)``, see
+        :func:`~syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.custom_op.AddJitterOp`.
+        """
+        kernel, covariance_scale = _extract_kernel_and_scale(state.kernel)
+        kernel_diag = np.reshape(kernel.diagonal(state.features), (-1,))
+        kernel_diag = kernel_diag * np.reshape(covariance_scale, ())
+        jitter = (
+            state.chol_fact[0, 0] ** 2
+            - kernel_diag[0]
+            - np.reshape(state.noise_variance, ())
+        )
+        threshold = 0.5 * NOISE_VARIANCE_LOWER_BOUND * max(np.mean(kernel_diag), 1.0)
+        return jitter < threshold
+
+
+class SparseGaussianProcessRegression(GaussianProcessOptimizeModel):
+    """
+    Sparse Gaussian Process Regression, based on inducing inputs
+
+    Same as :class:`GaussianProcessRegression`, but the exact marginal
+    likelihood and posterior are replaced by a sparse approximation (VFE or
+    FITC), see
+    :class:`~syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.likelihood.SparseGaussianProcessMarginalLikelihood`.
+    Fitting parameters and computing the posterior state scale as O(n m^2),
+    predictions as O(m^2) per test input, where n is the number of
+    observations and m = ``num_inducing_points``. This is useful if the
+    number of observations is large. As long as ``n <= num_inducing_points``,
+    the model coincides with :class:`GaussianProcessRegression`.
+
+    :param kernel: Kernel function
+    :param mean: Mean function (which depends on X only)
+    :param initial_noise_variance: Initial value for noise variance parameter
+    :param optimization_config: Configuration that specifies the behavior of
+        the optimization of the marginal likelihood.
+    :param random_seed: Random seed to be used (optional)
+    :param fit_reset_params: Reset parameters to initial values before running
+        'fit'? If False, 'fit' starts from the current values
+    :param num_inducing_points: Number of inducing inputs
+    :param approximation: Sparse approximation, "vfe" or "fitc". Defaults to
+        "vfe"
+    """
+
+    def __init__(
+        self,
+        kernel: KernelFunction,
+        mean: Optional[MeanFunction] = None,
+        initial_noise_variance: Optional[float] = None,
+        optimization_config: Optional[OptimizationConfig] = None,
+        random_seed=None,
+        fit_reset_params: bool = True,
+        num_inducing_points: int = DEFAULT_NUM_INDUCING_POINTS,
+        approximation: str = "vfe",
+    ):
+        super().__init__(
+            optimization_config=optimization_config,
+            random_seed=random_seed,
+            fit_reset_params=fit_reset_params,
+        )
+        if mean is None:
+            mean = ScalarMeanFunction()
+        self._likelihood = SparseGaussianProcessMarginalLikelihood(
+            kernel=kernel,
+            mean=mean,
+            initial_noise_variance=initial_noise_variance,
+            num_inducing_points=num_inducing_points,
+            approximation=approximation,
+        )
         self.reset_params()
 
     @property
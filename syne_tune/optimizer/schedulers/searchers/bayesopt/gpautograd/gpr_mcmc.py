@@ -11,9 +11,11 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 from typing import Callable, Optional, List
+import numpy as np
 import autograd.numpy as anp
 from autograd.builtins import isinstance
 from numpy.random import RandomState
+import scipy.linalg as spl
 
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.constants import (
     DEFAULT_MCMC_CONFIG,
@@ -42,19 +44,39 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_stat
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.slice import (
     SliceSampler,
+    BatchSliceSampler,
 )
 from syne_tune.optimizer.schedulers.utils.simple_profiler import SimpleProfiler
 
 
 class GPRegressionMCMC(GaussianProcessModel):
+    """
+    Gaussian process regression model, where hyperparameters are integrated
+    out by slice sampling (MCMC).
+
+    If ``batch_sampling == True``, we use
+    :class:`~syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.slice.BatchSliceSampler`,
+    where several evaluations of the log posterior density are done together,
+    computing Cholesky decompositions for stacked covariance matrices. Each
+    evaluation also requires a single Cholesky decomposition only. Samples
+    are the same as with the default sampler (up to round-off errors).
+
+    :param build_kernel: Creates kernel function
+    :param mcmc_config: Configuration of MCMC sampler
+    :param random_seed: Random seed
+    :param batch_sampling: See above. Defaults to ``True``
+    """
+
     def __init__(
         self,
         build_kernel: Callable[[], KernelFunction],
         mcmc_config: MCMCConfig = DEFAULT_MCMC_CONFIG,
         random_seed=None,
+        batch_sampling: bool = True,
     ):
         super().__init__(random_seed)
         self.mcmc_config = mcmc_config
+        self.batch_sampling = batch_sampling
         self.likelihood = _create_likelihood(
             build_kernel, random_state=self._random_state
         )
@@ -94,11 +116,41 @@ class GPRegressionMCMC(GaussianProcessModel):
             )
             return -neg_log
 
-        slice_sampler = SliceSampler(
-            log_density=_log_posterior_density,
-            scale=1.0,
-            random_state=self._random_state,
-        )
+        def _log_posterior_density_batch(hp_values_batch: np.ndarray) -> np.ndarray:
+            log_densities = np.full(hp_values_batch.shape[0], -np.inf)
+            feasible = [
+                pos
+                for pos, hp_values in enumerate(hp_values_batch)
+                if self._is_feasible(hp_values)
+            ]
+            if feasible:
+                values = _log_posterior_density_stacked(
+                    [hp_values_batch[pos] for pos in feasible],
+                    self.likelihood,
+                    features,
+                    targets,
+                )
+                if values is None:
+                    # Cholesky decomposition failed for some of the covariance
+                    # matrices: Fall back to evaluations which add jitter
+                    values = [
+                        _log_posterior_density(hp_values_batch[pos]) for pos in feasible
+                    ]
+                log_densities[feasible] = values
+            return log_densities
+
+        if self.batch_sampling:
+            slice_sampler = BatchSliceSampler(
+                log_density_batch=_log_posterior_density_batch,
+                scale=1.0,
+                random_state=self._random_state,
+            )
+        else:
+            slice_sampler = SliceSampler(
+                log_density=_log_posterior_density,
+                scale=1.0,
+                random_state=self._random_state,
+            )
         init_hp_values = _get_gp_hps(self.likelihood)
 
         self.samples = slice_sampler.sample(
@@ -196,6 +248,58 @@ def _set_gp_hps(
         pos += dim
 
 
+def _log_posterior_density_stacked(
+    hp_values_list: List[np.ndarray],
+    likelihood: GaussianProcessMarginalLikelihood,
+    features: np.ndarray,
+    targets: np.ndarray,
+) -> Optional[np.ndarray]:
+    """
+    Computes log posterior densities (negative marginal likelihood criterion
+    plus hyperpriors) for a list of hyperparameter vectors. The Cholesky
+    decompositions are done for the stack of covariance matrices. If any of
+    them fails, None is returned. Different from
+    :func:`~syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_utils.cholesky_computations`,
+    no jitter is added in this case.
+
+    :param hp_values_list: Hyperparameter vectors (must be feasible)
+    :param likelihood: Likelihood object, its parameters are overwritten
+    :param features: Input features
+    :param targets: Targets (single column)
+    :return: Vector of log posterior densities, or None
+    """
+    num_data = features.shape[0]
+    sys_mats, centered_targets, regularizers = [], [], []
+    for hp_values in hp_values_list:
+        _set_gp_hps(hp_values, likelihood)
+        sys_mat = likelihood.kernel(features, features)
+        sys_mat[np.diag_indices(num_data)] += likelihood.get_noise_variance()
+        sys_mats.append(sys_mat)
+        centered_targets.append(
+            targets.reshape((-1,)) - likelihood.mean(features).reshape((-1,))
+        )
+        regularizer = 0.0
+        for param_int, encoding in likelihood.param_encoding_pairs():
+            if encoding.regularizer is not None:
+                param = encode_unwrap_parameter(param_int, encoding)
+                regularizer = regularizer + encoding.regularizer(param)
+        regularizers.append(regularizer)
+    try:
+        chol_facts = np.linalg.cholesky(np.stack(sys_mats))
+    except np.linalg.LinAlgError:
+        return None
+    result = []
+    for chol_fact, centered_y, regularizer in zip(
+        chol_facts, centered_targets, regularizers
+    ):
+        pred_mat = spl.solve_triangular(chol_fact, centered_y, lower=True)
+        logdet_cholfact = 2.0 * np.sum(np.log(np.abs(np.diag(chol_fact))))
+        neg_log = 0.5 * (num_data * np.log(2 * np.pi) + logdet_cholfact)
+        neg_log += 0.5 * np.sum(np.square(pred_mat))
+        result.append(-(neg_log + np.sum(regularizer)))
+    return np.array(result)
+
+
 def _create_likelihood(
     build_kernel, random_state: RandomState
 ) -> GaussianProcessMarginalLikelihood:
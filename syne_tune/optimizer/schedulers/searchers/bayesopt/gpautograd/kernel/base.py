@@ -38,6 +38,18 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.mean import (
 )
 
 
+def _cast_to_dtype_of(param, X):
+    """
+    Kernel parameters are float64. If inputs ``X`` are float32 (reduced
+    precision prediction), parameters are cast down, so that the kernel
+    matrix is float32 as well.
+    """
+    if X.dtype == anp.float32 and not isinstance(param, float):
+        return param.astype(anp.float32)
+    else:
+        return param
+
+
 class KernelFunction(MeanFunction):
     """
     Base class of kernel (or covariance) function math:``k(x, x')``
@@ -137,7 +149,9 @@ class SquaredDistance(Block):
         """
         # In case inverse_bandwidths if of size (1, dimension), dimension>1,
         # ARD is handled by broadcasting
-        inverse_bandwidths = anp.reshape(self._inverse_bandwidths(), (1, -1))
+        inverse_bandwidths = _cast_to_dtype_of(
+            anp.reshape(self._inverse_bandwidths(), (1, -1)), X1
+        )
 
         if X2 is X1:
             X1_scaled = anp.multiply(X1, inverse_bandwidths)
@@ -242,7 +256,7 @@ class Matern52(KernelFunction):
         :param X1: input matrix, shape ``(n1,d)``
         :param X2: input matrix, shape ``(n2,d)``
         """
-        covariance_scale = self._covariance_scale()
+        covariance_scale = _cast_to_dtype_of(self._covariance_scale(), X1)
         X1 = self._check_input_shape(X1)
         if X2 is not X1:
             X2 = self._check_input_shape(X2)
@@ -257,9 +271,9 @@ class Matern52(KernelFunction):
 
     def diagonal(self, X):
         X = self._check_input_shape(X)
-        covariance_scale = self._covariance_scale()
+        covariance_scale = _cast_to_dtype_of(self._covariance_scale(), X)
         covariance_scale_times_ones = anp.multiply(
-            anp.ones((getval(X.shape[0]), 1)), covariance_scale
+            anp.ones((getval(X.shape[0]), 1), dtype=X.dtype), covariance_scale
         )
 
         return anp.reshape(covariance_scale_times_ones, (-1,))
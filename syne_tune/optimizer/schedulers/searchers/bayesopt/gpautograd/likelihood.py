@@ -20,6 +20,7 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.constants impo
     NOISE_VARIANCE_LOWER_BOUND,
     NOISE_VARIANCE_UPPER_BOUND,
     DEFAULT_ENCODING,
+    DEFAULT_NUM_INDUCING_POINTS,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.distribution import (
     Gamma,
@@ -40,6 +41,10 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.mean import (
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_state import (
     PosteriorState,
     GaussProcPosteriorState,
+    SparseGaussProcPosteriorState,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_utils import (
+    select_inducing_points,
 )
 from syne_tune.optimizer.schedulers.utils.simple_profiler import (
     SimpleProfiler,
@@ -240,3 +245,81 @@ class GaussianProcessMarginalLikelihood(MarginalLikelihood):
         ), "targets cannot be a matrix if parameters are to be fit"
         if isinstance(self.mean, ScalarMeanFunction):
             self.mean.set_mean_value(anp.mean(targets))
+
+
+class SparseGaussianProcessMarginalLikelihood(GaussianProcessMarginalLikelihood):
+    """
+    Sparse approximation of the marginal likelihood of a Gaussian process
+    with Gaussian likelihood, based on inducing inputs. The inducing inputs
+    are a subset of the training inputs of size ``num_inducing_points``,
+    selected by
+    :func:`~syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_utils.select_inducing_points`.
+    They are chosen in :meth:`data_precomputations` and stored in
+    ``data["inducing_features"]``, so they remain fixed while parameters are
+    fit. Computations scale as O(n m^2) instead of O(n^3), where n is the
+    number of training inputs, m the number of inducing inputs. If
+    ``n <= num_inducing_points``, the exact marginal likelihood is used.
+
+    :param kernel: Kernel function
+    :param mean: Mean function which depends on the input X only (by default,
+        a scalar fitted while optimizing the likelihood)
+    :param initial_noise_variance: A scalar to initialize the value of the
+        residual noise variance
+    :param num_inducing_points: Number of inducing inputs
+    :param approximation: Sparse approximation, "vfe" (variational free
+        energy, Titsias) or "fitc" (fully independent training conditional,
+        Snelson & Ghahramani). Defaults to "vfe"
+    """
+
+    def __init__(
+        self,
+        kernel: KernelFunction,
+        mean: Optional[MeanFunction] = None,
+        initial_noise_variance=None,
+        encoding_type=None,
+        num_inducing_points: int = DEFAULT_NUM_INDUCING_POINTS,
+        approximation: str = "vfe",
+        **kwargs,
+    ):
+        super(SparseGaussianProcessMarginalLikelihood, self).__init__(
+            kernel=kernel,
+            mean=mean,
+            initial_noise_variance=initial_noise_variance,
+            encoding_type=encoding_type,
+            **kwargs,
+        )
+        assert num_inducing_points >= 1, "num_inducing_points must be positive"
+        assert approximation in (
+            "vfe",
+            "fitc",
+        ), f"approximation = '{approximation}' not supported (use 'vfe' or 'fitc')"
+        self.num_inducing_points = num_inducing_points
+        self.approximation = approximation
+
+    def data_precomputations(self, data: dict, overwrite: bool = False):
+        if overwrite or "inducing_features" not in data:
+            self.assert_data_entries(data)
+            data["inducing_features"] = select_inducing_points(
+                features=data["features"],
+                targets=data["targets"],
+                num_inducing_points=self.num_inducing_points,
+            )
+
+    def get_posterior_state(self, data: dict) -> PosteriorState:
+        self.assert_data_entries(data)
+        if data["features"].shape[0] <= self.num_inducing_points:
+            return super().get_posterior_state(data)
+        self.data_precomputations(data)
+        return SparseGaussProcPosteriorState(
+            features=data["features"],
+            targets=data["targets"],
+            inducing_features=data["inducing_features"],
+            mean=self.mean,
+            kernel=self.kernel,
+            noise_variance=self._noise_variance(),
+            approximation=self.approximation,
+        )
+
+    def on_fit_start(self, data: dict, profiler: Optional[SimpleProfiler] = None):
+        super().on_fit_start(data, profiler)
+        self.data_precomputations(data, overwrite=True)
@@ -10,6 +10,11 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+import pickle
+import threading
+import weakref
 import numpy as np
 from scipy import optimize
 from autograd import value_and_grad
@@ -31,6 +36,8 @@ logger = logging.getLogger(__name__)
 __all__ = [
     "apply_lbfgs",
     "apply_lbfgs_with_multiple_starts",
+    "apply_lbfgs_with_multiple_starts_parallel",
+    "ParallelRestartsPool",
     "add_regularizer_to_criterion",
     "create_lbfgs_arguments",
 ]
@@ -87,7 +94,7 @@ def _apply_lbfgs_internal(
     param_converter: ParamVecDictConverter,
     param_numpy_array,
     param_bounds,
-    **kwargs
+    **kwargs,
 ):
     # Run L-BFGS-B
     LBFGS_tol = kwargs.get("tol", default_LBFGS_tol)
@@ -302,6 +309,197 @@ def apply_lbfgs_with_multiple_starts(
     return ret_infos
 
 
+class ParallelRestartsPool:
+    """
+    Pool of workers used by :func:`apply_lbfgs_with_multiple_starts_parallel`.
+    The pool is started when first used, and kept alive until :meth:`close` is
+    called (or the object is garbage collected), so that workers are not
+    started anew for every fit.
+
+    Copies of the pool made by ``copy.deepcopy`` (e.g., when a model is copied
+    for fitting in a background thread) share the same workers. Workers are
+    not pickled.
+
+    With ``parallel_backend == "process"``, workers are started with the
+    default start method of ``multiprocessing``. If this is "spawn" (default
+    on Windows and MacOS), the tuning script must protect its entry point with
+    ``if __name__ == "__main__":``. The "process" backend must not be used
+    if fitting runs in a background thread, since processes would be forked
+    from a multi-threaded process.
+
+    :param num_workers: Number of workers
+    :param parallel_backend: "process" or "thread"
+    """
+
+    def __init__(self, num_workers: int, parallel_backend: str = "process"):
+        assert num_workers >= 1, f"num_workers = {num_workers} must be positive"
+        assert parallel_backend in (
+            "process",
+            "thread",
+        ), f"parallel_backend = {parallel_backend} not supported"
+        self.num_workers = num_workers
+        self.parallel_backend = parallel_backend
+        self._lock = threading.Lock()
+        self._executor = None
+        self._finalizer = None
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.parallel_backend == "process":
+                    executor = ProcessPoolExecutor(max_workers=self.num_workers)
+                else:
+                    executor = ThreadPoolExecutor(max_workers=self.num_workers)
+                self._executor = executor
+                self._finalizer = weakref.finalize(self, executor.shutdown, False)
+            return self._executor
+
+    def close(self):
+        """
+        Shuts down the workers. The pool can still be used afterwards, in which
+        case new workers are started.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._finalizer.detach()
+                self._executor.shutdown(wait=True)
+                self._executor = None
+                self._finalizer = None
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("_lock", "_executor", "_finalizer"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._finalizer = None
+
+
+def _apply_lbfgs_single_start(
+    criterion_pickled: bytes,
+    crit_args: list,
+    start_params: dict,
+    bounds: dict,
+    verbose: bool,
+    kwargs: dict,
+):
+    # Runs in a worker, which works on its own copy of ``criterion``
+    criterion = pickle.loads(criterion_pickled)
+    exec_func, param_dict = create_lbfgs_arguments(criterion, crit_args, verbose)
+    for name, value in start_params.items():
+        param_dict[name].set_data(value)
+    decorator = ExecutorDecorator(exec_func)
+    ret_info = apply_lbfgs(decorator.exec_func, param_dict, bounds, **kwargs)
+    final_params = {name: param.data() for name, param in param_dict.items()}
+    return ret_info, decorator.best_objective, final_params
+
+
+def apply_lbfgs_with_multiple_starts_parallel(
+    criterion: MarginalLikelihood,
+    crit_args: list,
+    bounds: dict,
+    random_state,
+    n_starts: int = N_STARTS,
+    num_workers: int = 2,
+    parallel_backend: str = "process",
+    verbose: bool = False,
+    pool: Optional[ParallelRestartsPool] = None,
+    **kwargs,
+):
+    """
+    Variant of :func:`apply_lbfgs_with_multiple_starts`, where the restarts
+    are run in parallel, using a pool of ``num_workers`` processes or threads
+    (``parallel_backend`` is "process" or "thread"). Each restart works on its
+    own copy of ``criterion``, which is serialized only once. Since the
+    autograd code is dominated by Python overhead unless the dataset is large,
+    "process" is usually faster. If this function is called repeatedly, pass
+    a :class:`ParallelRestartsPool` as ``pool``, so that workers are started
+    only once. Otherwise, a pool is created and shut down for this call.
+
+    All starting points are drawn upfront from ``random_state``, in the same
+    order as in :func:`apply_lbfgs_with_multiple_starts`, and the best restart
+    is selected in the same way. Results are therefore the same as for the
+    serial variant, independent of ``num_workers``. The parameters of
+    ``criterion`` are set to the best solution found (they are not modified
+    if all restarts failed).
+
+    :param criterion: Learning criterion
+    :param crit_args: Arguments for ``criterion.forward``
+    :param bounds: see :func:`apply_lbfgs`
+    :param random_state: RandomState for sampling
+    :param n_starts: Number of times we start an optimization with L-BFGS
+        (must be >= 1)
+    :param num_workers: Number of workers in the pool
+    :param parallel_backend: "process" or "thread"
+    :param verbose: See :func:`create_lbfgs_arguments`
+    :param pool: Pool of workers to be used, optional. If given,
+        ``num_workers`` and ``parallel_backend`` are ignored
+    :return: List ret_infos of length n_starts. Entry is None if optimization
+        worked, or otherwise has dict with info about exception caught
+    """
+    assert n_starts >= 1
+    param_dict = {param.name: param for param in criterion.collect_params().values()}
+    copy_of_initial_param_dict = _deep_copy_param_dict(param_dict)
+    # Draw starting points in the same order as the serial variant
+    start_param_dict = _deep_copy_param_dict(param_dict)
+    all_start_params = []
+    for iter in range(n_starts):
+        if iter > 0:
+            _inplace_param_dict_randomization(
+                start_param_dict, copy_of_initial_param_dict, bounds, random_state
+            )
+        all_start_params.append(
+            {name: param.data().copy() for name, param in start_param_dict.items()}
+        )
+
+    if pool is None:
+        temporary_pool = ParallelRestartsPool(num_workers, parallel_backend)
+    else:
+        temporary_pool = None
+    try:
+        executor = (pool or temporary_pool).executor
+        criterion_pickled = pickle.dumps(criterion)
+        futures = [
+            executor.submit(
+                _apply_lbfgs_single_start,
+                criterion_pickled,
+                crit_args,
+                start_params,
+                bounds,
+                verbose,
+                kwargs,
+            )
+            for start_params in all_start_params
+        ]
+        results = [future.result() for future in futures]
+    finally:
+        if temporary_pool is not None:
+            temporary_pool.close()
+
+    ret_infos = []
+    best_objective_over_restarts = None
+    best_params_over_restarts = all_start_params[0]
+    for ret_info, best_objective, final_params in results:
+        ret_infos.append(ret_info)
+        if ret_info is None and (
+            best_objective_over_restarts is None
+            or best_objective < best_objective_over_restarts
+        ):
+            best_objective_over_restarts = best_objective
+            best_params_over_restarts = final_params
+    for name, param in param_dict.items():
+        param.set_data(best_params_over_restarts[name])
+    return ret_infos
+
+
 def add_regularizer_to_criterion(criterion: MarginalLikelihood, crit_args: list):
     objective_nd = criterion(*crit_args)
     # Add neg log hyperpriors, whenever some are defined
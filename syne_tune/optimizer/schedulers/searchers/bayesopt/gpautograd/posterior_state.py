@@ -11,30 +11,86 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 import numpy as np
+import scipy.linalg as spl
 import autograd.numpy as anp
 from autograd import grad
 from autograd.tracer import getval
-from typing import Tuple, Optional, Dict, Callable
+from typing import Tuple, Optional, Dict, Callable, List
 from numpy.random import RandomState
 
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.constants import (
+    MIN_POSTERIOR_VARIANCE_FLOAT32,
+    MAX_CHOLESKY_DIAGONAL_RATIO_FLOAT32,
+)
+
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.kernel import (
     KernelFunction,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.mean import (
     MeanFunction,
 )
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.prediction_cache import (
+    PredictionCache,
+)
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_utils import (
     cholesky_computations,
     predict_posterior_marginals,
+    predict_posterior_marginals_and_linv,
+    backward_gradient_posterior_marginals,
     sample_posterior_marginals,
     sample_posterior_joint,
     cholesky_update,
     negative_log_marginal_likelihood,
     sample_and_cholesky_update,
     KernelFunctionWithCovarianceScale,
+    sparse_cholesky_computations,
+    sparse_predict_posterior_marginals,
+    sparse_sample_posterior_joint,
+    sample_marginals_given_mean_and_variance,
 )
 
 
+def _state_kwargs_as_float32(
+    state_kwargs: dict, chol_fact_names: List[str]
+) -> Optional[dict]:
+    """
+    Casts matrices of a posterior state (as returned by ``_state_kwargs``) to
+    float32, for reduced precision prediction. We return None if a Cholesky
+    factor in ``chol_fact_names`` is too ill-conditioned for triangular solves
+    to be accurate in float32. This is checked cheaply via the ratio between
+    largest and smallest diagonal entry, which is a lower bound on the
+    condition number.
+    """
+    for name in chol_fact_names:
+        diag = np.abs(np.diag(state_kwargs[name]))
+        if np.max(diag) > MAX_CHOLESKY_DIAGONAL_RATIO_FLOAT32 * np.min(diag):
+            return None
+    result = dict()
+    for name, value in state_kwargs.items():
+        if isinstance(value, np.ndarray):
+            value = value.astype(np.float32)
+        elif isinstance(value, tuple):
+            value = (value[0], value[1].astype(np.float32))
+        result[name] = value
+    return result
+
+
+def _predict_float32(
+    predict_func: Callable[..., Tuple[np.ndarray, np.ndarray]],
+    state_kwargs: Optional[dict],
+    test_features: np.ndarray,
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    if state_kwargs is None:
+        return None
+    kwargs = dict(
+        state_kwargs,
+        test_features=test_features,
+        min_posterior_variance=MIN_POSTERIOR_VARIANCE_FLOAT32,
+    )
+    means, variances = predict_func(**kwargs)
+    return means.astype(np.float64), variances.astype(np.float64)
+
+
 class PosteriorState:
     """
     Interface for posterior state of Gaussian-linear model.
@@ -63,6 +119,10 @@ class PosteriorState:
         Computes marginal statistics (means, variances) for a number of test
         features.
 
+        If ``test_features`` is float32, subclasses may compute predictions in
+        reduced precision, which is faster for many test features. Results are
+        float64 in any case.
+
         :param test_features: Features for test configs
         :return: posterior_means, posterior_variances
         """
@@ -176,6 +236,9 @@ class GaussProcPosteriorState(PosteriorStateWithSampleJoint):
             self.features = features
             self.chol_fact = kwargs["chol_fact"]
             self.pred_mat = kwargs["pred_mat"]
+        # Intermediates of ``predict``, reused in ``backward_gradient``. Since
+        # the state is immutable, the cache is never invalidated
+        self.prediction_cache = PredictionCache()
 
     @staticmethod
     def _check_and_assign_kernel(kernel: KernelFunctionWithCovarianceScale):
@@ -216,10 +279,48 @@ class GaussProcPosteriorState(PosteriorStateWithSampleJoint):
         critval = negative_log_marginal_likelihood(self.chol_fact, self.pred_mat)
         return critval
 
+    def _state_kwargs_float32(self) -> Optional[dict]:
+        if not hasattr(self, "_float32_state_kwargs"):
+            self._float32_state_kwargs = _state_kwargs_as_float32(
+                self._state_kwargs(), chol_fact_names=["chol_fact"]
+            )
+        return self._float32_state_kwargs
+
     def predict(self, test_features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        return predict_posterior_marginals(
-            **self._state_kwargs(), test_features=test_features
-        )
+        if test_features.dtype == np.float32:
+            result = _predict_float32(
+                predict_posterior_marginals,
+                self._state_kwargs_float32(),
+                test_features,
+            )
+            if result is not None:
+                return result
+            test_features = test_features.astype(np.float64)
+        if type(test_features) is not np.ndarray:
+            # Called inside autograd (e.g., ``backward_gradient_given_predict``)
+            return predict_posterior_marginals(
+                **self._state_kwargs(), test_features=test_features
+            )
+        means, variances, _ = self._predict_and_linv(test_features)
+        return means, variances
+
+    def _predict_and_linv(
+        self, test_features: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        result = self.prediction_cache.get(test_features)
+        if result is None:
+            result = predict_posterior_marginals_and_linv(
+                **self._state_kwargs(), test_features=test_features
+            )
+            self.prediction_cache.put(test_features, result)
+        return result
+
+    def _pred_mat_backsolved(self) -> np.ndarray:
+        if not hasattr(self, "_alpha"):
+            self._alpha = spl.solve_triangular(
+                self.chol_fact, self.pred_mat, lower=True, trans="T"
+            )
+        return self._alpha
 
     def sample_marginals(
         self,
@@ -258,17 +359,26 @@ class GaussProcPosteriorState(PosteriorStateWithSampleJoint):
         :param std_data: Stddev used to normalize targets
         :return:
         """
-
-        def predict_func(test_feature_array):
-            return self.predict(test_feature_array)
-
-        return backward_gradient_given_predict(
-            predict_func=predict_func,
-            input=input,
+        assert (
+            "mean" in head_gradients
+        ), "Need head_gradients['mean'] for backward_gradient"
+        test_features = input if input.ndim == 2 else np.reshape(input, (1, -1))
+        test_features = test_features.astype(np.float64)
+        _, variances, linv_k_tr_te = self._predict_and_linv(test_features)
+        gradient = backward_gradient_posterior_marginals(
+            features=self.features,
+            mean=self.mean,
+            kernel=self.kernel,
+            chol_fact=self.chol_fact,
+            test_features=test_features,
+            linv_k_tr_te=linv_k_tr_te,
+            posterior_variances=variances,
+            pred_mat_backsolved=self._pred_mat_backsolved(),
             head_gradients=head_gradients,
             mean_data=mean_data,
             std_data=std_data,
         )
+        return np.reshape(gradient, input.shape)
 
     def sample_joint(
         self,
@@ -302,14 +412,21 @@ def backward_gradient_given_predict(
     the acquisition function is based on the de-normalized predictive
     distribution, which is why we need 'mean_data', 'std_data' here.
 
+    If ``input`` is a matrix of shape (n, d), the gradient for each of its
+    rows is computed in one go. This works because ``predict_func`` returns
+    marginals, so that the criterion for row i only depends on row i. In
+    this case, head gradients must have a leading dimension of size n (see
+    SurrogateModel.backward_gradient_batch).
+
     :param predict_func: Function mapping input x to mean, variance
-    :param input: Single input point x, shape (d,)
+    :param input: Single input point x, shape (d,), or input points, shape
+        (n, d)
     :param head_gradients: See SurrogateModel.backward_gradient
     :param mean_data: Mean used to normalize targets
     :param std_data: Stddev used to normalize targets
     :return:
     """
-    test_feature = np.reshape(input, (1, -1))
+    test_feature = input if input.ndim == 2 else np.reshape(input, (1, -1))
     assert "mean" in head_gradients, "Need head_gradients['mean'] for backward_gradient"
     has_std = "std" in head_gradients
 
@@ -332,6 +449,165 @@ def backward_gradient_given_predict(
     return np.reshape(test_feature_gradient(test_feature), input.shape)
 
 
+class SparseGaussProcPosteriorState(PosteriorStateWithSampleJoint):
+    """
+    Represent posterior state for sparse Gaussian process regression model,
+    based on inducing inputs (VFE or FITC approximation, see
+    :func:`~syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_utils.sparse_cholesky_computations`).
+    Computing the state scales as O(n m^2), prediction as O(m^2) per test
+    input, where n is the number of training inputs, m the number of
+    inducing inputs.
+
+    If targets has m > 1 columns, they correspond to fantasy samples. In
+    this case, :meth:`neg_log_likelihood` is not supported.
+
+    :param features: Input points X, shape (n, d)
+    :param targets: Targets Y, shape (n, m)
+    :param inducing_features: Inducing inputs Z, shape (num_inducing, d)
+    :param mean: Mean function m(X)
+    :param kernel: Kernel function k(X, X'), or tuple (see
+        :class:`GaussProcPosteriorState`)
+    :param noise_variance: Noise variance sigsq, shape (1,)
+    :param approximation: Either "vfe" or "fitc"
+    """
+
+    def __init__(
+        self,
+        features: np.ndarray,
+        targets: np.ndarray,
+        inducing_features: np.ndarray,
+        mean: MeanFunction,
+        kernel: KernelFunctionWithCovarianceScale,
+        noise_variance: np.ndarray,
+        approximation: str = "vfe",
+    ):
+        self.mean = mean
+        self.kernel = GaussProcPosteriorState._check_and_assign_kernel(kernel)
+        self.noise_variance = anp.array(noise_variance, copy=True)
+        self.approximation = approximation
+        targets_shape = getval(targets.shape)
+        targets = anp.reshape(targets, (targets_shape[0], -1))
+        (
+            self.chol_fact_uu,
+            self.chol_fact_b,
+            self.pred_mat,
+            self._neg_log_likelihood,
+        ) = sparse_cholesky_computations(
+            features=features,
+            targets=targets,
+            inducing_features=inducing_features,
+            mean=mean,
+            kernel=kernel,
+            noise_variance=noise_variance,
+            approximation=approximation,
+        )
+        self._num_data = targets_shape[0]
+        self.inducing_features = anp.array(inducing_features, copy=True)
+
+    @property
+    def num_data(self):
+        return self._num_data
+
+    @property
+    def num_features(self):
+        return self.inducing_features.shape[1]
+
+    @property
+    def num_fantasies(self):
+        return self.pred_mat.shape[1]
+
+    @property
+    def num_inducing_points(self):
+        return self.inducing_features.shape[0]
+
+    def _state_kwargs(self) -> dict:
+        return {
+            "inducing_features": self.inducing_features,
+            "mean": self.mean,
+            "kernel": self.kernel,
+            "chol_fact_uu": self.chol_fact_uu,
+            "chol_fact_b": self.chol_fact_b,
+            "pred_mat": self.pred_mat,
+        }
+
+    def neg_log_likelihood(self) -> anp.ndarray:
+        """
+        Works only if fantasy samples are not used (single targets vector).
+        For VFE, this is the negative of the variational lower bound.
+        """
+        assert (
+            self._neg_log_likelihood is not None
+        ), "Multiple target vectors are not supported"
+        return self._neg_log_likelihood
+
+    def _state_kwargs_float32(self) -> Optional[dict]:
+        if not hasattr(self, "_float32_state_kwargs"):
+            self._float32_state_kwargs = _state_kwargs_as_float32(
+                self._state_kwargs(), chol_fact_names=["chol_fact_uu", "chol_fact_b"]
+            )
+        return self._float32_state_kwargs
+
+    def predict(self, test_features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if test_features.dtype == np.float32:
+            result = _predict_float32(
+                sparse_predict_posterior_marginals,
+                self._state_kwargs_float32(),
+                test_features,
+            )
+            if result is not None:
+                return result
+            test_features = test_features.astype(np.float64)
+        return sparse_predict_posterior_marginals(
+            **self._state_kwargs(), test_features=test_features
+        )
+
+    def sample_marginals(
+        self,
+        test_features: np.ndarray,
+        num_samples: int = 1,
+        random_state: Optional[RandomState] = None,
+    ) -> np.ndarray:
+        if random_state is None:
+            random_state = np.random
+        post_means, post_vars = self.predict(test_features)
+        return sample_marginals_given_mean_and_variance(
+            post_means, post_vars, random_state=random_state, num_samples=num_samples
+        )
+
+    def backward_gradient(
+        self,
+        input: np.ndarray,
+        head_gradients: Dict[str, np.ndarray],
+        mean_data: float,
+        std_data: float,
+    ) -> np.ndarray:
+        def predict_func(test_feature_array):
+            return self.predict(test_feature_array)
+
+        return backward_gradient_given_predict(
+            predict_func=predict_func,
+            input=input,
+            head_gradients=head_gradients,
+            mean_data=mean_data,
+            std_data=std_data,
+        )
+
+    def sample_joint(
+        self,
+        test_features: np.ndarray,
+        num_samples: int = 1,
+        random_state: Optional[RandomState] = None,
+    ) -> np.ndarray:
+        if random_state is None:
+            random_state = np.random
+        return sparse_sample_posterior_joint(
+            **self._state_kwargs(),
+            test_features=test_features,
+            random_state=random_state,
+            num_samples=num_samples
+        )
+
+
 class IncrementalUpdateGPPosteriorState(GaussProcPosteriorState):
     """
     Extension of GaussProcPosteriorState which allows for incremental
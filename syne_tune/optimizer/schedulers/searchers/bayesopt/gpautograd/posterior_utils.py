@@ -10,10 +10,12 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
-from typing import Tuple, Union
+from typing import Tuple, Union, Dict
 import autograd.numpy as anp
 import autograd.scipy.linalg as aspl
 import numpy as np
+import scipy.linalg as spl
+from autograd import grad
 from autograd.builtins import isinstance
 from autograd.tracer import getval
 from numpy.random import RandomState
@@ -22,6 +24,7 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.constants impo
     NOISE_VARIANCE_LOWER_BOUND,
     MIN_POSTERIOR_VARIANCE,
     MIN_CHOLESKY_DIAGONAL_VALUE,
+    INDUCING_POINTS_JITTER,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.custom_op import (
     AddJitterOp,
@@ -96,6 +99,7 @@ def predict_posterior_marginals(
     chol_fact,
     pred_mat,
     test_features,
+    min_posterior_variance: float = MIN_POSTERIOR_VARIANCE,
 ):
     """
     Computes posterior means and variances for test_features.
@@ -110,8 +114,37 @@ def predict_posterior_marginals(
     :param chol_fact: Part L of posterior state
     :param pred_mat: Part P of posterior state
     :param test_features: Test inputs
+    :param min_posterior_variance: Lower bound on posterior variances
     :return: posterior_means, posterior_variances
     """
+    posterior_means, posterior_variances, _ = predict_posterior_marginals_and_linv(
+        features,
+        mean,
+        kernel,
+        chol_fact,
+        pred_mat,
+        test_features,
+        min_posterior_variance,
+    )
+    return posterior_means, posterior_variances
+
+
+def predict_posterior_marginals_and_linv(
+    features,
+    mean: MeanFunction,
+    kernel: KernelFunctionWithCovarianceScale,
+    chol_fact,
+    pred_mat,
+    test_features,
+    min_posterior_variance: float = MIN_POSTERIOR_VARIANCE,
+):
+    """
+    Same as :func:`predict_posterior_marginals`, but also returns
+    ``L^{-1} k(X, X_test)``, which is needed in
+    :func:`backward_gradient_posterior_marginals`.
+
+    :return: posterior_means, posterior_variances, linv_k_tr_te
+    """
     _kernel, covariance_scale = _extract_kernel_and_scale(kernel)
     k_tr_te = _kernel(features, test_features) * covariance_scale
     linv_k_tr_te = aspl.solve_triangular(chol_fact, k_tr_te, lower=True)
@@ -121,11 +154,92 @@ def predict_posterior_marginals(
     posterior_variances = _kernel.diagonal(test_features) * covariance_scale - anp.sum(
         anp.square(linv_k_tr_te), axis=0
     )
-    return posterior_means, anp.reshape(
-        anp.maximum(posterior_variances, MIN_POSTERIOR_VARIANCE), (-1,)
+    return (
+        posterior_means,
+        anp.reshape(anp.maximum(posterior_variances, min_posterior_variance), (-1,)),
+        linv_k_tr_te,
     )
 
 
+def backward_gradient_posterior_marginals(
+    features,
+    mean: MeanFunction,
+    kernel: KernelFunctionWithCovarianceScale,
+    chol_fact,
+    test_features: np.ndarray,
+    linv_k_tr_te: np.ndarray,
+    posterior_variances: np.ndarray,
+    pred_mat_backsolved: np.ndarray,
+    head_gradients: Dict[str, np.ndarray],
+    mean_data: float,
+    std_data: float,
+) -> np.ndarray:
+    """
+    Computes the gradient of
+
+        sum(head_gradients["mean"] * (means * std_data + mean_data)) +
+        sum(head_gradients["std"] * sqrt(variances) * std_data)
+
+    w.r.t. ``test_features``, where means, variances are returned by
+    :func:`predict_posterior_marginals`. Same as
+    :func:`~syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_state.backward_gradient_given_predict`
+    for this predictive distribution, but faster: ``linv_k_tr_te`` and
+    ``posterior_variances`` from :func:`predict_posterior_marginals_and_linv`
+    (for the same ``test_features``) are reused, and only kernel and mean
+    function are differentiated by autograd. With ``v = L^{-1} k``, we have
+    ``means = k^T alpha + m(X_test)``, ``alpha = L^{-T} P``, and
+    ``variances = k_diag - sum(v^2)``, whose gradient w.r.t. ``k`` is
+    ``-2 L^{-T} v``.
+
+    :param features: Training inputs
+    :param mean: Mean function
+    :param kernel: Kernel function, or tuple
+    :param chol_fact: Part L of posterior state
+    :param test_features: Test inputs, shape (n_test, d)
+    :param linv_k_tr_te: ``L^{-1} k(X, X_test)``
+    :param posterior_variances: Posterior variances (lower bounded)
+    :param pred_mat_backsolved: ``alpha = L^{-T} P``, where ``P`` is part
+        of posterior state
+    :param head_gradients: Head gradients for "mean" and (optionally) "std"
+    :param mean_data: Mean used to normalize targets
+    :param std_data: Stddev used to normalize targets
+    :return: Gradient, shape (n_test, d)
+    """
+    num_test = test_features.shape[0]
+    num_fantasies = pred_mat_backsolved.shape[1]
+    head_mean = np.reshape(head_gradients["mean"], (num_test, num_fantasies)) * std_data
+    # Cotangent for k(X, X_test), shape (n, n_test)
+    cotangent_kernel = np.matmul(pred_mat_backsolved, head_mean.T)
+    cotangent_diag = None
+    if "std" in head_gradients:
+        head_std = np.reshape(head_gradients["std"], (-1,)) * std_data
+        cotangent_diag = np.where(
+            posterior_variances > MIN_POSTERIOR_VARIANCE,
+            head_std / (2 * np.sqrt(posterior_variances)),
+            0.0,
+        )
+        cotangent_kernel -= 2 * (
+            spl.solve_triangular(chol_fact, linv_k_tr_te, lower=True, trans="T")
+            * cotangent_diag.reshape((1, -1))
+        )
+    head_mean_sum = np.sum(head_mean, axis=1)
+    _kernel, covariance_scale = _extract_kernel_and_scale(kernel)
+
+    def diff_test_features(test_features_array):
+        criterion = anp.sum(
+            _kernel(features, test_features_array) * covariance_scale * cotangent_kernel
+        ) + anp.sum(anp.reshape(mean(test_features_array), (-1,)) * head_mean_sum)
+        if cotangent_diag is not None and _kernel.diagonal_depends_on_X():
+            criterion = criterion + anp.sum(
+                _kernel.diagonal(test_features_array)
+                * covariance_scale
+                * cotangent_diag
+            )
+        return criterion
+
+    return grad(diff_test_features)(test_features)
+
+
 def sample_posterior_marginals(
     features,
     mean: MeanFunction,
@@ -153,6 +267,25 @@ def sample_posterior_marginals(
     post_means, post_vars = predict_posterior_marginals(
         features, mean, kernel, chol_fact, pred_mat, test_features
     )
+    return sample_marginals_given_mean_and_variance(
+        post_means, post_vars, random_state, num_samples
+    )
+
+
+def sample_marginals_given_mean_and_variance(
+    post_means, post_vars, random_state: RandomState, num_samples: int = 1
+):
+    """
+    Draws num_sample samples from the product of Gaussian marginals with
+    means ``post_means`` and variances ``post_vars``, as returned by
+    :func:`predict_posterior_marginals`.
+
+    :param post_means: Posterior means, shape (n_test, m)
+    :param post_vars: Posterior variances, shape (n_test,)
+    :param random_state: PRNG
+    :param num_samples: Number of samples to draw
+    :return: Samples, shape (n_test, num_samples) or (n_test, m, num_samples)
+    """
     post_means = anp.expand_dims(post_means, axis=-1)  # (n_test, m, 1)
     post_stds = anp.sqrt(anp.reshape(post_vars, (-1, 1, 1)))  # (n_test, 1, 1)
     n01_vecs = [
@@ -203,6 +336,14 @@ def sample_posterior_joint(
     posterior_cov = _kernel(test_features, test_features) * covariance_scale - anp.dot(
         anp.transpose(linv_k_tr_te), linv_k_tr_te
     )
+    return _sample_joint_given_mean_and_covariance(
+        posterior_mean, posterior_cov, random_state, num_samples
+    )
+
+
+def _sample_joint_given_mean_and_covariance(
+    posterior_mean, posterior_cov, random_state: RandomState, num_samples: int
+):
     jitter_init = anp.ones((1,)) * (1e-5)
     sys_mat = AddJitterOp(
         flatten_and_concat(posterior_cov, jitter_init),
@@ -228,6 +369,238 @@ def sample_posterior_joint(
     return samples
 
 
+def select_inducing_points(
+    features: np.ndarray,
+    targets: np.ndarray,
+    num_inducing_points: int,
+    fraction_best: float = 0.25,
+) -> np.ndarray:
+    """
+    Selects inducing inputs for a sparse Gaussian process approximation as a
+    subset of the training inputs ``features``. We start with the
+    ``fraction_best`` part of inputs with the smallest targets (first column
+    of ``targets``), so that the approximation is accurate close to the
+    incumbent. Then, we greedily add the input farthest away from all inputs
+    selected so far (farthest point sampling), which covers the input space
+    well. Selection is deterministic given the data, and stops early if all
+    remaining inputs coincide with selected ones.
+
+    :param features: Training inputs, shape (n, d)
+    :param targets: Training targets, shape (n, m) or (n,)
+    :param num_inducing_points: Maximum number of inducing inputs
+    :param fraction_best: See above. At least one input is selected this way
+    :return: Inducing inputs, shape (num_inducing, d)
+    """
+    num_data = features.shape[0]
+    if num_data <= num_inducing_points:
+        return features
+    num_best = max(int(fraction_best * num_inducing_points), 1)
+    order = np.argsort(np.reshape(targets, (num_data, -1))[:, 0], kind="stable")
+    indices = []
+    min_sqdists = np.full(num_data, np.inf)
+    for pos in range(num_inducing_points):
+        if pos < num_best:
+            next_ind = int(order[pos])
+        else:
+            next_ind = int(np.argmax(min_sqdists))
+        if min_sqdists[next_ind] <= 0:
+            if pos >= num_best:
+                break
+            continue  # Duplicate of an input selected already
+        indices.append(next_ind)
+        min_sqdists = np.minimum(
+            min_sqdists, np.sum(np.square(features - features[next_ind]), axis=1)
+        )
+    return features[indices]
+
+
+def sparse_cholesky_computations(
+    features,
+    targets,
+    inducing_features,
+    mean: MeanFunction,
+    kernel: KernelFunctionWithCovarianceScale,
+    noise_variance,
+    approximation: str = "vfe",
+):
+    """
+    Sparse Gaussian process approximation based on inducing inputs Z
+    (``inducing_features``), see
+
+        | Titsias, M.
+        | Variational Learning of Inducing Variables in Sparse Gaussian Processes
+        | AISTATS 2009
+
+    for ``approximation == "vfe"`` (variational free energy), and
+
+        | Snelson, E. and Ghahramani, Z.
+        | Sparse Gaussian Processes using Pseudo-inputs
+        | NIPS 2006
+
+    for ``approximation == "fitc"``. With ``A = L_u^{-1} k(Z, X)``, where
+    ``L_u`` is the Cholesky factor of ``k(Z, Z)``, the kernel matrix
+    ``k(X, X)`` is replaced by ``A^T A + Lambda``, ``Lambda`` diagonal. We
+    compute the posterior state {L_u, L_B, P}, where L_B is the Cholesky
+    factor of
+        B = I + A Lambda^{-1} A^T
+    and
+        L_B P = A Lambda^{-1} (Y - mean(X))
+    All computations are O(n m^2), where n is the number of training inputs,
+    m the number of inducing inputs.
+
+    :param features: Input matrix X (n, d)
+    :param targets: Target matrix Y (n, k)
+    :param inducing_features: Inducing inputs Z (m, d)
+    :param mean: Mean function
+    :param kernel: Kernel function, or tuple
+    :param noise_variance: Noise variance
+    :param approximation: Either "vfe" or "fitc"
+    :return: L_u, L_B, P, negative log marginal likelihood (the latter is
+        None if Y has more than one column)
+    """
+    assert approximation in ("vfe", "fitc"), approximation
+    _kernel, covariance_scale = _extract_kernel_and_scale(kernel)
+    kernel_mat_uu = _kernel(inducing_features, inducing_features) * covariance_scale
+    jitter_init = anp.ones((1,)) * INDUCING_POINTS_JITTER
+    sys_mat = AddJitterOp(
+        flatten_and_concat(kernel_mat_uu, jitter_init),
+        initial_jitter_factor=NOISE_VARIANCE_LOWER_BOUND,
+    )
+    chol_fact_uu = cholesky_factorization(sys_mat)
+    kernel_mat_uf = _kernel(inducing_features, features) * covariance_scale
+    amat = aspl.solve_triangular(chol_fact_uu, kernel_mat_uf, lower=True)
+    # Diagonal of k(X, X) - A^T A
+    residual_diag = _kernel.diagonal(features) * covariance_scale - anp.sum(
+        anp.square(amat), axis=0
+    )
+    num_data = getval(features.shape)[0]
+    noise_variance = anp.reshape(noise_variance, (1,))
+    if approximation == "fitc":
+        lambda_diag = anp.maximum(residual_diag, 0.0) + noise_variance
+    else:
+        lambda_diag = anp.ones(num_data) * noise_variance
+    inv_sqrt_lambda = anp.reshape(1.0 / anp.sqrt(lambda_diag), (1, -1))
+    amat_scaled = amat * inv_sqrt_lambda
+    num_inducing = getval(inducing_features.shape)[0]
+    chol_fact_b = cholesky_factorization(
+        anp.eye(num_inducing) + anp.matmul(amat_scaled, anp.transpose(amat_scaled))
+    )
+    centered_y = targets - anp.reshape(mean(features), (-1, 1))
+    centered_y_scaled = centered_y * anp.transpose(inv_sqrt_lambda)
+    pred_mat = aspl.solve_triangular(
+        chol_fact_b, anp.matmul(amat_scaled, centered_y_scaled), lower=True
+    )
+    if getval(targets.shape)[1] == 1:
+        neg_log_likelihood = 0.5 * (
+            num_data * anp.log(2 * anp.pi)
+            + anp.sum(anp.log(lambda_diag))
+            + 2.0 * anp.sum(anp.log(anp.abs(anp.diag(chol_fact_b))))
+            + anp.sum(anp.square(centered_y_scaled))
+            - anp.sum(anp.square(pred_mat))
+        )
+        if approximation == "vfe":
+            neg_log_likelihood = neg_log_likelihood + 0.5 * anp.sum(
+                residual_diag
+            ) / anp.reshape(noise_variance, ())
+    else:
+        neg_log_likelihood = None
+    return chol_fact_uu, chol_fact_b, pred_mat, neg_log_likelihood
+
+
+def _sparse_linv_k_tr_te(
+    inducing_features, kernel, chol_fact_uu, chol_fact_b, test_features
+):
+    _kernel, covariance_scale = _extract_kernel_and_scale(kernel)
+    k_tr_te = _kernel(inducing_features, test_features) * covariance_scale
+    luinv_k_tr_te = aspl.solve_triangular(chol_fact_uu, k_tr_te, lower=True)
+    lbinv_k_tr_te = aspl.solve_triangular(chol_fact_b, luinv_k_tr_te, lower=True)
+    return _kernel, covariance_scale, luinv_k_tr_te, lbinv_k_tr_te
+
+
+def sparse_predict_posterior_marginals(
+    inducing_features,
+    mean: MeanFunction,
+    kernel: KernelFunctionWithCovarianceScale,
+    chol_fact_uu,
+    chol_fact_b,
+    pred_mat,
+    test_features,
+    min_posterior_variance: float = MIN_POSTERIOR_VARIANCE,
+):
+    """
+    Computes posterior means and variances for test_features, given the
+    posterior state of :func:`sparse_cholesky_computations`. Same
+    conventions as :func:`predict_posterior_marginals`.
+
+    :param inducing_features: Inducing inputs
+    :param mean: Mean function
+    :param kernel: Kernel function, or tuple
+    :param chol_fact_uu: Part L_u of posterior state
+    :param chol_fact_b: Part L_B of posterior state
+    :param pred_mat: Part P of posterior state
+    :param test_features: Test inputs
+    :param min_posterior_variance: Lower bound on posterior variances
+    :return: posterior_means, posterior_variances
+    """
+    _kernel, covariance_scale, luinv_k_tr_te, lbinv_k_tr_te = _sparse_linv_k_tr_te(
+        inducing_features, kernel, chol_fact_uu, chol_fact_b, test_features
+    )
+    posterior_means = anp.matmul(anp.transpose(lbinv_k_tr_te), pred_mat) + anp.reshape(
+        mean(test_features), (-1, 1)
+    )
+    posterior_variances = (
+        _kernel.diagonal(test_features) * covariance_scale
+        - anp.sum(anp.square(luinv_k_tr_te), axis=0)
+        + anp.sum(anp.square(lbinv_k_tr_te), axis=0)
+    )
+    return posterior_means, anp.reshape(
+        anp.maximum(posterior_variances, min_posterior_variance), (-1,)
+    )
+
+
+def sparse_sample_posterior_joint(
+    inducing_features,
+    mean: MeanFunction,
+    kernel: KernelFunctionWithCovarianceScale,
+    chol_fact_uu,
+    chol_fact_b,
+    pred_mat,
+    test_features,
+    random_state: RandomState,
+    num_samples: int = 1,
+):
+    """
+    Draws num_sample samples from joint posterior distribution over inputs
+    test_features, given the posterior state of
+    :func:`sparse_cholesky_computations`. Same conventions as
+    :func:`sample_posterior_joint`.
+
+    :param inducing_features: Inducing inputs
+    :param mean: Mean function
+    :param kernel: Kernel function, or tuple
+    :param chol_fact_uu: Part L_u of posterior state
+    :param chol_fact_b: Part L_B of posterior state
+    :param pred_mat: Part P of posterior state
+    :param test_features: Test inputs
+    :param num_samples: Number of samples to draw
+    :return: Samples, shape (n_test, num_samples) or (n_test, m, num_samples)
+    """
+    _kernel, covariance_scale, luinv_k_tr_te, lbinv_k_tr_te = _sparse_linv_k_tr_te(
+        inducing_features, kernel, chol_fact_uu, chol_fact_b, test_features
+    )
+    posterior_mean = anp.matmul(anp.transpose(lbinv_k_tr_te), pred_mat) + anp.reshape(
+        mean(test_features), (-1, 1)
+    )
+    posterior_cov = (
+        _kernel(test_features, test_features) * covariance_scale
+        - anp.dot(anp.transpose(luinv_k_tr_te), luinv_k_tr_te)
+        + anp.dot(anp.transpose(lbinv_k_tr_te), lbinv_k_tr_te)
+    )
+    return _sample_joint_given_mean_and_covariance(
+        posterior_mean, posterior_cov, random_state, num_samples
+    )
+
+
 def _compute_lvec(features, chol_fact, kernel, covariance_scale, feature):
     kvec = anp.reshape(kernel(features, feature), (-1, 1)) * covariance_scale
     return anp.reshape(aspl.solve_triangular(chol_fact, kvec, lower=True), (1, -1))
@@ -293,6 +666,47 @@ def cholesky_update(
     return chol_fact_new, pred_mat_new
 
 
+def cholesky_block_update(
+    features,
+    kernel: KernelFunctionWithCovarianceScale,
+    chol_fact,
+    noise_variance,
+    features_new,
+):
+    """
+    Extends the Cholesky factor L of ``k(X, X) + noise_variance * I`` by
+    new rows ``X_new``, so that the result is the Cholesky factor of the same
+    matrix for ``X_ext = [X; X_new]``. With ``L12 = L^{-1} k(X, X_new)``, the
+    new diagonal block is the Cholesky factor of
+    ``k(X_new, X_new) + noise_variance * I - L12^T L12``. The cost is
+    ``O(n^2 n_new + n_new^3)``, compared to ``O((n + n_new)^3)`` for
+    :func:`cholesky_computations`.
+
+    In contrast to :func:`cholesky_computations`, no jitter is added. If the
+    new diagonal block is not positive definite, ``np.linalg.LinAlgError`` is
+    raised, and the caller should fall back to the full computation. This
+    function is not meant to be differentiated through.
+
+    :param features: Input matrix X (n, d)
+    :param kernel: Kernel function, or tuple
+    :param chol_fact: Cholesky factor L (n, n)
+    :param noise_variance: Noise variance
+    :param features_new: New input matrix X_new (n_new, d)
+    :return: Extended Cholesky factor (n + n_new, n + n_new)
+    """
+    _kernel, covariance_scale = _extract_kernel_and_scale(kernel)
+    num_new = getval(features_new.shape)[0]
+    k_tr_new = _kernel(features, features_new) * covariance_scale
+    lmat = aspl.solve_triangular(chol_fact, k_tr_new, lower=True)
+    schur_mat = (
+        _kernel(features_new, features_new) * covariance_scale
+        + np.reshape(noise_variance, ()) * np.eye(num_new)
+        - np.dot(lmat.T, lmat)
+    )
+    chol_new = cholesky_factorization(schur_mat)
+    return np.block([[chol_fact, np.zeros_like(lmat)], [lmat.T, chol_new]])
+
+
 # Specialized routine, used in IncrementalUpdateGPPosteriorState.
 # The idea is to share the computation of lvec between sampling a new target
 # value and incremental Cholesky update.
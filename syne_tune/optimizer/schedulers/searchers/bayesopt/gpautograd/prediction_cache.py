@@ -0,0 +1,109 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+import numpy as np
+
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.constants import (
+    PREDICTION_CACHE_MAX_SIZE,
+    PREDICTION_CACHE_MAX_BYTES,
+)
+
+
+class PredictionCache:
+    """
+    Small LRU cache for intermediates of posterior state computations,
+    keyed on test feature matrices. Within one ``get_config`` call, the
+    same test features are passed several times (e.g., ``predict`` followed
+    by ``backward_gradient`` in the local optimization of the acquisition
+    function), and intermediates like ``L^{-1} k(X, X_test)`` need only be
+    computed once.
+
+    Keys are computed from shape, dtype and content of the test features,
+    so that identical values passed in different array objects are matched
+    as well. On a hit, the content is compared against a copy stored with
+    the entry, so that hash collisions cannot lead to wrong results.
+
+    A cache belongs to a single posterior state. Since posterior states are
+    immutable (updates create a new object), the cache never has to be
+    invalidated.
+
+    :param max_size: Maximum number of entries. Defaults to
+        ``PREDICTION_CACHE_MAX_SIZE``
+    :param max_bytes: Maximum number of bytes of all entries, including the
+        copies of test features. Values larger than this are not cached.
+        Defaults to ``PREDICTION_CACHE_MAX_BYTES``
+    """
+
+    def __init__(self, max_size: Optional[int] = None, max_bytes: Optional[int] = None):
+        if max_size is None:
+            max_size = PREDICTION_CACHE_MAX_SIZE
+        if max_bytes is None:
+            max_bytes = PREDICTION_CACHE_MAX_BYTES
+        assert max_size >= 1, f"max_size = {max_size} must be positive"
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._num_bytes = 0
+        self.num_hits = 0
+        self.num_misses = 0
+
+    @staticmethod
+    def _key(features: np.ndarray) -> Tuple[Any, ...]:
+        features = np.ascontiguousarray(features)
+        return features.shape, features.dtype.str, hash(features.tobytes())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, features: np.ndarray) -> Optional[Any]:
+        """
+        :param features: Test features
+        :return: Value stored for ``features``, or None if there is none
+        """
+        key = self._key(features)
+        entry = self._entries.get(key)
+        if entry is not None and np.array_equal(entry[0], features):
+            self._entries.move_to_end(key)
+            self.num_hits += 1
+            return entry[1]
+        self.num_misses += 1
+        return None
+
+    def put(self, features: np.ndarray, value: Tuple[np.ndarray, ...]):
+        """
+        Stores ``value`` for ``features``, unless it is too large. Least
+        recently used entries are evicted until the cache is within its
+        limits.
+
+        :param features: Test features
+        :param value: Tuple of arrays to be stored
+        """
+        num_bytes = sum(v.nbytes for v in value) + features.nbytes
+        if num_bytes > self.max_bytes:
+            return
+        key = self._key(features)
+        old_entry = self._entries.pop(key, None)
+        if old_entry is not None:
+            self._num_bytes -= old_entry[2]
+        self._entries[key] = (np.array(features, copy=True), value, num_bytes)
+        self._num_bytes += num_bytes
+        while len(self._entries) > self.max_size or self._num_bytes > self.max_bytes:
+            _, evicted_entry = self._entries.popitem(last=False)
+            self._num_bytes -= evicted_entry[2]
+
+    def statistics(self) -> Tuple[int, int]:
+        """
+        :return: ``(num_hits, num_misses)``
+        """
+        return self.num_hits, self.num_misses
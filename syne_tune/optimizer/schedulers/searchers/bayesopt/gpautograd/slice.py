@@ -61,6 +61,74 @@ class SliceSampler:
         return samples[burn::thin]
 
 
+class BatchSliceSampler(SliceSampler):
+    """
+    Variant of :class:`SliceSampler`, where the log density can be evaluated
+    for several arguments at once, via ``log_density_batch``, mapping a
+    matrix of shape ``(batch_size, dimension)`` to a vector of size
+    ``batch_size``. This is faster if the evaluations share work or can be
+    vectorized (e.g., with batched Cholesky decompositions).
+
+    Candidates for lower and upper bound are evaluated together when stepping
+    out (see :func:`slice_sampler_step_out_batch`), and the log density at
+    the current sample is reused from the previous step, instead of being
+    recomputed. Apart from this, the sampler does exactly the same as
+    :class:`SliceSampler`, drawing the same random numbers, so samples are the
+    same as well.
+
+    :param log_density_batch: Batch log density, see above
+    :param scale: Initial width of slice
+    :param random_state: PRNG
+    """
+
+    def __init__(
+        self,
+        log_density_batch: Callable[[np.ndarray], np.ndarray],
+        scale: float,
+        random_state: RandomState,
+    ):
+        super().__init__(
+            log_density=lambda x: log_density_batch(x.reshape((1, -1)))[0],
+            scale=scale,
+            random_state=random_state,
+        )
+        self.log_density_batch = log_density_batch
+        self._log_density_x0 = None
+
+    def _gen_next_sample(self, x0: np.ndarray) -> np.ndarray:
+        random_direction = gen_random_direction(len(x0), self._random_state)
+        log_density_x0 = self._log_density_x0
+        if log_density_x0 is None:
+            log_density_x0 = self.log_density(x0)
+
+        def sliced_log_density_batch(_movements: np.ndarray) -> np.ndarray:
+            return self.log_density_batch(
+                x0.reshape((1, -1)) + _movements.reshape((-1, 1)) * random_direction
+            )
+
+        def sliced_log_density(_movement: float) -> float:
+            value = self.log_density(x0 + random_direction * _movement)
+            # The last value computed in ``slice_sampler_step_in`` is for the
+            # new sample
+            self._log_density_x0 = value
+            return value
+
+        log_pivot = log_density_x0 + np.log(self._random_state.rand())
+        lower_bound, upper_bound = slice_sampler_step_out_batch(
+            log_pivot, self.scale, sliced_log_density_batch, self._random_state
+        )
+        movement = slice_sampler_step_in(
+            lower_bound, upper_bound, log_pivot, sliced_log_density, self._random_state
+        )
+        return x0 + random_direction * movement
+
+    def sample(
+        self, init_sample: np.ndarray, num_samples: int, burn: int, thin: int
+    ) -> List[np.ndarray]:
+        self._log_density_x0 = None
+        return super().sample(init_sample, num_samples, burn, thin)
+
+
 def gen_random_direction(dimension: int, random_state: RandomState) -> np.ndarray:
     random_direction = random_state.randn(dimension)
     random_direction *= 1.0 / np.linalg.norm(random_direction)
@@ -95,6 +163,37 @@ def slice_sampler_step_out(
     return lower_bound, upper_bound
 
 
+def slice_sampler_step_out_batch(
+    log_pivot: float,
+    scale: float,
+    sliced_log_density_batch: Callable[[np.ndarray], np.ndarray],
+    random_state: RandomState,
+) -> Tuple[float, float]:
+    """
+    Same as :func:`slice_sampler_step_out`, but candidates for lower and upper
+    bound are evaluated together, using ``sliced_log_density_batch``, which
+    maps a vector of movements to a vector of log densities. The same
+    candidates are evaluated, and the same bounds are returned.
+    """
+    r = random_state.rand()
+    lower_bound = -r * scale
+    bounds = np.array([lower_bound, lower_bound + scale])
+    directions = np.array([-1.0, 1.0])
+    active = np.array([True, True])
+    for _ in range(MAX_STEP_OUT):
+        log_densities = sliced_log_density_batch(bounds[active])
+        still_active = log_densities > log_pivot
+        active[active] = still_active
+        if not np.any(active):
+            return bounds[0], bounds[1]
+        bounds[active] += directions[active] * scale
+    raise SliceException(
+        "Reach maximum iteration ({}) while stepping out for bound ({})".format(
+            MAX_STEP_OUT, directions[active][0]
+        )
+    )
+
+
 def slice_sampler_step_in(
     lower_bound: float,
     upper_bound: float,
@@ -10,7 +10,7 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Union, Tuple
 import numpy as np
 import logging
 from dataclasses import dataclass
@@ -26,6 +26,9 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.datatypes.common import (
     INTERNAL_METRIC_NAME,
 )
 from syne_tune.optimizer.schedulers.searchers.utils.common import ConfigurationFilter
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.constants import (
+    SUPPORTED_PREDICTION_PRECISIONS,
+)
 from syne_tune.optimizer.schedulers.searchers.bayesopt.datatypes.tuning_job_state import (
     TuningJobState,
 )
@@ -47,6 +50,8 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.hypertune.gp_m
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_state import (
     PosteriorState,
+    GaussProcPosteriorState,
+    SparseGaussProcPosteriorState,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.tuning_algorithms.base_classes import (
     SurrogateModel,
@@ -92,6 +97,10 @@ class GaussProcSurrogateModel(BaseSurrogateModel):
     :param active_metric: Name of the metric to optimize.
     :param normalize_mean: Mean used to normalize targets
     :param normalize_std: Stddev used to normalize targets
+    :param prediction_precision: Floating point precision for :meth:`predict`,
+        which is used to score many candidates. If "float32", predictions are
+        computed in single precision, which is faster. Fitting the model and
+        gradient computations always use "float64". Defaults to "float64"
     """
 
     def __init__(
@@ -104,13 +113,18 @@ class GaussProcSurrogateModel(BaseSurrogateModel):
         normalize_std: float = 1.0,
         filter_observed_data: Optional[ConfigurationFilter] = None,
         hp_ranges_for_prediction: Optional[HyperparameterRanges] = None,
+        prediction_precision: str = "float64",
     ):
         super().__init__(state, active_metric, filter_observed_data)
+        assert (
+            prediction_precision in SUPPORTED_PREDICTION_PRECISIONS
+        ), f"prediction_precision = {prediction_precision} not supported"
         self._gpmodel = gpmodel
         self.mean = normalize_mean
         self.std = normalize_std
         self.fantasy_samples = fantasy_samples
         self._hp_ranges_for_prediction = hp_ranges_for_prediction
+        self._prediction_dtype = np.dtype(prediction_precision)
 
     def hp_ranges_for_prediction(self) -> HyperparameterRanges:
         if self._hp_ranges_for_prediction is not None:
@@ -119,8 +133,18 @@ class GaussProcSurrogateModel(BaseSurrogateModel):
             return super().hp_ranges_for_prediction()
 
     def predict(self, inputs: np.ndarray) -> List[Dict[str, np.ndarray]]:
+        return self._predict(inputs, dtype=self._prediction_dtype)
+
+    def predict_full_precision(self, inputs: np.ndarray) -> List[Dict[str, np.ndarray]]:
+        return self._predict(inputs, dtype=np.float64)
+
+    def _predict(
+        self, inputs: np.ndarray, dtype: np.dtype
+    ) -> List[Dict[str, np.ndarray]]:
         predictions_list = []
-        for post_mean, post_variance in self._gpmodel.predict(inputs):
+        for post_mean, post_variance in self._gpmodel.predict(
+            inputs.astype(dtype, copy=False)
+        ):
             assert post_mean.shape[0] == inputs.shape[0], (
                 post_mean.shape,
                 inputs.shape,
@@ -152,6 +176,22 @@ class GaussProcSurrogateModel(BaseSurrogateModel):
             for poster_state, head_gradient in zip(poster_states, head_gradients)
         ]
 
+    def backward_gradient_batch(
+        self, inputs: np.ndarray, head_gradients: List[Dict[str, np.ndarray]]
+    ) -> List[np.ndarray]:
+        poster_states = self.posterior_states
+        if poster_states is not None and all(
+            isinstance(
+                poster_state,
+                (GaussProcPosteriorState, SparseGaussProcPosteriorState),
+            )
+            for poster_state in poster_states
+        ):
+            # Gradients for all inputs are computed in one go
+            return self.backward_gradient(inputs, head_gradients)
+        else:
+            return super().backward_gradient_batch(inputs, head_gradients)
+
     def does_mcmc(self):
         return isinstance(self._gpmodel, GPRegressionMCMC)
 
@@ -159,6 +199,21 @@ class GaussProcSurrogateModel(BaseSurrogateModel):
     def posterior_states(self) -> Optional[List[PosteriorState]]:
         return self._gpmodel.states
 
+    def prediction_cache_statistics(self) -> Tuple[int, int]:
+        """
+        Posterior states cache intermediates of predictions, so they can be
+        reused for the same test inputs (e.g., in ``backward_gradient``).
+
+        :return: ``(num_hits, num_misses)``, summed over posterior states
+        """
+        num_hits, num_misses = 0, 0
+        for state in self.posterior_states:
+            cache = getattr(state, "prediction_cache", None)
+            if cache is not None:
+                num_hits += cache.num_hits
+                num_misses += cache.num_misses
+        return num_hits, num_misses
+
     def _current_best_filter_candidates(self, candidates):
         candidates = super()._current_best_filter_candidates(candidates)
         hp_ranges = self.state.hp_ranges
@@ -243,6 +298,8 @@ class GaussProcModelFactory(TransformerModelFactory):
         simply ignored, fantasizing is not done (not recommended)
     :param hp_ranges_for_prediction: If given, :class:`GaussProcSurrogateModel`
         should use this instead of ``state.hp_ranges``
+    :param prediction_precision: Passed to :class:`GaussProcSurrogateModel`.
+        Defaults to "float64"
     """
 
     def __init__(
@@ -255,6 +312,7 @@ class GaussProcModelFactory(TransformerModelFactory):
         filter_observed_data: Optional[ConfigurationFilter] = None,
         no_fantasizing: bool = False,
         hp_ranges_for_prediction: Optional[HyperparameterRanges] = None,
+        prediction_precision: str = "float64",
     ):
         self._gpmodel = gpmodel
         self.active_metric = active_metric
@@ -264,6 +322,7 @@ class GaussProcModelFactory(TransformerModelFactory):
         self._filter_observed_data = filter_observed_data
         self._no_fantasizing = no_fantasizing
         self._hp_ranges_for_prediction = hp_ranges_for_prediction
+        self._prediction_precision = prediction_precision
         self._mean = None
         self._std = None
 
@@ -326,6 +385,7 @@ class GaussProcModelFactory(TransformerModelFactory):
             normalize_std=self._std,
             filter_observed_data=self._filter_observed_data,
             hp_ranges_for_prediction=self._hp_ranges_for_prediction,
+            prediction_precision=self._prediction_precision,
         )
 
     def _get_num_fantasy_samples(self) -> int:
@@ -476,6 +536,7 @@ class GaussProcEmpiricalBayesModelFactory(GaussProcModelFactory):
         filter_observed_data: Optional[ConfigurationFilter] = None,
         no_fantasizing: bool = False,
         hp_ranges_for_prediction: Optional[HyperparameterRanges] = None,
+        prediction_precision: str = "float64",
     ):
         assert num_fantasy_samples > 0
         super().__init__(
@@ -487,6 +548,7 @@ class GaussProcEmpiricalBayesModelFactory(GaussProcModelFactory):
             filter_observed_data=filter_observed_data,
             no_fantasizing=no_fantasizing,
             hp_ranges_for_prediction=hp_ranges_for_prediction,
+            prediction_precision=prediction_precision,
         )
         self.num_fantasy_samples = num_fantasy_samples
 
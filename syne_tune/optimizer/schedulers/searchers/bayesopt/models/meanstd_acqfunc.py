@@ -247,7 +247,7 @@ class MeanStdAcquisitionFunction(AcquisitionFunction):
         if isinstance(model, SurrogateModel):
             model = dictionarize_objective(model)
         output_to_predictions = self._map_outputs_to_predictions(
-            model, input.reshape(1, -1)
+            model, input.reshape(1, -1), full_precision=True
         )
         current_bests = self._get_current_bests(model)
 
@@ -304,9 +304,85 @@ class MeanStdAcquisitionFunction(AcquisitionFunction):
             gradient += output_gradient
         return fval, gradient
 
+    def compute_acq_with_gradient_batch(
+        self, inputs: np.ndarray, model: Optional[SurrogateOutputModel] = None
+    ) -> (np.ndarray, np.ndarray):
+        """
+        Predictions for all inputs are computed in one go, and so are the
+        gradients, via ``backward_gradient_batch`` of the models. Only the
+        head (and its gradients) is computed for each input separately.
+        """
+        if model is None:
+            model = self.model
+        if isinstance(model, SurrogateModel):
+            model = dictionarize_objective(model)
+        num_inputs = inputs.shape[0]
+        output_to_predictions = self._map_outputs_to_predictions(
+            model, inputs, full_precision=True
+        )
+        current_bests = self._get_current_bests(model)
+        shapes = {
+            output_name: {k: v.shape for k, v in preds_for_samples[0].items()}
+            for output_name, preds_for_samples in output_to_predictions.items()
+        }
+
+        fvals = np.zeros(num_inputs)
+        num_total = 0
+        list_values = [
+            list(enumerate(output_to_predictions[name]))
+            for name in self.model_output_names
+        ]
+        # head_gradient[output_name][pos][i]: Head gradient for input i
+        head_gradient = {
+            name: [[None] * num_inputs for _ in predictions]
+            for name, predictions in output_to_predictions.items()
+        }
+        for preds_and_pos in itertools.product(*list_values):
+            positions, predictions = zip(*preds_and_pos)
+            current_best = current_bests(positions)
+            num_total += 1
+            for i in range(num_inputs):
+                # Same shapes as in ``compute_acq_with_gradient``
+                output_to_preds = {
+                    name: {k: v[i].reshape((-1,)) for k, v in prediction.items()}
+                    for name, prediction in zip(self.model_output_names, predictions)
+                }
+                head_result = self._compute_head_and_gradient(
+                    output_to_preds, current_best
+                )
+                fvals[i] += head_result.hval
+                for output_name, pos in zip(self.model_output_names, positions):
+                    head_gradient[output_name][pos][i] = self._add_head_gradients(
+                        head_result.gradient[output_name],
+                        head_gradient[output_name][pos][i],
+                    )
+
+        fvals /= num_total
+        gradients = 0.0
+        for output_name, output_model in model.items():
+            shp = shapes[output_name]
+            head_grad = [
+                {
+                    k: np.stack([grad[k] for grad in grads_per_input]).reshape(shp[k])
+                    for k in grads_per_input[0].keys()
+                }
+                for grads_per_input in head_gradient[output_name]
+            ]
+            gradient_list = output_model.backward_gradient_batch(inputs, head_grad)
+            gradients += np.sum(gradient_list, axis=0) / num_total
+        return fvals, gradients
+
     def _map_outputs_to_predictions(
-        self, model: SurrogateOutputModel, inputs: np.ndarray
+        self,
+        model: SurrogateOutputModel,
+        inputs: np.ndarray,
+        full_precision: bool = False,
     ) -> PredictionsPerOutput:
+        if full_precision:
+            return {
+                output_name: output_model.predict_full_precision(inputs)
+                for output_name, output_model in model.items()
+            }
         return {
             output_name: output_model.predict(inputs)
             for output_name, output_model in model.items()
@@ -10,6 +10,7 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, Callable, Union
 import logging
 import copy
@@ -114,6 +115,22 @@ SkipOptimizationOutputPredicate = Union[
 ]
 
 
+def _fit_model_parameters(
+    model_factory: TransformerModelFactory, state: TuningJobState
+) -> Dict:
+    """
+    Fits model parameters of ``model_factory`` to data in ``state``. This is
+    run in a background thread (see :class:`ModelStateTransformer`), on copies
+    of factory and state.
+
+    :param model_factory: Model factory (copy)
+    :param state: Tuning job state without pending evaluations (copy)
+    :return: Fitted model parameters
+    """
+    model_factory.model(state=state, fit_params=True)
+    return model_factory.get_params()
+
+
 class ModelStateTransformer:
     """
     This class maintains the
@@ -140,10 +157,26 @@ class ModelStateTransformer:
     output names to models. In that case, the state is shared but the models for each
     output metric are updated independently.
 
+    If ``background_fitting == True``, model parameters are not fit in
+    :meth:`model`, which is on the critical path of ``get_config``. Instead,
+    whenever new observed data arrives, a refit is started in a background
+    thread, working on copies of the model factory and the observed data (only
+    one refit per output model runs at any time). :meth:`model` uses the
+    parameters of the most recently finished refit, and only recomputes the
+    posterior state, which is much faster. ``skip_optimization`` is ignored
+    in this case. The number of observations not used to fit the current
+    model parameters is returned by :meth:`model_staleness`. Note that
+    fitting in a background thread competes with the main thread for the
+    Python interpreter, but the main thread is mostly idle while waiting for
+    results. Restarts of the fitting can also be run in parallel threads
+    (see ``OptimizationConfig.num_workers``). Worker processes must not be
+    used, since they would be forked from a multi-threaded process.
+
     :param model_factory: Factory for surrogate models, given tuning job state
     :param init_state: Initial tuning job state
     :param skip_optimization: Skip optimization predicate (see above). Defaults to
         ``None`` (fitting is never skipped)
+    :param background_fitting: See above. Defaults to ``False``
     """
 
     def __init__(
@@ -151,6 +184,7 @@ class ModelStateTransformer:
         model_factory: TransformerOutputModelFactory,
         init_state: TuningJobState,
         skip_optimization: Optional[SkipOptimizationOutputPredicate] = None,
+        background_fitting: bool = False,
     ):
         self._use_single_model = False
         if isinstance(model_factory, TransformerModelFactory):
@@ -199,6 +233,15 @@ class ModelStateTransformer:
         # Observed data for which model parameters were re-fit most
         # recently, separately for each model
         self._num_evaluations = {output_name: 0 for output_name in model_factory.keys()}
+        self._background_fitting = background_fitting
+        # Background fitting: Single worker thread (created on demand), jobs
+        # currently running, and number of observed cases used to fit the
+        # current model parameters, separately for each model
+        self._fit_executor: Optional[ThreadPoolExecutor] = None
+        self._fit_jobs = dict()
+        self._num_evaluations_fitted = {
+            output_name: 0 for output_name in model_factory.keys()
+        }
 
     @property
     def state(self) -> TuningJobState:
@@ -222,6 +265,38 @@ class ModelStateTransformer:
     def skip_optimization(self) -> SkipOptimizationOutputPredicate:
         return self._unwrap_from_dict(self._skip_optimization)
 
+    @property
+    def background_fitting(self) -> bool:
+        return self._background_fitting
+
+    def model_staleness(self) -> Union[int, Dict[str, int]]:
+        """
+        :return: Number of observed cases which have not been used to fit the
+            current model parameters. Nonzero if fitting was skipped, or if
+            background fitting has not caught up with the data yet. In the
+            multi-model case, a dictionary mapping output names to these
+            numbers is returned
+        """
+        if self._background_fitting:
+            num_evaluations_fitted = self._num_evaluations_fitted
+        else:
+            num_evaluations_fitted = self._num_evaluations
+        staleness = {
+            output_name: self._state.num_observed_cases(output_name) - num_fitted
+            for output_name, num_fitted in num_evaluations_fitted.items()
+        }
+        return self._unwrap_from_dict(staleness)
+
+    def model_params_fitted(self) -> bool:
+        """
+        :return: Have parameters of all models been fit at least once?
+        """
+        if self._background_fitting:
+            num_evaluations_fitted = self._num_evaluations_fitted
+        else:
+            num_evaluations_fitted = self._num_evaluations
+        return all(x > 0 for x in num_evaluations_fitted.values())
+
     def model(self, **kwargs) -> SurrogateOutputModel:
         """
         If skip_optimization is given, it overrides the ``self._skip_optimization``
@@ -232,6 +307,8 @@ class ModelStateTransformer:
             output names to surrogate model instances for current state (shared
             across models).
         """
+        if self._background_fitting:
+            self._update_background_fitting()
         if self._model is None:
             skip_optimization = kwargs.get("skip_optimization")
             self._compute_model(skip_optimization=skip_optimization)
@@ -348,6 +425,8 @@ class ModelStateTransformer:
             else:
                 metrics[name].update(new_labels)
         self._model = None  # Invalidate
+        if self._background_fitting:
+            self._update_background_fitting()
 
     def filter_pending_evaluations(
         self, filter_pred: Callable[[PendingEvaluation], bool]
@@ -370,8 +449,65 @@ class ModelStateTransformer:
         if trial_id not in failed_trials:
             failed_trials.append(trial_id)
 
+    def _update_background_fitting(self):
+        """
+        Collects results of background refits which have finished, and starts
+        new refits for models whose observed data changed since their most
+        recent refit was started.
+        """
+        for output_name, model_factory in self._model_factory.items():
+            job = self._fit_jobs.get(output_name)
+            if job is not None:
+                future, num_evaluations = job
+                if not future.done():
+                    continue  # Refit still running
+                del self._fit_jobs[output_name]
+                try:
+                    params = future.result()
+                except Exception as ex:
+                    logger.warning(
+                        f"Background fitting of model parameters for {output_name} "
+                        f"failed with exception:\n{ex}"
+                    )
+                else:
+                    model_factory.set_params(params)
+                    self._num_evaluations_fitted[output_name] = num_evaluations
+                    self._model = None  # Invalidate
+            num_evaluations = self._state.num_observed_cases(output_name)
+            if num_evaluations > 0 and num_evaluations != self._num_evaluations.get(
+                output_name
+            ):
+                self._start_background_fitting(output_name, num_evaluations)
+
+    def _start_background_fitting(self, output_name: str, num_evaluations: int):
+        if self._fit_executor is None:
+            self._fit_executor = ThreadPoolExecutor(max_workers=1)
+        model_factory = self._model_factory[output_name]
+        # The refit works on a copy of the model factory, so the parameters
+        # used in the main thread are not modified. Debug log and profiler
+        # are not copied, but dropped (passed as ``memo``)
+        memo = {id(model_factory.debug_log): None, id(model_factory.profiler): None}
+        model_factory_copy = copy.deepcopy(model_factory, memo)
+        # Copy of observed data (pending evaluations are not used for fitting)
+        state = TuningJobState(
+            hp_ranges=self._state.hp_ranges,
+            config_for_trial=copy.deepcopy(self._state.config_for_trial),
+            trials_evaluations=copy.deepcopy(self._state.trials_evaluations),
+            failed_trials=list(self._state.failed_trials),
+        )
+        future = self._fit_executor.submit(
+            _fit_model_parameters, model_factory_copy, state
+        )
+        self._fit_jobs[output_name] = (future, num_evaluations)
+        self._num_evaluations[output_name] = num_evaluations
+
     def _compute_model(self, skip_optimization=None):
-        if skip_optimization is None:
+        if self._background_fitting:
+            # Model parameters are fit in the background
+            skip_optimization = {
+                output_name: True for output_name in self._model_factory.keys()
+            }
+        elif skip_optimization is None:
             skip_optimization = dict()
             for (
                 output_name,
@@ -380,7 +516,7 @@ class ModelStateTransformer:
                 skip_optimization[output_name] = output_skip_optimization(self._state)
         elif self._use_single_model:
             skip_optimization = dictionarize_objective(skip_optimization)
-        if self._debug_log is not None:
+        if self._debug_log is not None and not self._background_fitting:
             for output_name, skip_opt in skip_optimization.items():
                 if skip_opt:
                     logger.info(
@@ -113,6 +113,18 @@ class SurrogateModel:
         """
         raise NotImplementedError
 
+    def predict_full_precision(self, inputs: np.ndarray) -> List[Dict[str, np.ndarray]]:
+        """
+        Same as :meth:`predict`, but always computed in full (float64)
+        precision, even if :meth:`predict` uses reduced precision. This is
+        used along with :meth:`backward_gradient`, whose gradients must be
+        consistent with the predictions.
+
+        :param inputs: Input points, shape ``(n, d)``
+        :return: Same as :meth:`predict`
+        """
+        return self.predict(inputs)
+
     def hp_ranges_for_prediction(self) -> HyperparameterRanges:
         """
         :return: Feature generator to be used for ``inputs`` in :meth:`predict`
@@ -171,6 +183,35 @@ class SurrogateModel:
         """
         raise NotImplementedError
 
+    def backward_gradient_batch(
+        self, inputs: np.ndarray, head_gradients: List[Dict[str, np.ndarray]]
+    ) -> List[np.ndarray]:
+        """
+        Batch variant of :meth:`backward_gradient`, for ``n`` input points
+        :math:`x_i`. The head gradients have an additional leading dimension
+        of size ``n`` (same as statistics returned by :meth:`predict` for
+        ``inputs``). Since :math:`f(x_i)` only depends on :math:`x_i`, the
+        gradient of :math:`\sum_i f(x_i)` w.r.t. ``inputs`` is returned.
+
+        The default implementation loops over the input points. Subclasses
+        should override it if the gradients can be computed in one go.
+
+        :param inputs: Input points, shape ``(n, d)``
+        :param head_gradients: See above
+        :return: Gradients, shape ``(n, d)`` (several if MCMC is used)
+        """
+        gradients = [
+            self.backward_gradient(
+                input,
+                [{k: v[pos] for k, v in hgrad.items()} for hgrad in head_gradients],
+            )
+            for pos, input in enumerate(inputs)
+        ]
+        return [
+            np.vstack([grads[i].reshape((1, -1)) for grads in gradients])
+            for i in range(len(head_gradients))
+        ]
+
 
 # Useful type that allows for a dictionary mapping each output name to a SurrogateModel.
 # This is needed for multi-output BO methods such as constrained BO, where each output
@@ -197,6 +238,22 @@ class ScoringFunction:
         """
         raise NotImplementedError
 
+    def score_encoded(
+        self,
+        inputs: np.ndarray,
+        model: Optional[SurrogateOutputModel] = None,
+    ) -> np.ndarray:
+        """
+        Variant of :meth:`score` for candidates in encoded form, as obtained
+        from ``hp_ranges_for_prediction().to_ndarray_matrix``. Not all scoring
+        functions support this.
+
+        :param inputs: Encoded candidates, shape ``(n, d)``
+        :param model: Overrides default surrogate model
+        :return: Score values, shape ``(n,)``
+        """
+        raise NotImplementedError
+
 
 class AcquisitionFunction(ScoringFunction):
     """
@@ -240,6 +297,28 @@ class AcquisitionFunction(ScoringFunction):
         """
         raise NotImplementedError
 
+    def compute_acq_with_gradient_batch(
+        self, inputs: np.ndarray, model: Optional[SurrogateOutputModel] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batch variant of :meth:`compute_acq_with_gradient`, for ``n`` input
+        points :math:`x_i`. The default implementation loops over the input
+        points, subclasses should override it if the computation can be
+        vectorized.
+
+        :param inputs: Input points, shape ``(n, d)``
+        :param model: If given, overrides ``self.model``
+        :return: :math:`f(x_i)`, shape ``(n,)``; :math:`\nabla f(x_i)`, shape
+            ``(n, d)``
+        """
+        results = [
+            self.compute_acq_with_gradient(input, model=model) for input in inputs
+        ]
+        fvals, gradients = zip(*results)
+        return np.array(fvals).reshape((-1,)), np.vstack(
+            [grad.reshape((1, -1)) for grad in gradients]
+        )
+
     def score(
         self,
         candidates: Iterable[Configuration],
@@ -255,6 +334,13 @@ class AcquisitionFunction(ScoringFunction):
         inputs = hp_ranges.to_ndarray_matrix(candidates)
         return list(self.compute_acq(inputs, model=model))
 
+    def score_encoded(
+        self,
+        inputs: np.ndarray,
+        model: Optional[SurrogateOutputModel] = None,
+    ) -> np.ndarray:
+        return self.compute_acq(inputs, model=model)
+
 
 AcquisitionClassAndArgs = Union[
     Type[AcquisitionFunction], Tuple[Type[AcquisitionFunction], Dict[str, Any]]
@@ -314,3 +400,19 @@ class LocalOptimizer:
         :return: Configuration found by local optimization
         """
         raise NotImplementedError
+
+    def optimize_batch(
+        self,
+        candidates: List[Configuration],
+        model: Optional[SurrogateOutputModel] = None,
+    ) -> List[Configuration]:
+        """Run local optimizations, starting from each entry of ``candidates``
+
+        The default implementation calls :meth:`optimize` for each entry.
+
+        :param candidates: Starting points
+        :param model: Overrides ``self.model``
+        :return: Configurations found by local optimization, same order as
+            ``candidates``
+        """
+        return [self.optimize(candidate, model=model) for candidate in candidates]
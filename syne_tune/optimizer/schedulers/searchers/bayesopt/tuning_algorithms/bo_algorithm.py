@@ -10,7 +10,7 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
-from typing import List, Tuple, Iterator, Optional
+from typing import List, Tuple, Iterator, Optional, Iterable
 import logging
 from dataclasses import dataclass
 import numpy as np
@@ -28,14 +28,19 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.tuning_algorithms.base_cl
     ScoringFunction,
     LocalOptimizer,
     SurrogateModel,
+    AcquisitionFunction,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.tuning_algorithms.bo_algorithm_components import (
     LBFGSOptimizeAcquisition,
+    BatchedGradientOptimizeAcquisition,
+    IndependentThompsonSampling,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.tuning_algorithms.common import (
     generate_unique_candidates,
+    unique_encoded_candidates,
     ExclusionList,
     CandidateGenerator,
+    RandomStatefulCandidateGenerator,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.utils.debug_log import (
     DebugLogPrinter,
@@ -97,6 +102,13 @@ class BayesianOptimizationAlgorithm(NextCandidatesAlgorithm):
     :param sample_unique_candidates: If ``True``, we check that initial candidates
         sampled at random are unique and disjoint from the exclusion list.
         This can be expensive. Defaults to ``False``
+    :param encoded_initial_candidates: If ``True`` (default), initial
+        candidates are sampled directly in encoded form, deduplicated and
+        scored as a matrix, and only the top scorers are decoded to
+        configurations. This is much faster for large
+        ``num_initial_candidates``. It requires ``initial_candidates_generator``
+        to be of type :class:`RandomStatefulCandidateGenerator`, and is not
+        used if ``sample_unique_candidates == True``
     :param debug_log: If a
         :class:`~syne_tune.optimizer.schedulers.searchers.bayesopt.utils.debug_log.DebugLogPrinter`
         object is passed here, it is used to write log messages
@@ -114,6 +126,7 @@ class BayesianOptimizationAlgorithm(NextCandidatesAlgorithm):
     num_initial_candidates_for_batch: Optional[int] = None
     profiler: Optional[SimpleProfiler] = None
     sample_unique_candidates: bool = False
+    encoded_initial_candidates: bool = True
     debug_log: Optional[DebugLogPrinter] = None
 
     # Note: For greedy batch selection (num_outer_iterations > 1), the
@@ -209,6 +222,19 @@ class BayesianOptimizationAlgorithm(NextCandidatesAlgorithm):
 
         return candidates
 
+    def _use_encoded_initial_candidates(self) -> bool:
+        return (
+            self.encoded_initial_candidates
+            and not self.sample_unique_candidates
+            and isinstance(
+                self.initial_candidates_generator, RandomStatefulCandidateGenerator
+            )
+            and isinstance(
+                self.initial_candidates_scorer,
+                (AcquisitionFunction, IndependentThompsonSampling),
+            )
+        )
+
     def _get_next_candidates(
         self,
         num_candidates: int,
@@ -227,7 +253,16 @@ class BayesianOptimizationAlgorithm(NextCandidatesAlgorithm):
             self.profiler.push_prefix("nextcand")
             self.profiler.start("all")
             self.profiler.start("genrandom")
-        if self.sample_unique_candidates:
+        use_encoded = self._use_encoded_initial_candidates()
+        if use_encoded:
+            # Duplicates are removed, but not candidates in
+            # ``exclusion_candidates``. These are skipped when decoding below
+            initial_inputs = unique_encoded_candidates(
+                self.initial_candidates_generator.generate_candidates_encoded(
+                    num_initial_candidates
+                )
+            )
+        elif self.sample_unique_candidates:
             # This can be expensive, depending on what type Candidate is
             initial_candidates = generate_unique_candidates(
                 self.initial_candidates_generator,
@@ -246,7 +281,20 @@ class BayesianOptimizationAlgorithm(NextCandidatesAlgorithm):
             self.profiler.stop("genrandom")
             self.profiler.start("scoring")
         logger.info("BayesOpt Algorithm: Scoring (and reordering) candidates.")
-        if self.debug_log is not None:
+        if use_encoded:
+            initial_candidates, scores = _order_encoded_candidates(
+                initial_inputs,
+                self.initial_candidates_scorer,
+                hp_ranges=self.initial_candidates_generator.hp_ranges,
+                exclusion_candidates=self.exclusion_candidates,
+                model=model,
+            )
+            if self.debug_log is not None:
+                config = next(initial_candidates, None)
+                if config is not None:
+                    self.debug_log.set_init_config(config, scores[:5])
+                    initial_candidates = itertools.chain([config], initial_candidates)
+        elif self.debug_log is not None:
             candidates_and_scores = _order_candidates(
                 initial_candidates,
                 self.initial_candidates_scorer,
@@ -272,7 +320,8 @@ class BayesianOptimizationAlgorithm(NextCandidatesAlgorithm):
         )
         logger.info("BayesOpt Algorithm: Selecting final set of candidates.")
         if self.debug_log is not None and isinstance(
-            self.local_optimizer, LBFGSOptimizeAcquisition
+            self.local_optimizer,
+            (LBFGSOptimizeAcquisition, BatchedGradientOptimizeAcquisition),
         ):
             # We would like to get num_evaluations from the first run (usually
             # the only one). This requires peeking at the first entry of the
@@ -312,8 +361,40 @@ def _order_candidates(
         return [cand for score, cand in sorted_list]
 
 
+def _order_encoded_candidates(
+    inputs: np.ndarray,
+    scoring_function: ScoringFunction,
+    hp_ranges: HyperparameterRanges,
+    exclusion_candidates: ExclusionList,
+    model: Optional[SurrogateModel],
+) -> (Iterator[Configuration], np.ndarray):
+    """
+    Scores encoded candidates in a single call and sorts them by score.
+    Rows are decoded lazily, in order of increasing score, and candidates in
+    ``exclusion_candidates`` are skipped. Since only a few top scorers are
+    needed in general, most rows are never decoded.
+
+    :return: ``(candidates, scores)``, where ``candidates`` iterates over
+        decoded configurations, and ``scores`` are the sorted score values
+    """
+    if inputs.shape[0] == 0:
+        return iter([]), np.zeros((0,))
+    scores = np.asarray(scoring_function.score_encoded(inputs, model=model)).reshape(
+        (-1,)
+    )
+    order = np.argsort(scores, kind="stable")
+
+    def decoded_candidates():
+        for pos in order:
+            config = hp_ranges.from_ndarray(inputs[pos])
+            if not exclusion_candidates.contains(config):
+                yield config
+
+    return decoded_candidates(), scores[order]
+
+
 def _lazily_locally_optimize(
-    candidates: List[Configuration],
+    candidates: Iterable[Configuration],
     local_optimizer: LocalOptimizer,
     hp_ranges: HyperparameterRanges,
     model: Optional[SurrogateModel],
@@ -323,12 +404,36 @@ def _lazily_locally_optimize(
     we have to locally optimize, hence this helper to create a lazy generator
     of locally optimized candidates.
     Note that ``candidates`` may contain duplicates, but such are skipped here.
+
+    If ``local_optimizer`` is of type
+    :class:`~syne_tune.optimizer.schedulers.searchers.bayesopt.tuning_algorithms.bo_algorithm_components.BatchedGradientOptimizeAcquisition`,
+    candidates are optimized in batches of size ``local_optimizer.batch_size``,
+    and the results of each batch are returned in order of increasing
+    acquisition function values.
     """
+    if isinstance(local_optimizer, BatchedGradientOptimizeAcquisition):
+        batch_size = local_optimizer.batch_size
+    else:
+        batch_size = 1
+
+    def optimize_batch(batch):
+        if batch_size == 1:
+            return [(batch[0], local_optimizer.optimize(batch[0], model=model))]
+        optimized = local_optimizer.optimize_batch(batch, model=model)
+        order = np.argsort(local_optimizer.acquisition_values, kind="stable")
+        return [(batch[pos], optimized[pos]) for pos in order]
+
     considered_already = ExclusionList.empty_list(hp_ranges)
+    batch = []
     for cand in candidates:
         if not considered_already.contains(cand):
             considered_already.add(cand)
-            yield cand, local_optimizer.optimize(cand, model=model)
+            batch.append(cand)
+            if len(batch) == batch_size:
+                yield from optimize_batch(batch)
+                batch = []
+    if batch:
+        yield from optimize_batch(batch)
 
 
 # Note: If ``duplicate_detector`` is at least :class:`DuplicateDetectorIdentical`,
@@ -74,6 +74,25 @@ class IndependentThompsonSampling(ScoringFunction):
             scores.append(new_score)
         return list(np.mean(np.array(scores), axis=0))
 
+    def score_encoded(
+        self,
+        inputs: np.ndarray,
+        model: Optional[SurrogateModel] = None,
+    ) -> np.ndarray:
+        if model is None:
+            model = self.model
+        scores = []
+        for predictions in model.predict(inputs):
+            posterior_means = predictions["mean"]
+            posterior_stds = predictions["std"]
+            if posterior_means.ndim == 1:
+                posterior_means = posterior_means.reshape((-1, 1))
+            samples = self.random_state.normal(
+                posterior_means, posterior_stds.reshape((-1, 1))
+            )
+            scores.append(np.mean(samples, axis=1))
+        return np.mean(np.vstack(scores), axis=0)
+
 
 class LBFGSOptimizeAcquisition(LocalOptimizer):
     def __init__(
@@ -134,6 +153,153 @@ class LBFGSOptimizeAcquisition(LocalOptimizer):
             return result
 
 
+DEFAULT_BATCH_SIZE = 5
+
+DEFAULT_MAX_ITERATIONS = 100
+
+
+class BatchedGradientOptimizeAcquisition(LocalOptimizer):
+    """
+    Alternative to :class:`LBFGSOptimizeAcquisition`, which minimizes the
+    acquisition function starting from several candidates at once. We run
+    spectral projected gradient descent on the box given by
+    ``hp_ranges.get_ndarray_bounds()``, with a step size per candidate. Step
+    sizes are set by the Barzilai-Borwein rule, and a step is accepted only
+    if it satisfies the Armijo condition, otherwise the step size is
+    decreased. Each iteration requires a single call of
+    ``compute_acq_with_gradient_batch`` for all candidates which are still
+    active. This avoids the overhead of evaluating the acquisition function
+    and its gradient for one candidate at a time.
+
+    The optimization of a candidate stops once the projected gradient or the
+    relative decrease of the acquisition function become small, using the
+    same defaults as ``scipy.optimize.fmin_l_bfgs_b``.
+
+    If ``local_minimizer_class`` is set to this class,
+    :class:`~syne_tune.optimizer.schedulers.searchers.bayesopt.tuning_algorithms.bo_algorithm.BayesianOptimizationAlgorithm`
+    optimizes the top ``batch_size`` initial candidates together, and
+    considers the results in order of their acquisition function values.
+
+    :param batch_size: Number of candidates optimized together. Defaults to
+        :const:`DEFAULT_BATCH_SIZE`
+    :param max_iterations: Maximum number of iterations. Defaults to
+        :const:`DEFAULT_MAX_ITERATIONS`
+    :param pgtol: A candidate is not optimized further once its projected
+        gradient has norm (max over coordinates) smaller than this. Defaults
+        to 1e-5
+    :param ftol: A candidate is not optimized further once the relative
+        decrease of the acquisition function in a step is smaller than
+        this. Defaults to ``1e7`` times machine precision
+    """
+
+    def __init__(
+        self,
+        hp_ranges: HyperparameterRanges,
+        model: SurrogateOutputModel,
+        acquisition_class: AcquisitionClassAndArgs,
+        active_metric: str = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_iterations: int = DEFAULT_MAX_ITERATIONS,
+        pgtol: float = 1e-5,
+        ftol: float = 1e7 * np.finfo(float).eps,
+    ):
+        super().__init__(hp_ranges, model, acquisition_class, active_metric)
+        assert batch_size >= 1
+        self.batch_size = batch_size
+        self.max_iterations = max_iterations
+        self.pgtol = pgtol
+        self.ftol = ftol
+        # Number of calls of ``compute_acq_with_gradient_batch`` in last
+        # recent optimize_batch call
+        self.num_evaluations = None
+        # Acquisition function values for results of last recent
+        # optimize_batch call
+        self.acquisition_values = None
+
+    def optimize(
+        self, candidate: Configuration, model: Optional[SurrogateOutputModel] = None
+    ) -> Configuration:
+        return self.optimize_batch([candidate], model=model)[0]
+
+    def optimize_batch(
+        self,
+        candidates: List[Configuration],
+        model: Optional[SurrogateOutputModel] = None,
+    ) -> List[Configuration]:
+        if model is None:
+            model = self.model
+        acquisition_class, acquisition_kwargs = unwrap_acquisition_class_and_kwargs(
+            self.acquisition_class
+        )
+        acquisition_function = acquisition_class(
+            model, self.active_metric, **acquisition_kwargs
+        )
+        lower, upper = (np.array(x) for x in zip(*self.hp_ranges.get_ndarray_bounds()))
+
+        def projected_gradient_norm(x, g):
+            return np.max(np.abs(np.clip(x - g, lower, upper) - x), axis=1)
+
+        inputs = self.hp_ranges.to_ndarray_matrix(candidates)
+        fvals, gradients = acquisition_function.compute_acq_with_gradient_batch(
+            inputs, model=model
+        )
+        num_evaluations = 1
+        # Initial step sizes are chosen so that no coordinate changes by more
+        # than 0.1 (encoded inputs are mostly in [0, 1])
+        grad_norms = np.max(np.abs(gradients), axis=1)
+        step_sizes = 0.1 / np.maximum(grad_norms, 1e-12)
+        active = projected_gradient_norm(inputs, gradients) > self.pgtol
+        for _ in range(self.max_iterations):
+            index = np.flatnonzero(active)
+            if index.size == 0:
+                break
+            new_inputs = np.clip(
+                inputs[index] - step_sizes[index].reshape((-1, 1)) * gradients[index],
+                lower,
+                upper,
+            )
+            (
+                new_fvals,
+                new_gradients,
+            ) = acquisition_function.compute_acq_with_gradient_batch(
+                new_inputs, model=model
+            )
+            num_evaluations += 1
+            steps = new_inputs - inputs[index]
+            accept = new_fvals <= fvals[index] + 1e-4 * np.sum(
+                gradients[index] * steps, axis=1
+            )
+            # Rejected: Backtracking
+            reject_pos = index[~accept]
+            step_sizes[reject_pos] *= 0.25
+            active[reject_pos] = np.max(np.abs(steps[~accept]), axis=1) > 1e-10
+            # Accepted: Barzilai-Borwein step size
+            pos = index[accept]
+            steps = steps[accept]
+            new_gradients = new_gradients[accept]
+            new_fvals = new_fvals[accept]
+            s_times_y = np.sum(steps * (new_gradients - gradients[pos]), axis=1)
+            s_times_s = np.sum(steps * steps, axis=1)
+            step_sizes[pos] = np.where(
+                s_times_y > 0,
+                np.clip(s_times_s / np.maximum(s_times_y, 1e-300), 1e-10, 1e10),
+                2 * step_sizes[pos],
+            )
+            rel_decrease = (fvals[pos] - new_fvals) / np.maximum(
+                np.maximum(np.abs(fvals[pos]), np.abs(new_fvals)), 1.0
+            )
+            inputs[pos] = new_inputs[accept]
+            fvals[pos] = new_fvals
+            gradients[pos] = new_gradients
+            active[pos] = np.logical_and(
+                rel_decrease > self.ftol,
+                projected_gradient_norm(inputs[pos], gradients[pos]) > self.pgtol,
+            )
+        self.num_evaluations = num_evaluations
+        self.acquisition_values = fvals
+        return [self.hp_ranges.from_ndarray(x) for x in inputs]
+
+
 class NoOptimization(LocalOptimizer):
     def optimize(
         self, candidate: Configuration, model: Optional[SurrogateModel] = None
@@ -35,12 +35,24 @@ MAX_RETRIES_CANDIDATES_EN_BULK = 20
 class ExclusionList:
     """
     Maintains exclusion list of configs, to avoid choosing configs several
-    times. In fact, ``self.excl_set`` maintains a set of match strings.
+    times. Configs are represented by compact keys, the bytes of their
+    encoded vectors (see :meth:`HyperparameterRanges.config_to_match_key`).
+    These are stored in sets, so that keys are compared exactly in case of
+    hash collisions.
 
     The exclusion list contains non-extended configs, but it can be fed with
     and queried with extended configs. In that case, the resource attribute
     is removed from the config.
 
+    :meth:`copy` does not copy the entries. Instead, the copy shares the
+    entries of the original as read-only base sets, and new entries are
+    added to an overlay set. If the original is modified afterwards, its
+    own entries are moved to a base set first (copy-on-write), so that the
+    copy is not affected. Base sets are merged (into new sets) so that their
+    sizes decrease geometrically. This way, there are only logarithmically
+    many of them, and each entry is merged a logarithmic number of times
+    when an exclusion list is alternately copied and extended.
+
     :param state: Either tuning job state, or a ``dict`` containing the members
         to be used (copy constructor)
     :param filter_observed_data: Filter on observed data, optional
@@ -54,14 +66,6 @@ class ExclusionList:
         is_new = isinstance(state, TuningJobState)
         if is_new:
             self.hp_ranges = state.hp_ranges
-            keys = self.hp_ranges.internal_keys
-            # Remove resource attribute from ``self.keys`` if present
-            resource_attr = self.hp_ranges.name_last_pos
-            if resource_attr is None:
-                self.keys = keys
-            else:
-                pos = keys.index(resource_attr)
-                self.keys = keys[:pos] + keys[(pos + 1) :]
             _elist = [
                 x.trial_id for x in state.pending_evaluations
             ] + state.failed_trials
@@ -74,30 +78,65 @@ class ExclusionList:
                 ]
             _elist = set(_elist + observed_trial_ids)
             self.excl_set = set(
-                self._to_matchstr(state.config_for_trial[trial_id])
-                for trial_id in _elist
+                self._to_key(state.config_for_trial[trial_id]) for trial_id in _elist
             )
+            self._base_sets = ()
+            self.configspace_size = config_space_size(self.hp_ranges.config_space)
         else:
             self.hp_ranges = state["hp_ranges"]
             self.excl_set = state["excl_set"]
-            self.keys = state["keys"]
-        self.configspace_size = config_space_size(self.hp_ranges.config_space)
+            self._base_sets = state.get("base_sets", ())
+            if "configspace_size" in state:
+                self.configspace_size = state["configspace_size"]
+            else:
+                self.configspace_size = config_space_size(self.hp_ranges.config_space)
+        # Is ``excl_set`` shared with a copy?
+        self._excl_set_shared = False
 
-    def _to_matchstr(self, config) -> str:
-        return self.hp_ranges.config_to_match_string(config, keys=self.keys)
+    def _to_key(self, config: Configuration) -> bytes:
+        return self.hp_ranges.config_to_match_key(config, skip_last=True)
+
+    def _contains_key(self, key: bytes) -> bool:
+        return key in self.excl_set or any(key in s for s in self._base_sets)
 
     def contains(self, config: Configuration) -> bool:
-        return self._to_matchstr(config) in self.excl_set
+        return self._contains_key(self._to_key(config))
 
     def add(self, config: Configuration):
-        self.excl_set.add(self._to_matchstr(config))
+        key = self._to_key(config)
+        if not self._contains_key(key):
+            if self._excl_set_shared:
+                # Copy-on-write: Entries so far become a read-only base set
+                self._base_sets = self._merged_base_sets(
+                    self._base_sets + (self.excl_set,)
+                )
+                self.excl_set = set()
+                self._excl_set_shared = False
+            self.excl_set.add(key)
+
+    @staticmethod
+    def _merged_base_sets(base_sets: tuple) -> tuple:
+        # Merge trailing sets into a new set (shared sets are not modified),
+        # until sizes are strictly decreasing
+        base_sets = list(base_sets)
+        while len(base_sets) >= 2 and len(base_sets[-2]) <= len(base_sets[-1]):
+            last_set = base_sets.pop()
+            merged_set = set(base_sets.pop())
+            merged_set.update(last_set)
+            base_sets.append(merged_set)
+        return tuple(base_sets)
 
     def copy(self) -> "ExclusionList":
+        base_sets = self._base_sets
+        if self.excl_set:
+            base_sets = base_sets + (self.excl_set,)
+            self._excl_set_shared = True
         return ExclusionList(
             {
                 "hp_ranges": self.hp_ranges,
-                "excl_set": set(self.excl_set),
-                "keys": self.keys,
+                "excl_set": set(),
+                "base_sets": base_sets,
+                "configspace_size": self.configspace_size,
             }
         )
 
@@ -106,11 +145,11 @@ class ExclusionList:
         return ExclusionList(TuningJobState.empty_state(hp_ranges))
 
     def __len__(self) -> int:
-        return len(self.excl_set)
+        return len(self.excl_set) + sum(len(s) for s in self._base_sets)
 
     def config_space_exhausted(self) -> bool:
         return (self.configspace_size is not None) and len(
-            self.excl_set
+            self
         ) >= self.configspace_size
 
 
@@ -135,6 +174,18 @@ class CandidateGenerator:
         """
         raise NotImplementedError
 
+    def generate_candidates_encoded(self, num_cands: int) -> np.ndarray:
+        """
+        Array-native variant of :meth:`generate_candidates_en_bulk`, which
+        returns candidates in their encoded form (rows of the matrix), and
+        does not filter against an exclusion list. Candidates can be decoded
+        with ``hp_ranges.from_ndarray``. Not all generators support this.
+
+        :param num_cands: Number of candidates to generate
+        :return: Matrix of encoded candidates, shape ``(num_cands, d)``
+        """
+        raise NotImplementedError
+
 
 class RandomStatefulCandidateGenerator(CandidateGenerator):
     """
@@ -191,6 +242,29 @@ class RandomStatefulCandidateGenerator(CandidateGenerator):
                 )
             return configs
 
+    def generate_candidates_encoded(self, num_cands: int) -> np.ndarray:
+        return self.hp_ranges.random_ndarray_matrix(self.random_state, num_cands)
+
+
+def unique_encoded_candidates(inputs: np.ndarray) -> np.ndarray:
+    """
+    Removes duplicate rows from matrix of encoded candidates, keeping the
+    first occurrence of each row and the order of rows otherwise. Rows are
+    compared by their byte representation, which is exact for encodings
+    obtained from :meth:`HyperparameterRanges.to_ndarray`.
+
+    :param inputs: Matrix of encoded candidates, shape ``(n, d)``
+    :return: Matrix of unique rows, shape ``(n', d)``, ``n' <= n``
+    """
+    if inputs.shape[0] <= 1:
+        return inputs
+    inputs = np.ascontiguousarray(inputs)
+    row_keys = inputs.view(np.dtype((np.void, inputs.dtype.itemsize * inputs.shape[1])))
+    _, index = np.unique(row_keys.reshape((-1,)), return_index=True)
+    if index.size == inputs.shape[0]:
+        return inputs
+    return inputs[np.sort(index)]
+
 
 MAX_RETRIES_ON_DUPLICATES = 10000
 
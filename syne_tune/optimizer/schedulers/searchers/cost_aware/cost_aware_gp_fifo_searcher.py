@@ -55,6 +55,7 @@ class MultiModelGPFIFOSearcher(GPFIFOSearcher):
             model_factory=output_model_factory,
             init_state=init_state,
             skip_optimization=output_skip_optimization,
+            background_fitting=self.state_transformer.background_fitting,
         )
 
 
@@ -60,6 +60,7 @@ class MultiModelGPMultiFidelitySearcher(GPMultiFidelitySearcher):
             model_factory=output_model_factory,
             init_state=init_state,
             skip_optimization=output_skip_optimization,
+            background_fitting=self.state_transformer.background_fitting,
         )
 
 
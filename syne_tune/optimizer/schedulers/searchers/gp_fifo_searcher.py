@@ -55,6 +55,9 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.models.model_transformer
     TransformerOutputModelFactory,
     ModelStateTransformer,
 )
+from syne_tune.optimizer.schedulers.searchers.bayesopt.models.gp_model import (
+    GaussProcSurrogateModel,
+)
 from syne_tune.optimizer.schedulers.searchers.bayesopt.models.model_skipopt import (
     SkipOptimizationPredicate,
     AlwaysSkipPredicate,
@@ -143,6 +146,8 @@ class ModelBasedSearcher(SearcherWithRandomSeed):
         cost_attr: Optional[str] = None,
         resource_attr: Optional[str] = None,
         filter_observed_data: Optional[ConfigurationFilter] = None,
+        background_fitting: bool = False,
+        background_fitting_random_fallback: bool = False,
     ):
         self.hp_ranges = hp_ranges
         self.num_initial_candidates = num_initial_candidates
@@ -170,7 +175,9 @@ class ModelBasedSearcher(SearcherWithRandomSeed):
             model_factory=model_factory,
             init_state=init_state,
             skip_optimization=skip_optimization,
+            background_fitting=background_fitting,
         )
+        self.background_fitting_random_fallback = background_fitting_random_fallback
         self.random_generator = RandomStatefulCandidateGenerator(
             self._hp_ranges_for_prediction(), random_state=self.random_state
         )
@@ -178,6 +185,12 @@ class ModelBasedSearcher(SearcherWithRandomSeed):
         self._cost_attr = cost_attr
         self._resource_attr = resource_attr
         self._filter_observed_data = filter_observed_data
+        # Configs of observed (after filtering) and failed trials, maintained
+        # incrementally (see :meth:`_get_exclusion_candidates`)
+        self._exclusion_base = None
+        self._exclusion_base_state = None
+        self._exclusion_base_num_observed = 0
+        self._exclusion_base_num_failed = 0
         self._random_searcher = None
         # Tracks the cumulative time spent in ``get_config`` calls
         self.cumulative_get_config_time = 0
@@ -287,10 +300,45 @@ class ModelBasedSearcher(SearcherWithRandomSeed):
         raise NotImplementedError
 
     def _get_exclusion_candidates(self, **kwargs) -> ExclusionList:
-        return ExclusionList(
-            self.state_transformer.state,
-            filter_observed_data=self._filter_observed_data,
-        )
+        """
+        Returns the exclusion list for the current state, which contains the
+        configs of all pending, failed, and observed trials (the latter after
+        filtering with ``filter_observed_data``).
+
+        Observed and failed trials are only ever appended to the state. Their
+        configs are added to a base exclusion list, which is updated with the
+        entries appended since the last call. The result is a copy of this
+        base list (which does not copy the entries), extended by the configs
+        of pending trials. The cost therefore does not depend on the total
+        number of trials.
+
+        :return: Exclusion list for the current state
+        """
+        state = self.state_transformer.state
+        if (
+            self._exclusion_base is None
+            or state is not self._exclusion_base_state
+            or len(state.trials_evaluations) < self._exclusion_base_num_observed
+            or len(state.failed_trials) < self._exclusion_base_num_failed
+        ):
+            # New state: Start from scratch
+            self._exclusion_base = ExclusionList.empty_list(state.hp_ranges)
+            self._exclusion_base_state = state
+            self._exclusion_base_num_observed = 0
+            self._exclusion_base_num_failed = 0
+        exclusion_base = self._exclusion_base
+        for ev in state.trials_evaluations[self._exclusion_base_num_observed :]:
+            config = state.config_for_trial[ev.trial_id]
+            if self._filter_observed_data is None or self._filter_observed_data(config):
+                exclusion_base.add(config)
+        self._exclusion_base_num_observed = len(state.trials_evaluations)
+        for trial_id in state.failed_trials[self._exclusion_base_num_failed :]:
+            exclusion_base.add(state.config_for_trial[trial_id])
+        self._exclusion_base_num_failed = len(state.failed_trials)
+        exclusion_candidates = exclusion_base.copy()
+        for pending in state.pending_evaluations:
+            exclusion_candidates.add(state.config_for_trial[pending.trial_id])
+        return exclusion_candidates
 
     def _should_pick_random_config(self, exclusion_candidates: ExclusionList) -> bool:
         """
@@ -303,6 +351,13 @@ class ModelBasedSearcher(SearcherWithRandomSeed):
         state = self.state_transformer.state
         if not state.trials_evaluations:
             return True
+        if (
+            self.background_fitting_random_fallback
+            and self.state_transformer.background_fitting
+            and not self.state_transformer.model_params_fitted()
+        ):
+            # First background fitting has not finished yet
+            return True
         if self._filter_observed_data is None:
             return False
         for ev in state.trials_evaluations:
@@ -361,6 +416,7 @@ class ModelBasedSearcher(SearcherWithRandomSeed):
                 "fit_hyperparams": not skip_optimization(state),
                 "num_observed": state.num_observed_cases(),
                 "num_pending": len(state.pending_evaluations),
+                "model_staleness": self.model_staleness(),
             }
             self.profiler.begin_block(meta)
             self.profiler.start("all")
@@ -404,6 +460,19 @@ class ModelBasedSearcher(SearcherWithRandomSeed):
     def model_parameters(self):
         return self.state_transformer.get_params()
 
+    def model_staleness(self) -> int:
+        """
+        :return: Number of observed cases which have not been used to fit the
+            parameters of the current surrogate model (for the active metric).
+            This is nonzero if fitting is skipped (see ``opt_skip_*``
+            parameters), or if fitting runs in the background (see
+            ``opt_background_fitting``) and has not caught up yet
+        """
+        staleness = self.state_transformer.model_staleness()
+        if isinstance(staleness, dict):
+            staleness = staleness[INTERNAL_METRIC_NAME]
+        return staleness
+
     def set_params(self, param_dict):
         self.state_transformer.set_params(param_dict)
 
@@ -546,6 +615,29 @@ class GPFIFOSearcher(ModelBasedSearcher):
         evaluations are ignored. This may lead to loss of diversity in
         decisions
     :type no_fantasizing: Defaults to False
+    :param gp_approximation: Approximation used for the Gaussian process
+        surrogate model. "exact" uses exact GP inference, which scales
+        cubically in the number of observations. "vfe" (variational free
+        energy) and "fitc" (fully independent training conditional) are sparse
+        approximations based on ``gp_num_inducing_points`` inducing inputs,
+        chosen among the observed configurations. They scale linearly in the
+        number of observations, and should be used if this number is large
+        (several thousands). Not supported for Hyper-Tune. Defaults to
+        "exact"
+    :type gp_approximation: str, optional
+    :param gp_num_inducing_points: Number of inducing inputs if
+        ``gp_approximation`` is "vfe" or "fitc". As long as the number of
+        observations is not larger, exact inference is used. Defaults to 256
+    :type gp_num_inducing_points: int, optional
+    :param prediction_precision: Floating point precision used to predict on
+        candidates when they are scored by the acquisition function, either
+        "float64" or "float32". Single precision is faster if many candidates
+        are scored (see ``num_init_candidates``). Fitting the surrogate model
+        and local optimization of the acquisition function use double
+        precision in any case. If the model is too ill-conditioned for single
+        precision to be accurate, double precision is used. Defaults to
+        "float64"
+    :type prediction_precision: str, optional
     :param initial_scoring: Scoring function to rank initial candidates
         (local optimization of EI is started from top scorer):
 
@@ -570,6 +662,33 @@ class GPFIFOSearcher(ModelBasedSearcher):
     :param opt_maxiter: Parameter for surrogate model fitting. Maximum
         number of iterations per restart. Defaults to 50
     :type opt_maxiter: int, optional
+    :param opt_num_workers: Parameter for surrogate model fitting. If
+        ``>1``, the random restarts are run in parallel, using a pool of this
+        many workers. Results do not depend on this value. Defaults to 1
+    :type opt_num_workers: int, optional
+    :param opt_parallel_backend: Parameter for surrogate model fitting.
+        Type of pool used if ``opt_num_workers > 1``, either "process" or
+        "thread". The pool is kept alive during the experiment. With
+        "process" on platforms which start processes by "spawn" (Windows,
+        MacOS), the tuning script must protect its entry point with
+        ``if __name__ == "__main__":``. Must be "thread" if
+        ``opt_background_fitting=True``. Defaults to "process"
+    :type opt_parallel_backend: str, optional
+    :param opt_background_fitting: Parameter for surrogate model fitting. If
+        ``True``, model parameters are refit in a background thread whenever
+        new data arrives, and :meth:`get_config` uses the parameters of the
+        most recently finished refit (only the posterior state is recomputed).
+        This removes the fitting from the critical path of :meth:`get_config`,
+        at the expense of model parameters lagging behind the data (see
+        :meth:`model_staleness`). ``opt_skip_*`` parameters are ignored in
+        this case. Defaults to ``False``
+    :type opt_background_fitting: bool, optional
+    :param opt_background_random_fallback: Parameter for surrogate model
+        fitting. If ``True`` and ``opt_background_fitting=True``, configs are
+        drawn at random until the first background refit has finished.
+        Otherwise, initial model parameters are used until then. Defaults to
+        ``False``
+    :type opt_background_random_fallback: bool, optional
     :param opt_warmstart: Parameter for surrogate model fitting. If ``True``,
         each fitting is started from the previous optimum. Not recommended
         in general. Defaults to ``False``
@@ -766,6 +885,13 @@ class GPFIFOSearcher(ModelBasedSearcher):
         )
         # Next candidate decision
         _config = bo_algorithm.next_candidates()
+        if self.debug_log is not None and isinstance(model, GaussProcSurrogateModel):
+            num_hits, num_misses = model.prediction_cache_statistics()
+            self.debug_log.append_extra(
+                f"Prediction cache: {num_hits} hits, {num_misses} misses"
+            )
+        if self.debug_log is not None and self.state_transformer.background_fitting:
+            self.debug_log.append_extra(f"Model staleness: {self.model_staleness()}")
         if len(_config) > 0:
             config = self._postprocess_config(_config[0])
         else:
@@ -908,6 +1034,8 @@ class GPFIFOSearcher(ModelBasedSearcher):
             cost_attr=self._cost_attr,
             resource_attr=self._resource_attr,
             filter_observed_data=self._filter_observed_data,
+            background_fitting=self.state_transformer.background_fitting,
+            background_fitting_random_fallback=self.background_fitting_random_fallback,
         )
 
     def clone_from_state(self, state):
@@ -34,9 +34,13 @@ from syne_tune.optimizer.schedulers.searchers.utils.hp_ranges import (
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.constants import (
     OptimizationConfig,
     DEFAULT_OPTIMIZATION_CONFIG,
+    DEFAULT_NUM_INDUCING_POINTS,
+    SUPPORTED_GP_APPROXIMATIONS,
+    SUPPORTED_PREDICTION_PRECISIONS,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.gp_regression import (
     GaussianProcessRegression,
+    SparseGaussianProcessRegression,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.kernel import (
     Matern52,
@@ -156,6 +160,8 @@ def _create_gp_common(hp_ranges: HyperparameterRanges, **kwargs):
         lbfgs_maxiter=kwargs["opt_maxiter"],
         verbose=kwargs["opt_verbose"],
         n_starts=kwargs["opt_nstarts"],
+        num_workers=kwargs.get("opt_num_workers", 1),
+        parallel_backend=kwargs.get("opt_parallel_backend", "process"),
     )
     if kwargs.get("profiler", False):
         profiler = SimpleProfiler()
@@ -195,6 +201,7 @@ def _create_gp_model_factory(
         filter_observed_data=filter_observed_data,
         no_fantasizing=kwargs.get("no_fantasizing", False),
         hp_ranges_for_prediction=hp_ranges_for_prediction,
+        prediction_precision=kwargs.get("prediction_precision", "float64"),
     )
     return {
         "model_factory": model_factory,
@@ -227,7 +234,11 @@ def _create_gp_standard_model(
         random_seed=random_seed,
         fit_reset_params=not result["opt_warmstart"],
     )
+    gp_approximation = kwargs.get("gp_approximation", "exact")
     if is_hypertune:
+        assert (
+            gp_approximation == "exact"
+        ), "gp_approximation must be 'exact' for Hyper-Tune"
         resource_attr_range = (1, kwargs["max_epochs"])
         hypertune_distribution_args = HyperTuneDistributionArguments(
             num_samples=kwargs["hypertune_distribution_num_samples"],
@@ -239,9 +250,18 @@ def _create_gp_standard_model(
             **common_kwargs,
         )
         hp_ranges_for_prediction = hp_ranges
-    else:
+    elif gp_approximation == "exact":
         gpmodel = GaussianProcessRegression(**common_kwargs)
         hp_ranges_for_prediction = None
+    else:
+        gpmodel = SparseGaussianProcessRegression(
+            num_inducing_points=kwargs.get(
+                "gp_num_inducing_points", DEFAULT_NUM_INDUCING_POINTS
+            ),
+            approximation=gp_approximation,
+            **common_kwargs,
+        )
+        hp_ranges_for_prediction = None
     return _create_gp_model_factory(
         gpmodel=gpmodel,
         result=result,
@@ -352,6 +372,21 @@ def _create_common_objects(model=None, is_hypertune=False, **kwargs):
     ), f"model = {model} only together with hyperband_* scheduler"
     hp_ranges = create_hp_ranges_for_warmstarting(**kwargs)
     random_seed, _kwargs = extract_random_seed(**kwargs)
+    background_fitting = kwargs.get("opt_background_fitting", False)
+    # Hyper-Tune computes its distribution over brackets as part of fitting,
+    # which would not be transferred from the background refit
+    assert not (
+        background_fitting and is_hypertune
+    ), "opt_background_fitting is not supported for Hyper-Tune"
+    # Worker processes must not be forked from the background fitting thread
+    assert not (
+        background_fitting
+        and kwargs.get("opt_num_workers", 1) > 1
+        and kwargs.get("opt_parallel_backend", "process") == "process"
+    ), (
+        "opt_background_fitting requires opt_parallel_backend = 'thread' if "
+        "opt_num_workers > 1"
+    )
     # Skip optimization predicate for GP surrogate model
     if kwargs.get("opt_skip_num_max_resource", False) and is_hyperband:
         skip_optimization = SkipNoMaxResourcePredicate(
@@ -401,6 +436,10 @@ def _create_common_objects(model=None, is_hypertune=False, **kwargs):
         "hp_ranges": hp_ranges,
         "map_reward": _map_reward,
         "skip_optimization": skip_optimization,
+        "background_fitting": background_fitting,
+        "background_fitting_random_fallback": kwargs.get(
+            "opt_background_random_fallback", False
+        ),
     }
     if is_hyperband:
         epoch_range = (1, kwargs["max_epochs"])
@@ -793,7 +832,11 @@ def _common_defaults(
         "profiler": False,
         "opt_maxiter": 50,
         "opt_nstarts": 2,
+        "opt_num_workers": 1,
+        "opt_parallel_backend": "process",
         "opt_warmstart": False,
+        "opt_background_fitting": False,
+        "opt_background_random_fallback": False,
         "opt_verbose": False,
         "opt_debug_writer": False,
         "num_fantasy_samples": 20,
@@ -806,6 +849,9 @@ def _common_defaults(
         "cost_attr": "elapsed_time",
         "normalize_targets": True,
         "no_fantasizing": False,
+        "gp_approximation": "exact",
+        "gp_num_inducing_points": DEFAULT_NUM_INDUCING_POINTS,
+        "prediction_precision": "float64",
     }
     if is_hyperband:
         if is_hypertune:
@@ -833,7 +879,11 @@ def _common_defaults(
         "profiler": Boolean(),
         "opt_maxiter": Integer(1, None),
         "opt_nstarts": Integer(1, None),
+        "opt_num_workers": Integer(1, None),
+        "opt_parallel_backend": Categorical(choices=("process", "thread")),
         "opt_warmstart": Boolean(),
+        "opt_background_fitting": Boolean(),
+        "opt_background_random_fallback": Boolean(),
         "opt_verbose": Boolean(),
         "opt_debug_writer": Boolean(),
         "num_fantasy_samples": Integer(1, None),
@@ -843,6 +893,9 @@ def _common_defaults(
         "skip_local_optimization": Boolean(),
         "debug_log": Boolean(),
         "normalize_targets": Boolean(),
+        "gp_approximation": Categorical(choices=SUPPORTED_GP_APPROXIMATIONS),
+        "gp_num_inducing_points": Integer(1, None),
+        "prediction_precision": Categorical(choices=SUPPORTED_PREDICTION_PRECISIONS),
     }
 
     if is_hyperband:
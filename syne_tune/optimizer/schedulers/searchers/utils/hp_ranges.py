@@ -234,6 +234,23 @@ class HyperparameterRanges:
             for config in self._random_configs(random_state, num_configs)
         ]
 
+    def random_ndarray_matrix(
+        self, random_state: RandomState, num_configs: int
+    ) -> np.ndarray:
+        """Draws random configurations in encoded form
+
+        Same distribution as ``to_ndarray_matrix(random_configs(...))``, but
+        subclasses can sample the encoded matrix directly, which is much
+        faster for large ``num_configs``. Rows can be mapped back to
+        configurations with :meth:`from_ndarray`.
+
+        :param random_state: Random state
+        :param num_configs: Number of configurations to sample
+        :return: Matrix of encoded random configurations, shape
+            ``(num_configs, ndarray_size)``
+        """
+        return self.to_ndarray_matrix(self.random_configs(random_state, num_configs))
+
     def get_ndarray_bounds(self) -> List[Tuple[float, float]]:
         """
         :return: List of ``(lower, upper)`` bounds for each dimension in
@@ -333,3 +350,20 @@ class HyperparameterRanges:
             if skip_last and self.name_last_pos is not None:
                 keys = keys[:-1]  # Skip last pos
         return config_to_match_string(config, self.config_space, keys)
+
+    def config_to_match_key(
+        self, config: Configuration, skip_last: bool = False
+    ) -> bytes:
+        """
+        Maps configuration to a compact key, used to compare for approximate
+        equality (same as :meth:`config_to_match_string`). Subclasses use
+        the encoded vector of ``config``, the default implementation uses the
+        match string.
+
+        :param config: Configuration
+        :param skip_last: If True and ``name_last_pos`` is used, the
+            corresponding attribute is skipped, so that config and match
+            key are non-extended
+        :return: Match key
+        """
+        return self.config_to_match_string(config, skip_last=skip_last).encode()
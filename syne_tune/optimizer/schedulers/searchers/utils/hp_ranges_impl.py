@@ -10,8 +10,10 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
-from typing import Tuple, Dict, List, Any, Optional, Union
+from array import array
+from typing import Tuple, Dict, List, Any, Optional, Union, Sequence, Iterable
 import numpy as np
+from numpy.random import RandomState
 from autograd import numpy as anp
 
 from syne_tune.config_space import (
@@ -38,6 +40,12 @@ from syne_tune.optimizer.schedulers.searchers.utils.scaling import (
 # Epsilon margin to account for numerical errors
 EPS = 1e-8
 
+# Encoded values of continuous hyperparameters are rounded to this number of
+# digits when configs are compared for (approximate) equality
+MATCH_VALUE_DECIMALS = 10
+
+MATCH_VALUE_SCALE = 10**MATCH_VALUE_DECIMALS
+
 
 class HyperparameterRange:
     def __init__(self, name: str):
@@ -50,6 +58,28 @@ class HyperparameterRange:
     def to_ndarray(self, hp: Hyperparameter) -> np.ndarray:
         raise NotImplementedError
 
+    def to_ndarray_matrix(self, hps: Sequence[Hyperparameter]) -> np.ndarray:
+        """
+        Vectorized version of :meth:`to_ndarray`. Subclasses should override
+        the default implementation, which loops over ``hps``.
+
+        :param hps: Values to encode
+        :return: Matrix of shape ``(len(hps), ndarray_size())``
+        """
+        return np.vstack([self.to_ndarray(hp).reshape((1, -1)) for hp in hps])
+
+    def match_value(self, hp: Hyperparameter) -> int:
+        """
+        Maps value to an integer, which is used to compare values for
+        (approximate) equality. For continuous ranges, this is the encoded
+        value, quantized to ``MATCH_VALUE_DECIMALS`` digits. For discrete
+        ranges, it is an index.
+
+        :param hp: Value of hyperparameter
+        :return: Integer representation of ``hp`` for matching
+        """
+        raise NotImplementedError
+
     def from_ndarray(self, cand_ndarray: np.ndarray) -> Hyperparameter:
         raise NotImplementedError
 
@@ -135,6 +165,29 @@ class HyperparameterRangeContinuous(HyperparameterRange):
             result = np.clip((hp_internal - lower) / (upper - lower), 0.0, 1.0)
         return np.array([result])
 
+    def to_ndarray_matrix(self, hps: Sequence[Hyperparameter]) -> np.ndarray:
+        hps = np.asarray(hps, dtype=np.float64).reshape((-1, 1))
+        assert np.all(
+            (self.lower_bound - EPS <= hps) & (hps <= self.upper_bound + EPS)
+        ), self
+        lower, upper = self.lower_internal, self.upper_internal
+        if upper == lower:
+            return np.zeros_like(hps)
+        hps_internal = self.scaling.to_internal(hps)
+        return np.clip((hps_internal - lower) / (upper - lower), 0.0, 1.0)
+
+    def match_value(self, hp: Hyperparameter) -> int:
+        lower, upper = self.lower_internal, self.upper_internal
+        if upper == lower:
+            return 0
+        # Python floats are faster than NumPy scalars here
+        value = float(self.scaling.to_internal(hp) - lower) / float(upper - lower)
+        if value <= 0.0:
+            return 0
+        if value >= 1.0:
+            return MATCH_VALUE_SCALE
+        return int(value * MATCH_VALUE_SCALE + 0.5)
+
     def from_ndarray(self, ndarray: np.ndarray) -> Hyperparameter:
         return scale_from_zero_one(
             ndarray.item(),
@@ -219,6 +272,12 @@ class HyperparameterRangeInteger(HyperparameterRange):
     def to_ndarray(self, hp: Hyperparameter) -> np.ndarray:
         return self._continuous_range.to_ndarray(float(hp))
 
+    def to_ndarray_matrix(self, hps: Sequence[Hyperparameter]) -> np.ndarray:
+        return self._continuous_range.to_ndarray_matrix(hps)
+
+    def match_value(self, hp: Hyperparameter) -> int:
+        return int(round(hp))
+
     def _round_to_int(self, value: float) -> int:
         return int(np.clip(round(value), self.lower_bound, self.upper_bound))
 
@@ -321,6 +380,22 @@ class HyperparameterRangeFiniteRange(HyperparameterRange):
     def to_ndarray(self, hp: Hyperparameter) -> np.ndarray:
         return self._range_int.to_ndarray(self._map_to_int(hp))
 
+    def to_ndarray_matrix(self, hps: Sequence[Hyperparameter]) -> np.ndarray:
+        hps = np.asarray(hps, dtype=np.float64)
+        if self._step_internal == 0:
+            hps_int = np.zeros_like(hps)
+        else:
+            y_int = np.clip(
+                self._scaling.to_internal(hps),
+                self._lower_internal,
+                self._upper_internal,
+            )
+            hps_int = np.round((y_int - self._lower_internal) / self._step_internal)
+        return self._range_int.to_ndarray_matrix(hps_int)
+
+    def match_value(self, hp: Hyperparameter) -> int:
+        return self._map_to_int(hp)
+
     def from_ndarray(self, ndarray: np.ndarray) -> Hyperparameter:
         int_val = self._range_int.from_ndarray(ndarray)
         return self._map_from_int(int_val)
@@ -365,6 +440,7 @@ class HyperparameterRangeCategorical(HyperparameterRange):
         self.choices = list(choices)
         self.num_choices = len(self.choices)
         assert self.num_choices > 0
+        self._choice_to_index = {x: i for i, x in enumerate(self.choices)}
 
     @staticmethod
     def _assert_value_type(value):
@@ -381,6 +457,18 @@ class HyperparameterRangeCategorical(HyperparameterRange):
             type(x) == value_type for x in choices
         ), f"All entries in choices = {choices} must have the same type {value_type}"
 
+    def _indices_of_choices(self, hps: Sequence[Hyperparameter]) -> np.ndarray:
+        try:
+            return np.array([self._choice_to_index[hp] for hp in hps], dtype=np.int64)
+        except KeyError as ex:
+            raise AssertionError(f"{ex.args[0]} not in {self}")
+
+    def match_value(self, hp: Hyperparameter) -> int:
+        try:
+            return self._choice_to_index[hp]
+        except KeyError:
+            raise AssertionError(f"{hp} not in {self}")
+
     def __repr__(self) -> str:
         return "{}({}, {})".format(
             self.__class__.__name__, repr(self.name), repr(self.choices)
@@ -442,6 +530,12 @@ class HyperparameterRangeCategoricalNonBinary(HyperparameterRangeCategorical):
         result[idx] = 1.0
         return result
 
+    def to_ndarray_matrix(self, hps: Sequence[Hyperparameter]) -> np.ndarray:
+        indices = self._indices_of_choices(hps)
+        result = np.zeros(shape=(indices.size, self.num_choices))
+        result[np.arange(indices.size), indices] = 1.0
+        return result
+
     def from_ndarray(self, cand_ndarray: np.ndarray) -> Hyperparameter:
         assert len(cand_ndarray) == self.num_choices, (cand_ndarray, self)
         return self.choices[int(np.argmax(cand_ndarray))]
@@ -502,6 +596,9 @@ class HyperparameterRangeCategoricalBinary(HyperparameterRangeCategorical):
         idx = self.choices.index(hp)
         return self._range_int.to_ndarray(idx)
 
+    def to_ndarray_matrix(self, hps: Sequence[Hyperparameter]) -> np.ndarray:
+        return self._range_int.to_ndarray_matrix(self._indices_of_choices(hps))
+
     def from_ndarray(self, cand_ndarray: np.ndarray) -> Hyperparameter:
         assert len(cand_ndarray) == 1
         return self.choices[self._range_int.from_ndarray(cand_ndarray)]
@@ -534,6 +631,9 @@ class HyperparameterRangeOrdinalEqual(HyperparameterRangeCategorical):
         idx = self.choices.index(hp)
         return self._range_int.to_ndarray(idx)
 
+    def to_ndarray_matrix(self, hps: Sequence[Hyperparameter]) -> np.ndarray:
+        return self._range_int.to_ndarray_matrix(self._indices_of_choices(hps))
+
     def from_ndarray(self, cand_ndarray: np.ndarray) -> Hyperparameter:
         assert len(cand_ndarray) == 1
         return self.choices[self._range_int.from_ndarray(cand_ndarray)]
@@ -581,6 +681,11 @@ class HyperparameterRangeOrdinalNearestNeighbor(HyperparameterRangeCategorical):
             np.log(float(hp)) if self.log_scale else float(hp)
         )
 
+    def to_ndarray_matrix(self, hps: Sequence[Hyperparameter]) -> np.ndarray:
+        self._indices_of_choices(hps)  # Checks that all values are valid
+        hps = np.asarray(hps, dtype=np.float64)
+        return self._range_int.to_ndarray_matrix(np.log(hps) if self.log_scale else hps)
+
     def from_ndarray(self, cand_ndarray: np.ndarray) -> Hyperparameter:
         assert len(cand_ndarray) == 1
         return self._domain_int.cast_int(self._range_int.from_ndarray(cand_ndarray))
@@ -710,6 +815,44 @@ class HyperparameterRangesImpl(HyperparameterRanges):
         ]
         return np.hstack(pieces)
 
+    def to_ndarray_matrix(self, configs: Iterable[Configuration]) -> np.ndarray:
+        configs = list(configs)
+        pieces = [
+            hp_range.to_ndarray_matrix([config[name] for config in configs])
+            for hp_range, name in zip(self._hp_ranges, self.internal_keys)
+        ]
+        return np.hstack(pieces)
+
+    def config_to_match_key(
+        self, config: Configuration, skip_last: bool = False
+    ) -> bytes:
+        hp_ranges = self._hp_ranges
+        if skip_last and self.name_last_pos is not None:
+            hp_ranges = hp_ranges[:-1]  # Skip last pos
+        return array(
+            "q", [hp_range.match_value(config[hp_range.name]) for hp_range in hp_ranges]
+        ).tobytes()
+
+    def random_ndarray_matrix(
+        self, random_state: RandomState, num_configs: int
+    ) -> np.ndarray:
+        if num_configs == 0:
+            return np.zeros((0, self._ndarray_size))
+        pieces = []
+        for hp_range in self._hp_ranges:
+            name = hp_range.name
+            if self._fix_attribute_value(name):
+                enc_fixed = hp_range.to_ndarray(self.value_for_last_pos)
+                pieces.append(np.tile(enc_fixed.reshape((1, -1)), (num_configs, 1)))
+            else:
+                hps = self.config_space_for_sampling[name].sample(
+                    size=num_configs, random_state=random_state
+                )
+                if num_configs == 1:
+                    hps = [hps]
+                pieces.append(hp_range.to_ndarray_matrix(hps))
+        return np.hstack(pieces)
+
     def from_ndarray(self, enc_config: np.ndarray) -> Configuration:
         enc_config = enc_config.reshape((-1, 1))
         assert enc_config.size == self._ndarray_size, (
@@ -15,6 +15,11 @@ import numpy as np
 from syne_tune.config_space import Domain, is_log_space, is_reverse_log_space
 
 
+def _all(condition) -> bool:
+    # Works for scalars and arrays, but avoids ``np.all`` overhead for scalars
+    return condition.all() if isinstance(condition, np.ndarray) else condition
+
+
 class Scaling:
     def to_internal(self, value: float) -> float:
         raise NotImplementedError
@@ -40,7 +45,7 @@ class LinearScaling(Scaling):
 
 class LogScaling(Scaling):
     def to_internal(self, value: float) -> float:
-        assert value > 0, "Value must be strictly positive to be log-scaled."
+        assert _all(value > 0), "Value must be strictly positive to be log-scaled."
         return np.log(value)
 
     def from_internal(self, value: float) -> float:
@@ -49,8 +54,8 @@ class LogScaling(Scaling):
 
 class ReverseLogScaling(Scaling):
     def to_internal(self, value: float) -> float:
-        assert (
-            0 <= value < 1
+        assert _all(
+            (0 <= value) & (value < 1)
         ), "Value must be between 0 (inclusive) and 1 (exclusive) to be reverse-log-scaled."
         return -np.log(1.0 - value)
 
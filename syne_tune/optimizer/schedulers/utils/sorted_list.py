@@ -0,0 +1,228 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+from bisect import bisect_left, insort
+from typing import Iterable, Iterator, Optional, List, Union
+
+
+class SortedList:
+    """
+    List of comparable values (e.g., numbers or tuples of numbers), which is
+    kept sorted in ascending order as values are added or removed. Values are
+    stored in chunks (sorted lists of bounded size), along with the maximum of
+    each chunk and a Fenwick tree over chunk sizes. Adding, removing or
+    ranking a value costs a logarithmic number of comparisons, plus a memory
+    move of the order of the chunk size, which is much faster than
+    re-allocating a sorted array of size :math:`n` for every insertion.
+
+    NaN values are sorted to the end, in the same way as NumPy does. Ranks
+    returned by :meth:`add` and :meth:`bisect_left` are the same as
+    ``np.searchsorted(values, value)`` would return for the sorted array
+    ``values`` of current entries.
+
+    :param values: Initial values, optional
+    :param chunk_size: Chunks are split once they have grown beyond twice this
+        size. Defaults to 1000
+    """
+
+    def __init__(
+        self, values: Optional[Iterable[float]] = None, chunk_size: int = 1000
+    ):
+        assert chunk_size >= 1
+        self._chunk_size = chunk_size
+        self._chunks = []
+        self._maxes = []
+        self._tree = [0]
+        self._nans = []
+        self._len = 0
+        if values is not None:
+            for value in values:
+                self.add(value)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[float]:
+        for chunk in self._chunks:
+            yield from chunk
+        yield from self._nans
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)})"
+
+    def _rebuild_tree(self):
+        num_chunks = len(self._chunks)
+        tree = [0] * (num_chunks + 1)
+        for pos, chunk in enumerate(self._chunks, start=1):
+            tree[pos] += len(chunk)
+            parent = pos + (pos & -pos)
+            if parent <= num_chunks:
+                tree[parent] += tree[pos]
+        self._tree = tree
+
+    def _update_tree(self, chunk_pos: int, delta: int):
+        pos = chunk_pos + 1
+        tree = self._tree
+        while pos < len(tree):
+            tree[pos] += delta
+            pos += pos & -pos
+
+    def _num_before_chunk(self, chunk_pos: int) -> int:
+        """
+        :return: Total size of chunks ``0, ..., chunk_pos - 1``
+        """
+        total = 0
+        pos = chunk_pos
+        tree = self._tree
+        while pos > 0:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def _num_not_nan(self) -> int:
+        return self._len - len(self._nans)
+
+    def _locate(self, index: int) -> (int, int):
+        """
+        :param index: Position in ``[0, _num_not_nan())``
+        :return: ``(chunk_pos, offset)`` such that the entry at ``index`` is
+            ``_chunks[chunk_pos][offset]``
+        """
+        tree = self._tree
+        num_chunks = len(tree) - 1
+        chunk_pos = 0
+        step = 1 << num_chunks.bit_length()
+        while step > 0:
+            next_pos = chunk_pos + step
+            if next_pos <= num_chunks and tree[next_pos] <= index:
+                chunk_pos = next_pos
+                index -= tree[next_pos]
+            step >>= 1
+        return chunk_pos, index
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[float, List[float]]:
+        """
+        Supports indexing and slicing with the semantics of a sorted Python
+        list. Slices with step 1 cost a logarithmic number of operations plus
+        the size of the slice.
+        """
+        num_not_nan = self._num_not_nan()
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if step != 1:
+                return list(self)[key]
+            result = []
+            if start < min(stop, num_not_nan):
+                chunk_pos, offset = self._locate(start)
+                remaining = min(stop, num_not_nan) - start
+                while remaining > 0:
+                    chunk = self._chunks[chunk_pos][offset : (offset + remaining)]
+                    result.extend(chunk)
+                    remaining -= len(chunk)
+                    chunk_pos += 1
+                    offset = 0
+            if stop > num_not_nan:
+                result.extend(
+                    self._nans[max(start - num_not_nan, 0) : (stop - num_not_nan)]
+                )
+            return result
+        index = key + self._len if key < 0 else key
+        if not 0 <= index < self._len:
+            raise IndexError(f"{self.__class__.__name__} index out of range")
+        if index >= num_not_nan:
+            return self._nans[index - num_not_nan]
+        chunk_pos, offset = self._locate(index)
+        return self._chunks[chunk_pos][offset]
+
+    def bisect_left(self, value: float) -> int:
+        """
+        :param value: Value to be ranked
+        :return: Number of entries strictly smaller than ``value`` (NaN is
+            larger than any other value)
+        """
+        if value != value:
+            return self._num_not_nan()
+        chunk_pos = bisect_left(self._maxes, value)
+        if chunk_pos == len(self._maxes):
+            return self._num_not_nan()
+        return self._num_before_chunk(chunk_pos) + bisect_left(
+            self._chunks[chunk_pos], value
+        )
+
+    def add(self, value: float) -> int:
+        """
+        Inserts ``value``.
+
+        :param value: Value to be inserted
+        :return: Rank of ``value`` before insertion, as returned by
+            :meth:`bisect_left`
+        """
+        rank = self.bisect_left(value)
+        self._len += 1
+        if value != value:
+            self._nans.append(value)
+            return rank
+        if not self._chunks:
+            self._chunks.append([value])
+            self._maxes.append(value)
+            self._rebuild_tree()
+            return rank
+        chunk_pos = bisect_left(self._maxes, value)
+        if chunk_pos == len(self._maxes):
+            chunk_pos -= 1
+            chunk = self._chunks[chunk_pos]
+            chunk.append(value)
+            self._maxes[chunk_pos] = value
+        else:
+            chunk = self._chunks[chunk_pos]
+            insort(chunk, value)
+        if len(chunk) > 2 * self._chunk_size:
+            # Split chunk in two halves
+            half = len(chunk) // 2
+            self._chunks[chunk_pos : (chunk_pos + 1)] = [chunk[:half], chunk[half:]]
+            self._maxes[chunk_pos : (chunk_pos + 1)] = [chunk[half - 1], chunk[-1]]
+            self._rebuild_tree()
+        else:
+            self._update_tree(chunk_pos, 1)
+        return rank
+
+    def remove(self, value: float):
+        """
+        Removes one occurrence of ``value``, which must be contained.
+
+        :param value: Value to be removed
+        """
+        if value != value:
+            if not self._nans:
+                raise ValueError(f"{value} not in {self.__class__.__name__}")
+            self._nans.pop()
+            self._len -= 1
+            return
+        chunk_pos = bisect_left(self._maxes, value)
+        if chunk_pos < len(self._maxes):
+            chunk = self._chunks[chunk_pos]
+            pos = bisect_left(chunk, value)
+            if chunk[pos] == value:
+                del chunk[pos]
+                self._len -= 1
+                if chunk:
+                    self._maxes[chunk_pos] = chunk[-1]
+                    self._update_tree(chunk_pos, -1)
+                else:
+                    del self._chunks[chunk_pos]
+                    del self._maxes[chunk_pos]
+                    self._rebuild_tree()
+                return
+        raise ValueError(f"{value} not in {self.__class__.__name__}")
+
+    def tolist(self) -> List[float]:
+        return list(self)
@@ -17,11 +17,15 @@ import numpy as np
 import json
 import logging
 from ast import literal_eval
-from typing import List, Dict
+from pathlib import Path
+from typing import List, Dict, Optional, Union
 from time import time, perf_counter
 from dataclasses import dataclass
 
 from syne_tune.constants import (
+    ST_METRICS_CHANNEL_ENV,
+    ST_METRICS_CHANNEL_BATCH_SIZE_ENV,
+    ST_METRICS_CHANNEL_MAX_DELAY_ENV,
     ST_INSTANCE_TYPE,
     ST_INSTANCE_COUNT,
     ST_WORKER_TIME,
@@ -59,12 +63,29 @@ class Reporter:
         :class:`Reporter` object is reported automatically as
         :const:`~syne_tune.constants.ST_WORKER_COST`. This is available for
         SageMaker back-end only. Requires ``add_time=True``.
+
+    If the environment variable
+    :const:`~syne_tune.constants.ST_METRICS_CHANNEL_ENV` is set (this is done
+    by :class:`~syne_tune.backend.LocalBackend` if ``metrics_channel`` is
+    used), reports are written to a binary metrics channel file (see
+    :mod:`syne_tune.metrics_channel`) instead of being printed to ``stdout``.
     """
 
     add_time: bool = True
     add_cost: bool = True
 
     def __post_init__(self):
+        self._metrics_channel = None
+        metrics_channel_path = os.getenv(ST_METRICS_CHANNEL_ENV)
+        if metrics_channel_path is not None:
+            from syne_tune.metrics_channel import MetricsChannelWriter
+
+            max_delay = os.getenv(ST_METRICS_CHANNEL_MAX_DELAY_ENV)
+            self._metrics_channel = MetricsChannelWriter(
+                path=metrics_channel_path,
+                batch_size=int(os.getenv(ST_METRICS_CHANNEL_BATCH_SIZE_ENV, "1")),
+                max_delay=None if max_delay is None else float(max_delay),
+            )
         if self.add_time:
             self.start = perf_counter()
             self.iter = 0
@@ -116,7 +137,10 @@ class Reporter:
                 kwargs[ST_WORKER_COST] = seconds_spent * self.dollar_cost
         kwargs[ST_WORKER_ITER] = self.iter
         self.iter += 1
-        _report_logger(**kwargs)
+        if self._metrics_channel is not None:
+            self._metrics_channel.write(kwargs)
+        else:
+            _report_logger(**kwargs)
 
 
 def _report_logger(**kwargs):
@@ -160,3 +184,69 @@ def retrieve(log_lines: List[str]) -> List[Dict[str, float]]:
     for metric_values in re.findall(regex, "\n".join(log_lines)):
         metrics.append(json.loads(metric_values))
     return metrics
+
+
+class IncrementalLogReader:
+    """
+    Retrieves metrics reported with :func:`_report_logger` from a log file
+    which is appended to while being read, such as the ``std.out`` file of a
+    running trial. In contrast to calling :func:`retrieve` on the full file
+    content, each call of :meth:`read` only parses bytes appended since the
+    previous call. A trailing line which is not terminated yet is buffered
+    until it is complete.
+
+    If the file is truncated or replaced, reading starts from scratch, so
+    that :attr:`metrics` are the metrics contained in the current file, just
+    like with :func:`retrieve`. Appending to the same file (e.g., when a paused
+    trial is resumed) is handled naturally.
+
+    :param path: Path of log file. The file need not exist yet
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._reset(inode=None)
+
+    def _reset(self, inode: Optional[int]):
+        self._inode = inode
+        self._offset = 0
+        self._unparsed_bytes = b""
+        # Note: We create a new list instead of clearing the old one, since the
+        # latter may still be referenced from outside
+        self.metrics = []
+
+    def _parse(self, data: bytes) -> bytes:
+        """
+        Appends metrics contained in ``data`` to :attr:`metrics`.
+
+        :param data: Bytes not parsed so far
+        :return: Trailing part of ``data`` which cannot be parsed yet, since it
+            is incomplete
+        """
+        lines = data.split(b"\n")
+        incomplete_line = lines.pop()
+        if lines:
+            self.metrics.extend(
+                retrieve(log_lines=[line.decode(errors="replace") for line in lines])
+            )
+        return incomplete_line
+
+    def read(self) -> List[Dict[str, float]]:
+        """
+        :return: All metrics contained in the log file so far. The list
+            returned is :attr:`metrics`, which is appended to in place by
+            subsequent calls, unless the file is truncated or replaced.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self.metrics
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._reset(inode=stat.st_ino)
+        if stat.st_size > self._offset:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                new_bytes = f.read()
+            self._offset += len(new_bytes)
+            self._unparsed_bytes = self._parse(self._unparsed_bytes + new_bytes)
+        return self.metrics
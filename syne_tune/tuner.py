@@ -57,8 +57,10 @@ class Tuner:
     :param n_workers: Number of workers used here. Note that the back-end
         needs to support (at least) this number of workers to be run
         in parallel
-    :param sleep_time: Time to sleep when all workers are busy. Defaults to
-        :const:`DEFAULT_SLEEP_TIME`
+    :param sleep_time: Time to sleep when all workers are busy. If the back-end
+        supports :meth:`~syne_tune.backend.trial_backend.TrialBackend.wait_for_events`,
+        this is the maximum time to wait, and the tuning loop resumes as soon
+        as the back-end signals activity. Defaults to :const:`DEFAULT_SLEEP_TIME`
     :param results_update_interval: Frequency at which results are updated and
         stored (in seconds). Defaults to 10.
     :param print_update_interval: Frequency at which result table is printed.
@@ -328,7 +330,10 @@ class Tuner:
             )
 
     def _sleep(self):
-        time.sleep(self.sleep_time)
+        # Back-ends which support it return early on activity (e.g., a new
+        # result or a trial finishing), otherwise we sleep for the full time
+        if not self.trial_backend.wait_for_events(timeout=self.sleep_time):
+            time.sleep(self.sleep_time)
         for callback in self.callbacks:
             callback.on_tuning_sleep(self.sleep_time)
 
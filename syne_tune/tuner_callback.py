@@ -10,9 +10,12 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
+from pathlib import Path
 from time import perf_counter
+from typing import Iterator, List, Optional, Union
 import copy
 import logging
+import re
 import pandas as pd
 
 from syne_tune.backend.trial_status import Trial
@@ -184,3 +187,121 @@ class StoreResultsCallback(TunerCallback):
         # store the results in case some results were not committed yet (since they are saved every
         # ``results_update_interval`` seconds)
         self.store_results()
+
+
+RESULTS_CHUNKS_DIRNAME = "results_chunks"
+
+
+def _chunk_filename(chunk_index: int) -> str:
+    return f"part-{chunk_index:06d}.parquet"
+
+
+def _chunk_index(path: Path) -> Optional[int]:
+    match = re.fullmatch(r"part-(\d+)\.parquet", path.name)
+    return None if match is None else int(match.group(1))
+
+
+def results_chunk_paths(path: Union[str, Path]) -> List[Path]:
+    """
+    :param path: Path of experiment (``tuner.tuner_path``), or of the
+        :const:`RESULTS_CHUNKS_DIRNAME` directory therein
+    :return: Paths of result chunks written by
+        :class:`ChunkedStoreResultsCallback`, in the order they were written
+    """
+    path = Path(path)
+    if path.name != RESULTS_CHUNKS_DIRNAME:
+        path = path / RESULTS_CHUNKS_DIRNAME
+    if not path.is_dir():
+        return []
+    indexed_paths = [(_chunk_index(x), x) for x in path.iterdir()]
+    return [x for index, x in sorted(indexed_paths) if index is not None]
+
+
+def read_results_chunks(path: Union[str, Path]) -> Iterator[pd.DataFrame]:
+    """
+    Iterates over chunks of results written by
+    :class:`ChunkedStoreResultsCallback`. Chunks are loaded lazily, one at a
+    time, so the whole results table can be concatenated with ``pd.concat`` or
+    processed chunk by chunk.
+
+    :param path: See :func:`results_chunk_paths`
+    :return: Iterator over dataframes, in the order they were written
+    """
+    for chunk_path in results_chunk_paths(path):
+        yield pd.read_parquet(chunk_path)
+
+
+class ChunkedStoreResultsCallback(StoreResultsCallback):
+    """
+    Variant of :class:`StoreResultsCallback` which appends results to an
+    append-only store, instead of rewriting the full table every time. Only
+    results received since the last recent flush are kept in memory (in
+    :attr:`results`), and each flush writes them as a new Parquet file to
+    ``{tuner.tuner_path}/results_chunks/``. A flush happens every
+    ``tuner.results_update_interval`` seconds, or once ``max_results_in_memory``
+    results are held in memory. Cost and memory for storing results do not
+    grow with the length of the experiment then.
+
+    Chunks are read back with :func:`read_results_chunks`, which is used by
+    :func:`~syne_tune.experiments.load_experiment`. Writing Parquet files
+    requires ``pyarrow`` or ``fastparquet`` to be installed.
+
+    :param add_wallclock_time: See :class:`StoreResultsCallback`
+    :param max_results_in_memory: Results are flushed once this many of them
+        are held in memory. Defaults to 10000
+    """
+
+    def __init__(
+        self,
+        add_wallclock_time: bool = True,
+        max_results_in_memory: int = 10000,
+    ):
+        # Raises an ``ImportError`` if no Parquet engine is installed
+        pd.io.parquet.get_engine("auto")
+        super().__init__(add_wallclock_time)
+        assert max_results_in_memory >= 1
+        self.max_results_in_memory = max_results_in_memory
+        self.chunks_path = None
+        self._num_chunks = 0
+
+    def on_trial_result(self, trial: Trial, status: str, result: dict, decision: str):
+        super().on_trial_result(trial, status, result, decision)
+        if len(self.results) >= self.max_results_in_memory:
+            self.store_results()
+        else:
+            self.save_results_at_frequency()
+
+    def store_results(self):
+        """
+        Appends results received since the last recent call as new chunk to
+        ``{tuner.tuner_path}/results_chunks/``.
+        """
+        if self.chunks_path is not None and self.results:
+            pd.DataFrame(self.results).to_parquet(
+                self.chunks_path / _chunk_filename(self._num_chunks), index=False
+            )
+            self._num_chunks += 1
+            self.results = []
+
+    def dataframe(self) -> pd.DataFrame:
+        dfs = []
+        if self.chunks_path is not None:
+            dfs.extend(read_results_chunks(self.chunks_path))
+        if self.results:
+            dfs.append(pd.DataFrame(self.results))
+        if not dfs:
+            return pd.DataFrame()
+        return pd.concat(dfs, ignore_index=True)
+
+    def on_tuning_start(self, tuner):
+        super().on_tuning_start(tuner)
+        # Results are not written to ``results.csv.zip``
+        self.csv_file = None
+        self.chunks_path = tuner.tuner_path / RESULTS_CHUNKS_DIRNAME
+        self.chunks_path.mkdir(parents=True, exist_ok=True)
+        # If the tuner is resumed, chunks written after it was last saved are
+        # removed, since their results are not known to this object. This
+        # keeps the store consistent with the state of the tuner
+        for chunk_path in results_chunk_paths(self.chunks_path):
+            if _chunk_index(chunk_path) >= self._num_chunks:
+                chunk_path.unlink()
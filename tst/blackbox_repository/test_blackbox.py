@@ -13,6 +13,7 @@
 import tempfile
 
 import numpy as np
+import pytest
 import pandas as pd
 
 import syne_tune.config_space as sp
@@ -239,6 +240,16 @@ def test_blackbox_tabular_serialization():
                 bb2.objectives_evaluations.reshape(-1),
             )
 
+        # Memory-mapped (default) and in-memory loading give the same results
+        bb_dict3 = deserialize_tabular(tmpdirname, mmap_mode=None)
+        for key in bb_dict2.keys():
+            evals_mmap = bb_dict2[key].objectives_evaluations
+            evals_memory = bb_dict3[key].objectives_evaluations
+            assert not evals_mmap.flags.writeable
+            assert evals_memory.flags.writeable
+            np.testing.assert_array_equal(evals_mmap, evals_memory)
+        del bb_dict2, bb_dict3
+
         # blackbox.serialize(tmpdirname)
         # blackbox_deserialized = deserialize(tmpdirname)
         # for u, v in zip(x1, x2):
@@ -292,3 +303,90 @@ def test_blackbox_tabular():
     assert np.allclose(
         np.ravel(objectives_evaluations.transpose((1, 0, 2, 3))), np.ravel(y.to_numpy())
     )
+
+
+def _assert_batch_equals_single_queries(blackbox, configs, fidelities, seeds):
+    res_batch = blackbox.objective_function_batch(
+        pd.DataFrame(configs), fidelities=fidelities, seeds=seeds
+    )
+    assert res_batch.shape == (len(configs), len(fidelities), 2)
+    for config, seed, res_row in zip(configs, seeds, res_batch):
+        for fidelity, res in zip(fidelities, res_row):
+            res_single = blackbox.objective_function(
+                dict(config), fidelity={"hp_epoch": fidelity}, seed=seed
+            )
+            np.testing.assert_allclose(res, [res_single["a"], res_single["b"]])
+
+
+def test_objective_function_batch():
+    hyperparameters = pd.DataFrame(
+        data=np.stack([x1, x2]).T, columns=["hp_x1", "hp_x2"]
+    )
+    num_seeds = 3
+    objectives_evaluations = np.random.rand(n, num_seeds, n_epochs, 2)
+    blackbox_tabular = BlackboxTabular(
+        hyperparameters=hyperparameters,
+        configuration_space=cs,
+        fidelity_space=cs_fidelity,
+        objectives_evaluations=objectives_evaluations,
+        objectives_names=["a", "b"],
+    )
+    rows = np.array([7, 2, 2, 9, 0])
+    configs = hyperparameters.iloc[rows].to_dict(orient="records")
+    seeds = [0, 2, 1, 1, 0]
+    # All fidelities, configurations as array
+    res = blackbox_tabular.objective_function_batch(
+        hyperparameters.to_numpy()[rows], seeds=seeds
+    )
+    np.testing.assert_array_equal(res, objectives_evaluations[rows, seeds])
+    _assert_batch_equals_single_queries(
+        blackbox_tabular, configs, fidelities=[4, 1], seeds=seeds
+    )
+    with pytest.raises(ValueError):
+        blackbox_tabular.objective_function_batch(
+            pd.DataFrame([{"hp_x1": 0, "hp_x2": 0}])
+        )
+
+    # Offline blackbox with the same data
+    df = pd.DataFrame(
+        [
+            dict(config, hp_epoch=epoch + 1, seed=seed, a=vals[0], b=vals[1])
+            for i, config in enumerate(hyperparameters.to_dict(orient="records"))
+            for seed in range(num_seeds)
+            for epoch, vals in enumerate(objectives_evaluations[i, seed])
+        ]
+    )
+    blackbox_offline = BlackboxOffline(
+        df_evaluations=df,
+        configuration_space=cs,
+        fidelity_space=cs_fidelity,
+        objectives_names=["a", "b"],
+        seed_col="seed",
+    )
+    res = blackbox_offline.objective_function_batch(
+        hyperparameters.iloc[rows], seeds=seeds
+    )
+    np.testing.assert_array_equal(res, objectives_evaluations[rows, seeds])
+    _assert_batch_equals_single_queries(
+        blackbox_offline, configs, fidelities=[2, 5], seeds=seeds
+    )
+
+    # Default implementation of ``Blackbox``
+    def eval_fun(config, fidelity, seed):
+        i = config["hp_x1"]
+        return dict(
+            zip(["a", "b"], objectives_evaluations[i, seed, fidelity["hp_epoch"] - 1])
+        )
+
+    blackbox_function = from_function(
+        configuration_space=cs,
+        eval_fun=eval_fun,
+        fidelity_space=cs_fidelity,
+        objectives_names=["a", "b"],
+        fidelity_values=np.arange(1, n_epochs + 1),
+    )
+    res = blackbox_function.objective_function_batch(pd.DataFrame(configs), seeds=seeds)
+    np.testing.assert_array_equal(res, objectives_evaluations[rows, seeds])
+    _assert_batch_equals_single_queries(
+        blackbox_function, configs, fidelities=[3], seeds=seeds
+    )
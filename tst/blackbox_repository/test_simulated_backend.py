@@ -13,6 +13,7 @@ import numpy as np
 import pandas as pd
 
 from syne_tune.config_space import randint
+from syne_tune.blackbox_repository.blackbox import from_function
 from syne_tune.blackbox_repository.blackbox_tabular import BlackboxTabular
 from syne_tune.blackbox_repository.simulated_tabular_backend import (
     UserBlackboxBackend,
@@ -112,3 +113,39 @@ def test_pause_and_resume():
         if resource == pause_resource + 1:
             got_it[trial_id] = True
     assert all(got_it)
+
+
+def test_blackbox_from_function_backend():
+    elapsed_time_attr = "elapsed_time"
+
+    def eval_fun(config, fidelity, seed):
+        epoch = fidelity[resource_attr]
+        return {
+            "error": (config["hp_x1"] - config["hp_x2"]) ** 2 / epoch,
+            elapsed_time_attr: 0.5 * epoch,
+        }
+
+    blackbox = from_function(
+        configuration_space=cs,
+        eval_fun=eval_fun,
+        fidelity_space=cs_fidelity,
+        objectives_names=["error", elapsed_time_attr],
+        fidelity_values=list(range(1, n_epochs + 1)),
+    )
+    assert blackbox.objective_function(dict(hp_x1=3, hp_x2=1)).shape == (
+        n_epochs,
+        2,
+    )
+    backend = UserBlackboxBackend(
+        blackbox=blackbox,
+        elapsed_time_attr=elapsed_time_attr,
+    )
+    backend.time_keeper.start_of_time()
+    backend.start_trial(dict(hp_x1=3, hp_x2=1))
+    backend.time_keeper.advance(n_epochs)
+    _, results = backend.fetch_status_results(trial_ids=[0])
+    assert [result[resource_attr] for _, result in results] == list(
+        range(1, n_epochs + 1)
+    )
+    for _, result in results:
+        assert result["error"] == 4 / result[resource_attr]
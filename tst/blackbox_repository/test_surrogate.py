@@ -142,3 +142,42 @@ def test_blackbox_tabular_surrogate():
         res = blackbox.objective_function(configuration)
         assert res.shape == (num_fidelities, num_objectives)
         assert np.allclose(np.ravel(res), np.ravel(objectives_evaluations[i, 0, :, :]))
+
+
+@pytest.mark.parametrize(
+    "predict_curves, fit_differences",
+    [(True, None), (True, ["b"]), (False, None), (False, ["b"])],
+)
+def test_surrogate_objective_function_batch(predict_curves, fit_differences):
+    n = 10
+    hyperparameters = pd.DataFrame(
+        data=np.stack([np.arange(n), np.arange(n)[::-1]]).T,
+        columns=["hp_x1", "hp_x2"],
+    )
+    cs = {name: sp.randint(0, n) for name in hyperparameters.columns}
+    n_epochs = 4
+    objectives_evaluations = np.random.rand(n, 1, n_epochs, 2)
+    objectives_evaluations[..., 1] = np.cumsum(objectives_evaluations[..., 1], axis=2)
+    blackbox = add_surrogate(
+        BlackboxTabular(
+            hyperparameters=hyperparameters,
+            configuration_space=cs,
+            fidelity_space={"hp_epoch": sp.randint(1, n_epochs)},
+            objectives_evaluations=objectives_evaluations,
+            objectives_names=["a", "b"],
+        ),
+        surrogate=KNeighborsRegressor(n_neighbors=2),
+        configuration_space={name: sp.uniform(0, n) for name in cs.keys()},
+        predict_curves=predict_curves,
+        fit_differences=fit_differences,
+    )
+    configs = pd.DataFrame(
+        {"hp_x1": np.random.uniform(0, n, 6), "hp_x2": np.random.uniform(0, n, 6)}
+    )
+    for fidelities in (None, [3, 1]):
+        res_batch = blackbox.objective_function_batch(configs, fidelities=fidelities)
+        for config, res in zip(configs.to_dict(orient="records"), res_batch):
+            res_single = blackbox.objective_function(config)
+            if fidelities is not None:
+                res_single = res_single[np.array(fidelities) - 1]
+            np.testing.assert_allclose(res, res_single)
@@ -10,6 +10,9 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
+import copy
+import pickle
+
 import numpy
 import autograd.numpy as anp
 import pytest
@@ -27,7 +30,9 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.gp_regression
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.constants import (
     NOISE_VARIANCE_LOWER_BOUND,
     INVERSE_BANDWIDTHS_LOWER_BOUND,
+    OptimizationConfig,
 )
+from syne_tune.optimizer.schedulers.utils.simple_profiler import SimpleProfiler
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.gluon_blocks_helpers import (
     LogarithmScalarEncoding,
     PositiveScalarEncoding,
@@ -183,3 +188,68 @@ def test_gp_regression_2d_with_ard():
     numpy.testing.assert_almost_equal(mu_train, y_train, decimal=2)
     # Fewer decimals imposed for the test points
     numpy.testing.assert_almost_equal(mu_test, y_test, decimal=1)
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize("parallel_backend", ["thread", "process"])
+def test_gp_regression_parallel_restarts(parallel_backend):
+    random_state = numpy.random.RandomState(2718281)
+    features = random_state.uniform(size=(30, 2))
+    targets = numpy.sin(3 * features[:, 0]) + 0.1 * random_state.normal(size=30)
+    data = {"features": features, "targets": targets}
+    all_params = []
+    for num_workers in (1, 3):
+        model = GaussianProcessRegression(
+            kernel=Matern52(dimension=2, ARD=True),
+            optimization_config=OptimizationConfig(
+                lbfgs_tol=1e-6,
+                lbfgs_maxiter=50,
+                verbose=False,
+                n_starts=4,
+                num_workers=num_workers,
+                parallel_backend=parallel_backend,
+            ),
+            random_seed=31415,
+        )
+        profiler = SimpleProfiler()
+        profiler.begin_block({})
+        model.fit(data, profiler=profiler)
+        assert len(profiler.records[-1].durations["fit"]) == 1
+        all_params.append(model.get_params())
+    # Results must not depend on ``num_workers``
+    for name, value in all_params[0].items():
+        numpy.testing.assert_allclose(value, all_params[1][name], rtol=1e-10)
+
+
+@pytest.mark.timeout(30)
+def test_gp_regression_parallel_restarts_pool_kept_alive():
+    random_state = numpy.random.RandomState(2718281)
+    features = random_state.uniform(size=(20, 2))
+    targets = numpy.sin(3 * features[:, 0]) + 0.1 * random_state.normal(size=20)
+    data = {"features": features, "targets": targets}
+    model = GaussianProcessRegression(
+        kernel=Matern52(dimension=2, ARD=True),
+        optimization_config=OptimizationConfig(
+            lbfgs_tol=1e-6,
+            lbfgs_maxiter=20,
+            verbose=False,
+            n_starts=3,
+            num_workers=2,
+            parallel_backend="thread",
+        ),
+        random_seed=31415,
+    )
+    model.fit(data)
+    pool = model._restarts_pool
+    executor = pool.executor
+    model.fit(data)
+    # Workers are started only once
+    assert model._restarts_pool is pool
+    assert pool.executor is executor
+    # Copies share the workers, pickling drops them
+    assert copy.deepcopy(model)._restarts_pool is pool
+    pool_unpickled = pickle.loads(pickle.dumps(pool))
+    assert pool_unpickled._executor is None
+    assert pool_unpickled.num_workers == 2
+    model.close()
+    assert pool._executor is None
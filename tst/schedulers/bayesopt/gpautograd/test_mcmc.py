@@ -17,7 +17,9 @@ import pytest
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd import SliceException
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.slice import (
     SliceSampler,
+    BatchSliceSampler,
     slice_sampler_step_out,
+    slice_sampler_step_out_batch,
     slice_sampler_step_in,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.distribution import (
@@ -37,6 +39,9 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.mean import (
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.likelihood import (
     GaussianProcessMarginalLikelihood,
 )
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.constants import (
+    MCMCConfig,
+)
 from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.gpr_mcmc import (
     GPRegressionMCMC,
     _get_gp_hps,
@@ -161,6 +166,76 @@ def test_slice_step_in():
         slice_sampler_step_in(2.0, 10.0, log_pivot, sliced_log_density, random_state)
 
 
+@pytest.mark.timeout(10)
+def test_batch_slice_sampler_same_samples():
+    normal = Normal(0, 1)
+
+    def log_density(x):
+        return old_log_likelihood(x, normal)
+
+    def log_density_batch(x):
+        return anp.array([log_density(row) for row in x])
+
+    init_sample = anp.array([0.5, -0.2])
+    slice = SliceSampler(
+        log_density=log_density, scale=1.0, random_state=anp.random.RandomState(3)
+    )
+    samples = slice.sample(init_sample, 500, 10, 2)
+    slice_batch = BatchSliceSampler(
+        log_density_batch=log_density_batch,
+        scale=1.0,
+        random_state=anp.random.RandomState(3),
+    )
+    samples_batch = slice_batch.sample(init_sample, 500, 10, 2)
+    numpy.testing.assert_array_equal(anp.array(samples_batch), anp.array(samples))
+
+
+def test_slice_step_out_batch():
+    normal = Normal(0, 1)
+
+    def sliced_log_density(x):
+        return old_log_likelihood(anp.array([x]), normal)
+
+    def sliced_log_density_batch(x):
+        return anp.array([sliced_log_density(v) for v in x])
+
+    for scale, value in [(0.1, 1.0), (1.0, 2.5), (0.5, 0.0)]:
+        log_pivot = sliced_log_density(value)
+        bounds = slice_sampler_step_out(
+            log_pivot, scale, sliced_log_density, anp.random.RandomState(0)
+        )
+        bounds_batch = slice_sampler_step_out_batch(
+            log_pivot, scale, sliced_log_density_batch, anp.random.RandomState(0)
+        )
+        assert bounds_batch == bounds
+    log_pivot = sliced_log_density(100)
+    with pytest.raises(SliceException):
+        slice_sampler_step_out_batch(
+            log_pivot, 0.1, sliced_log_density_batch, anp.random.RandomState(0)
+        )
+
+
+@pytest.mark.timeout(20)
+def test_gp_mcmc_batch_sampling_same_samples():
+    random_state = anp.random.RandomState(0)
+    features = random_state.uniform(size=(50, 2))
+    targets = anp.sin(3 * anp.sum(features, axis=1, keepdims=True))
+    targets += 0.1 * random_state.normal(size=targets.shape)
+    data = {"features": features, "targets": targets}
+    samples = dict()
+    for batch_sampling in (False, True):
+        model = GPRegressionMCMC(
+            build_kernel=lambda: Matern52(dimension=2, ARD=True),
+            mcmc_config=MCMCConfig(n_samples=30, n_burnin=10, n_thinning=5),
+            random_seed=1,
+            batch_sampling=batch_sampling,
+        )
+        model.fit(data)
+        samples[batch_sampling] = anp.array(model.samples)
+    assert samples[True].shape == (4, 5)
+    numpy.testing.assert_allclose(samples[True], samples[False], rtol=1e-8)
+
+
 def test_get_gp_hps():
     mean = ScalarMeanFunction()
     kernel = Matern52(dimension=1)
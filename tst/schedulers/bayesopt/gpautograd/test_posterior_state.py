@@ -95,5 +95,58 @@ def test_incremental_update():
         numpy.testing.assert_almost_equal(pred_mat_incr, pred_mat_comp, decimal=2)
 
 
+@pytest.mark.timeout(10)
+def test_recompute_states_incremental():
+    random_state = numpy.random.RandomState(3141592)
+    num_data, num_pending, dimension = 20, 4, 3
+    features = random_state.uniform(size=(num_data + num_pending, dimension))
+    targets = random_state.normal(size=(num_data + num_pending, 1))
+    model = GaussianProcessRegression(kernel=Matern52(dimension=dimension))
+    model.fit({"features": features[:10], "targets": targets[:10]})
+    assert model.num_full_updates == 1
+    data_sequence = [
+        # New labeled data
+        (features[:num_data], targets[:num_data]),
+        # Add fantasy samples for pending evaluations
+        (
+            features,
+            numpy.hstack(
+                [targets, random_state.normal(size=(num_data + num_pending, 1))]
+            ),
+        ),
+        # Pending evaluations are removed again, target normalization changed
+        (features[:num_data], 2 * targets[:num_data] + 1),
+        # Some labeled data removed, new data appended
+        (features[2:num_data], targets[2:num_data]),
+    ]
+    expected_incremental = [True, True, True, False]
+    for (feats, targs), incremental in zip(data_sequence, expected_incremental):
+        num_incremental = model.num_incremental_updates
+        model.recompute_states({"features": feats, "targets": targs})
+        assert model.num_incremental_updates == num_incremental + int(incremental)
+        state = model.states[0]
+        state_comp = GaussProcPosteriorState(
+            features=feats,
+            targets=targs,
+            mean=model.likelihood.mean,
+            kernel=model.likelihood.kernel,
+            noise_variance=model.likelihood.get_noise_variance(as_ndarray=True),
+        )
+        numpy.testing.assert_allclose(
+            state.chol_fact, state_comp.chol_fact, rtol=1e-6, atol=1e-8
+        )
+        numpy.testing.assert_allclose(
+            state.pred_mat, state_comp.pred_mat, rtol=1e-6, atol=1e-8
+        )
+    # Changing the parameters forces a full recomputation
+    params = model.get_params()
+    params["noise_variance"] = 2 * params["noise_variance"]
+    model.set_params(params)
+    num_incremental = model.num_incremental_updates
+    model.recompute_states({"features": features, "targets": targets})
+    assert model.num_incremental_updates == num_incremental
+
+
 if __name__ == "__main__":
     test_incremental_update()
+    test_recompute_states_incremental()
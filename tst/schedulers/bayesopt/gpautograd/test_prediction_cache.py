@@ -0,0 +1,144 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+import numpy as np
+import pytest
+
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.kernel import Matern52
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.mean import (
+    ScalarMeanFunction,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_state import (
+    GaussProcPosteriorState,
+    backward_gradient_given_predict,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.prediction_cache import (
+    PredictionCache,
+)
+
+
+def _create_state(
+    num_data: int, dimension: int, num_fantasies: int, with_scale: bool, seed: int
+) -> GaussProcPosteriorState:
+    random_state = np.random.RandomState(seed)
+    features = random_state.uniform(size=(num_data, dimension))
+    targets = np.sin(6 * np.sum(features, axis=1, keepdims=True))
+    targets = targets + random_state.normal(scale=0.1, size=(num_data, num_fantasies))
+    mean = ScalarMeanFunction()
+    mean.collect_params().initialize()
+    mean.set_mean_value(0.3)
+    kernel = Matern52(dimension=dimension, ARD=True)
+    kernel.collect_params().initialize()
+    inv_bws = random_state.uniform(low=0.5, high=2, size=dimension)
+    kernel.set_params(
+        dict(
+            {f"inv_bw{k}": inv_bw for k, inv_bw in enumerate(inv_bws)},
+            covariance_scale=1.5,
+        )
+    )
+    if with_scale:
+        kernel = (kernel, np.array([0.7]))
+    return GaussProcPosteriorState(
+        features=features,
+        targets=targets,
+        mean=mean,
+        kernel=kernel,
+        noise_variance=np.array([0.01]),
+    )
+
+
+@pytest.mark.parametrize(
+    "num_fantasies, with_scale, with_std, batch",
+    [
+        (1, False, True, False),
+        (1, False, True, True),
+        (3, True, True, True),
+        (1, True, False, True),
+        (2, False, False, False),
+    ],
+)
+def test_backward_gradient_matches_autograd(num_fantasies, with_scale, with_std, batch):
+    dimension = 4
+    num_test = 7 if batch else 1
+    state = _create_state(
+        num_data=30,
+        dimension=dimension,
+        num_fantasies=num_fantasies,
+        with_scale=with_scale,
+        seed=31415927,
+    )
+    random_state = np.random.RandomState(2718)
+    if batch:
+        inputs = random_state.uniform(size=(num_test, dimension))
+        shape = (num_test, num_fantasies)
+    else:
+        inputs = random_state.uniform(size=dimension)
+        shape = (num_fantasies,)
+    head_gradients = {"mean": random_state.normal(size=shape)}
+    if with_std:
+        head_gradients["std"] = random_state.normal(size=shape[:-1] or (1,))
+    kwargs = dict(head_gradients=head_gradients, mean_data=0.5, std_data=2.0)
+    # Call ``predict`` first, as done in acquisition function code
+    test_features = inputs if batch else inputs.reshape((1, -1))
+    state.predict(test_features)
+    gradient = state.backward_gradient(inputs, **kwargs)
+    assert state.prediction_cache.num_hits == 1
+    gradient_expected = backward_gradient_given_predict(
+        predict_func=state.predict, input=inputs, **kwargs
+    )
+    assert gradient.shape == inputs.shape
+    np.testing.assert_allclose(gradient, gradient_expected, rtol=1e-6, atol=1e-8)
+
+
+def test_prediction_cache_hits_and_bounded():
+    cache = PredictionCache(max_size=2)
+    arrays = [np.full((3, 2), float(i)) for i in range(3)]
+    for features in arrays:
+        assert cache.get(features) is None
+        cache.put(features, (features * 2,))
+    assert len(cache) == 2
+    # Least recently used entry has been evicted
+    assert cache.get(arrays[0]) is None
+    # Same content in a different array object is a hit
+    value = cache.get(arrays[2].copy())
+    np.testing.assert_array_equal(value[0], arrays[2] * 2)
+    assert cache.statistics() == (1, 4)
+    # Entries which are too large are not stored
+    cache = PredictionCache(max_bytes=80)
+    cache.put(arrays[0], (np.zeros(10),))
+    assert len(cache) == 0
+    # Least recently used entries are evicted to stay within the byte budget
+    cache = PredictionCache(max_size=10, max_bytes=200)
+    for features in arrays:
+        cache.put(features, (features * 2,))
+    assert len(cache) == 2
+    assert cache.get(arrays[0]) is None
+    assert cache.get(arrays[1]) is not None
+
+
+def test_prediction_cache_of_posterior_state():
+    state = _create_state(
+        num_data=20, dimension=3, num_fantasies=1, with_scale=False, seed=123
+    )
+    test_features = np.random.RandomState(0).uniform(size=(5, 3))
+    means1, variances1 = state.predict(test_features)
+    means2, variances2 = state.predict(test_features.copy())
+    np.testing.assert_array_equal(means1, means2)
+    np.testing.assert_array_equal(variances1, variances2)
+    assert state.prediction_cache.statistics() == (1, 1)
+    # A new state (e.g., after fitting or updating) starts with an empty cache
+    new_state = _create_state(
+        num_data=20, dimension=3, num_fantasies=1, with_scale=False, seed=124
+    )
+    assert len(new_state.prediction_cache) == 0
+    means3, _ = new_state.predict(test_features)
+    assert not np.allclose(means1, means3)
@@ -0,0 +1,203 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+import numpy as np
+import pytest
+
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.kernel import Matern52
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.mean import (
+    ScalarMeanFunction,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_state import (
+    GaussProcPosteriorState,
+    SparseGaussProcPosteriorState,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.posterior_utils import (
+    select_inducing_points,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.gp_regression import (
+    GaussianProcessRegression,
+    SparseGaussianProcessRegression,
+)
+from syne_tune.optimizer.schedulers.searchers import GPFIFOSearcher
+from syne_tune.optimizer.schedulers.searchers.gp_searcher_factory import (
+    gp_fifo_searcher_defaults,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.datatypes.common import (
+    INTERNAL_METRIC_NAME,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.utils.comparison_gpy import (
+    Ackley,
+    sample_data,
+)
+from tst.util_test import sample_regression_data
+
+
+def test_select_inducing_points():
+    features, targets = sample_regression_data(num_data=50, dimension=3, seed=3141)
+    inducing = select_inducing_points(features, targets, num_inducing_points=10)
+    assert inducing.shape == (10, 3)
+    # First inducing input is the one with the smallest target
+    np.testing.assert_array_equal(inducing[0], features[np.argmin(targets)])
+    # Inducing inputs are distinct training inputs
+    for row in inducing:
+        assert np.any(np.all(features == row, axis=1))
+    assert np.unique(inducing, axis=0).shape[0] == 10
+    # No selection if there are not more data than inducing inputs
+    assert select_inducing_points(features, targets, 50) is features
+    # Selection stops early if inputs are duplicated
+    features = np.repeat(features[:4], 20, axis=0)
+    targets = np.repeat(targets[:4], 20, axis=0)
+    inducing = select_inducing_points(features, targets, num_inducing_points=10)
+    assert inducing.shape == (4, 3)
+
+
+@pytest.mark.parametrize("approximation", ["vfe", "fitc"])
+def test_sparse_posterior_state_all_inducing(approximation):
+    # If all training inputs are inducing inputs, the sparse approximation
+    # is exact
+    features, targets = sample_regression_data(num_data=30, dimension=2, seed=2718)
+    test_features, _ = sample_regression_data(num_data=20, dimension=2, seed=1618)
+    kernel = Matern52(dimension=2)
+    kernel.collect_params().initialize()
+    mean = ScalarMeanFunction()
+    mean.collect_params().initialize()
+    noise_variance = np.array([0.01])
+    state_exact = GaussProcPosteriorState(
+        features=features,
+        targets=targets,
+        mean=mean,
+        kernel=kernel,
+        noise_variance=noise_variance,
+    )
+    state_sparse = SparseGaussProcPosteriorState(
+        features=features,
+        targets=targets,
+        inducing_features=features,
+        mean=mean,
+        kernel=kernel,
+        noise_variance=noise_variance,
+        approximation=approximation,
+    )
+    assert state_sparse.num_data == 30
+    assert state_sparse.num_inducing_points == 30
+    np.testing.assert_allclose(
+        state_sparse.neg_log_likelihood(),
+        state_exact.neg_log_likelihood(),
+        rtol=1e-3,
+    )
+    means_exact, vars_exact = state_exact.predict(test_features)
+    means_sparse, vars_sparse = state_sparse.predict(test_features)
+    np.testing.assert_allclose(means_sparse, means_exact, rtol=1e-3, atol=1e-4)
+    np.testing.assert_allclose(vars_sparse, vars_exact, rtol=1e-3, atol=1e-4)
+
+
+@pytest.mark.timeout(20)
+@pytest.mark.parametrize("approximation", ["vfe", "fitc"])
+def test_sparse_gp_regression(approximation):
+    features, targets = sample_regression_data(num_data=400, dimension=2, seed=1234)
+    test_features, test_targets = sample_regression_data(
+        num_data=100, dimension=2, seed=4321
+    )
+    model = SparseGaussianProcessRegression(
+        kernel=Matern52(dimension=2, ARD=True),
+        num_inducing_points=50,
+        approximation=approximation,
+        random_seed=31415927,
+    )
+    data = {"features": features, "targets": targets}
+    model.fit(data)
+    state = model.states[0]
+    assert isinstance(state, SparseGaussProcPosteriorState)
+    assert state.num_inducing_points == 50
+    means, variances = model.predict(test_features)[0]
+    assert means.shape == (100,) and variances.shape == (100,)
+    rmse = np.sqrt(np.mean(np.square(means - test_targets[:, 0])))
+    assert rmse < 0.2, rmse
+    # Fantasy samples (several target columns)
+    model.recompute_states({"features": features, "targets": np.tile(targets, (1, 3))})
+    means, _ = model.predict(test_features)[0]
+    assert means.shape == (100, 3)
+    samples = model.sample_joint(test_features[:5], num_samples=4)
+    assert samples.shape == (5, 3, 4)
+    # Exact inference as long as there are few data
+    model.fit({"features": features[:40], "targets": targets[:40]})
+    assert isinstance(model.states[0], GaussProcPosteriorState)
+
+
+def test_sparse_posterior_state_backward_gradient():
+    features, targets = sample_regression_data(num_data=60, dimension=2, seed=5678)
+    model = SparseGaussianProcessRegression(
+        kernel=Matern52(dimension=2), num_inducing_points=10
+    )
+    model.recompute_states({"features": features, "targets": targets})
+    state = model.states[0]
+    assert isinstance(state, SparseGaussProcPosteriorState)
+    inputs, _ = sample_regression_data(num_data=4, dimension=2, seed=8765)
+    head_gradients = {"mean": np.ones(4), "std": np.ones(4)}
+    grad_batch = state.backward_gradient(inputs, head_gradients, 0.0, 1.0)
+    for i in range(4):
+        grad_single = state.backward_gradient(
+            inputs[i], {"mean": np.ones(1), "std": np.ones(1)}, 0.0, 1.0
+        )
+        np.testing.assert_allclose(grad_batch[i], grad_single.reshape((-1,)))
+    # Compare against finite differences
+    eps = 1e-6
+    input = inputs[0]
+
+    def criterion(x):
+        mean, variance = state.predict(x.reshape((1, -1)))
+        return mean[0, 0] + np.sqrt(variance[0])
+
+    grad_single = state.backward_gradient(
+        input, {"mean": np.ones(1), "std": np.ones(1)}, 0.0, 1.0
+    ).reshape((-1,))
+    for j in range(2):
+        delta = np.zeros(2)
+        delta[j] = eps
+        fd = (criterion(input + delta) - criterion(input - delta)) / (2 * eps)
+        np.testing.assert_allclose(grad_single[j], fd, rtol=1e-4, atol=1e-6)
+
+
+@pytest.mark.timeout(20)
+def test_gp_fifo_searcher_sparse_gp():
+    _, searcher_options, _ = gp_fifo_searcher_defaults()
+    num_data = searcher_options["num_init_random"] + 8
+    data = sample_data(Ackley, num_train=num_data, num_grid=5)
+    searcher_options.update(
+        config_space=data["state"].hp_ranges.config_space,
+        scheduler="fifo",
+        random_seed=894623209,
+        metric="accuracy",
+        mode="min",
+        debug_log=False,
+        gp_approximation="vfe",
+        gp_num_inducing_points=6,
+    )
+    searcher = GPFIFOSearcher(**searcher_options)
+    config_for_trial = data["state"].config_for_trial
+    for ev in data["state"].trials_evaluations:
+        searcher._update(
+            ev.trial_id,
+            config_for_trial[ev.trial_id],
+            {"accuracy": ev.metrics[INTERNAL_METRIC_NAME]},
+        )
+    config = searcher.get_config()
+    assert config is not None
+    gpmodel = searcher.state_transformer.model_factory.gpmodel
+    assert isinstance(gpmodel, SparseGaussianProcessRegression)
+    assert not isinstance(gpmodel, GaussianProcessRegression)
+    model = searcher.state_transformer.model()
+    assert all(
+        isinstance(state, SparseGaussProcPosteriorState)
+        for state in model.posterior_states
+    )
@@ -0,0 +1,155 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import numpy as np
+import pytest
+
+from syne_tune.optimizer.schedulers.searchers import GPFIFOSearcher
+from syne_tune.optimizer.schedulers.searchers.gp_searcher_factory import (
+    gp_fifo_searcher_defaults,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.datatypes.common import (
+    INTERNAL_METRIC_NAME,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.utils.comparison_gpy import (
+    Ackley,
+    sample_data,
+)
+
+
+def _create_searcher(data: dict, **kwargs) -> GPFIFOSearcher:
+    _, searcher_options, _ = gp_fifo_searcher_defaults()
+    searcher_options.update(
+        config_space=data["state"].hp_ranges.config_space,
+        scheduler="fifo",
+        random_seed=894623209,
+        metric="accuracy",
+        mode="min",
+        debug_log=False,
+        **kwargs,
+    )
+    return GPFIFOSearcher(**searcher_options)
+
+
+def _update_searcher(searcher: GPFIFOSearcher, data: dict, start: int, end: int):
+    state = data["state"]
+    for ev in state.trials_evaluations[start:end]:
+        searcher._update(
+            ev.trial_id,
+            state.config_for_trial[ev.trial_id],
+            {"accuracy": ev.metrics[INTERNAL_METRIC_NAME]},
+        )
+
+
+def _wait_for_background_fitting(searcher: GPFIFOSearcher):
+    # Refits which finish may trigger new ones, if data changed in between
+    state_transformer = searcher.state_transformer
+    while state_transformer._fit_jobs:
+        for future, _ in list(state_transformer._fit_jobs.values()):
+            future.result()
+        state_transformer.model()
+
+
+def _block_background_fitting(searcher: GPFIFOSearcher) -> threading.Event:
+    # Refits are queued behind a job which waits for the event. A timeout
+    # avoids the worker thread blocking forever if the test fails
+    state_transformer = searcher.state_transformer
+    if state_transformer._fit_executor is None:
+        state_transformer._fit_executor = ThreadPoolExecutor(max_workers=1)
+    event = threading.Event()
+    state_transformer._fit_executor.submit(event.wait, 20)
+    return event
+
+
+@pytest.mark.timeout(30)
+def test_background_fitting_same_params_as_synchronous():
+    data = sample_data(Ackley, num_train=20, num_grid=5)
+    searcher_sync = _create_searcher(data)
+    searcher_background = _create_searcher(data, opt_background_fitting=True)
+    for searcher in (searcher_sync, searcher_background):
+        _update_searcher(searcher, data, 0, 20)
+    searcher_sync.state_transformer.model()
+    assert searcher_sync.model_staleness() == 0
+    _wait_for_background_fitting(searcher_background)
+    assert searcher_background.model_staleness() == 0
+    assert searcher_background.state_transformer.model_params_fitted()
+    params_sync = searcher_sync.model_parameters()
+    params_background = searcher_background.model_parameters()
+    for name, value in params_sync.items():
+        np.testing.assert_allclose(params_background[name], value, rtol=1e-6)
+
+
+@pytest.mark.timeout(30)
+def test_background_fitting_staleness():
+    data = sample_data(Ackley, num_train=20, num_grid=5)
+    searcher = _create_searcher(data, opt_background_fitting=True)
+    state_transformer = searcher.state_transformer
+    event = _block_background_fitting(searcher)
+    _update_searcher(searcher, data, 0, 12)
+    # Posterior is computed with initial parameters
+    state_transformer.model()
+    assert not state_transformer.model_params_fitted()
+    assert searcher.model_staleness() == 12
+    # Only one refit is running at any time
+    assert len(state_transformer._fit_jobs) == 1
+    event.set()
+    _wait_for_background_fitting(searcher)
+    state_transformer.model()
+    assert searcher.model_staleness() == 0
+    # New data triggers a refit, and the model is stale until it finished
+    event = _block_background_fitting(searcher)
+    _update_searcher(searcher, data, 12, 15)
+    state_transformer.model()
+    assert searcher.model_staleness() == 3
+    event.set()
+    _wait_for_background_fitting(searcher)
+    assert searcher.model_staleness() == 0
+
+
+@pytest.mark.timeout(30)
+def test_background_fitting_random_fallback():
+    data = sample_data(Ackley, num_train=20, num_grid=5)
+    searcher = _create_searcher(
+        data,
+        opt_background_fitting=True,
+        opt_background_random_fallback=True,
+        num_init_random=2,
+    )
+    event = _block_background_fitting(searcher)
+    _update_searcher(searcher, data, 0, 10)
+    exclusion_candidates = searcher._get_exclusion_candidates()
+    assert searcher._should_pick_random_config(exclusion_candidates)
+    assert searcher.get_config() is not None
+    event.set()
+    _wait_for_background_fitting(searcher)
+    assert not searcher._should_pick_random_config(exclusion_candidates)
+
+
+def test_background_fitting_not_with_worker_processes():
+    data = sample_data(Ackley, num_train=5, num_grid=5)
+    with pytest.raises(AssertionError):
+        _create_searcher(
+            data,
+            opt_background_fitting=True,
+            opt_num_workers=2,
+            opt_parallel_backend="process",
+        )
+    searcher = _create_searcher(
+        data,
+        opt_background_fitting=True,
+        opt_num_workers=2,
+        opt_parallel_backend="thread",
+    )
+    assert searcher.state_transformer.background_fitting
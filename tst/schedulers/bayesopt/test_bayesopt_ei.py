@@ -41,6 +41,7 @@ from syne_tune.optimizer.schedulers.searchers.bayesopt.models.gp_mcmc_model impo
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.tuning_algorithms.bo_algorithm_components import (
     LBFGSOptimizeAcquisition,
+    BatchedGradientOptimizeAcquisition,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.utils.test_objects import (
     default_gpmodel,
@@ -296,6 +297,47 @@ def test_value_same_as_with_gradient():
         np.testing.assert_almost_equal(vec1, vec2)
 
 
+@pytest.mark.timeout(10)
+def test_gradient_batch_same_as_single():
+    for model in default_models():
+        ei = EIAcquisitionFunction(model)
+
+        random = np.random.RandomState(42)
+        X = np.vstack(
+            [
+                random.uniform(low=0.0, high=1.0, size=(5, 2)),
+                random.uniform(low=0.0, high=0.02, size=(5, 2)),
+            ]
+        )
+        fvals, gradients = ei.compute_acq_with_gradient_batch(X)
+        assert fvals.shape == (10,) and gradients.shape == (10, 2)
+        for x, fval, gradient in zip(X, fvals, gradients):
+            f0, analytical_gradient = ei.compute_acq_with_gradient(x)
+            np.testing.assert_almost_equal(fval, f0)
+            np.testing.assert_almost_equal(gradient, analytical_gradient.flatten())
+
+
+@pytest.mark.timeout(10)
+def test_batched_optimization_improves():
+    random = np.random.RandomState(42)
+    for model in default_models():
+        ei = EIAcquisitionFunction(model)
+        hp_ranges = model.hp_ranges_for_prediction()
+        opt = BatchedGradientOptimizeAcquisition(
+            hp_ranges, model, EIAcquisitionFunction, batch_size=10
+        )
+        initial_points = random.uniform(low=0.0, high=0.1, size=(10, 2))
+        acq0 = ei.compute_acq(initial_points)
+        optimized = opt.optimize_batch(
+            [hp_ranges.from_ndarray(x) for x in initial_points]
+        )
+        acq_opt = ei.compute_acq(hp_ranges.to_ndarray_matrix(optimized))
+        np.testing.assert_almost_equal(acq_opt, opt.acquisition_values)
+        assert all(acq_opt <= acq0)
+        assert np.all(acq_opt[acq0 != 0] < acq0[acq0 != 0])
+        assert opt.num_evaluations > 1
+
+
 if __name__ == "__main__":
     test_optimization_improves()
     test_numerical_gradient()
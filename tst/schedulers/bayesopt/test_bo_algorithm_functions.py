@@ -10,9 +10,19 @@
 # on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
+import numpy as np
+
 from syne_tune.optimizer.schedulers.searchers.bayesopt.tuning_algorithms.bo_algorithm import (
     _pick_from_locally_optimized,
     _lazily_locally_optimize,
+    _order_encoded_candidates,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.tuning_algorithms.base_classes import (
+    ScoringFunction,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.tuning_algorithms.common import (
+    ExclusionList,
+    unique_encoded_candidates,
 )
 from syne_tune.optimizer.schedulers.searchers.bayesopt.tuning_algorithms.bo_algorithm_components import (
     NoOptimization,
@@ -122,3 +132,35 @@ def test_lazily_locally_optimize():
         )
         == 0
     )
+
+
+class SumOfFeaturesScore(ScoringFunction):
+    def score_encoded(self, inputs, model=None):
+        return np.sum(inputs, axis=1)
+
+
+def test_order_encoded_candidates():
+    hp_ranges = make_hyperparameter_ranges(
+        {"a": randint(0, 3), "b": choice(["a", "c", "d"])}
+    )
+    configs = tuples_to_configs(
+        [(1, "d"), (0, "a"), (3, "c"), (0, "a"), (2, "d"), (1, "d")], hp_ranges
+    )
+    inputs = unique_encoded_candidates(hp_ranges.to_ndarray_matrix(configs))
+    # Duplicates are removed, order of first occurrences is maintained
+    assert inputs.shape[0] == 4
+    assert [hp_ranges.from_ndarray(row) for row in inputs] == configs[:3] + [configs[4]]
+    exclusion_list = ExclusionList.empty_list(hp_ranges)
+    exclusion_list.add(configs[2])
+    candidates, scores = _order_encoded_candidates(
+        inputs,
+        SumOfFeaturesScore(),
+        hp_ranges=hp_ranges,
+        exclusion_candidates=exclusion_list,
+        model=None,
+    )
+    # Candidates are sorted by score, and those in the exclusion list are
+    # skipped
+    assert list(candidates) == [configs[1], configs[0], configs[4]]
+    assert len(scores) == 4
+    assert np.all(np.diff(scores) >= 0)
@@ -11,6 +11,7 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 from typing import List, Set, Tuple
+import numpy as np
 import pytest
 
 from syne_tune.optimizer.schedulers.searchers.bayesopt.datatypes.common import (
@@ -31,9 +32,14 @@ from syne_tune.optimizer.schedulers.searchers.utils.hp_ranges_factory import (
     make_hyperparameter_ranges,
 )
 from syne_tune.config_space import randint, choice
+from syne_tune.optimizer.schedulers.searchers import GPFIFOSearcher
+from syne_tune.optimizer.schedulers.searchers.gp_searcher_factory import (
+    gp_fifo_searcher_defaults,
+)
 from syne_tune.optimizer.schedulers.searchers.bayesopt.utils.test_objects import (
     create_tuning_job_state,
     create_exclusion_set,
+    tuples_to_configs,
 )
 
 
@@ -48,14 +54,14 @@ def hp_ranges():
     "observed_data,failed_tuples,pending_tuples,expected",
     [
         ([], [], [], set()),
-        ([((123, "a"), 9.87)], [], [], {"hp1:123,hp2:0"}),
-        ([], [(123, "a")], [], {"hp1:123,hp2:0"}),
-        ([], [], [(123, "a")], {"hp1:123,hp2:0"}),
+        ([((123, "a"), 9.87)], [], [], {(123, "a")}),
+        ([], [(123, "a")], [], {(123, "a")}),
+        ([], [], [(123, "a")], {(123, "a")}),
         (
             [((1, "a"), 9.87)],
             [(2, "b")],
             [(3, "c")],
-            {"hp1:1,hp2:0", "hp1:2,hp2:1", "hp1:3,hp2:2"},
+            {(1, "a"), (2, "b"), (3, "c")},
         ),
     ],
 )
@@ -64,7 +70,7 @@ def test_compute_blacklisted_candidates(
     observed_data: List[Tuple],
     failed_tuples: List[Tuple],
     pending_tuples: List[Tuple],
-    expected: Set[str],
+    expected: Set[Tuple],
 ):
     if observed_data:
         cand_tuples, metrics = zip(*observed_data)
@@ -81,7 +87,35 @@ def test_compute_blacklisted_candidates(
         failed_tuples=failed_tuples,
     )
     actual = ExclusionList(state)
-    assert set(expected) == actual.excl_set
+    assert len(actual) == len(expected)
+    for config_tpl in expected:
+        assert actual.contains(hp_ranges.tuple_to_config(config_tpl))
+    assert not actual.contains(hp_ranges.tuple_to_config((200, "a")))
+
+
+def test_exclusion_list_copy_on_write(hp_ranges: HyperparameterRanges):
+    configs = tuples_to_configs([(i, "a") for i in range(6)], hp_ranges)
+    exclusion_list = create_exclusion_set(configs[:2], hp_ranges, is_dict=True)
+    exclusion_copy = exclusion_list.copy()
+    exclusion_copy.add(configs[2])
+    assert len(exclusion_copy) == 3 and len(exclusion_list) == 2
+    assert exclusion_copy.contains(configs[0])
+    assert not exclusion_list.contains(configs[2])
+    # Modifying the original must not affect the copy
+    exclusion_list.add(configs[3])
+    assert exclusion_list.contains(configs[3])
+    assert not exclusion_copy.contains(configs[3])
+    second_copy = exclusion_copy.copy()
+    second_copy.add(configs[4])
+    exclusion_copy.add(configs[5])
+    assert all(second_copy.contains(config) for config in configs[:3])
+    assert second_copy.contains(configs[4]) and not second_copy.contains(configs[5])
+    assert exclusion_copy.contains(configs[5]) and not exclusion_copy.contains(
+        configs[4]
+    )
+    # Adding an entry twice does not change the size
+    exclusion_copy.add(configs[0])
+    assert len(exclusion_copy) == 4
 
 
 def _assert_no_duplicates(
@@ -123,3 +157,55 @@ def test_generate_unique_candidates(num_unique_candidates, num_requested_candida
         num_unique_candidates - len(excluded), num_requested_candidates
     )
     _assert_no_duplicates(candidates, hp_ranges)
+
+
+def test_exclusion_candidates_of_searcher_maintained_incrementally():
+    config_space = {"hp1": randint(0, 200), "hp2": choice(["a", "b", "c"])}
+    _, searcher_options, _ = gp_fifo_searcher_defaults()
+    searcher_options.update(
+        config_space=config_space,
+        scheduler="fifo",
+        random_seed=31415927,
+        metric="accuracy",
+        mode="min",
+        debug_log=False,
+    )
+    searcher = GPFIFOSearcher(**searcher_options)
+
+    def filter_observed_data(config: Configuration) -> bool:
+        return config["hp1"] % 3 != 0
+
+    searcher._filter_observed_data = filter_observed_data
+    random_state = np.random.RandomState(2718281)
+    running_trials = dict()
+    all_configs = []
+    for trial in range(300):
+        if len(running_trials) < 4 or random_state.rand() < 0.3:
+            # Few distinct configs, so there are duplicates
+            config = {
+                "hp1": int(random_state.randint(30)),
+                "hp2": str(random_state.choice(["a", "b", "c"])),
+            }
+            trial_id = str(trial)
+            searcher.register_pending(trial_id, config=config)
+            running_trials[trial_id] = config
+            all_configs.append(config)
+        else:
+            trial_id = str(random_state.choice(sorted(running_trials.keys())))
+            config = running_trials.pop(trial_id)
+            if random_state.rand() < 0.2:
+                searcher.evaluation_failed(trial_id)
+            else:
+                searcher._update(trial_id, config, {"accuracy": random_state.rand()})
+        if trial % 7 == 0:
+            state = searcher.state_transformer.state
+            actual = searcher._get_exclusion_candidates()
+            expected = ExclusionList(state, filter_observed_data=filter_observed_data)
+            assert len(actual) == len(expected)
+            for config in all_configs:
+                assert actual.contains(config) == expected.contains(config)
+            # Entries added to the result are not added to the searcher
+            actual.add({"hp1": 100, "hp2": "a"})
+            assert not searcher._get_exclusion_candidates().contains(
+                {"hp1": 100, "hp2": "a"}
+            )
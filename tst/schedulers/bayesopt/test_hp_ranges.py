@@ -460,3 +460,43 @@ def test_encoded_ranges():
     assert encoded_ranges["7"] == (14, 15)
     assert encoded_ranges["8"] == (15, 16)
     assert encoded_ranges["9"] == (16, 17)
+
+
+@pytest.mark.parametrize("value_for_last_pos", [None, 9])
+def test_random_ndarray_matrix(value_for_last_pos):
+    random_state = np.random.RandomState(0)
+    hp_ranges = make_hyperparameter_ranges(
+        {
+            "0": uniform(1.0, 1000.0),
+            "1": loguniform(1.0, 1000.0),
+            "2": reverseloguniform(0.9, 0.9999),
+            "3": randint(1, 1000),
+            "4": lograndint(1, 1000),
+            "5": choice(["a", "b", "c"]),
+            "6": choice([1, 2]),
+            "7": ordinal(["a", "b", "c"]),
+            "8": logordinal([1, 10, 100]),
+            "9": finrange(0.1, 1.0, 10),
+            "10": logfinrange(1, 64, 7, cast_int=True),
+            "r": randint(1, 27),
+        },
+        name_last_pos="r",
+        value_for_last_pos=value_for_last_pos,
+    )
+    num_configs = 200
+    # Vectorized encoding must be the same as encoding configs one by one
+    configs = hp_ranges.random_configs(random_state, num_configs)
+    features = hp_ranges.to_ndarray_matrix(configs)
+    features_compare = np.vstack([hp_ranges.to_ndarray(config) for config in configs])
+    assert_allclose(features, features_compare)
+    # Rows of sampled matrix must be encodings of configs
+    features = hp_ranges.random_ndarray_matrix(random_state, num_configs)
+    assert features.shape == (num_configs, hp_ranges.ndarray_size)
+    configs = [hp_ranges.from_ndarray(row) for row in features]
+    assert_allclose(hp_ranges.to_ndarray_matrix(configs), features)
+    if value_for_last_pos is not None:
+        assert all(config["r"] == value_for_last_pos for config in configs)
+    assert hp_ranges.random_ndarray_matrix(random_state, 0).shape == (
+        0,
+        hp_ranges.ndarray_size,
+    )
@@ -0,0 +1,127 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+import numpy as np
+import pytest
+
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.gp_regression import (
+    GaussianProcessRegression,
+    SparseGaussianProcessRegression,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.gpautograd.kernel import Matern52
+from syne_tune.optimizer.schedulers.searchers import GPFIFOSearcher
+from syne_tune.optimizer.schedulers.searchers.gp_searcher_factory import (
+    gp_fifo_searcher_defaults,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.datatypes.common import (
+    INTERNAL_METRIC_NAME,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.models.meanstd_acqfunc_impl import (
+    EIAcquisitionFunction,
+)
+from syne_tune.optimizer.schedulers.searchers.bayesopt.utils.comparison_gpy import (
+    Ackley,
+    sample_data,
+)
+from tst.util_test import sample_regression_data
+
+
+@pytest.mark.timeout(10)
+@pytest.mark.parametrize("sparse", [False, True])
+def test_predict_float32(sparse):
+    features, targets = sample_regression_data(num_data=200, dimension=3, seed=31415)
+    test_features, _ = sample_regression_data(num_data=1000, dimension=3, seed=27182)
+    kernel = Matern52(dimension=3, ARD=True)
+    if sparse:
+        model = SparseGaussianProcessRegression(kernel=kernel, num_inducing_points=50)
+    else:
+        model = GaussianProcessRegression(kernel=kernel)
+    model.fit({"features": features, "targets": targets})
+    state = model.states[0]
+    if state._state_kwargs_float32() is None:
+        pytest.skip("Posterior state too ill-conditioned for float32")
+    means64, vars64 = model.predict(test_features)[0]
+    means32, vars32 = model.predict(test_features.astype(np.float32))[0]
+    assert means32.dtype == np.float64 and vars32.dtype == np.float64
+    np.testing.assert_allclose(means32, means64, rtol=1e-3, atol=1e-3)
+    np.testing.assert_allclose(vars32, vars64, rtol=1e-2, atol=1e-5)
+
+
+def test_predict_float32_falls_back_if_ill_conditioned():
+    features, targets = sample_regression_data(num_data=50, dimension=2, seed=1234)
+    model = GaussianProcessRegression(kernel=Matern52(dimension=2))
+    # Very small noise variance and a large bandwidth make the Cholesky factor
+    # ill-conditioned
+    model.set_params(dict(model.get_params(), noise_variance=1e-9, kernel_inv_bw=0.01))
+    model.recompute_states({"features": features, "targets": targets})
+    state = model.states[0]
+    assert state._state_kwargs_float32() is None
+    features32 = features.astype(np.float32)
+    means64, vars64 = model.predict(features32.astype(np.float64))[0]
+    means32, vars32 = model.predict(features32)[0]
+    np.testing.assert_array_equal(means32, means64)
+    np.testing.assert_array_equal(vars32, vars64)
+
+
+def _create_searcher(prediction_precision: str, data: dict) -> GPFIFOSearcher:
+    _, searcher_options, _ = gp_fifo_searcher_defaults()
+    searcher_options.update(
+        config_space=data["state"].hp_ranges.config_space,
+        scheduler="fifo",
+        random_seed=894623209,
+        metric="accuracy",
+        mode="min",
+        debug_log=False,
+        prediction_precision=prediction_precision,
+    )
+    searcher = GPFIFOSearcher(**searcher_options)
+    config_for_trial = data["state"].config_for_trial
+    for ev in data["state"].trials_evaluations:
+        searcher._update(
+            ev.trial_id,
+            config_for_trial[ev.trial_id],
+            {"accuracy": ev.metrics[INTERNAL_METRIC_NAME]},
+        )
+    return searcher
+
+
+@pytest.mark.timeout(30)
+def test_selected_candidates_float32_vs_float64():
+    data = sample_data(Ackley, num_train=30, num_grid=5)
+    random_state = np.random.RandomState(2345)
+    searchers = {
+        precision: _create_searcher(precision, data)
+        for precision in ("float64", "float32")
+    }
+    scores = dict()
+    for precision, searcher in searchers.items():
+        model = searcher.state_transformer.model()
+        hp_ranges = model.hp_ranges_for_prediction()
+        inputs = hp_ranges.random_ndarray_matrix(random_state, 5000)
+        random_state = np.random.RandomState(2345)
+        scores[precision] = EIAcquisitionFunction(model).compute_acq(inputs)
+    # Make sure that reduced precision is not switched off
+    state = searchers["float32"].state_transformer.model().posterior_states[0]
+    assert state._state_kwargs_float32() is not None
+    np.testing.assert_allclose(
+        scores["float32"], scores["float64"], rtol=1e-3, atol=1e-5
+    )
+    top64 = np.argsort(scores["float64"])[:10]
+    top32 = np.argsort(scores["float32"])[:10]
+    assert top64[0] == top32[0]
+    assert len(set(top64).intersection(top32)) >= 8
+    # Local optimization runs in float64, so the configs selected are the same
+    configs = {
+        precision: searcher.get_config() for precision, searcher in searchers.items()
+    }
+    for name, value in configs["float64"].items():
+        assert value == pytest.approx(configs["float32"][name], rel=1e-4)
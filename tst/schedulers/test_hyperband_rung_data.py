@@ -0,0 +1,197 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from syne_tune.optimizer.schedulers.hyperband_stopping import (
+    RungData,
+    StoppingRungSystem,
+    quantile_cutoff,
+)
+from syne_tune.optimizer.schedulers.hyperband_promotion import PromotionRungSystem
+from syne_tune.optimizer.schedulers.hyperband_pasha import PASHARungSystem
+from syne_tune.optimizer.schedulers.hyperband_rush import (
+    RUSHPromotionRungSystem,
+    RUSHStoppingRungSystem,
+)
+from syne_tune.optimizer.schedulers.hyperband_cost_promotion import (
+    CostPromotionRungSystem,
+)
+
+
+def _random_values(random_state, size, with_ties):
+    if with_ties:
+        return list(random_state.randint(0, 5, size=size) * 0.25)
+    else:
+        return list(random_state.randn(size))
+
+
+@pytest.mark.parametrize("mode", ["min", "max"])
+@pytest.mark.parametrize("with_ties", [False, True])
+def test_rung_data_quantile_and_best_paused(mode, with_ties):
+    random_state = np.random.RandomState(31415927)
+    sign = 1 if mode == "max" else -1
+    data = RungData(mode)
+    reference = dict()
+    values = _random_values(random_state, 60, with_ties)
+    for trial_id, value in enumerate(values):
+        record = (value, bool(random_state.rand() < 0.3))
+        data[str(trial_id)] = record
+        reference[str(trial_id)] = record
+        if random_state.rand() < 0.2:
+            # Mark some trial as promoted
+            paused = [k for k, v in reference.items() if not v[1]]
+            if paused:
+                k = paused[random_state.randint(len(paused))]
+                data[k] = (data[k][0], True)
+                reference[k] = (reference[k][0], True)
+        all_values = [v[0] for v in reference.values()]
+        for prom_quant in [0.0, 0.1, 1 / 3, 0.5, 0.75, 1.0]:
+            assert data.quantile_cutoff(prom_quant) == quantile_cutoff(
+                all_values, prom_quant, mode
+            )
+        best_paused = data.best_paused_trial()
+        ref_id, ref_val = max(
+            ((k, v[0]) for k, v in reference.items() if not v[1]),
+            key=lambda x: sign * x[1],
+            default=(None, None),
+        )
+        if ref_id is None:
+            assert best_paused is None
+        else:
+            assert best_paused == (ref_id, ref_val)
+        ref_sorted = sorted(reference.items(), key=lambda x: -sign * x[1][0])
+        assert list(data.sorted_items()) == ref_sorted
+    assert data == reference
+
+
+def test_rung_data_copy_and_removal():
+    data = RungData("min")
+    for trial_id, value in enumerate([3.0, 1.0, 2.0, 1.0]):
+        data[str(trial_id)] = (value, False)
+    for other in [copy.deepcopy(data), pickle.loads(pickle.dumps(data))]:
+        assert isinstance(other, RungData)
+        assert other == data
+        assert other.best_paused_trial() == ("1", 1.0)
+        assert list(other.sorted_items()) == list(data.sorted_items())
+    del data["1"]
+    assert data.best_paused_trial() == ("3", 1.0)
+    assert data.pop("3") == (1.0, False)
+    assert data.best_paused_trial() == ("2", 2.0)
+    assert data.quantile_cutoff(0.5) == 2.5
+    data["4"] = (float("nan"), False)
+    assert data.has_nan
+    del data["4"]
+    assert not data.has_nan
+    data.clear()
+    assert data.best_paused_trial() is None and data.quantile_cutoff(0.5) is None
+
+
+def _make_rung_system(name, mode):
+    kwargs = dict(
+        rung_levels=[1, 3, 9, 27],
+        promote_quantiles=[1 / 3] * 4,
+        metric="metric",
+        mode=mode,
+        resource_attr="epoch",
+    )
+    if name == "stopping":
+        return StoppingRungSystem(**kwargs)
+    if name == "rush_stopping":
+        return RUSHStoppingRungSystem(**kwargs, num_threshold_candidates=2)
+    kwargs["max_t"] = 81
+    if name == "promotion":
+        return PromotionRungSystem(**kwargs)
+    if name == "rush_promotion":
+        return RUSHPromotionRungSystem(**kwargs, num_threshold_candidates=2)
+    if name == "pasha":
+        return PASHARungSystem(
+            **kwargs, ranking_criterion="soft_ranking", epsilon=0.1, epsilon_scaling=1
+        )
+    assert name == "cost_promotion"
+    return CostPromotionRungSystem(**kwargs, cost_attr="cost")
+
+
+def _run_rung_system(rung_system, seed, with_ties):
+    """
+    Simulates an asynchronous scheduler driving ``rung_system``, returning
+    all decisions taken.
+    """
+    random_state = np.random.RandomState(seed)
+    decisions = []
+    running = dict()  # trial_id -> milestone
+    num_trials = 0
+    for _ in range(400):
+        if len(running) < 4:
+            ret_dict = rung_system.on_task_schedule()
+            decisions.append(ret_dict)
+            if ret_dict:
+                trial_id = ret_dict["trial_id"]
+                rung_system.on_task_add(
+                    trial_id,
+                    skip_rungs=0,
+                    new_config=False,
+                    milestone=ret_dict["milestone"],
+                    resume_from=ret_dict["resume_from"],
+                )
+                running[trial_id] = ret_dict["milestone"]
+            else:
+                trial_id = str(num_trials)
+                num_trials += 1
+                rung_system.on_task_add(trial_id, skip_rungs=0, new_config=True)
+                running[trial_id] = rung_system.get_first_milestone(skip_rungs=0)
+        trial_id = list(running.keys())[random_state.randint(len(running))]
+        milestone = running[trial_id]
+        value = _random_values(random_state, 1, with_ties)[0]
+        result = dict(epoch=milestone, metric=value, cost=random_state.rand())
+        ret_dict = rung_system.on_task_report(trial_id, result, skip_rungs=0)
+        decisions.append(ret_dict)
+        next_milestone = ret_dict["next_milestone"]
+        if ret_dict["task_continues"] and next_milestone is not None:
+            running[trial_id] = next_milestone
+        else:
+            del running[trial_id]
+            if rung_system.does_pause_resume():
+                rung_system.on_task_remove(trial_id)
+    return decisions
+
+
+@pytest.mark.timeout(20)
+@pytest.mark.parametrize(
+    "name",
+    [
+        "stopping",
+        "rush_stopping",
+        "promotion",
+        "rush_promotion",
+        "pasha",
+        "cost_promotion",
+    ],
+)
+@pytest.mark.parametrize("mode", ["min", "max"])
+@pytest.mark.parametrize("with_ties", [False, True])
+def test_rung_data_same_decisions_as_dict(name, mode, with_ties):
+    seed = 2718281
+    rung_system = _make_rung_system(name, mode)
+    decisions = _run_rung_system(rung_system, seed, with_ties)
+    # Plain dictionaries trigger the code which scans all entries
+    rung_system_dict = _make_rung_system(name, mode)
+    for rung in rung_system_dict._rungs:
+        rung.data = dict()
+    decisions_dict = _run_rung_system(rung_system_dict, seed, with_ties)
+    assert decisions == decisions_dict
+    for rung, rung_dict in zip(rung_system._rungs, rung_system_dict._rungs):
+        assert rung.data == rung_dict.data
@@ -0,0 +1,122 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from syne_tune.backend.trial_status import Trial
+from syne_tune.config_space import uniform
+from syne_tune.optimizer.scheduler import SchedulerDecision
+from syne_tune.optimizer.schedulers import FIFOScheduler
+from syne_tune.optimizer.schedulers.median_stopping_rule import MedianStoppingRule
+
+
+class ReferenceMedianStoppingRule(MedianStoppingRule):
+    """
+    Previous implementation of :meth:`on_trial_result`, using sorted arrays.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sorted_results = defaultdict(list)
+
+    def on_trial_result(self, trial: Trial, result: dict) -> str:
+        new_metric = result[self.metric]
+        if self.mode == "max":
+            new_metric *= -1
+        time_step = result[self.resource_attr]
+        if self.running_average:
+            self.trial_to_results[trial.trial_id].append(new_metric)
+            new_metric = np.mean(self.trial_to_results[trial.trial_id])
+        index = np.searchsorted(self.sorted_results[time_step], new_metric)
+        self.sorted_results[time_step] = np.insert(
+            self.sorted_results[time_step], index, new_metric
+        )
+        normalized_rank = index / float(len(self.sorted_results[time_step]))
+        if (
+            self.grace_condition(time_step=time_step)
+            or normalized_rank <= self.rank_cutoff
+        ):
+            return self.scheduler.on_trial_result(trial=trial, result=result)
+        else:
+            return SchedulerDecision.STOP
+
+
+def _make_scheduler(scheduler_cls, mode, running_average, **kwargs):
+    config_space = {"x": uniform(0, 1), "epochs": 10}
+    return scheduler_cls(
+        scheduler=FIFOScheduler(
+            config_space, searcher="random", metric="metric", mode=mode
+        ),
+        resource_attr="epoch",
+        running_average=running_average,
+        **kwargs,
+    )
+
+
+def _decisions(scheduler, seed):
+    random_state = np.random.RandomState(seed)
+    decisions = []
+    for trial_id in range(40):
+        trial = Trial(trial_id=trial_id, config=dict(), creation_time=datetime.now())
+        for epoch in range(1, 11):
+            result = dict(epoch=epoch, metric=random_state.randint(20) * 0.1)
+            decision = scheduler.on_trial_result(trial, result)
+            decisions.append(decision)
+            if decision == SchedulerDecision.STOP:
+                break
+    return decisions
+
+
+@pytest.mark.parametrize("mode", ["min", "max"])
+@pytest.mark.parametrize("running_average", [True, False])
+def test_median_stopping_rule_same_as_before(mode, running_average):
+    seed = 2718281
+    decisions = _decisions(
+        _make_scheduler(MedianStoppingRule, mode, running_average), seed
+    )
+    ref_decisions = _decisions(
+        _make_scheduler(ReferenceMedianStoppingRule, mode, running_average), seed
+    )
+    assert SchedulerDecision.STOP in decisions
+    assert decisions == ref_decisions
+
+
+def test_median_stopping_rule_rank_window():
+    scheduler = _make_scheduler(
+        MedianStoppingRule,
+        mode="min",
+        running_average=False,
+        grace_population=1,
+        rank_window=3,
+    )
+    trials = [
+        Trial(trial_id=trial_id, config=dict(), creation_time=datetime.now())
+        for trial_id in range(6)
+    ]
+    decisions = [
+        scheduler.on_trial_result(trial, dict(epoch=2, metric=metric))
+        for trial, metric in zip(trials, [1.0, 2.0, 3.0, 4.0, 5.0, 0.5])
+    ]
+    # Ranks among the 3 most recent results: 0, 1/2, 2/3, 2/3, 2/3, 0
+    assert decisions == [
+        SchedulerDecision.CONTINUE,
+        SchedulerDecision.CONTINUE,
+        SchedulerDecision.STOP,
+        SchedulerDecision.STOP,
+        SchedulerDecision.STOP,
+        SchedulerDecision.CONTINUE,
+    ]
+    assert scheduler.sorted_results[2].tolist() == [0.5, 4.0, 5.0]
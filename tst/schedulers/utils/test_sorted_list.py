@@ -0,0 +1,66 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+import numpy as np
+import pytest
+
+from syne_tune.optimizer.schedulers.utils.sorted_list import SortedList
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1000])
+def test_sorted_list_same_ranks_as_searchsorted(chunk_size):
+    random_state = np.random.RandomState(31415927)
+    sorted_list = SortedList(chunk_size=chunk_size)
+    values = np.zeros(0)
+    for _ in range(500):
+        if random_state.rand() < 0.2 and values.size > 0:
+            value = values[random_state.randint(values.size)]
+            sorted_list.remove(value)
+            pos = np.searchsorted(values, value)
+            if value != value:
+                pos = np.flatnonzero(np.isnan(values))[0]
+            values = np.delete(values, pos)
+        else:
+            value = random_state.choice([np.nan, random_state.randint(10) * 0.5])
+            index = np.searchsorted(values, value)
+            assert sorted_list.bisect_left(value) == index
+            assert sorted_list.add(value) == index
+            values = np.insert(values, index, value)
+        assert len(sorted_list) == values.size
+        np.testing.assert_array_equal(sorted_list.tolist(), values)
+    with pytest.raises(ValueError):
+        sorted_list.remove(100.0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1000])
+def test_sorted_list_indexing(chunk_size):
+    random_state = np.random.RandomState(27182818)
+    values = random_state.randint(20, size=200).tolist() + [np.nan] * 3
+    sorted_list = SortedList(values, chunk_size=chunk_size)
+    reference = sorted(values[:-3]) + values[-3:]
+    num_values = len(reference)
+    for index in list(range(num_values)) + [-1, -num_values]:
+        np.testing.assert_array_equal(sorted_list[index], reference[index])
+    for start, stop in [
+        (None, None),
+        (0, 5),
+        (17, 150),
+        (-7, None),
+        (None, -2),
+        (-0, None),
+        (199, 202),
+        (150, 10),
+    ]:
+        np.testing.assert_array_equal(sorted_list[start:stop], reference[start:stop])
+    np.testing.assert_array_equal(sorted_list[::3], reference[::3])
+    with pytest.raises(IndexError):
+        sorted_list[num_values]
@@ -24,6 +24,11 @@ from syne_tune.optimizer.schedulers.multiobjective.multiobjective_priority impor
     LinearScalarizationPriority,
     NonDominatedPriority,
 )
+from syne_tune.optimizer.schedulers.multiobjective.non_dominated_priority import (
+    NonDominatedLayers,
+    nondominated_layer_indices,
+    nondominated_sort,
+)
 from syne_tune.config_space import randint
 
 
@@ -157,3 +162,146 @@ def test_multiobjective_priorities(mo_priority, expected_priority):
     priorities = mo_priority.__call__(objectives=objectives)
     assert np.allclose(priorities, expected_priority)
     assert priorities.shape == (num_samples,)
+
+
+@pytest.mark.parametrize(
+    "max_num_samples,expected_priority",
+    [(None, [3, 0, 1, 2]), (2, [2, 0, 1, 2])],
+)
+def test_nondominated_priority_is_position_in_sort(max_num_samples, expected_priority):
+    # Layer 0 contains items 1, 2, 3 (in this order), layer 1 contains item 0
+    objectives = np.array([[5.0, 5.0], [0.0, 4.0], [4.0, 0.0], [2.0, 2.0]])
+    priorities = NonDominatedPriority(max_num_samples=max_num_samples)(objectives)
+    np.testing.assert_array_equal(priorities, expected_priority)
+
+
+@pytest.mark.parametrize(
+    "max_num_samples, expected_last_decision",
+    [(None, SchedulerDecision.STOP), (2, SchedulerDecision.CONTINUE)],
+)
+def test_moasha_nondominated_priority_decisions(
+    max_num_samples, expected_last_decision
+):
+    scheduler = scheduler_fun(
+        mode="min",
+        multiobjective_priority=NonDominatedPriority(max_num_samples=max_num_samples),
+    )
+    values = [5.0, 1.0, 3.0, 4.0, 4.5]
+    decisions = []
+    for trial_id, value in enumerate(values):
+        trial = make_trial(trial_id=trial_id)
+        scheduler.on_trial_add(trial=trial)
+        decisions.append(
+            scheduler.on_trial_result(
+                trial, {time_attr: 1, metric1: value, metric2: value}
+            )
+        )
+    # The last trial is placed at position 3 of 5. If only 2 trials are sorted,
+    # it shares the lowest priority with the others not sorted, and its rank
+    # is 2
+    assert decisions == [SchedulerDecision.CONTINUE] * 4 + [expected_last_decision]
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize("num_objectives", [1, 2, 3, 4])
+@pytest.mark.parametrize("num_values", [3, 100])
+def test_nondominated_layers_same_as_nondominated_sort(num_objectives, num_values):
+    # Small ``num_values`` results in many ties
+    random_state = np.random.RandomState(31415927)
+    points = random_state.randint(num_values, size=(100, num_objectives))
+    layers = NonDominatedLayers(num_objectives=num_objectives)
+    for num_points, point in enumerate(points, start=1):
+        ref_layers = nondominated_sort(points[:num_points], flatten=False)
+        ref_num_before = 0
+        for layer in ref_layers:
+            if num_points - 1 in layer:
+                break
+            ref_num_before += len(layer)
+        assert layers.add(point) == ref_num_before
+        assert [sorted(x) for x in layers.layers()] == [sorted(x) for x in ref_layers]
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize("num_objectives", [2, 3, 4])
+@pytest.mark.parametrize("num_values", [None, 5])
+def test_nondominated_layers_many_points(num_objectives, num_values):
+    # Layers of more than 100 points, with many changes of each layer
+    random_state = np.random.RandomState(271828)
+    num_points = 1500
+    if num_values is None:
+        points = random_state.rand(num_points, num_objectives)
+    else:
+        points = random_state.randint(num_values, size=(num_points, num_objectives))
+    layers = NonDominatedLayers(num_objectives=num_objectives)
+    for num, point in enumerate(points, start=1):
+        num_before = layers.add(point)
+        if num % 250 == 0:
+            layer_indices = nondominated_layer_indices(points[:num])
+            assert num_before == np.sum(layer_indices < layer_indices[-1])
+            assert [sorted(x) for x in layers.layers()] == [
+                np.flatnonzero(layer_indices == k).tolist()
+                for k in range(layer_indices.max() + 1)
+            ]
+
+
+class _FromScratchPriority(LinearScalarizationPriority):
+    def rank_structure(self):
+        return None
+
+
+class _FromScratchNonDominatedPriority(NonDominatedPriority):
+    def rank_structure(self):
+        return None
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize("num_objectives", [2, 3, 4])
+@pytest.mark.parametrize("num_values", [None, 4])
+@pytest.mark.parametrize("max_num_samples", [None, 20])
+def test_nondominated_ranks_same_as_from_scratch(
+    num_objectives, num_values, max_num_samples
+):
+    random_state = np.random.RandomState(31415)
+    num_points = 300
+    if num_values is None:
+        points = random_state.rand(num_points, num_objectives)
+    else:
+        points = random_state.randint(num_values, size=(num_points, num_objectives))
+    priority = NonDominatedPriority(max_num_samples=max_num_samples)
+    ranks = priority.rank_structure()
+    for num, point in enumerate(points, start=1):
+        priorities = priority(points[:num])
+        expected_rank = np.searchsorted(np.sort(priorities), priorities[-1])
+        assert ranks.add(point) == expected_rank
+
+
+@pytest.mark.parametrize(
+    "mo_priority,ref_priority",
+    [
+        (LinearScalarizationPriority(), _FromScratchPriority()),
+        (
+            LinearScalarizationPriority(weights=[0.2, 0.7]),
+            _FromScratchPriority(weights=[0.2, 0.7]),
+        ),
+        (NonDominatedPriority(), _FromScratchNonDominatedPriority()),
+        (NonDominatedPriority(dim=1), _FromScratchNonDominatedPriority(dim=1)),
+        (
+            NonDominatedPriority(max_num_samples=5),
+            _FromScratchNonDominatedPriority(max_num_samples=5),
+        ),
+    ],
+)
+def test_bracket_rank_structure_same_as_from_scratch(mo_priority, ref_priority):
+    random_state = np.random.RandomState(2718281)
+    bracket = _Bracket(1, 27, 3, 0, mo_priority)
+    ref_bracket = _Bracket(1, 27, 3, 0, ref_priority)
+    num_stopped = 0
+    for trial_id in range(100):
+        for step in range(1, 28):
+            metrics = {metric1: random_state.randint(10), metric2: random_state.rand()}
+            decision = bracket.on_result(trial_id, step, metrics)
+            assert decision == ref_bracket.on_result(trial_id, step, metrics)
+            if decision == SchedulerDecision.STOP:
+                num_stopped += 1
+                break
+    assert num_stopped > 0
@@ -0,0 +1,250 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Compares optimized implementations in ``non_dominated_priority`` against the
+previous implementations, which are used as reference here.
+"""
+from typing import Optional, List, Union
+
+import numpy as np
+import pytest
+
+from syne_tune.optimizer.schedulers.multiobjective.non_dominated_priority import (
+    pareto_efficient,
+    compute_epsilon_net,
+    nondominated_sort,
+    nondominated_layer_indices,
+)
+
+
+def pareto_efficient_reference(X: np.ndarray) -> np.ndarray:
+    """
+    Evaluates for each allocation in the provided array whether it is Pareto efficient. The costs
+    are assumed to be improved by lowering them (eg lower is better).
+
+    Parameters
+    ----------
+    X: np.ndarray [N, D]
+        The allocations to check where N is the number of allocations and D the number of costs per
+        allocation.
+
+    Returns
+    -------
+    np.ndarray [N]
+        A boolean array, indicating for each allocation whether it is Pareto efficient.
+    """
+    # First, we assume that all allocations are Pareto efficient, i.e. not dominated
+    mask = np.ones(X.shape[0], dtype=bool)
+    # Then, we iterate over all allocations A and check which are dominated by then current
+    # allocation A. If it is, we don't need to check it against another allocation.
+    for i, allocation in enumerate(X):
+        # Only consider allocation if it hasn't been dominated yet
+        if mask[i]:
+            # An allocation is dominated by A if all costs are equal or lower and at least one cost
+            # is strictly lower. Using that definition, A cannot be dominated by itself.
+            dominated = np.all(allocation <= X[mask], axis=1) * np.any(
+                allocation < X[mask], axis=1
+            )
+            mask[mask] = ~dominated
+
+    return mask
+
+
+def compute_epsilon_net_reference(
+    X: np.ndarray, dim: Optional[int] = None
+) -> np.ndarray:
+    """
+    Outputs an order of the items in the provided array such that the items are spaced well. This
+    means that after choosing a seed item, the next item is chosen to be the farthest from the seed
+    item. The third item is then chosen to maximize the distance to the existing points and so on.
+
+    This algorithm is taken from "Nearest-Neighbor Searching and Metric Space Dimensions"
+    (Clarkson, 2005, p.17).
+
+    Parameters
+    ----------
+    X: np.ndarray [N, D]
+        The items to sparsify where N is the number of items and D their dimensionality.
+    dim: Optional[int], default: None
+        The index of the dimension which to use to choose the seed item. If ``None``, an item is
+        chosen at random, otherwise the item with the lowest value in the specified dimension is
+        used.
+
+    Returns
+    -------
+    np.ndarray [N]
+        The rank of each item in the sparsified order.
+    """
+    indices = set(range(X.shape[0]))
+
+    # Choose the seed item according to dim
+    if dim is None:
+        initial_index = np.random.choice(X.shape[0])
+    else:
+        initial_index = np.argmin(X, axis=0)[dim]
+
+    # Initialize the order
+    order = [initial_index]
+    indices.remove(initial_index)
+
+    # Iterate until all models have been chosen
+    while indices:
+        # Get the distance to all items that have already been chosen
+        ordered_indices = list(indices)
+        diff = X[ordered_indices][:, None, :].repeat(len(order), axis=1) - X[order]
+        min_distances = np.linalg.norm(diff, axis=-1).min(-1)
+
+        # Then, choose the one with the maximum distance to all points
+        choice = ordered_indices[min_distances.argmax()]
+        order.append(choice)
+        indices.remove(choice)
+
+    # convert argsort indices to rank
+    ranks = np.empty(len(order), dtype=int)
+    for rank, i in enumerate(order):
+        ranks[i] = rank
+    return np.array(ranks)
+
+
+def nondominated_sort_reference(
+    X: np.ndarray,
+    dim: Optional[int] = None,
+    max_items: Optional[int] = None,
+    flatten: bool = True,
+) -> Union[List[int], List[List[int]]]:
+    """
+    Performs a multi-objective sort by iteratively computing the Pareto front and sparsifying the
+    items within the Pareto front. This is a non-dominated sort leveraging an epsilon-net.
+
+    Parameters
+    ----------
+    X: np.ndarray [N, D]
+        The multi-dimensional items to sort.
+    dim: Optional[int], default: None
+        The feature (metric) to prefer when ranking items within the Pareto front. If ``None``, items
+        are chosen randomly.
+    max_items: Optional[int], default: None
+        The maximum number of items that should be returned. When this is ``None``, all items are
+        sorted.
+    flatten: bool, default: True
+        Whether to flatten the resulting array.
+
+    Returns
+    -------
+    Union[List[int], List[List[int]]]
+        The indices of the sorted items, either globally or within each of the Pareto front
+        depending on the value of ``flatten``.
+    """
+    remaining = np.arange(X.shape[0])
+    indices = []
+    num_items = 0
+
+    # Iterate until max_items are reached or there are no items left
+    while remaining.size > 0 and (max_items is None or num_items < max_items):
+        # Compute the Pareto front and sort the items within
+        pareto_mask = pareto_efficient_reference(X[remaining])
+        pareto_front = remaining[pareto_mask]
+        pareto_ranks = compute_epsilon_net_reference(X[pareto_front], dim=dim)
+
+        # Add order to the indices
+        indices.append(pareto_front[np.argsort(pareto_ranks)].tolist())
+        num_items += len(pareto_front)
+
+        # Remove items in the Pareto front from the remaining items
+        remaining = remaining[~pareto_mask]
+
+    # Restrict the number of items returned and optionally flatten
+    if max_items is not None:
+        limit = max_items - sum(len(x) for x in indices[:-1])
+        indices[-1] = indices[-1][:limit]
+        if not indices[-1]:
+            indices = indices[:-1]
+
+    if flatten:
+        return [i for ix in indices for i in ix]
+    return indices
+
+
+def _random_points(random_state, num_points, num_objectives, num_values):
+    if num_values is None:
+        return random_state.rand(num_points, num_objectives)
+    else:
+        # Many ties and duplicates
+        return random_state.randint(num_values, size=(num_points, num_objectives))
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize("num_objectives", [1, 2, 3, 4, 6])
+@pytest.mark.parametrize("num_values", [None, 3, 10])
+def test_pareto_efficient_and_layers(num_objectives, num_values):
+    random_state = np.random.RandomState(31415927)
+    for num_points in [1, 2, 5, 50, 300]:
+        X = _random_points(random_state, num_points, num_objectives, num_values)
+        np.testing.assert_array_equal(
+            pareto_efficient(X), pareto_efficient_reference(X)
+        )
+        # Layers by peeling off Pareto fronts
+        layer_indices = nondominated_layer_indices(X, block_size=16)
+        remaining = np.arange(num_points)
+        layer = 0
+        while remaining.size > 0:
+            pareto_mask = pareto_efficient_reference(X[remaining])
+            np.testing.assert_array_equal(layer_indices[remaining[pareto_mask]], layer)
+            remaining = remaining[~pareto_mask]
+            layer += 1
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize("num_objectives", [2, 3])
+@pytest.mark.parametrize("num_values", [None, 4])
+@pytest.mark.parametrize("dim", [None, 0, 1])
+def test_compute_epsilon_net(num_objectives, num_values, dim):
+    random_state = np.random.RandomState(2718281)
+    for num_points in [1, 2, 10, 100]:
+        X = _random_points(random_state, num_points, num_objectives, num_values)
+        np.random.seed(num_points)
+        ranks = compute_epsilon_net(X, dim=dim)
+        np.random.seed(num_points)
+        ref_ranks = compute_epsilon_net_reference(X, dim=dim)
+        np.testing.assert_array_equal(ranks, ref_ranks)
+        for max_items in [0, 1, 5]:
+            np.random.seed(num_points)
+            ranks = compute_epsilon_net(X, dim=dim, max_items=max_items)
+            np.testing.assert_array_equal(ranks, np.minimum(ref_ranks, max_items))
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize("num_objectives", [2, 3, 5])
+@pytest.mark.parametrize("num_values", [None, 5])
+@pytest.mark.parametrize("dim", [None, 0])
+@pytest.mark.parametrize("max_items", [None, 1, 17])
+@pytest.mark.parametrize("flatten", [True, False])
+def test_nondominated_sort(num_objectives, num_values, dim, max_items, flatten):
+    random_state = np.random.RandomState(141421)
+    X = _random_points(random_state, 200, num_objectives, num_values)
+    np.random.seed(0)
+    result = nondominated_sort(X, dim=dim, max_items=max_items, flatten=flatten)
+    np.random.seed(0)
+    ref_result = nondominated_sort_reference(
+        X, dim=dim, max_items=max_items, flatten=flatten
+    )
+    assert result == ref_result
+
+
+def test_nondominated_sort_orders_front_by_epsilon_net():
+    X = np.array([[0, 4], [1, 3], [2, 2], [3, 1], [4, 0], [5, 5]])
+    # Seed is item 0, then the item farthest away (4), then the one in the
+    # middle (2). Items 1 and 3 are tied, the smaller index comes first
+    np.testing.assert_array_equal(compute_epsilon_net(X[:5], dim=0), [0, 3, 2, 4, 1])
+    assert nondominated_sort(X, dim=0, flatten=False) == [[0, 4, 2, 1, 3], [5]]
+    assert nondominated_sort(X, dim=0, max_items=3) == [0, 4, 2]
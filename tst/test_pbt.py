@@ -11,10 +11,15 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 from datetime import datetime
+import math
+
+import numpy as np
+import pytest
 
 from syne_tune.backend.trial_status import Trial
 from syne_tune.config_space import loguniform
 from syne_tune.optimizer.schedulers.pbt import PopulationBasedTraining
+from syne_tune.optimizer.scheduler import SchedulerDecision
 
 max_steps = 10
 
@@ -110,3 +115,88 @@ def test_ptb():
     # we should now continue with config 10
     suggest = pbt.suggest(total_steps)
     assert suggest.checkpoint_trial_id == 10
+
+
+class ReferencePopulationBasedTraining(PopulationBasedTraining):
+    """
+    Previous implementation, which sorts the population for every decision.
+    """
+
+    def _quantiles(self):
+        trials = []
+        for trial, state in self._trial_state.items():
+            if not state.stopped and state.last_score is not None:
+                trials.append(trial)
+        trials.sort(key=lambda t: self._trial_state[t].last_score)
+        if len(trials) <= 1:
+            return [], []
+        else:
+            num_trials_in_quantile = int(
+                math.ceil(len(trials) * self._quantile_fraction)
+            )
+            if num_trials_in_quantile > len(trials) / 2:
+                num_trials_in_quantile = int(math.floor(len(trials) / 2))
+            return trials[:num_trials_in_quantile], trials[-num_trials_in_quantile:]
+
+    def _get_trial_id_to_continue(self, trial: Trial) -> int:
+        lower_quantile, upper_quantile = self._quantiles()
+        trial_id = trial.trial_id
+        if trial_id in lower_quantile:
+            return int(self._random_state.choice(upper_quantile))
+        else:
+            return trial_id
+
+
+def _run_pbt(scheduler_cls, mode, quantile_fraction, seed):
+    scheduler = scheduler_cls(
+        config_space=config_space,
+        metric=metric,
+        resource_attr=resource_attr,
+        population_size=8,
+        mode=mode,
+        max_t=20,
+        perturbation_interval=2,
+        quantile_fraction=quantile_fraction,
+        random_seed=random_seed,
+    )
+    random_state = np.random.RandomState(seed)
+    running = dict()
+    decisions = []
+    for trial_id in range(300):
+        if len(running) < 8:
+            suggestion = scheduler.suggest(trial_id)
+            trial = Trial(
+                trial_id=trial_id,
+                config=suggestion.config,
+                creation_time=datetime.now(),
+            )
+            scheduler.on_trial_add(trial)
+            running[trial_id] = (trial, 1)
+            decisions.append(suggestion.checkpoint_trial_id)
+        trial, step = running[int(random_state.choice(list(running.keys())))]
+        # Few distinct values, so that there are many ties
+        result = {resource_attr: step, metric: random_state.randint(5) * 0.5}
+        decision = scheduler.on_trial_result(trial, result)
+        decisions.append(decision)
+        if decision == SchedulerDecision.CONTINUE:
+            running[trial.trial_id] = (trial, step + 1)
+        else:
+            del running[trial.trial_id]
+    return decisions, scheduler._checkpointing_history
+
+
+@pytest.mark.timeout(20)
+@pytest.mark.parametrize("mode", ["min", "max"])
+@pytest.mark.parametrize("quantile_fraction", [0.0, 0.25, 0.5])
+def test_pbt_ranking_same_as_sorting(mode, quantile_fraction):
+    seed = 2718281
+    decisions, history = _run_pbt(
+        PopulationBasedTraining, mode, quantile_fraction, seed
+    )
+    ref_decisions, ref_history = _run_pbt(
+        ReferencePopulationBasedTraining, mode, quantile_fraction, seed
+    )
+    assert decisions == ref_decisions
+    assert [x[:2] for x in history] == [x[:2] for x in ref_history]
+    if quantile_fraction > 0:
+        assert SchedulerDecision.PAUSE in decisions
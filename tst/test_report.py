@@ -12,8 +12,11 @@
 # permissions and limitations under the License.
 import logging
 
+import numpy as np
+
 from syne_tune import Reporter
-from syne_tune.report import retrieve
+from syne_tune.report import retrieve, IncrementalLogReader
+from syne_tune.metrics_channel import MetricsChannelWriter, MetricsChannelReader
 
 
 def test_report_logger():
@@ -34,3 +37,59 @@ def test_report_logger():
         {"train_nll": 1.45, "time": 1.0, "step": 2},
         {"train_nll": 1.2, "time": 2.0, "step": 3},
     ]
+
+
+def test_incremental_log_reader(tmp_path):
+    path = tmp_path / "std.out"
+    reader = IncrementalLogReader(path)
+    assert reader.read() == []
+
+    with open(path, "w") as f:
+        f.write("some user output\n")
+        f.write('[tune-metric]: {"step": 1}\n')
+        f.write('[tune-metric]: {"st')
+    assert reader.read() == [{"step": 1}]
+
+    # Completing the partial line, then appending, as a resumed trial does
+    with open(path, "a") as f:
+        f.write('ep": 2}\n')
+    with open(path, "a") as f:
+        f.write('[tune-metric]: {"step": 3}\n')
+    metrics = reader.read()
+    assert metrics == [{"step": 1}, {"step": 2}, {"step": 3}]
+    assert reader.read() is metrics
+    with open(path, "r") as f:
+        assert retrieve(log_lines=f.readlines()) == metrics
+
+    # Truncation: reading starts from scratch
+    with open(path, "w") as f:
+        f.write('[tune-metric]: {"step": 4}\n')
+    assert reader.read() == [{"step": 4}]
+
+
+def test_metrics_channel(tmp_path):
+    path = tmp_path / "metrics.bin"
+    reports = [
+        {"epoch": 1, "loss": 0.5, "done": False},
+        {"epoch": np.int64(2), "loss": np.float32(0.25), "done": False},
+        {"epoch": 3, "loss": 0.125, "tag": "text"},
+        {"epoch": 4, "loss": 0.0625, "done": True},
+    ]
+    expected = [
+        {k: v.item() if isinstance(v, np.generic) else v for k, v in report.items()}
+        for report in reports
+    ]
+    writer = MetricsChannelWriter(path, batch_size=2)
+    reader = MetricsChannelReader(path)
+    writer.write(reports[0])
+    assert reader.read() == []
+    writer.write(reports[1])
+    metrics = reader.read()
+    assert metrics == expected[:2]
+    assert isinstance(metrics[1]["epoch"], int)
+    # Another writer appending to the same file, as a resumed trial does
+    writer = MetricsChannelWriter(path)
+    for report in reports[2:]:
+        writer.write(report)
+    assert reader.read() == expected
+    assert MetricsChannelReader(path).read() == expected
@@ -0,0 +1,58 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+from datetime import datetime
+from types import SimpleNamespace
+
+import pandas as pd
+
+from syne_tune.backend.trial_status import Trial, Status
+from syne_tune.experiments import load_experiment
+from syne_tune.tuner_callback import (
+    ChunkedStoreResultsCallback,
+    results_chunk_paths,
+    read_results_chunks,
+)
+
+
+def test_chunked_store_results_callback(tmp_path):
+    tuner_name = "chunked-results"
+    tuner = SimpleNamespace(
+        tuner_path=tmp_path / tuner_name, results_update_interval=1000
+    )
+    callback = ChunkedStoreResultsCallback(max_results_in_memory=3)
+    callback.on_tuning_start(tuner)
+    num_results = 7
+    for i in range(num_results):
+        trial = Trial(trial_id=i % 2, config={"x": i}, creation_time=datetime.now())
+        callback.on_trial_result(
+            trial=trial,
+            status=Status.in_progress,
+            result={"epoch": i, "loss": 1.0 / (i + 1)},
+            decision="continue",
+        )
+    # Two chunks have been flushed, one result remains in memory
+    assert len(results_chunk_paths(tuner.tuner_path)) == 2
+    assert len(callback.results) == 1
+    df = callback.dataframe()
+    assert list(df["epoch"]) == list(range(num_results))
+
+    callback.on_tuning_end()
+    assert len(callback.results) == 0
+    chunks = list(read_results_chunks(tuner.tuner_path))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+    result = load_experiment(
+        tuner_name, download_if_not_found=False, local_path=str(tmp_path)
+    )
+    pd.testing.assert_frame_equal(result.results, df)
@@ -11,6 +11,7 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 import logging
+import time
 from pathlib import Path
 
 import pytest
@@ -162,6 +163,33 @@ def test_start_config_previous_checkpoint(caplog):
     assert results == ["nothing", "nothing", "state-0", "state-1"]
 
 
+@pytest.mark.timeout(10)
+def test_wait_for_events():
+    path_script = script_checkpoint_example_path()
+    backend = temporary_local_backend(entry_point=path_script)
+    trial_id = backend.start_trial(
+        config={"num-epochs": 100, "sleep-time": 0.05}
+    ).trial_id
+    # Returns with the first result, long before the timeout
+    start_time = time.monotonic()
+    assert backend.wait_for_events(timeout=8)
+    assert time.monotonic() - start_time < 6
+    _, new_metrics = get_status_metrics(backend, trial_id)
+    assert len(new_metrics) >= 1
+
+    trial_id = backend.start_trial(config={"num-epochs": 1}).trial_id
+    backend.stop_trial(trial_id=0)
+    # Returns on results or once the job of the trial ends
+    deadline = time.monotonic() + 5
+    while status(backend, [trial_id]) != [Status.completed]:
+        assert time.monotonic() < deadline
+        assert backend.wait_for_events(timeout=1)
+    # Nothing left to wait for
+    start_time = time.monotonic()
+    assert backend.wait_for_events(timeout=0.3)
+    assert time.monotonic() - start_time >= 0.3
+
+
 def test_gpu_allocation(caplog):
     caplog.set_level(logging.INFO)
     path_script = Path(__file__).parent / "main_checkpoint.py"
@@ -11,10 +11,12 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 import tempfile
+from pathlib import Path
 
 import pytest
 
 from syne_tune.backend import PythonBackend
+from syne_tune.backend.local_backend import MetricsChannelConfig
 from syne_tune.backend.trial_status import Status
 from syne_tune.config_space import randint
 from tst.util_test import wait_until_all_trials_completed
@@ -32,13 +34,28 @@ def f(x):
 
 
 @pytest.mark.timeout(5)
-def test_python_backend():
+@pytest.mark.parametrize(
+    "metrics_channel, use_warm_pool",
+    [
+        (None, False),
+        (MetricsChannelConfig(), False),
+        (MetricsChannelConfig(batch_size=3), False),
+        (None, True),
+        (MetricsChannelConfig(batch_size=3), True),
+    ],
+)
+def test_python_backend(metrics_channel, use_warm_pool):
     with tempfile.TemporaryDirectory() as local_path:
         import logging
 
         root = logging.getLogger()
         root.setLevel(logging.INFO)
-        backend = PythonBackend(f, config_space={"x": randint(0, 10)})
+        backend = PythonBackend(
+            f,
+            config_space={"x": randint(0, 10)},
+            metrics_channel=metrics_channel,
+            use_warm_pool=use_warm_pool,
+        )
         backend.set_path(str(local_path))
         backend.start_trial({"x": 2})
         backend.start_trial({"x": 3})
@@ -56,3 +73,48 @@ def test_python_backend():
         metrics_second_trial = [metric["y"] for x, metric in metrics if x == 1]
         assert metrics_first_trial == [2, 3, 4, 5, 6]
         assert metrics_second_trial == [3, 4, 5, 6, 7]
+        channel_used = (Path(local_path) / "0" / "metrics.bin").exists()
+        assert channel_used == (metrics_channel is not None)
+        backend.stop_all()
+
+
+def g(x):
+    import time
+    from syne_tune import Reporter
+
+    reporter = Reporter()
+    for i in range(x):
+        reporter(step=i + 1)
+        time.sleep(0.1)
+
+
+@pytest.mark.timeout(10)
+def test_python_backend_warm_pool():
+    with tempfile.TemporaryDirectory() as local_path:
+        backend = PythonBackend(
+            g,
+            config_space={"x": randint(1, 100)},
+            use_warm_pool=True,
+            preload_modules=["numpy"],
+        )
+        backend.set_path(str(local_path))
+        backend.start_trial({"x": 1})
+        wait_until_all_trials_completed(backend)
+        pid = backend.trial_subprocess[0].pid
+        # The idle worker is reused
+        backend.start_trial({"x": 100})
+        assert backend.trial_subprocess[1].pid == pid
+        backend.wait_for_events(timeout=5)
+        # Pausing kills the worker, which is replaced when resuming
+        backend.pause_trial(trial_id=1)
+        trials, _ = backend.fetch_status_results([1])
+        assert trials[1][1] == Status.paused
+        backend.resume_trial(trial_id=1, new_config={"x": 2})
+        assert backend.trial_subprocess[1].pid != pid
+        wait_until_all_trials_completed(backend)
+        trials, metrics = backend.fetch_status_results([0, 1])
+        assert all(status == Status.completed for _, status in trials.values())
+        # Results of trial 1 after being resumed come last
+        steps = [result["step"] for _, result in metrics]
+        assert steps[0] == 1 and steps[-2:] == [1, 2]
+        backend.stop_all()
@@ -14,9 +14,11 @@ import math
 import pytest
 
 from syne_tune.backend import LocalBackend
+from syne_tune.backend.trial_status import Status
 from syne_tune.backend.simulator_backend.simulator_backend import (
     SimulatorBackend,
     SimulatorConfig,
+    FunctionSimulatorBackend,
 )
 from syne_tune.backend.simulator_backend.events import (
     SimulatorState,
@@ -266,3 +268,74 @@ def test_simulator_state():
             (OnTrialResultEvent, 1, 3, 3.5),
             (CompleteEvent, 1, "completed", 4),
         ]
+
+
+def test_simulator_state_remove_events():
+    state = SimulatorState()
+    num_trials = 10
+    for trial_id in range(num_trials):
+        for epoch in range(1, 6):
+            state.push(
+                OnTrialResultEvent(trial_id=trial_id, result=dict(epoch=epoch)),
+                event_time=epoch + 0.1 * trial_id,
+            )
+    removed_trial_ids = {1, 2, 3, 5, 8}
+    for trial_id in removed_trial_ids:
+        state.remove_events(trial_id)
+    # Events pushed after removal are not affected
+    state.push(CompleteEvent(trial_id=2, status="stopped"), event_time=2.5)
+    obtained_results = []
+    while True:
+        entry = state.next_until(10)
+        if entry is None:
+            break
+        obtained_results.append(entry)
+    required_results = sorted(
+        [
+            (epoch + 0.1 * trial_id, trial_id)
+            for trial_id in range(num_trials)
+            if trial_id not in removed_trial_ids
+            for epoch in range(1, 6)
+        ]
+        + [(2.5, 2)]
+    )
+    assert [(t, event.trial_id) for t, event in obtained_results] == required_results
+    assert not state.event_heap
+
+
+def test_function_simulator_backend():
+    num_epochs = 5
+
+    def train_fn(config):
+        for epoch in range(1, num_epochs + 1):
+            if epoch > config["fail_after"]:
+                raise ValueError("training diverged")
+            yield {
+                "epoch": epoch,
+                "mean_loss": config["x"] / epoch,
+                "elapsed_time": 2.0 * epoch,
+            }
+
+    backend = FunctionSimulatorBackend(
+        train_fn=train_fn, elapsed_time_attr="elapsed_time"
+    )
+    backend.time_keeper.start_of_time()
+    configs = [dict(x=1.0, fail_after=num_epochs), dict(x=2.0, fail_after=2)]
+    for config in configs:
+        backend.start_trial(config)
+    backend.time_keeper.advance(3.0)
+    trial_status, results = backend.fetch_status_results(trial_ids=[0, 1])
+    assert [(trial_id, result["epoch"]) for trial_id, result in results] == [
+        (0, 1),
+        (1, 1),
+    ]
+    assert trial_status[1][1] == Status.in_progress
+    backend.time_keeper.advance(2.0 * num_epochs)
+    trial_status, results = backend.fetch_status_results(trial_ids=[0, 1])
+    assert trial_status[0][1] == Status.completed
+    assert trial_status[1][1] == Status.failed
+    epochs = {0: [], 1: []}
+    for trial_id, result in results:
+        epochs[trial_id].append(result["epoch"])
+        assert result["mean_loss"] == configs[trial_id]["x"] / result["epoch"]
+    assert epochs == {0: list(range(2, num_epochs + 1)), 1: [2]}
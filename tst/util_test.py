@@ -14,6 +14,8 @@ from typing import Optional
 import tempfile
 import time
 
+import numpy as np
+
 from syne_tune.backend import LocalBackend
 from syne_tune.backend.trial_status import Status
 from syne_tune.util import script_height_example_path
@@ -131,3 +133,16 @@ def run_experiment_with_height(
         save_tuner=False,
     )
     tuner.run()
+
+
+def sample_regression_data(num_data: int, dimension: int, seed: int):
+    """
+    :return: ``(features, targets)``, where features are sampled uniformly in
+        the unit cube and targets are a smooth function of them, plus a little
+        noise. Shapes are ``(num_data, dimension)`` and ``(num_data, 1)``.
+    """
+    random_state = np.random.RandomState(seed)
+    features = random_state.uniform(size=(num_data, dimension))
+    targets = np.sin(6 * np.sum(features, axis=1, keepdims=True))
+    targets += random_state.normal(scale=0.05, size=targets.shape)
+    return features, targets